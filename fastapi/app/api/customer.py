@@ -9,7 +9,9 @@ from typing import Optional
 from datetime import datetime, timedelta
 import uuid
 import random
-from ..database.connection import connect_db
+from ..database.async_db import fetch_one, execute, run_db
+from ..database.pagination import fetch_page
+from ..utils.password_hasher import hash_password, verify_password
 try:
     from ..utils.email_service import EmailService
 except ImportError:
@@ -61,18 +63,16 @@ class PushNotificationRequest(BaseModel):
 # 전체 고객 조회
 # ============================================
 @router.get("")
-async def select_customers():
-    """전체 고객 목록을 조회합니다 (비밀번호 제외)."""
+async def select_customers(after_seq: Optional[int] = None, limit: Optional[int] = None):
+    """
+    전체 고객 목록을 조회합니다 (비밀번호 제외).
+    - after_seq/limit 지정 시 키셋 페이지 단위 조회 (다음 페이지: after_seq=next_cursor)
+    """
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        curs.execute("""
+        rows, next_cursor = await fetch_page("""
             SELECT customer_seq, customer_name, customer_phone, customer_email, created_at 
-            FROM customer 
-            ORDER BY customer_seq
-        """)
-        rows = curs.fetchall()
-        conn.close()
+            FROM customer
+        """, "customer_seq", after_seq, limit)
         
         result = []
         for row in rows:
@@ -95,7 +95,7 @@ async def select_customers():
                 print(f"Error processing row: {e}, row: {row}")
                 continue
         
-        return {"results": result}
+        return {"results": result, "next_cursor": next_cursor}
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -115,10 +115,9 @@ async def get_customers_with_fcm_token():
     - device_token 테이블에 등록된 고객만 반환
     - 고객 정보와 함께 등록된 기기 수도 반환
     """
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    try:
+    def _work(conn):
+        curs = conn.cursor()
+
         # FCM 토큰이 등록된 고객 조회 (중복 제거, 기기 수 포함)
         # 최근 30일 이내에 업데이트된 토큰만 카운트 (활성 기기만 표시)
         # device_id가 있으면 device_id 기준으로, 없으면 fcm_token 기준으로 카운트
@@ -135,9 +134,9 @@ async def get_customers_with_fcm_token():
             GROUP BY c.customer_seq, c.customer_name, c.customer_email, c.customer_phone
             ORDER BY c.customer_seq
         """)
-        
+
         rows = curs.fetchall()
-        
+
         result = []
         for row in rows:
             result.append({
@@ -147,13 +146,15 @@ async def get_customers_with_fcm_token():
                 'customer_phone': row[3],
                 'device_count': row[4]
             })
-        
+
         return {
             "result": "OK",
             "results": result,
             "total_count": len(result)
         }
-        
+
+    try:
+        return await run_db(_work)
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -164,15 +165,6 @@ async def get_customers_with_fcm_token():
             "results": [],
             "total_count": 0
         }
-    finally:
-        try:
-            curs.close()
-        except:
-            pass
-        try:
-            conn.close()
-        except:
-            pass
 
 
 # ============================================
@@ -182,16 +174,12 @@ async def get_customers_with_fcm_token():
 async def select_customer(customer_seq: int):
     """특정 고객을 ID로 조회합니다 (비밀번호 제외)."""
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        curs.execute("""
+        row = await fetch_one("""
             SELECT customer_seq, customer_name, customer_phone, customer_email, 
                    created_at, provider, provider_subject
             FROM customer 
             WHERE customer_seq = %s
         """, (customer_seq,))
-        row = curs.fetchone()
-        conn.close()
         
         if row is None:
             return {"result": "Error", "message": "Customer not found"}
@@ -233,36 +221,34 @@ async def register_customer(
     """
     회원가입
     - 이메일 중복 확인
-    - 고객 정보 저장
+    - 고객 정보 저장 (비밀번호는 scrypt 해시로 저장)
     """
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    try:
+    def _work(conn, pw_hash):
+        curs = conn.cursor()
+
         # 1. 이메일 중복 확인
         curs.execute("""
             SELECT customer_seq FROM customer WHERE customer_email = %s
         """, (customer_email,))
         existing_customer = curs.fetchone()
-        
+
         if existing_customer:
             return {
                 "result": "Error",
                 "errorMsg": "이미 사용 중인 이메일입니다."
             }
-        
+
         # 2. 고객 정보 저장
-        # TODO: 향후 비밀번호 해시화 필요 (bcrypt 등)
         # 전화번호가 빈 문자열이면 None으로 처리
         phone_value = customer_phone if customer_phone and customer_phone.strip() else None
         curs.execute("""
             INSERT INTO customer (customer_name, customer_phone, customer_email, customer_pw, provider, created_at) 
             VALUES (%s, %s, %s, %s, 'local', NOW())
-        """, (customer_name, phone_value, customer_email, customer_pw))
+        """, (customer_name, phone_value, customer_email, pw_hash))
         customer_seq = curs.lastrowid
-        
+
         conn.commit()
-        
+
         return {
             "result": {
                 "customer_seq": customer_seq,
@@ -273,9 +259,12 @@ async def register_customer(
             },
             "message": "회원가입 성공"
         }
-        
+
+    try:
+        # 해시는 CPU를 많이 쓰므로 DB 작업 전에 해시 프로세스 풀에서 계산
+        pw_hash = await hash_password(customer_pw)
+        return await run_db(_work, pw_hash)
     except Exception as e:
-        conn.rollback()
         import traceback
         error_msg = str(e)
         traceback.print_exc()
@@ -284,8 +273,6 @@ async def register_customer(
             "errorMsg": error_msg,
             "traceback": traceback.format_exc()
         }
-    finally:
-        conn.close()
 
 
 # ============================================
@@ -298,35 +285,44 @@ async def login_customer(
 ):
     """
     로그인
-    - 이메일과 비밀번호 확인
+    - 이메일과 비밀번호 확인 (scrypt 검증은 해시 프로세스 풀에서 실행)
+    - 평문으로 저장된 예전 비밀번호는 로그인 성공 시 해시로 교체
     - 로그인 성공 시 고객 정보 반환
     """
-    conn = connect_db()
-    curs = conn.cursor()
-    
     try:
-        # 1. 이메일과 비밀번호로 고객 확인 (provider='local'만)
-        curs.execute("""
-            SELECT customer_seq, customer_name, customer_phone, customer_email, created_at, provider
+        # 1. 이메일로 고객 확인 (provider='local'만)
+        customer_row = await fetch_one("""
+            SELECT customer_seq, customer_name, customer_phone, customer_email, created_at, provider, customer_pw
             FROM customer 
-            WHERE customer_email = %s AND customer_pw = %s AND provider = 'local'
-        """, (customer_email, customer_pw))
-        customer_row = curs.fetchone()
-        
-        if customer_row is None:
+            WHERE customer_email = %s AND provider = 'local'
+        """, (customer_email,))
+
+        # 2. 비밀번호 검증 (계정이 없어도 같은 시간이 걸리도록 더미 해시와 비교)
+        stored_pw = customer_row[6] if customer_row else None
+        ok, needs_rehash = await verify_password(customer_pw, stored_pw)
+
+        if not ok:
             return {
                 "result": "Error",
                 "errorMsg": "이메일 또는 비밀번호가 올바르지 않습니다."
             }
-        
-        # 2. 고객 정보 반환 (비밀번호 제외)
+
+        # 3. 평문/이전 설정 해시면 새 해시로 교체 (그 사이 비밀번호가 바뀌었으면 덮어쓰지 않음)
+        if needs_rehash:
+            new_hash = await hash_password(customer_pw)
+            await execute("""
+                UPDATE customer SET customer_pw = %s
+                WHERE customer_seq = %s AND customer_pw = %s
+            """, (new_hash, customer_row[0], stored_pw))
+
+        # 4. 고객 정보 반환 (비밀번호 제외)
         created_at = None
         if customer_row[4]:
             if hasattr(customer_row[4], 'isoformat'):
                 created_at = customer_row[4].isoformat()
             else:
                 created_at = str(customer_row[4])
-        
+
         return {
             "result": {
                 "customer_seq": customer_row[0],
@@ -338,7 +334,6 @@ async def login_customer(
             },
             "message": "로그인 성공"
         }
-        
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -348,8 +343,6 @@ async def login_customer(
             "errorMsg": error_msg,
             "traceback": traceback.format_exc()
         }
-    finally:
-        conn.close()
 
 
 # ============================================
@@ -365,33 +358,32 @@ async def change_password(
     비밀번호 변경 (인증 완료 후)
     - 인증 토큰 검증
     - 인증 완료 여부 확인
-    - 비밀번호 변경
+    - 비밀번호 변경 (scrypt 해시로 저장)
     """
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    try:
+    def _work(conn, pw_hash):
+        curs = conn.cursor()
+
         # 1. 고객 정보 확인
         curs.execute("""
             SELECT customer_seq, provider FROM customer WHERE customer_seq = %s
         """, (customer_seq,))
         customer = curs.fetchone()
-        
+
         if customer is None:
             return {
                 "result": "Error",
                 "errorMsg": "고객을 찾을 수 없습니다."
             }
-        
+
         provider = customer[1]
-        
+
         # 2. 구글 계정은 비밀번호 변경 불가
         if provider == 'google':
             return {
                 "result": "Error",
                 "errorMsg": "구글 로그인 계정은 비밀번호를 변경할 수 없습니다."
             }
-        
+
         # 3. 인증 토큰 검증
         curs.execute("""
             SELECT auth_seq, expires_at, is_verified, customer_seq
@@ -401,65 +393,55 @@ async def change_password(
             LIMIT 1
         """, (auth_token, customer_seq))
         auth_record = curs.fetchone()
-        
+
         if auth_record is None:
             return {
                 "result": "Error",
                 "errorMsg": "유효하지 않은 인증 토큰입니다."
             }
-        
+
         expires_at = auth_record[1]
         is_verified = auth_record[2]
-        
+
         # 4. 인증 완료 여부 확인
         if not is_verified:
             return {
                 "result": "Error",
                 "errorMsg": "이메일 인증을 먼저 완료해주세요."
             }
-        
+
         # 5. 만료 시간 확인
         if datetime.now() > expires_at:
             return {
                 "result": "Error",
                 "errorMsg": "인증이 만료되었습니다. 다시 요청해주세요."
             }
-        
-        # 6. 현재 비밀번호 확인 (동일한 비밀번호로 변경하는 경우 허용)
-        curs.execute("""
-            SELECT customer_pw FROM customer WHERE customer_seq = %s
-        """, (customer_seq,))
-        current_password = curs.fetchone()
-        
-        if current_password and current_password[0] == new_password:
-            # 동일한 비밀번호로 변경하는 경우 허용 (사용자가 원하는 경우)
-            # 보안상 경고 메시지는 표시하지 않고 그대로 진행
-            pass
-        
-        # 7. 비밀번호 변경
-        # TODO: 향후 비밀번호 해시화 필요 (bcrypt 등)
+
+        # 6. 비밀번호 변경 (동일한 비밀번호로 변경하는 경우도 허용)
         curs.execute("""
             UPDATE customer 
             SET customer_pw = %s 
             WHERE customer_seq = %s
-        """, (new_password, customer_seq))
-        
-        # 8. 인증 토큰 삭제 (일회용)
+        """, (pw_hash, customer_seq))
+
+        # 7. 인증 토큰 삭제 (일회용)
         auth_seq = auth_record[0]
         curs.execute("""
             DELETE FROM password_reset_auth 
             WHERE auth_seq = %s
         """, (auth_seq,))
-        
+
         conn.commit()
-        
+
         return {
             "result": "OK",
             "message": "비밀번호가 성공적으로 변경되었습니다."
         }
-        
+
+    try:
+        pw_hash = await hash_password(new_password)
+        return await run_db(_work, pw_hash)
     except Exception as e:
-        conn.rollback()
         import traceback
         error_msg = str(e)
         traceback.print_exc()
@@ -468,15 +450,6 @@ async def change_password(
             "errorMsg": error_msg,
             "traceback": traceback.format_exc()
         }
-    finally:
-        try:
-            curs.close()
-        except:
-            pass
-        try:
-            conn.close()
-        except:
-            pass
 
 
 # ============================================
@@ -495,36 +468,35 @@ async def update_customer(
     - 이메일은 선택사항 (제공되지 않으면 기존 이메일 유지)
     - 비밀번호는 선택사항 (변경하지 않으려면 None)
     """
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    try:
+    def _work(conn):
+        curs = conn.cursor()
+
         # 1. 고객 존재 확인 및 provider 확인
         curs.execute("""
             SELECT customer_seq, provider, customer_email FROM customer WHERE customer_seq = %s
         """, (customer_seq,))
         existing_customer = curs.fetchone()
-        
+
         if existing_customer is None:
             return {
                 "result": "Error",
                 "errorMsg": "고객을 찾을 수 없습니다."
             }
-        
+
         existing_provider = existing_customer[1]
         existing_email = existing_customer[2]
-        
+
         # 2. 구글 계정은 비밀번호 수정 불가
         if existing_provider == 'google' and customer_pw:
             return {
                 "result": "Error",
                 "errorMsg": "구글 로그인 계정은 비밀번호를 변경할 수 없습니다."
             }
-        
+
         # 3. 이메일이 제공되지 않으면 기존 이메일 사용
         if customer_email is None or customer_email.strip() == '':
             customer_email = existing_email
-        
+
         # 4. 이메일 중복 확인 (다른 고객이 사용 중인지, 이메일이 변경되는 경우만)
         if customer_email != existing_email:
             curs.execute("""
@@ -532,13 +504,13 @@ async def update_customer(
                 WHERE customer_email = %s AND customer_seq != %s
             """, (customer_email, customer_seq))
             email_duplicate = curs.fetchone()
-            
+
             if email_duplicate:
                 return {
                     "result": "Error",
                     "errorMsg": "이미 사용 중인 이메일입니다."
                 }
-        
+
         # 5. 고객 정보 수정 (비밀번호 변경 제외)
         # 비밀번호 변경은 별도 엔드포인트(/change-password) 사용
         curs.execute("""
@@ -546,13 +518,14 @@ async def update_customer(
             SET customer_name=%s, customer_phone=%s, customer_email=%s 
             WHERE customer_seq=%s
         """, (customer_name, customer_phone, customer_email, customer_seq))
-        
+
         conn.commit()
-        
+
         return {"result": "OK"}
-        
+
+    try:
+        return await run_db(_work)
     except Exception as e:
-        conn.rollback()
         import traceback
         error_msg = str(e)
         traceback.print_exc()
@@ -561,16 +534,6 @@ async def update_customer(
             "errorMsg": error_msg,
             "traceback": traceback.format_exc()
         }
-    finally:
-        # 연결 안전하게 닫기
-        try:
-            curs.close()
-        except:
-            pass
-        try:
-            conn.close()
-        except:
-            pass
 
 
 # ============================================
@@ -580,25 +543,19 @@ async def update_customer(
 async def delete_customer(customer_seq: int):
     """고객을 삭제합니다."""
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
         # 고객 존재 확인
-        curs.execute("""
+        existing_customer = await fetch_one("""
             SELECT customer_seq FROM customer WHERE customer_seq = %s
         """, (customer_seq,))
-        existing_customer = curs.fetchone()
-        
+
         if existing_customer is None:
             return {
                 "result": "Error",
                 "errorMsg": "고객을 찾을 수 없습니다."
             }
-        
+
         # 고객 삭제
-        curs.execute("DELETE FROM customer WHERE customer_seq=%s", (customer_seq,))
-        conn.commit()
-        conn.close()
+        await execute("DELETE FROM customer WHERE customer_seq=%s", (customer_seq,))
         
         return {"result": "OK"}
     except Exception as e:
@@ -628,10 +585,9 @@ async def login_social_customer(
     - local 계정이 있으면 계정 통합 필요 응답 반환
     - 없으면 신규 구글 계정 생성
     """
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    try:
+    def _work(conn):
+        curs = conn.cursor()
+
         # 1. provider_subject로 기존 구글 계정 조회
         curs.execute("""
             SELECT customer_seq, customer_name, customer_phone, customer_email, 
@@ -640,7 +596,7 @@ async def login_social_customer(
             WHERE provider_subject = %s AND provider = 'google'
         """, (provider_subject,))
         customer_row = curs.fetchone()
-        
+
         if customer_row:
             # 기존 구글 계정으로 로그인 성공
             created_at = None
@@ -649,7 +605,7 @@ async def login_social_customer(
                     created_at = customer_row[4].isoformat()
                 else:
                     created_at = str(customer_row[4])
-            
+
             return {
                 "result": {
                     "customer_seq": customer_row[0],
@@ -662,7 +618,7 @@ async def login_social_customer(
                 },
                 "message": "로그인 성공"
             }
-        
+
         # 2. 이메일로 local 계정 확인
         curs.execute("""
             SELECT customer_seq, customer_name, provider 
@@ -670,7 +626,7 @@ async def login_social_customer(
             WHERE customer_email = %s AND provider = 'local'
         """, (customer_email,))
         local_account = curs.fetchone()
-        
+
         if local_account:
             # 기존 local 계정 존재 → 계정 통합 필요
             return {
@@ -679,7 +635,7 @@ async def login_social_customer(
                 "customer_seq": local_account[0],
                 "customer_name": local_account[1]
             }
-        
+
         # 3. 신규 구글 계정 생성
         curs.execute("""
             INSERT INTO customer 
@@ -689,7 +645,7 @@ async def login_social_customer(
         """, (customer_name, customer_email, provider_subject))
         customer_seq = curs.lastrowid
         conn.commit()
-        
+
         return {
             "result": {
                 "customer_seq": customer_seq,
@@ -702,9 +658,10 @@ async def login_social_customer(
             },
             "message": "회원가입 성공"
         }
-        
+
+    try:
+        return await run_db(_work)
     except Exception as e:
-        conn.rollback()
         import traceback
         error_msg = str(e)
         traceback.print_exc()
@@ -713,8 +670,6 @@ async def login_social_customer(
             "errorMsg": error_msg,
             "traceback": traceback.format_exc()
         }
-    finally:
-        conn.close()
 
 
 # ============================================
@@ -733,10 +688,9 @@ async def link_social_account(
     - customer_pw를 NULL로 설정
     - customer_name 업데이트
     """
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    try:
+    def _work(conn):
+        curs = conn.cursor()
+
         # 1. 고객 존재 확인 및 provider 확인
         curs.execute("""
             SELECT customer_seq, provider 
@@ -744,32 +698,32 @@ async def link_social_account(
             WHERE customer_seq = %s
         """, (customer_seq,))
         existing_customer = curs.fetchone()
-        
+
         if existing_customer is None:
             return {
                 "result": "Error",
                 "errorMsg": "고객을 찾을 수 없습니다."
             }
-        
+
         if existing_customer[1] != 'local':
             return {
                 "result": "Error",
                 "errorMsg": "이미 소셜 로그인 계정입니다."
             }
-        
+
         # 2. provider_subject 중복 확인
         curs.execute("""
             SELECT customer_seq FROM customer 
             WHERE provider_subject = %s AND customer_seq != %s
         """, (provider_subject, customer_seq))
         duplicate = curs.fetchone()
-        
+
         if duplicate:
             return {
                 "result": "Error",
                 "errorMsg": "이미 사용 중인 구글 계정입니다."
             }
-        
+
         # 3. 계정 통합 처리
         curs.execute("""
             UPDATE customer 
@@ -780,7 +734,7 @@ async def link_social_account(
             WHERE customer_seq = %s
         """, (provider_subject, customer_name, customer_seq))
         conn.commit()
-        
+
         # 4. 업데이트된 정보 조회
         curs.execute("""
             SELECT customer_seq, customer_name, customer_phone, customer_email, 
@@ -789,14 +743,14 @@ async def link_social_account(
             WHERE customer_seq = %s
         """, (customer_seq,))
         customer_row = curs.fetchone()
-        
+
         created_at = None
         if customer_row[4]:
             if hasattr(customer_row[4], 'isoformat'):
                 created_at = customer_row[4].isoformat()
             else:
                 created_at = str(customer_row[4])
-        
+
         return {
             "result": {
                 "customer_seq": customer_row[0],
@@ -809,9 +763,10 @@ async def link_social_account(
             },
             "message": "계정이 통합되었습니다."
         }
-        
+
+    try:
+        return await run_db(_work)
     except Exception as e:
-        conn.rollback()
         import traceback
         error_msg = str(e)
         traceback.print_exc()
@@ -820,15 +775,6 @@ async def link_social_account(
             "errorMsg": error_msg,
             "traceback": traceback.format_exc()
         }
-    finally:
-        try:
-            curs.close()
-        except:
-            pass
-        try:
-            conn.close()
-        except:
-            pass
 
 
 # ============================================
@@ -844,10 +790,9 @@ async def request_password_change(
     - 인증 토큰 생성 및 저장
     - 만료 시간: 10분
     """
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    try:
+    def _work(conn):
+        curs = conn.cursor()
+
         # 1. 고객 정보 확인
         curs.execute("""
             SELECT customer_seq, customer_name, customer_email, provider 
@@ -855,73 +800,75 @@ async def request_password_change(
             WHERE customer_seq = %s
         """, (customer_seq,))
         customer = curs.fetchone()
-        
+
         if customer is None:
             return {
                 "result": "Error",
                 "errorMsg": "고객을 찾을 수 없습니다."
             }
-        
+
         customer_name = customer[1]
         customer_email = customer[2]
         provider = customer[3]
-        
+
         # 2. 구글 계정은 비밀번호 변경 불가
         if provider == 'google':
             return {
                 "result": "Error",
                 "errorMsg": "구글 로그인 계정은 비밀번호를 변경할 수 없습니다."
             }
-        
+
         # 3. 기존 미사용 인증 토큰 삭제 (중복 방지)
         curs.execute("""
             DELETE FROM password_reset_auth 
             WHERE customer_seq = %s AND is_verified = FALSE AND expires_at > NOW()
         """, (customer_seq,))
-        
+
         # 4. 인증 토큰 및 코드 생성
         auth_token = str(uuid.uuid4())
         auth_code = f"{random.randint(100000, 999999)}"  # 6자리 숫자
         expires_at = datetime.now() + timedelta(minutes=10)  # 10분 후 만료
-        
+
         # 5. 인증 토큰 저장
         curs.execute("""
             INSERT INTO password_reset_auth 
             (customer_seq, auth_token, auth_code, expires_at, is_verified, created_at) 
             VALUES (%s, %s, %s, %s, FALSE, NOW())
         """, (customer_seq, auth_token, auth_code, expires_at))
-        
+
         conn.commit()
-        
+
         # 6. 이메일 발송
         if EmailService is None:
             return {
                 "result": "Error",
                 "errorMsg": "이메일 서비스가 설정되지 않았습니다."
             }
-        
-        email_sent = EmailService.send_password_reset_email(
+
+        # 발송 대기열에 등록만 하고 응답 (SMTP 발송은 email_queue 워커가 처리)
+        email_queued = EmailService.queue_password_reset_email(
             to_email=customer_email,
             customer_name=customer_name,
             auth_code=auth_code,
             expires_minutes=10
         )
-        
-        if not email_sent:
+
+        if not email_queued:
             return {
                 "result": "Error",
                 "errorMsg": "이메일 발송에 실패했습니다. 잠시 후 다시 시도해주세요."
             }
-        
+
         return {
             "result": "OK",
             "message": "인증 코드가 이메일로 발송되었습니다.",
             "auth_token": auth_token,  # 프론트엔드에서 인증 코드 검증 시 사용
             "expires_at": expires_at.isoformat()
         }
-        
+
+    try:
+        return await run_db(_work)
     except Exception as e:
-        conn.rollback()
         import traceback
         error_msg = str(e)
         traceback.print_exc()
@@ -930,15 +877,6 @@ async def request_password_change(
             "errorMsg": error_msg,
             "traceback": traceback.format_exc()
         }
-    finally:
-        try:
-            curs.close()
-        except:
-            pass
-        try:
-            conn.close()
-        except:
-            pass
 
 
 # ============================================
@@ -956,10 +894,9 @@ async def verify_password_change_code(
     - 만료 시간 확인
     - 인증 완료 처리
     """
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    try:
+    def _work(conn):
+        curs = conn.cursor()
+
         # 1. 인증 토큰 조회
         curs.execute("""
             SELECT auth_seq, auth_code, expires_at, is_verified, customer_seq
@@ -969,38 +906,38 @@ async def verify_password_change_code(
             LIMIT 1
         """, (auth_token, customer_seq))
         auth_record = curs.fetchone()
-        
+
         if auth_record is None:
             return {
                 "result": "Error",
                 "errorMsg": "유효하지 않은 인증 토큰입니다."
             }
-        
+
         stored_code = auth_record[1]
         expires_at = auth_record[2]
         is_verified = auth_record[3]
-        
+
         # 2. 이미 인증 완료된 경우
         if is_verified:
             return {
                 "result": "Error",
                 "errorMsg": "이미 사용된 인증 코드입니다."
             }
-        
+
         # 3. 만료 시간 확인
         if datetime.now() > expires_at:
             return {
                 "result": "Error",
                 "errorMsg": "인증 코드가 만료되었습니다. 다시 요청해주세요."
             }
-        
+
         # 4. 인증 코드 확인
         if stored_code != auth_code:
             return {
                 "result": "Error",
                 "errorMsg": "인증 코드가 일치하지 않습니다."
             }
-        
+
         # 5. 인증 완료 처리
         auth_seq = auth_record[0]
         curs.execute("""
@@ -1008,16 +945,17 @@ async def verify_password_change_code(
             SET is_verified = TRUE 
             WHERE auth_seq = %s
         """, (auth_seq,))
-        
+
         conn.commit()
-        
+
         return {
             "result": "OK",
             "message": "인증이 완료되었습니다."
         }
-        
+
+    try:
+        return await run_db(_work)
     except Exception as e:
-        conn.rollback()
         import traceback
         error_msg = str(e)
         traceback.print_exc()
@@ -1026,15 +964,6 @@ async def verify_password_change_code(
             "errorMsg": error_msg,
             "traceback": traceback.format_exc()
         }
-    finally:
-        try:
-            curs.close()
-        except:
-            pass
-        try:
-            conn.close()
-        except:
-            pass
 
 
 # ============================================
@@ -1051,22 +980,21 @@ async def register_fcm_token(
     - 같은 고객의 같은 토큰이 이미 있으면 업데이트 (updated_at 갱신)
     - 새로운 토큰이면 등록
     """
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    try:
+    def _work(conn):
+        curs = conn.cursor()
+
         # 1. 고객 존재 확인
         curs.execute("""
             SELECT customer_seq FROM customer WHERE customer_seq = %s
         """, (customer_seq,))
         customer = curs.fetchone()
-        
+
         if customer is None:
             return {
                 "result": "Error",
                 "errorMsg": "고객을 찾을 수 없습니다."
             }
-        
+
         # 2. device_type 검증
         device_type = request.device_type.lower()
         if device_type not in ['ios', 'android']:
@@ -1074,7 +1002,7 @@ async def register_fcm_token(
                 "result": "Error",
                 "errorMsg": "device_type은 'ios' 또는 'android'여야 합니다."
             }
-        
+
         # 3. 기기 ID가 있으면 동일 기기 확인 및 다른 사용자 토큰 정리
         if request.device_id:
             # 같은 고객의 같은 기기 ID가 있는지 확인
@@ -1083,12 +1011,12 @@ async def register_fcm_token(
                 WHERE customer_seq = %s AND device_id = %s
             """, (customer_seq, request.device_id))
             existing_device = curs.fetchone()
-            
+
             if existing_device:
                 # 같은 기기에서 앱 재설치한 경우: 기존 토큰 업데이트
                 existing_token_seq = existing_device[0]
                 existing_fcm_token = existing_device[1]
-                
+
                 if existing_fcm_token == request.fcm_token:
                     # 같은 토큰이면 업데이트만
                     curs.execute("""
@@ -1103,20 +1031,20 @@ async def register_fcm_token(
                         SET fcm_token = %s, device_type = %s, updated_at = NOW()
                         WHERE device_token_seq = %s
                     """, (request.fcm_token, device_type, existing_token_seq))
-                
+
                 conn.commit()
                 return {
                     "result": "OK",
                     "message": "FCM 토큰이 업데이트되었습니다. (동일 기기)"
                 }
-        
+
         # 4. 기존 토큰 확인 (기기 ID가 없거나 동일 기기를 찾지 못한 경우)
         curs.execute("""
             SELECT device_token_seq FROM device_token 
             WHERE customer_seq = %s AND fcm_token = %s
         """, (customer_seq, request.fcm_token))
         existing_token = curs.fetchone()
-        
+
         if existing_token:
             # 기존 토큰 업데이트 (updated_at 자동 갱신)
             if request.device_id:
@@ -1141,16 +1069,17 @@ async def register_fcm_token(
                 (customer_seq, fcm_token, device_type, device_id, created_at, updated_at)
                 VALUES (%s, %s, %s, %s, NOW(), NOW())
             """, (customer_seq, request.fcm_token, device_type, request.device_id))
-        
+
         conn.commit()
-        
+
         return {
             "result": "OK",
             "message": "FCM 토큰이 등록되었습니다."
         }
-        
+
+    try:
+        return await run_db(_work)
     except Exception as e:
-        conn.rollback()
         import traceback
         error_msg = str(e)
         traceback.print_exc()
@@ -1159,15 +1088,6 @@ async def register_fcm_token(
             "errorMsg": error_msg,
             "traceback": traceback.format_exc()
         }
-    finally:
-        try:
-            curs.close()
-        except:
-            pass
-        try:
-            conn.close()
-        except:
-            pass
 
 
 # ============================================
@@ -1186,23 +1106,30 @@ async def send_push_to_customer(
         request: 푸시 알림 요청 (title, body, data)
     
     Returns:
-        성공 시 발송된 기기 수 반환
+        발송 대기열 번호(outbox_seq)와 대상 기기 수(target_count) 반환
+        (실제 발송은 push outbox 워커가 처리, 실패 시 재시도 → 발송 성공 수는 아직 알 수 없어 success_count는 주지 않음)
     """
     try:
-        from ..utils.fcm_service import FCMService
+        from ..utils.push_outbox import enqueue_push
         
-        # FCMService를 사용하여 고객의 모든 기기에 알림 발송
-        success_count = FCMService.send_notification_to_customer(
-            customer_seq=customer_seq,
-            title=request.title,
-            body=request.body,
-            data=request.data
-        )
+        row = await fetch_one("SELECT COUNT(*) FROM device_token WHERE customer_seq = %s", (customer_seq,))
+        device_count = row[0] if row else 0
+        if device_count == 0:
+            return {
+                "result": "Error",
+                "errorMsg": "등록된 기기가 없습니다.",
+                "success_count": 0
+            }
+        
+        # 발송 대기열에 등록하고 바로 응답 (Firebase 왕복을 요청 지연에 포함하지 않음)
+        outbox_seq = await enqueue_push(request.title, request.body, request.data, customer_seq=customer_seq)
         
         return {
             "result": "OK",
-            "success_count": success_count,
-            "message": f"{success_count}개 기기에 알림이 발송되었습니다."
+            "queued": True,
+            "outbox_seq": outbox_seq,
+            "target_count": device_count,
+            "message": f"{device_count}개 기기로 알림 발송이 예약되었습니다."
         }
         
     except Exception as e:
@@ -1249,4 +1176,30 @@ async def send_push_to_customer(
 #   - POST /{customer_seq}/fcm-token 엔드포인트 구현
 #   - FCMTokenRequest 모델 추가
 #   - 기존 토큰이 있으면 업데이트, 없으면 등록
-#   - device_type 검증 (ios/android)
\ No newline at end of file
+#   - device_type 검증 (ios/android)
+#
+# 2026-01-22 김택권: 커넥션 풀 적용
+#   - connect_db() 대신 get_connection() 컨텍스트 매니저로 연결 대여/반납
+#
+# 2026-01-22 김택권: 비동기 DB 계층 적용
+#   - 단일 쿼리는 async_db.fetch_all/fetch_one/execute 사용
+#   - 여러 쿼리를 묶는 처리는 run_db()로 DB 스레드 풀에서 실행 (이벤트 루프 블로킹 제거)
+#
+# 2026-01-22 김택권: 전체 고객 조회 키셋 페이지네이션
+#   - GET ""에 after_seq / limit 쿼리 파라미터 및 next_cursor 응답 추가 (database.pagination.fetch_page)
+#
+# 2026-01-22 김택권: 푸시 발송을 스레드에서 실행
+#   - send_push_to_customer: FCMService.send_notification_to_customer를 asyncio.to_thread로 호출 (이벤트 루프 블로킹 제거)
+#
+# 2026-01-22 김택권: 푸시 알림 발송 대기열 적용
+#   - send_push_to_customer: 바로 발송하지 않고 push_outbox에 등록 후 응답 (outbox_seq, 대상 기기 수 반환)
+#
+# 2026-01-22 김택권: 비밀번호 변경 인증 이메일 대기열 발송
+#   - request_password_change: SMTP로 바로 보내지 않고 email_queue에 등록 후 응답 (대기열이 가득 차면 오류 반환)
+#
+# 2026-01-22 김택권: 비밀번호 scrypt 해시 적용
+#   - register_customer / change_password: 비밀번호를 해시 프로세스 풀(utils.password_hasher)에서 해시해 저장
+#   - login_customer: 이메일로 조회 후 해시 검증, 평문으로 저장된 예전 비밀번호는 로그인 성공 시 해시로 교체
+#
+# 2026-01-22 김택권: 푸시 대기열 등록 응답의 success_count → target_count
+#   - 등록 시점에는 발송 전이므로 성공 수가 아니라 대상 기기 수 (발송 결과는 push_outbox.success_count)
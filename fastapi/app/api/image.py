@@ -0,0 +1,74 @@
+"""
+이미지 API
+IMAGE_DIR의 메뉴 / 식당 이미지를 파일명으로 제공 (menu.menu_image, store.store_image 값)
+작성일: 2026-01-22
+작성자: 김택권
+
+- 버전 주소(?v=내용 해시 앞 12자리)는 1년 immutable 캐시, v가 없거나 다르면 no-cache + ETag 재검증
+- ?w=너비: IMAGE_VARIANT_WIDTHS 중 같거나 큰 축소본 (로컬 디스크에 캐시)
+- If-None-Match / If-Modified-Since → 304, Range → 206 (app/utils/image_store.py)
+- POST /upload: multipart 파일을 스트리밍으로 받아 "<내용 해시>.<확장자>"로 저장 (app/utils/image_upload.py)
+  메뉴 / 식당에 바로 연결하려면 /api/menu/upload_menu_image, /api/store/upload_store_image 사용
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from ..utils.image_store import serve_image
+from ..utils.image_upload import UploadError, handle_image_upload, upload_result
+
+router = APIRouter()
+
+
+# ============================================
+# 이미지 업로드 (upload_image.php 대체)
+# ============================================
+# multipart/form-data, 파일 필드 이름은 file (본문을 메모리에 모으지 않고 임시 파일로 바로 기록)
+# 반환: file_name (DB에 저장할 값), file_url (버전 주소), size, width, height, deduplicated
+@router.post("/upload")
+async def upload_image(request: Request):
+    try:
+        _, stored = await handle_image_upload(request)
+        return await upload_result(stored)
+    except UploadError as e:
+        return JSONResponse({"result": "Error", "errorMsg": str(e)}, status_code=e.status_code)
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+
+# ============================================
+# 파일명으로 이미지 조회
+# ============================================
+# GET / HEAD를 별도 라우트로 등록 (OpenAPI operation ID가 겹치지 않도록)
+@router.get("/{name}")
+@router.head("/{name}")
+async def view_image_file(request: Request, name: str, w: Optional[int] = None, v: Optional[str] = None):
+    """
+    이미지 파일 응답
+
+    Args:
+        name: 파일명 (경로 구분자 불가)
+        w: 축소본 너비 (생략 시 원본)
+        v: 버전 (image_url / menu_image_url에 포함된 값)
+    """
+    try:
+        return await serve_image(request, name, w, v)
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 이미지 API - 파일명 기반 이미지 제공 (ETag / Last-Modified / Range / 너비별 축소본 / immutable 캐시)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - GET/HEAD /{name}?w=&v=
+# 2026-01-22 김택권: 이미지 업로드 추가
+#   - POST /upload (multipart 스트리밍 수신, 내용 해시 파일명, 프로세스 풀 검증 / 축소 / 변환)
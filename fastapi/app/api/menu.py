@@ -10,13 +10,26 @@ menu API - 메뉴 CRUD
 |------|--------|------|
 | 2026-01-15 | 임소연 | 최초 생성 |
 | 2026-01-16 | 임소연 | 상대경로로 변경 |
+| 2026-01-22 | 김택권 | 커넥션 풀 적용 (connect_db → get_connection) |
+| 2026-01-22 | 김택권 | 비동기 DB 계층 적용 (get_connection → async_db.fetch_all/fetch_one/execute) |
+| 2026-01-22 | 김택권 | 전체 조회에 키셋 페이지네이션 추가 (after_seq, limit, next_cursor) |
+| 2026-01-22 | 김택권 | 카탈로그 캐시 적용 (조회 캐시, 쓰기 시 무효화) |
+| 2026-01-22 | 김택권 | 메뉴 변경 시 식당 묶음 캐시 무효화 |
+| 2026-01-22 | 김택권 | 이미지 조회를 image_store로 변경 (ETag / Last-Modified / Range / 너비별 축소본), 메뉴 목록에 menu_image_url 추가 |
+| 2026-01-22 | 김택권 | 메뉴 이미지 업로드 추가 (POST /upload_menu_image/{menu_seq}, upload_image.php 대체) |
 """
 
-from fastapi import APIRouter, Form, UploadFile, File, Response
+import asyncio
+from fastapi import APIRouter, Form, UploadFile, File, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
-from ..database.connection import connect_db
+from ..database.async_db import fetch_all, fetch_one, execute
+from ..database.pagination import fetch_page
+from ..utils.catalog_cache import catalog_cache, menus_key, options_key, bundle_key, menu_image_key
+from ..utils.image_store import image_store, serve_image
+from ..utils.image_upload import UploadError, handle_image_upload, upload_result
 
 router = APIRouter()
 ipAddress = "127.0.0.1"
@@ -42,19 +55,12 @@ class YourModel(BaseModel):
 # - 이미지 BLOB 컬럼은 제외하고 조회
 # - ORDER BY id 정렬
 @router.get("/select_menu")
-async def select_all():
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    # TODO: SQL 작성
-    curs.execute("""
+async def select_all(after_seq: Optional[int] = None, limit: Optional[int] = None):
+    # 키셋 페이지네이션: after_seq/limit 지정 시 페이지 단위 조회, 없으면 전체 조회
+    rows, next_cursor = await fetch_page("""
         SELECT menu_seq, store_seq, menu_name, menu_price, menu_description, menu_image, menu_cost, created_at 
-        FROM menu 
-        ORDER BY menu_seq
-    """)
-    
-    rows = curs.fetchall()
-    conn.close()
+        FROM menu
+    """, "menu_seq", after_seq, limit)
     
     # TODO: 결과 매핑
     result = [{
@@ -68,7 +74,7 @@ async def select_all():
         'created_at': row[7],
     } for row in rows]
     
-    return {"results": result}
+    return {"results": result, "next_cursor": next_cursor}
 
 
 # ============================================
@@ -78,19 +84,21 @@ async def select_all():
 # - 존재하지 않으면 에러 응답
 @router.get("/select_menu/{store_seq}")
 async def select_one(store_seq: int):
-    conn = connect_db()
-    curs = conn.cursor()
-    
+    # 카탈로그 캐시 적중 시 DB 조회 생략
+    return await catalog_cache.get_or_load(menus_key(store_seq), lambda: _load_menus(store_seq))
+
+
+async def _load_menus(store_seq: int):
     # TODO: SQL 작성
-    curs.execute("""
+    rows = await fetch_all("""
         SELECT menu_seq, store_seq, menu_name, menu_price, menu_description, menu_image, menu_cost, created_at 
         FROM menu 
         WHERE store_seq = %s
         ORDER BY menu_seq
     """, (store_seq,))
-    
-    rows = curs.fetchall()
-    conn.close()
+
+    # 이미지 버전 주소 (v=내용 해시라 앱이 오래 캐시해도 됨, 목록 썸네일은 &w=320 등을 붙여 사용)
+    image_urls = await asyncio.gather(*(image_store.image_url(row[5]) for row in rows))
 
     # TODO: 결과 매핑
     result = [{
@@ -100,9 +108,10 @@ async def select_one(store_seq: int):
         'menu_price': row[3],
         'menu_description': row[4],
         'menu_image': row[5],
+        'menu_image_url': image_url,
         'menu_cost': row[6],
         'created_at': row[7],
-    } for row in rows]
+    } for row, image_url in zip(rows, image_urls)]
 
     return {"results": result}
 
@@ -129,19 +138,14 @@ async def insert_one(
         if created_at:
             created_at_dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
 
-        conn = connect_db()
-        curs = conn.cursor()
-        
         # TODO: SQL 작성
         sql = """
             INSERT INTO menu (store_seq, menu_name, menu_price, menu_description, menu_image, menu_cost, created_at) 
             VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
-        curs.execute(sql, (store_seq, menu_name, menu_price, menu_description, menu_image, menu_cost, created_at_dt))
-        
-        conn.commit()
-        inserted_id = curs.lastrowid
-        conn.close()
+        result = await execute(sql, (store_seq, menu_name, menu_price, menu_description, menu_image, menu_cost, created_at_dt))
+        inserted_id = result.lastrowid
+        await catalog_cache.invalidate(menus_key(store_seq), bundle_key(store_seq))
         
         return {"result": "OK", "id": inserted_id}
     except Exception as e:
@@ -169,20 +173,20 @@ async def update_one(
         if created_at:
             created_at_dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
 
-        conn = connect_db()
-        curs = conn.cursor()
-        
-        
+        # 식당이 바뀌는 경우 이전 식당의 메뉴 캐시도 무효화
+        old = await fetch_one("SELECT store_seq FROM menu WHERE menu_seq = %s", (menu_seq,))
+
         # TODO: SQL 작성
         sql = """
             UPDATE menu 
             SET store_seq=%s, menu_name=%s, menu_price=%s, menu_description=%s, menu_image=%s, menu_cost=%s, created_at=%s 
             WHERE menu_seq=%s
         """
-        curs.execute(sql, (store_seq, menu_name, menu_price, menu_description, menu_image, menu_cost, created_at_dt, menu_seq))
-        
-        conn.commit()
-        conn.close()
+        await execute(sql, (store_seq, menu_name, menu_price, menu_description, menu_image, menu_cost, created_at_dt, menu_seq))
+        keys = [menus_key(store_seq), options_key(store_seq, menu_seq), bundle_key(store_seq), menu_image_key(menu_seq)]
+        if old is not None and old[0] != store_seq:
+            keys += [menus_key(old[0]), options_key(old[0], menu_seq), bundle_key(old[0])]
+        await catalog_cache.invalidate(*keys)
         
         return {"result": "OK"}
     except Exception as e:
@@ -197,14 +201,11 @@ async def update_one(
 @router.delete("/delete_menu/{item_id}")
 async def delete_one(item_id: int):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
+        old = await fetch_one("SELECT store_seq FROM menu WHERE menu_seq = %s", (item_id,))
         sql = "DELETE FROM menu WHERE menu_seq=%s"
-        curs.execute(sql, (item_id,))
-        
-        conn.commit()
-        conn.close()
+        await execute(sql, (item_id,))
+        if old is not None:
+            await catalog_cache.invalidate(menus_key(old[0]), options_key(old[0], item_id), bundle_key(old[0]), menu_image_key(item_id))
         
         return {"result": "OK"}
     except Exception as e:
@@ -212,58 +213,50 @@ async def delete_one(item_id: int):
 
 
 # ============================================
-# [선택] 이미지 조회 (이미지 BLOB 컬럼이 있는 경우)
+# 이미지 조회
 # ============================================
-# TODO: 이미지 바이너리 직접 반환
-# - Response 객체 사용
-# - media_type: "image/jpeg" 또는 "image/png"
+# menu.menu_image는 IMAGE_DIR 안의 파일명 (app/utils/image_store.py)
+# - w: 목록 썸네일 너비 (IMAGE_VARIANT_WIDTHS 중 같거나 큰 축소본), v: 버전(menu_image_url의 v 값, 일치 시 immutable 캐시)
+# - If-None-Match / If-Modified-Since → 304, Range → 206
+# GET / HEAD를 별도 라우트로 등록 (OpenAPI operation ID가 겹치지 않도록)
 @router.get("/view_menu_image/{menu_seq}")
-async def view_image(menu_seq: int):
+@router.head("/view_menu_image/{menu_seq}")
+async def view_menu_image(request: Request, menu_seq: int, w: Optional[int] = None, v: Optional[str] = None):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        curs.execute("SELECT menu_image FROM menu WHERE menu_seq = %s", (menu_seq,))
-        row = curs.fetchone()
-        conn.close()
-        
-        if row is None:
-            return {"result": "Error", "message": "Not found"}
-        
-        if row[0] is None:
-            return {"result": "Error", "message": "No image"}
-        
-        return Response(
-            content=row[0],
-            media_type="image/jpeg",
-            headers={"Cache-Control": "no-cache"}
-        )
+        async def _load():
+            row = await fetch_one("SELECT menu_image FROM menu WHERE menu_seq = %s", (menu_seq,))
+            if row is None:
+                return {"result": "Error", "message": "Not found"}
+            return {"menu_image": row[0]}
+
+        # 메뉴 → 파일명은 카탈로그 캐시 (요청마다 DB 조회하지 않음)
+        data = await catalog_cache.get_or_load(menu_image_key(menu_seq), _load)
+        if data.get("result") == "Error":
+            return JSONResponse(data, status_code=404)
+        return await serve_image(request, data["menu_image"], w, v)
     except Exception as e:
         return {"result": "Error", "errorMsg": str(e)}
 
 
 # ============================================
-# [선택] 이미지 업데이트 (이미지 BLOB 컬럼이 있는 경우)
+# 이미지 업로드
 # ============================================
-# TODO: 이미지만 별도로 업데이트
-# - UploadFile = File(...) 사용
-# @app.post("/update_[테이블명]_image")
-# async def update_image(
-#     item_id: int = Form(...),
-#     file: UploadFile = File(...)
-# ):
-#     try:
-#         image_data = await file.read()
-#         
-#         conn = connect_db()
-#         curs = conn.cursor()
-#         sql = "UPDATE [테이블명] SET [이미지컬럼]=%s WHERE id=%s"
-#         curs.execute(sql, (image_data, item_id))
-#         conn.commit()
-#         conn.close()
-#         
-#         return {"result": "OK"}
-#     except Exception as e:
-#         return {"result": "Error", "errorMsg": str(e)}
+# multipart/form-data의 file을 IMAGE_DIR에 "<내용 해시>.<확장자>"로 저장하고 menu.menu_image 교체
+# (app/utils/image_upload.py, 이전 파일은 다른 메뉴가 같은 내용을 쓸 수 있어 지우지 않음)
+@router.post("/upload_menu_image/{menu_seq}")
+async def upload_menu_image(request: Request, menu_seq: int):
+    try:
+        old = await fetch_one("SELECT store_seq FROM menu WHERE menu_seq = %s", (menu_seq,))
+        if old is None:
+            return JSONResponse({"result": "Error", "message": "Not found"}, status_code=404)
+        _, stored = await handle_image_upload(request)
+        await execute("UPDATE menu SET menu_image=%s WHERE menu_seq=%s", (stored.file_name, menu_seq))
+        await catalog_cache.invalidate(menus_key(old[0]), bundle_key(old[0]), menu_image_key(menu_seq))
+        return await upload_result(stored)
+    except UploadError as e:
+        return JSONResponse({"result": "Error", "errorMsg": str(e)}, status_code=e.status_code)
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
 
 
 # ============================================
@@ -10,13 +10,21 @@ option API - 옵션 CRUD
 |------|--------|------|
 | 2026-01-15 | 임소연 | 최초 생성 |
 | 2026-01-16 | 임소연 | 상대경로 |
+| 2026-01-22 | 김택권 | 커넥션 풀 적용 (connect_db → get_connection) |
+| 2026-01-22 | 김택권 | 비동기 DB 계층 적용 (get_connection → async_db.fetch_all/fetch_one/execute) |
+| 2026-01-22 | 김택권 | 전체 조회에 키셋 페이지네이션 추가 (after_seq, limit, next_cursor) |
+| 2026-01-22 | 김택권 | 카탈로그 캐시 적용 (조회 캐시, 쓰기 시 무효화) |
+| 2026-01-22 | 김택권 | delete_option WHERE 조건 수정 (id → option_seq) |
+| 2026-01-22 | 김택권 | 옵션 변경 시 식당 묶음 캐시 무효화 |
 """
 
 from fastapi import APIRouter, Form, UploadFile, File, Response
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
-from ..database.connection import connect_db
+from ..database.async_db import fetch_all, fetch_one, execute
+from ..database.pagination import fetch_page
+from ..utils.catalog_cache import catalog_cache, options_key, bundle_key
 
 router = APIRouter()
 ipAddress = "127.0.0.1"
@@ -30,19 +38,12 @@ port = 8000
 # - 이미지 BLOB 컬럼은 제외하고 조회
 # - ORDER BY id 정렬
 @router.get("/select_option")
-async def select_all():
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    # TODO: SQL 작성
-    curs.execute("""
+async def select_all(after_seq: Optional[int] = None, limit: Optional[int] = None):
+    # 키셋 페이지네이션: after_seq/limit 지정 시 페이지 단위 조회, 없으면 전체 조회
+    rows, next_cursor = await fetch_page("""
         SELECT option_seq, store_seq, menu_seq, option_name, option_price, option_cost, created_at 
-        FROM table_now_db.option 
-        ORDER BY option_seq
-    """)
-    
-    rows = curs.fetchall()
-    conn.close()
+        FROM table_now_db.option
+    """, "option_seq", after_seq, limit)
     
     # TODO: 결과 매핑
     result = [{
@@ -55,7 +56,7 @@ async def select_all():
         'created_at': row[6]
     } for row in rows]
     
-    return {"results": result}
+    return {"results": result, "next_cursor": next_cursor}
 
 
 # ============================================
@@ -65,20 +66,21 @@ async def select_all():
 # - 존재하지 않으면 에러 응답
 @router.get("/select_option/{store_seq}/{menu_seq}")
 async def select_one(store_seq: int, menu_seq: int):
-    conn = connect_db()
-    curs = conn.cursor()
-    
+    # 카탈로그 캐시 적중 시 DB 조회 생략
+    return await catalog_cache.get_or_load(
+        options_key(store_seq, menu_seq), lambda: _load_options(store_seq, menu_seq)
+    )
+
+
+async def _load_options(store_seq: int, menu_seq: int):
     # TODO: SQL 작성
-    curs.execute("""
+    rows = await fetch_all("""
         SELECT option_seq, store_seq, menu_seq, option_name, option_price, option_cost, created_at 
         FROM table_now_db.option 
         WHERE store_seq = %s and menu_seq = %s
         ORDER BY option_seq
     """, (store_seq, menu_seq))
     
-    rows = curs.fetchall()
-    conn.close()
-    
     # TODO: 결과 매핑
     result = [{
         'option_seq': row[0],
@@ -113,19 +115,14 @@ async def insert_one(
         if created_at:
             created_at_dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
 
-        conn = connect_db()
-        curs = conn.cursor()
-        
         # TODO: SQL 작성
         sql = """
             INSERT INTO table_now_db.option (store_seq, menu_seq, option_name, option_price, option_cost, created_at) 
             VALUES (%s, %s, %s, %s, %s, %s)
         """
-        curs.execute(sql, (store_seq, menu_seq, option_name, option_price, option_cost, created_at_dt))
-        
-        conn.commit()
-        inserted_id = curs.lastrowid
-        conn.close()
+        result = await execute(sql, (store_seq, menu_seq, option_name, option_price, option_cost, created_at_dt))
+        inserted_id = result.lastrowid
+        await catalog_cache.invalidate(options_key(store_seq, menu_seq), bundle_key(store_seq))
         
         return {"result": "OK", "id": inserted_id}
     except Exception as e:
@@ -152,19 +149,20 @@ async def update_one(
         if created_at:
             created_at_dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
 
-        conn = connect_db()
-        curs = conn.cursor()
-        
+        # 식당/메뉴가 바뀌는 경우 이전 옵션 캐시도 무효화
+        old = await fetch_one("SELECT store_seq, menu_seq FROM table_now_db.option WHERE option_seq = %s", (option_seq,))
+
         # TODO: SQL 작성
         sql = """
             UPDATE table_now_db.option 
             SET store_seq=%s, menu_seq=%s, option_name=%s, option_price=%s, option_cost=%s, created_at=%s 
             WHERE option_seq=%s
         """
-        curs.execute(sql, (store_seq, menu_seq, option_name, option_price, option_cost, created_at_dt, option_seq))
-        
-        conn.commit()
-        conn.close()
+        await execute(sql, (store_seq, menu_seq, option_name, option_price, option_cost, created_at_dt, option_seq))
+        keys = [options_key(store_seq, menu_seq), bundle_key(store_seq)]
+        if old is not None:
+            keys += [options_key(old[0], old[1]), bundle_key(old[0])]
+        await catalog_cache.invalidate(*keys)
         
         return {"result": "OK"}
     except Exception as e:
@@ -179,14 +177,11 @@ async def update_one(
 @router.delete("/delete_option/{item_id}")
 async def delete_one(item_id: int):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
-        sql = "DELETE FROM table_now_db.option WHERE id=%s"
-        curs.execute(sql, (item_id,))
-        
-        conn.commit()
-        conn.close()
+        old = await fetch_one("SELECT store_seq, menu_seq FROM table_now_db.option WHERE option_seq = %s", (item_id,))
+        sql = "DELETE FROM table_now_db.option WHERE option_seq=%s"
+        await execute(sql, (item_id,))
+        if old is not None:
+            await catalog_cache.invalidate(options_key(old[0], old[1]), bundle_key(old[0]))
         
         return {"result": "OK"}
     except Exception as e:
@@ -1,11 +1,23 @@
 
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Form, Header, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime, timedelta
 import uuid
 import random
-from ..database.connection import connect_db
+from ..database.async_db import fetch_all, execute, run_db
+from ..database.bulk import bulk_insert
+from ..database.pagination import fetch_page
+from ..database.streaming import StreamLimitError, stream_rows
+from ..utils.export import build_export_filter, export_response
+from ..utils.availability import availability_index
+from ..utils.catalog_cache import catalog_cache, bundle_key, layout_key
+from ..utils.reserve_table import write_reserve_tables
+from ..utils.idempotency import idempotency_store
+from ..utils.order_summary import load_order_summary, lock_reserves, refresh_order_summaries
+from ..utils.sales_rollup import apply_sales_rollup
+from ..utils.occupancy_hub import occupancy_hub, reserve_event
 
 # encrypt package
 from Crypto.Cipher import AES
@@ -28,31 +40,56 @@ class Payment(BaseModel):
 
 
 
+# pay 행 컬럼 순서 (build_pay_rows 결과와 동일)
+PAY_COLUMNS = ("reserve_seq", "store_seq", "menu_seq", "option_seq", "pay_quantity", "pay_amount", "created_at")
+
+
+def build_pay_rows(reserve_seq: int, store_seq: int, items: dict) -> list:
+    """
+    장바구니(items['menus'])를 pay 행 목록으로 변환
+    - 메뉴 1행 + 메뉴에 딸린 옵션마다 1행 (옵션 행은 메뉴의 menu_seq/date를 그대로 사용)
+
+    items 형식:
+        {"menus": {menu_seq: {"count", "price", "date", "options": {option_seq: {"count", "price"}}}}}
+    """
+    rows = []
+    for m_id, value in items['menus'].items():
+        rows.append((reserve_seq, store_seq, m_id, None, value['count'], value['price'], value['date']))
+        for k, v in (value.get('options') or {}).items():
+            rows.append((reserve_seq, store_seq, m_id, k, v['count'], v['price'], value['date']))
+    return rows
+
+
 # ============================================
 # Purchase 수정 (Update)
 # ============================================
 @router.post("/purchase/update")
 async def update_one(data:dict):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
         sql = """
             UPDATE reserve 
             SET payment_key=%s, payment_status=%s     
             WHERE reserve_seq=%s
         """
-        curs.execute(sql, (data['payment_key'], data['payment_status'], data['reserve_seq']))
-        
-        conn.commit()
-        conn.close()
+        await execute(sql, (data['payment_key'], data['payment_status'], data['reserve_seq']))
+        # 결제 취소 등 상태 변경을 예약 가능 여부 인덱스에 반영
+        row = await availability_index.refresh_reserve(data['reserve_seq'])
+        if row is not None:
+            occupancy_hub.publish(row[0], reserve_event(row[0], data['reserve_seq'], row[1], row[2], row[3]))
         
         return {"result": "OK"}
     except Exception as e:
         return {"result": "Error", "errorMsg": str(e)}
 
 @router.post("/insert_reserve")
-async def create_reserve(reserve:dict) :
+async def create_reserve(reserve:dict, response: Response, idempotency_key: Optional[str] = Header(None)) :
+    # Idempotency-Key 헤더가 있으면 같은 키의 재시도에는 저장된 응답 반환 (예약 중복 생성 방지)
+    return await idempotency_store.respond(
+        "pay.insert_reserve", idempotency_key, response, lambda: _create_reserve(reserve), reserve
+    )
+
+
+async def _create_reserve(reserve: dict):
     created_at =  datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     reserveData = (
         reserve['store_seq'],
@@ -65,34 +102,50 @@ async def create_reserve(reserve:dict) :
         reserve['payment_status']   
     )
     returnData = {"result": "Error"}
-    conn = connect_db()
     try:
-        curs = conn.cursor()
-
-        ### Reserve 추가하기
-        curs.execute("""
-        insert into reserve(
-            store_seq,customer_seq,
-            reserve_tables,
-            reserve_capacity,reserve_date,created_at,
-            payment_key,payment_status
-        ) values (%s,%s,%s,%s,%s,%s,%s,%s)
-    """,reserveData)
-        inserted_id = curs.lastrowid
-        conn.commit()
+        ### Reserve 추가하기 (reserve_table도 같은 트랜잭션으로 기록)
+        def _insert_reserve(conn):
+            curs = conn.cursor()
+            curs.execute("""
+            insert into reserve(
+                store_seq,customer_seq,
+                reserve_tables,
+                reserve_capacity,reserve_date,created_at,
+                payment_key,payment_status
+            ) values (%s,%s,%s,%s,%s,%s,%s,%s)
+        """,reserveData)
+            reserve_seq = curs.lastrowid
+            write_reserve_tables(curs, reserve_seq, reserve['store_seq'], reserve['reserve_tables'], reserve['reserve_date'])
+            conn.commit()
+            return reserve_seq
+
+        inserted_id = await run_db(_insert_reserve)
+        availability_index.upsert_reserve(
+            inserted_id, reserve['store_seq'], reserve['reserve_tables'],
+            reserve['reserve_date'], reserve['payment_status']
+        )
+        occupancy_hub.publish(reserve['store_seq'], reserve_event(
+            reserve['store_seq'], inserted_id, reserve['reserve_tables'],
+            reserve['reserve_date'], reserve['payment_status']
+        ))
         returnData = {"result": {"reserve_seq":inserted_id}}
     except Exception as err:
         import traceback
         error_msg = str(err)
         traceback.print_exc()
         returnData = {"result": "Error", "errorMsg": error_msg, "traceback": traceback.format_exc()}
-    finally:
-        conn.close()
 
     return returnData
 
 @router.post("/purchase")
-async def create_purchase(reserve:dict,items: dict):
+async def create_purchase(reserve:dict,items: dict, response: Response, idempotency_key: Optional[str] = Header(None)):
+    return await idempotency_store.respond(
+        "pay.purchase", idempotency_key, response, lambda: _create_purchase(reserve, items),
+        reserve, items, error_key="results"
+    )
+
+
+async def _create_purchase(reserve: dict, items: dict):
 
     created_at =  datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     print(items['menus'])
@@ -103,8 +156,6 @@ async def create_purchase(reserve:dict,items: dict):
     if reserve == None or items == None or 'store_seq' not in reserve:
         return returnData
     
-    data = []
-     
     reserveData = (
         reserve['reserve_seq'],
         reserve['store_seq'],
@@ -129,9 +180,12 @@ async def create_purchase(reserve:dict,items: dict):
             created_at
         ))
 
-    conn = connect_db()
-    try:
+    inserted_id = reserveData[0]
+
+    def _insert_purchase(conn, data):
         curs = conn.cursor()
+        # 같은 예약에 동시에 결제가 기록되면 요약이 서로의 pay를 놓치지 않도록 pay INSERT 전에 잠금
+        lock_reserves(curs, [inserted_id])
 
         ### Reserve 추가하기
     #     curs.execute("""
@@ -143,15 +197,6 @@ async def create_purchase(reserve:dict,items: dict):
     #     ) values (%s,%s,%s,%s,%s,%s,%s,%s)
     # """,reserveData)
     #     inserted_id = curs.lastrowid
-        
-        ### menu 추가하기전 데이터 만들기
-        inserted_id = reserveData[0]
-        for m_id, value in items['menus'].items():        
-            data.append((inserted_id,reserve['store_seq'],m_id,None,value['count'],value['price'],value['date']))
-            if len(value['options']) > 0:
-                for k, v in value['options'].items():
-                    data.append((inserted_id,reserve['store_seq'],m_id,k,v['count'],v['price'],value['date']))
-
 
         ### store table 추가
         if len(storeTableData) > 0 :
@@ -163,41 +208,114 @@ async def create_purchase(reserve:dict,items: dict):
                 ) values (%s,%s,%s,%s,%s)
             """,storeTableData)
 
-        ### pay table 추가
-        curs.executemany("""
-           insert into pay(reserve_seq,store_seq,menu_seq,option_seq,pay_quantity,pay_amount,created_at) 
-                    values (%s,%s,%s,%s,%s,%s,%s)
-        """,data)
+        ### pay table 추가 (다중 행 INSERT)
+        bulk_insert(curs, "pay", PAY_COLUMNS, data)
+        refresh_order_summaries(curs, [inserted_id])
+        apply_sales_rollup(curs, data)
 
         conn.commit()
+
+    try:
+        ### menu 추가하기전 데이터 만들기 (장바구니 형식 오류도 아래 Error 응답으로 반환)
+        data = build_pay_rows(inserted_id, reserve['store_seq'], items)
+
+        ### commit실패시 rollback (커밋 전 예외는 연결 반납 시 롤백됨)
+        await run_db(_insert_purchase, data)
+        if len(storeTableData) > 0:
+            availability_index.invalidate_tables(reserve['store_seq'])
+            await catalog_cache.invalidate(bundle_key(reserve['store_seq']), layout_key(reserve['store_seq']))
+            # 여러 테이블을 한 번에 추가하므로 구독 중인 화면은 스냅샷을 다시 받음
+            occupancy_hub.request_resync(reserve['store_seq'])
         returnData = {"results": {"reserve_seq":inserted_id}}
-    
-    except Exception as e:
-        ### commit실패시 rollback
-        conn.rollback()
 
+    except Exception as e:
         import traceback
         error_msg = str(e)
         traceback.print_exc()
         returnData = {"results": "Error", "errorMsg": error_msg, "traceback": traceback.format_exc()}
-    finally:
-        conn.close()
     
     return returnData
 
-@router.get("/")
-async def select_pays():
+# ============================================
+# 예약 + 결제 한 번에 기록 (Booking)
+# ============================================
+@router.post("/booking")
+async def create_booking(reserve: dict, items: dict, response: Response, idempotency_key: Optional[str] = Header(None)):
+    """
+    예약 / 결제 항목 / 결제 상태를 한 트랜잭션으로 기록
+    - insert_reserve → purchase → purchase/update 세 번의 호출을 한 번으로 대체
+    - reserve 1행, reserve_table / pay는 각각 한 문장(다중 행 INSERT)으로 기록
+    - 중간에 실패하면 전체 롤백되므로 결제 항목 없는 예약이 남지 않음
+
+    요청 본문:
+        {"reserve": {store_seq, customer_seq, reserve_tables, reserve_capacity, reserve_date,
+                     payment_key, payment_status},
+         "items": {"menus": {menu_seq: {"count", "price", "date", "options": {...}}}}}
 
+    Idempotency-Key 헤더를 보내면 같은 키의 재시도에는 기록 없이 첫 응답을 그대로 반환
+    """
+    return await idempotency_store.respond(
+        "pay.booking", idempotency_key, response, lambda: _create_booking(reserve, items), reserve, items
+    )
 
+
+async def _create_booking(reserve: dict, items: dict):
+    required = ('store_seq', 'customer_seq', 'reserve_tables', 'reserve_capacity', 'reserve_date')
+    missing = [key for key in required if reserve.get(key) is None]
+    if missing:
+        return {"result": "Error", "errorMsg": f"필수 값이 없습니다: {', '.join(missing)}"}
+    if not items.get('menus'):
+        return {"result": "Error", "errorMsg": "결제할 메뉴가 없습니다."}
+
+    store_seq = reserve['store_seq']
+    payment_status = reserve.get('payment_status')
     try:
-        conn = connect_db()
+        # 잘못된 장바구니 형식은 DB 작업 전에 걸러냄
+        build_pay_rows(0, store_seq, items)
+    except (KeyError, AttributeError, TypeError) as e:
+        return {"result": "Error", "errorMsg": f"결제 항목 형식이 올바르지 않습니다: {e}"}
+
+    def _work(conn):
         curs = conn.cursor()
         curs.execute("""
-        select pay_id,reserve_seq,store_seq,menu_seq,option_seq,pay_quantity,pay_amount,created_at
-        from pay
-    """)
-        rows = curs.fetchall()
-        conn.close()
+            INSERT INTO reserve (store_seq, customer_seq, reserve_tables, reserve_capacity, reserve_date, created_at, payment_key, payment_status)
+            VALUES (%s, %s, %s, %s, %s, NOW(), %s, %s)
+        """, (store_seq, reserve['customer_seq'], reserve['reserve_tables'], reserve['reserve_capacity'],
+              reserve['reserve_date'], reserve.get('payment_key'), payment_status))
+        reserve_seq = curs.lastrowid
+        write_reserve_tables(curs, reserve_seq, store_seq, reserve['reserve_tables'], reserve['reserve_date'])
+        pay_rows = build_pay_rows(reserve_seq, store_seq, items)
+        pay_count = bulk_insert(curs, "pay", PAY_COLUMNS, pay_rows)
+        refresh_order_summaries(curs, [reserve_seq])
+        apply_sales_rollup(curs, pay_rows)
+        conn.commit()
+        return reserve_seq, pay_count
+
+    try:
+        reserve_seq, pay_count = await run_db(_work)
+        availability_index.upsert_reserve(
+            reserve_seq, store_seq, reserve['reserve_tables'], reserve['reserve_date'], payment_status
+        )
+        occupancy_hub.publish(store_seq, reserve_event(
+            store_seq, reserve_seq, reserve['reserve_tables'], reserve['reserve_date'], payment_status
+        ))
+        return {"result": {"reserve_seq": reserve_seq, "pay_count": pay_count}}
+    except Exception as e:
+        import traceback
+        error_msg = str(e)
+        traceback.print_exc()
+        return {"result": "Error", "errorMsg": error_msg, "traceback": traceback.format_exc()}
+
+
+@router.get("/")
+async def select_pays(after_seq: Optional[int] = None, limit: Optional[int] = None):
+    # 키셋 페이지네이션: after_seq/limit 지정 시 페이지 단위 조회, 없으면 전체 조회
+
+    try:
+        rows, next_cursor = await fetch_page("""
+            select pay_id,reserve_seq,store_seq,menu_seq,option_seq,pay_quantity,pay_amount,created_at
+            from pay
+        """, "pay_id", after_seq, limit)
         
         results = []
         for row in rows:
@@ -223,7 +341,7 @@ async def select_pays():
                 print(f"Error processing row: {e}, row: {row}")
                 continue
         
-        return {"results": results}
+        return {"results": results, "next_cursor": next_cursor}
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -231,6 +349,41 @@ async def select_pays():
         return {"results": "Error", "errorMsg": error_msg, "traceback": traceback.format_exc()}
 
 
+# ============================================
+# 결제 내보내기 (NDJSON / CSV 스트리밍)
+# ============================================
+# - 정산용 전체 결제 내보내기: 서버 측 커서로 읽어 일정한 메모리로 스트리밍
+# - start_date, end_date: 'YYYY-MM-DD' (created_at 기준, end_date 당일 포함)
+# - store_seq: 식당 필터
+# - 주의: /{id} 보다 앞에 위치해야 함
+PAY_EXPORT_COLUMNS = [
+    'pay_id', 'reserve_seq', 'store_seq', 'menu_seq', 'option_seq',
+    'pay_quantity', 'pay_amount', 'created_at'
+]
+
+
+@router.get("/export")
+async def export_pays(
+    format: str = "ndjson",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    store_seq: Optional[int] = None
+):
+    try:
+        where, params = build_export_filter("created_at", start_date, end_date, store_seq)
+        rows = stream_rows(f"""
+            select {','.join(PAY_EXPORT_COLUMNS)}
+            from pay
+            {where}
+            order by pay_id
+        """, params)
+        return export_response(rows, PAY_EXPORT_COLUMNS, format, "pay")
+    except StreamLimitError as e:
+        return JSONResponse({"results": "Error", "errorMsg": str(e)}, status_code=503, headers={"Retry-After": "5"})
+    except ValueError as e:
+        return {"results": "Error", "errorMsg": str(e)}
+
+
 def _encrypt_pay_toss_key():
     try:
         # todo: need to get the KEY and IV from database
@@ -289,55 +442,8 @@ async def select_pays_group_by_reserve(reserve_seq: int):
     #     raise Exception("401 Unauthorized: 인증에 실패했습니다.")
 
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        curs.execute("""
-            select pp.*,m.menu_name ,s.store_description,o.option_name,m.menu_image from 
-   (
-   select count(p.pay_id) as total_row_count,
-                     p.reserve_seq,
-                     p.store_seq,
-                     p.menu_seq,
-                     p.option_seq,
-                     sum(p.pay_quantity) as total_quantity,
-                     sum(p.pay_amount) as total_amount,
-                     sum(p.pay_quantity*p.pay_amount) as total_pay
-   from pay p
-   where p.reserve_seq =%s
-   group by p.reserve_seq, p.store_seq, p.menu_seq, p.option_seq
-   order by p.reserve_seq desc
-   ) as pp
-   inner join menu m on pp.menu_seq=m.menu_seq
-   inner join store s on pp.store_seq=s.store_seq
-   left join `option` o on pp.option_seq = o.option_seq
-    """,[reserve_seq])
-        
-        rows = curs.fetchall()
-        print(len(rows))
-        conn.close()
-        
-        results = []
-        for row in rows:
-            try:
-                
-                
-                results.append({
-                    'total_count': row[0],
-                    'reserve_seq': row[1],
-                    'store_seq': row[2],
-                    'menu_seq': row[3],
-                    'option_seq': row[4],
-                    'total_quantity': row[5],
-                    'total_pay': row[6],
-                    'menu_name' : row[8],
-                    'store_description': row[9],
-                    'option_name': row[10],
-                    'menu_image': row[11]
-                })
-            except Exception as e:
-                print(f"Error processing row: {e}, row: {row}")
-                continue
-        
+        # 결제 기록 시 저장한 요약을 PK로 조회 (없으면 집계 후 저장)
+        results = await run_db(load_order_summary, reserve_seq)
         return {"results": results}
     except Exception as e:
         import traceback
@@ -354,14 +460,10 @@ async def select_pays_by_reserve(reserve_seq:int):
     #     raise Exception("401 Unauthorized: 인증에 실패했습니다.")
 
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        curs.execute("""
-        select pay_id,reserve_seq,store_seq,menu_seq,option_seq,pay_quantity,pay_amount,created_at
-        from pay where reserve_seq=%s
-    """,[reserve_seq])
-        rows = curs.fetchall()
-        conn.close()
+        rows = await fetch_all("""
+            select pay_id,reserve_seq,store_seq,menu_seq,option_seq,pay_quantity,pay_amount,created_at
+            from pay where reserve_seq=%s
+        """,[reserve_seq])
         
         results = []
         for row in rows:
@@ -421,26 +523,80 @@ async def get_pay_by_id(id: int):
 
 
 
+# /insert 항목 필수 정수 필드 (option_seq는 생략하거나 null이면 기존과 같이 1)
+PAY_ITEM_FIELDS = ("reserve_seq", "store_seq", "menu_seq", "pay_quantity", "pay_amount")
+
+
+def validate_pay_items(items: list):
+    """
+    /insert 항목 검증 후 pay 행 목록 생성 (created_at 제외, 기록 시 DB 시각을 붙임)
+    반환: (rows, errors) - errors가 있으면 아무것도 기록하지 않음
+          errors: [{"index": 항목 위치, "errors": [사유, ...]}, ...]
+    """
+    rows, errors = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "errors": ["항목이 객체가 아닙니다."]})
+            continue
+        item_errors = []
+        for field in PAY_ITEM_FIELDS:
+            value = item.get(field)
+            if value is None:
+                item_errors.append(f"{field} 값이 없습니다.")
+            elif isinstance(value, bool) or not isinstance(value, int):
+                item_errors.append(f"{field}는 정수여야 합니다.")
+        # 앱(lib/model/payment.dart)은 옵션이 없으면 "option_seq": null을 보냄 → 기존처럼 1로 기록
+        option_seq = item.get('option_seq')
+        if option_seq is None:
+            option_seq = 1
+        elif isinstance(option_seq, bool) or not isinstance(option_seq, int):
+            item_errors.append("option_seq는 정수 또는 null이어야 합니다.")
+        if not item_errors:
+            if item['pay_quantity'] <= 0:
+                item_errors.append("pay_quantity는 1 이상이어야 합니다.")
+            if item['pay_amount'] < 0:
+                item_errors.append("pay_amount는 0 이상이어야 합니다.")
+        if item_errors:
+            errors.append({"index": index, "errors": item_errors})
+            continue
+        rows.append((item['reserve_seq'], item['store_seq'], item['menu_seq'], option_seq,
+                     item['pay_quantity'], item['pay_amount']))
+    return rows, errors
+
+
 @router.post("/insert")
 async def create_pay(items: list[dict]):
-    conn = connect_db()
-    try:
-               
+    """
+    결제 항목 일괄 추가
+    - 모든 항목을 먼저 검증하고, 하나라도 잘못되면 항목별 사유(errors)와 함께 기록하지 않음
+    - BULK_INSERT_CHUNK개씩 다중 행 INSERT로 한 트랜잭션에 기록 (항목마다 왕복하지 않음)
+    """
+    item_rows, errors = validate_pay_items(items)
+    if errors:
+        return {"results": "Error", "errorMsg": f"잘못된 항목이 {len(errors)}개 있습니다.", "errors": errors}
+
+    def _insert_pays(conn):
         curs = conn.cursor()
-        for item in items:
-            # print("insert into pay(reserve_seq,store_seq,menu_seq,option_seq,pay_quantity,pay_amount,created_at) values(?,?,?,?,?,?,current_timestamp)",[item['reserve_seq'],item['store_seq'],item['menu_seq'],1,item['pay_quantity'],item['pay_amount']])
-            curs.execute("insert into pay(reserve_seq,store_seq,menu_seq,option_seq,pay_quantity,pay_amount,created_at) values(%s,%s,%s,%s,%s,%s,current_timestamp)",(item['reserve_seq'],item['store_seq'],item['menu_seq'],1,item['pay_quantity'],item['pay_amount']))
+        # 같은 예약에 동시에 결제가 기록되면 요약이 서로의 pay를 놓치지 않도록 pay INSERT 전에 잠금
+        lock_reserves(curs, [row[0] for row in item_rows])
+        # created_at은 기존과 같이 DB 시각 (current_timestamp), 매출 집계 날짜도 같은 값 사용
+        curs.execute("SELECT NOW()")
+        created_at = curs.fetchone()[0]
+        rows = [row + (created_at,) for row in item_rows]
+        count = bulk_insert(curs, "pay", PAY_COLUMNS, rows)
+        refresh_order_summaries(curs, [row[0] for row in rows])
+        apply_sales_rollup(curs, rows)
         conn.commit()
+        return count
 
-        return {"result": "OK"}
+    try:
+        count = await run_db(_insert_pays)
+        return {"result": "OK", "count": count}
     except Exception as e:
-        conn.rollback()
         import traceback
         error_msg = str(e)
         traceback.print_exc()
         return {"results": "Error", "errorMsg": error_msg, "traceback": traceback.format_exc()}
-    finally:
-        conn.close()
 
 
 @router.put("/{id}")
@@ -483,4 +639,58 @@ async def delete_pay(id: int):
 #   - ecrypt/decrypt 관련 소스 정리
 #   - flutter에 키/IV를 통해 decrypt되게 설정. 
 #   - db에서 값들을 받아아야 하나 현재는 하드코딩으로 처리
-#   - purchase 추가 : 데이터를 받아서 각 테이블에 insert
\ No newline at end of file
+#   - purchase 추가 : 데이터를 받아서 각 테이블에 insert
+#
+# 2026-01-22 김택권: 커넥션 풀 적용
+#   - connect_db() 대신 get_connection() 컨텍스트 매니저로 연결 대여/반납
+#
+# 2026-01-22 김택권: 비동기 DB 계층 적용
+#   - 단일 쿼리는 async_db.fetch_all/execute 사용
+#   - purchase / insert는 run_db()로 한 트랜잭션 실행
+#
+# 2026-01-22 김택권: 예약 가능 여부 인덱스 연동
+#   - insert_reserve / purchase/update 후 점유 인덱스 갱신
+#   - purchase에서 store_table 추가 시 테이블 목록 무효화
+#
+# 2026-01-22 김택권: reserve_table 이중 기록
+#   - insert_reserve에서 reserve와 reserve_table을 한 트랜잭션으로 기록
+#
+# 2026-01-22 김택권: 전체 결제 조회 키셋 페이지네이션
+#   - GET /에 after_seq / limit 쿼리 파라미터 및 next_cursor 응답 추가 (database.pagination.fetch_page)
+#
+# 2026-01-22 김택권: 결제 내보내기 API 추가
+#   - GET /export - 서버 측 커서 기반 NDJSON/CSV 스트리밍 (기간/식당 필터)
+#
+# 2026-01-22 김택권: 예약 + 결제 단일 트랜잭션 API 추가
+#   - POST /booking - reserve / reserve_table / pay를 한 트랜잭션으로 기록 (pay는 다중 행 INSERT)
+#   - 장바구니 → pay 행 변환을 build_pay_rows로 분리해 purchase와 공유, purchase도 bulk_insert 사용
+#
+# 2026-01-22 김택권: Idempotency-Key 중복 요청 방지
+#   - insert_reserve / purchase / booking: Idempotency-Key 헤더가 있으면 첫 응답을 저장하고 재시도에는 저장된 응답 반환
+#
+# 2026-01-22 김택권: /insert 다중 행 INSERT 적용
+#   - 항목마다 execute하던 것을 bulk_insert(BULK_INSERT_CHUNK개씩 다중 행 INSERT)로 변경
+#   - validate_pay_items로 먼저 검증, 잘못된 항목은 위치별 사유(errors) 반환
+#   - option_seq를 보내면 그 값 사용 (생략하거나 null이면 기존과 같이 1)
+#   - created_at은 기존과 같이 DB 시각 (같은 트랜잭션에서 SELECT NOW())
+#
+# 2026-01-22 김택권: 예약별 주문 요약 저장 (order_summary)
+#   - purchase / booking / insert: 커밋 전에 같은 트랜잭션에서 refresh_order_summaries 호출
+#   - select_group_by_reserve: GROUP BY + 조인 대신 order_summary PK 조회 (응답 형식 동일)
+#
+# 2026-01-22 김택권: 일별 매출 / 마진 집계 (sales_daily)
+#   - purchase / booking / insert: 커밋 전에 같은 트랜잭션에서 apply_sales_rollup 호출
+#
+# 2026-01-22 김택권: purchase에서 store_table 추가 시 식당 묶음 / 배치도 캐시 무효화
+#
+# 2026-01-22 김택권: 식당별 점유 현황 실시간 이벤트 발행 (utils.occupancy_hub)
+#   - insert_reserve / booking / purchase/update: 커밋 후 reserve 이벤트 발행
+#   - purchase에서 store_table 추가 시 구독 화면 스냅샷 재전송 (request_resync)
+#
+# 2026-01-22 김택권: 같은 예약 동시 결제 시 주문 요약 덮어쓰기 수정
+#   - purchase / insert: pay INSERT 전에 lock_reserves로 예약 행 잠금
+#
+# 2026-01-22 김택권: purchase의 결제 항목 변환(build_pay_rows)을 try 안으로 이동
+#   - 잘못된 장바구니 형식이 500 대신 기존처럼 {"results": "Error", ...}로 응답
+#
+# 2026-01-22 김택권: export 동시 요청 수 초과 시 503 (STREAM_MAX_CONCURRENT, database.streaming)
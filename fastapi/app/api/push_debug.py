@@ -8,6 +8,7 @@ DB·예약 로직 없이 푸시 발송만 테스트하기 위한 디버그 엔
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from app.utils.fcm_service import FCMService
+from app.utils.push_outbox import enqueue_push, outbox_counts, requeue_dead, push_outbox_worker
 
 router = APIRouter()
 
@@ -18,6 +19,7 @@ class PushRequest(BaseModel):
     title: str = "테스트 푸시"
     body: str = "FCM 단발 테스트"
     data: dict | None = None
+    sync: bool = False  # True면 대기열을 거치지 않고 바로 발송 (FCM 연결 확인용)
 
 
 @router.post("/debug/push")
@@ -29,9 +31,20 @@ async def debug_push(req: PushRequest):
         req: 푸시 발송 요청 (token, title, body, data)
     
     Returns:
-        성공 시 message_id 반환
+        성공 시 message_id 반환 (대기열 등록 시 "outbox-{outbox_seq}")
     """
     try:
+        if not req.sync:
+            # 발송 대기열에 등록하고 바로 응답 (발송은 push outbox 워커가 처리)
+            outbox_seq = await enqueue_push(req.title, req.body, req.data, fcm_token=req.token)
+            return {
+                "ok": True,
+                "queued": True,
+                "outbox_seq": outbox_seq,
+                "message_id": f"outbox-{outbox_seq}",
+                "token": req.token[:20] + "..." if len(req.token) > 20 else req.token,
+            }
+        
         # FCMService를 사용하여 푸시 알림 발송
         message_id = FCMService.send_notification(
             token=req.token,
@@ -61,6 +74,26 @@ async def debug_push(req: PushRequest):
         )
 
 
+@router.get("/debug/push/outbox")
+async def debug_push_outbox():
+    """발송 대기열 상태별 건수 및 이 프로세스 워커 지표"""
+    try:
+        return {"result": {"counts": await outbox_counts(), "worker": push_outbox_worker.stats()}}
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+
+@router.post("/debug/push/outbox/{outbox_seq}/retry")
+async def debug_push_outbox_retry(outbox_seq: int):
+    """DEAD 상태 알림을 다시 발송 대기열에 넣음"""
+    try:
+        if not await requeue_dead(outbox_seq):
+            return {"result": "Error", "errorMsg": "DEAD 상태의 알림이 아닙니다."}
+        return {"result": "OK"}
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+
 # ============================================================
 # 생성 이력
 # ============================================================
@@ -78,4 +111,8 @@ async def debug_push(req: PushRequest):
 # 2026-01-19 김택권: FCMService 사용으로 리팩토링
 #   - 중복 초기화 코드 제거
 #   - FCMService.send_notification() 사용
-#   - 전역 초기화는 FCMService에서 자동 처리
\ No newline at end of file
+#   - 전역 초기화는 FCMService에서 자동 처리
+#
+# 2026-01-22 김택권: 푸시 알림 발송 대기열 적용
+#   - /debug/push: 기본은 push_outbox에 등록 후 응답, sync=true면 기존처럼 바로 발송
+#   - GET /debug/push/outbox (상태별 건수), POST /debug/push/outbox/{outbox_seq}/retry (DEAD 재시도) 추가
@@ -10,18 +10,69 @@ reserve API - reserve CRUD
 |———--|———---|———--|
 |2026.01.15|유다원|생성|
 |2026.01.21|김택권|weather_datetime 컬럼 제거 (weather 테이블 마이그레이션)|
+|2026.01.22|김택권|커넥션 풀 적용 (connect_db → get_connection)|
+|2026.01.22|김택권|비동기 DB 계층 적용 (get_connection → async_db.fetch_all/fetch_one/execute)|
+|2026.01.22|김택권|예약 가능 테이블 조회 API 추가 (/availability/{store_seq}), 예약 추가/수정/삭제 시 점유 인덱스 갱신|
+|2026.01.22|김택권|reserve_table 이중 기록/이중 읽기 (추가·수정 시 reserve_table 기록, /table_free/{store_table_seq} 충돌 조회)|
+|2026.01.22|김택권|8일 조회를 반개구간 [start, start+8일) 조건으로 변경 (idx_reserve_store_date / idx_reserve_date 사용), SQL 상수화|
+|2026.01.22|김택권|전체 조회에 키셋 페이지네이션 추가 (after_seq, limit, next_cursor)|
+|2026.01.22|김택권|예약 내보내기 API 추가 (/export, NDJSON/CSV 스트리밍, 기간/식당 필터)|
+|2026.01.22|김택권|insert_reserve에 Idempotency-Key 중복 요청 방지 적용 (utils.idempotency)|
+|2026.01.22|김택권|예약 추가/수정/삭제 시 식당별 점유 현황 이벤트 발행 (utils.occupancy_hub)|
+|2026.01.22|김택권|내보내기 동시 요청 수 초과 시 503 (STREAM_MAX_CONCURRENT)|
 """
 
 from datetime import datetime, timedelta
-from fastapi import APIRouter, FastAPI, Form, UploadFile, File, Response
+from fastapi import APIRouter, FastAPI, Form, UploadFile, File, Response, Header
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional
-from ..database.connection import connect_db
+from ..database.async_db import fetch_all, fetch_one, execute, run_db
+from ..database.pagination import fetch_page
+from ..database.streaming import StreamLimitError, stream_rows
+from ..utils.export import build_export_filter, export_response
+from ..utils.availability import availability_index
+from ..utils.reserve_table import write_reserve_tables, find_table_conflicts
+from ..utils.idempotency import idempotency_store
+from ..utils.occupancy_hub import occupancy_hub, reserve_event, reserve_removed_event
 
 router = APIRouter()
 ipAddress = "127.0.0.1"
 port = 8000
 
+# 8일 조회 기간 (오늘 포함)
+RESERVE_RANGE_DAYS = 8
+
+# 8일 조회 SQL (check_reserve_query_plans.py에서 EXPLAIN으로 실행 계획 검사)
+# - 반개구간 [시작일 00:00, 시작일 + 8일 00:00) → idx_reserve_date 범위 검색
+SELECT_RESERVES_RANGE_SQL = """
+    SELECT reserve_seq, store_seq, customer_seq,
+           reserve_tables,
+           reserve_capacity, reserve_date,
+           created_at, payment_key, payment_status
+    FROM reserve
+    WHERE reserve_date >= %s AND reserve_date < %s
+    ORDER BY reserve_seq
+"""
+
+# - 식당 조건 포함 → idx_reserve_store_date (store_seq, reserve_date) 범위 검색
+SELECT_RESERVES_RANGE_STORE_SQL = """
+    SELECT reserve_seq, store_seq, customer_seq,
+           reserve_tables,
+           reserve_capacity, reserve_date,
+           created_at, payment_key, payment_status
+    FROM reserve
+    WHERE store_seq = %s
+    AND reserve_date >= %s AND reserve_date < %s
+    ORDER BY reserve_seq
+"""
+
+
+def reserve_range(date: str):
+    """'YYYY-MM-DD' 시작일부터 8일간의 반개구간 [start, end) 반환"""
+    start = datetime.strptime(date, "%Y-%m-%d")
+    return start, start + timedelta(days=RESERVE_RANGE_DAYS)
+
 
 # ============================================
 # 모델 정의
@@ -42,19 +93,12 @@ class YourModel(BaseModel):
 # - 이미지 BLOB 컬럼은 제외하고 조회
 # - ORDER BY id 정렬
 @router.get("/select_reserves")
-async def select_all():
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    # TODO: SQL 작성
-    curs.execute("""
+async def select_all(after_seq: Optional[int] = None, limit: Optional[int] = None):
+    # 키셋 페이지네이션: after_seq/limit 지정 시 페이지 단위 조회, 없으면 전체 조회
+    rows, next_cursor = await fetch_page("""
         SELECT reserve_seq, store_seq, customer_seq, reserve_tables, reserve_capacity, reserve_date, created_at, payment_key, payment_status 
-        FROM reserve 
-        ORDER BY reserve_seq
-    """)
-    
-    rows = curs.fetchall()
-    conn.close()
+        FROM reserve
+    """, "reserve_seq", after_seq, limit)
     
     # TODO: 결과 매핑
     result = [{
@@ -70,7 +114,41 @@ async def select_all():
         # …
     } for row in rows]
     
-    return {"results": result}
+    return {"results": result, "next_cursor": next_cursor}
+
+
+# ============================================
+# 내보내기 (NDJSON / CSV 스트리밍)
+# ============================================
+# - 정산용 전체 예약 내보내기: 서버 측 커서로 읽어 일정한 메모리로 스트리밍
+# - start_date, end_date: 'YYYY-MM-DD' (reserve_date 기준, end_date 당일 포함)
+# - store_seq: 식당 필터
+RESERVE_EXPORT_COLUMNS = [
+    'reserve_seq', 'store_seq', 'customer_seq', 'reserve_tables', 'reserve_capacity',
+    'reserve_date', 'created_at', 'payment_key', 'payment_status'
+]
+
+
+@router.get("/export")
+async def export_reserves(
+    format: str = "ndjson",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    store_seq: Optional[int] = None
+):
+    try:
+        where, params = build_export_filter("reserve_date", start_date, end_date, store_seq)
+        rows = stream_rows(f"""
+            SELECT {', '.join(RESERVE_EXPORT_COLUMNS)}
+            FROM reserve
+            {where}
+            ORDER BY reserve_seq
+        """, params)
+        return export_response(rows, RESERVE_EXPORT_COLUMNS, format, "reserve")
+    except StreamLimitError as e:
+        return JSONResponse({"result": "Error", "errorMsg": str(e)}, status_code=503, headers={"Retry-After": "5"})
+    except ValueError as e:
+        return {"result": "Error", "errorMsg": str(e)}
 
 
 # ============================================
@@ -82,27 +160,9 @@ async def select_all():
 
 @router.get("/select_reserves_8/{date}")
 async def select_all_8(date: str):
-    conn = connect_db()
-    curs = conn.cursor()
+    start_dt, end_dt = reserve_range(date)
 
-    dt = datetime.strptime(date, "%Y-%m-%d")
-    dt_plus_7 = dt + timedelta(days=7)
-
-    start_dt = dt.strftime("%Y-%m-%d 00:00:00")
-    end_dt = dt_plus_7.strftime("%Y-%m-%d 23:59:59")
-
-    curs.execute("""
-        SELECT reserve_seq, store_seq, customer_seq,
-               reserve_tables,
-               reserve_capacity, reserve_date,
-               created_at, payment_key, payment_status
-        FROM reserve
-        WHERE reserve_date BETWEEN %s AND %s
-        ORDER BY reserve_seq
-    """, (start_dt, end_dt))
-
-    rows = curs.fetchall()
-    conn.close()
+    rows = await fetch_all(SELECT_RESERVES_RANGE_SQL, (start_dt, end_dt))
 
     return {
         "results": [
@@ -130,28 +190,9 @@ async def select_all_8(date: str):
 
 @router.get("/select_reserves_8_store/{date}/{seq}")
 async def select_all_8_store(date: str, seq: int):
-    conn = connect_db()
-    curs = conn.cursor()
-
-    dt = datetime.strptime(date, "%Y-%m-%d")
-    dt_plus_7 = dt + timedelta(days=7)
-
-    start_dt = dt.strftime("%Y-%m-%d 00:00:00")
-    end_dt = dt_plus_7.strftime("%Y-%m-%d 23:59:59")
+    start_dt, end_dt = reserve_range(date)
 
-    curs.execute("""
-        SELECT reserve_seq, store_seq, customer_seq,
-               reserve_tables,
-               reserve_capacity, reserve_date,
-               created_at, payment_key, payment_status
-        FROM reserve
-        WHERE store_seq = %s
-        AND reserve_date BETWEEN %s AND %s
-        ORDER BY reserve_seq
-    """, (seq, start_dt, end_dt))
-
-    rows = curs.fetchall()
-    conn.close()
+    rows = await fetch_all(SELECT_RESERVES_RANGE_STORE_SQL, (seq, start_dt, end_dt))
 
     return {
         "results": [
@@ -170,6 +211,51 @@ async def select_all_8_store(date: str, seq: int):
     }
 
 
+# ============================================
+# 예약 가능 테이블 조회
+# ============================================
+# - reserve_date 시각에 reserve_capacity명이 앉을 수 있는 빈 테이블 목록
+# - 메모리 점유 구간 인덱스에서 조회 (해당 날짜 첫 조회 시에만 DB 읽기)
+# - tables: 수용 인원이 충분한 빈 테이블, free_tables: 모든 빈 테이블 (여러 테이블 조합용)
+@router.get("/availability/{store_seq}")
+async def select_availability(store_seq: int, reserve_date: str, reserve_capacity: int = 1):
+    try:
+        result = await availability_index.find_available(store_seq, reserve_date, reserve_capacity)
+        result['store_seq'] = store_seq
+        result['reserve_date'] = reserve_date
+        result['reserve_capacity'] = reserve_capacity
+        return {"result": result}
+    except ValueError as e:
+        return {"result": "Error", "errorMsg": f"reserve_date 형식 오류: {e}"}
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+
+# ============================================
+# 테이블 단위 예약 충돌 조회
+# ============================================
+# - store_table_seq 테이블이 reserve_date 시각에 비어 있는지 확인
+# - reserve_table (store_table_seq, reserve_date) 인덱스 범위 검색
+# - 백필 전 예약은 reserve_tables 문자열로 함께 확인 (이중 읽기)
+@router.get("/table_free/{store_table_seq}")
+async def select_table_free(store_table_seq: int, reserve_date: str):
+    try:
+        def _work(conn):
+            return find_table_conflicts(conn.cursor(), store_table_seq, reserve_date)
+
+        conflicts = await run_db(_work)
+        return {"result": {
+            'store_table_seq': store_table_seq,
+            'reserve_date': reserve_date,
+            'free': len(conflicts) == 0,
+            'conflicts': [{'reserve_seq': row[0], 'reserve_date': row[1]} for row in conflicts]
+        }}
+    except ValueError as e:
+        return {"result": "Error", "errorMsg": f"reserve_date 형식 오류: {e}"}
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+
 # ============================================
 # 단일 조회 (Read One)
 # ============================================
@@ -177,19 +263,13 @@ async def select_all_8_store(date: str, seq: int):
 # - 존재하지 않으면 에러 응답
 @router.get("/select_reserve/{item_id}")
 async def select_one(item_id: int):
-    conn = connect_db()
-    curs = conn.cursor()
-    
     # TODO: SQL 작성
-    curs.execute("""
+    row = await fetch_one("""
         SELECT reserve_seq, store_seq, customer_seq, reserve_tables, reserve_capacity, reserve_date, created_at, payment_key, payment_status 
         FROM reserve 
         WHERE reserve_seq = %s
     """, (item_id,))
     
-    row = curs.fetchone()
-    conn.close()
-    
     if row is None:
         return {"result": "Error", "message": "reserve not found"}
     
@@ -225,22 +305,37 @@ async def insert_one(
     reserve_capacity: int = Form(...),
     reserve_date: str = Form(...),
     payment_key: Optional[str] = Form(None),
-    payment_status: Optional[str] = Form(None)
+    payment_status: Optional[str] = Form(None),
+    response: Response = None,
+    idempotency_key: Optional[str] = Header(None)
 ):
+    # Idempotency-Key 헤더가 있으면 같은 키의 재시도에는 저장된 응답 반환 (예약 중복 생성 방지)
+    form = (store_seq, customer_seq, reserve_tables, reserve_capacity, reserve_date, payment_key, payment_status)
+    return await idempotency_store.respond(
+        "reserve.insert_reserve", idempotency_key, response, lambda: _insert_reserve(*form), *form
+    )
+
+
+async def _insert_reserve(store_seq, customer_seq, reserve_tables, reserve_capacity, reserve_date, payment_key, payment_status):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
         # TODO: SQL 작성
         sql = """
             INSERT INTO reserve (store_seq, customer_seq, reserve_tables, reserve_capacity, reserve_date, created_at, payment_key, payment_status) 
             VALUES (%s, %s, %s, %s, %s, NOW(), %s, %s)
         """
-        curs.execute(sql, (store_seq, customer_seq, reserve_tables, reserve_capacity, reserve_date, payment_key, payment_status))
-        
-        conn.commit()
-        inserted_id = curs.lastrowid
-        conn.close()
+
+        # reserve와 reserve_table을 한 트랜잭션으로 기록
+        def _work(conn):
+            curs = conn.cursor()
+            curs.execute(sql, (store_seq, customer_seq, reserve_tables, reserve_capacity, reserve_date, payment_key, payment_status))
+            reserve_seq = curs.lastrowid
+            write_reserve_tables(curs, reserve_seq, store_seq, reserve_tables, reserve_date)
+            conn.commit()
+            return reserve_seq
+
+        inserted_id = await run_db(_work)
+        availability_index.upsert_reserve(inserted_id, store_seq, reserve_tables, reserve_date, payment_status)
+        occupancy_hub.publish(store_seq, reserve_event(store_seq, inserted_id, reserve_tables, reserve_date, payment_status))
         
         return {"result": "OK", "id": inserted_id}
     except Exception as e:
@@ -265,19 +360,22 @@ async def update_one(
     # TODO: 수정할 Form 파라미터 정의
 ):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
         # TODO: SQL 작성
         sql = """
             UPDATE reserve 
             SET store_seq=%s, customer_seq=%s, reserve_tables=%s, reserve_capacity=%s, reserve_date=%s, payment_key=%s, payment_status=%s     
             WHERE reserve_seq=%s
         """
-        curs.execute(sql, (store_seq, customer_seq, reserve_tables, reserve_capacity, reserve_date, payment_key, payment_status, reserve_seq))
-        
-        conn.commit()
-        conn.close()
+
+        def _work(conn):
+            curs = conn.cursor()
+            curs.execute(sql, (store_seq, customer_seq, reserve_tables, reserve_capacity, reserve_date, payment_key, payment_status, reserve_seq))
+            write_reserve_tables(curs, reserve_seq, store_seq, reserve_tables, reserve_date)
+            conn.commit()
+
+        await run_db(_work)
+        availability_index.upsert_reserve(reserve_seq, store_seq, reserve_tables, reserve_date, payment_status)
+        occupancy_hub.publish(store_seq, reserve_event(store_seq, reserve_seq, reserve_tables, reserve_date, payment_status))
         
         return {"result": "OK"}
     except Exception as e:
@@ -292,14 +390,13 @@ async def update_one(
 @router.delete("/delete_reserve/{item_id}")
 async def delete_one(item_id: int):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
+        # reserve_table 행은 FK ON DELETE CASCADE로 함께 삭제됨
+        old = await fetch_one("SELECT store_seq FROM reserve WHERE reserve_seq = %s", (item_id,))
         sql = "DELETE FROM reserve WHERE reserve_seq=%s"
-        curs.execute(sql, (item_id,))
-        
-        conn.commit()
-        conn.close()
+        await execute(sql, (item_id,))
+        availability_index.remove_reserve(item_id)
+        if old is not None:
+            occupancy_hub.publish(old[0], reserve_removed_event(old[0], item_id))
         
         return {"result": "OK"}
     except Exception as e:
@@ -0,0 +1,152 @@
+"""
+매출 리포트 API
+식당별 일별 매출 / 원가 / 마진을 pay 대신 sales_daily 집계에서 조회
+작성일: 2026-01-22
+작성자: 김택권
+
+- 집계는 결제 기록 시 같은 트랜잭션에서 갱신 (app/utils/sales_rollup.py)
+- 조회는 sales_daily PK (store_seq, sales_date, ...) 범위 스캔이라 pay 크기와 관계없이 기간 길이에만 비례
+"""
+
+import os
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter
+from ..database.async_db import fetch_all
+
+router = APIRouter()
+
+# 기간을 생략했을 때 조회할 일 수 (오늘 포함)
+SALES_REPORT_DEFAULT_DAYS = int(os.getenv('SALES_REPORT_DEFAULT_DAYS', '30'))
+# 한 번에 조회할 수 있는 최대 일 수
+SALES_REPORT_MAX_DAYS = int(os.getenv('SALES_REPORT_MAX_DAYS', '366'))
+
+
+def _parse_range(start_date: Optional[str], end_date: Optional[str]):
+    """
+    'YYYY-MM-DD' 기간 → (시작일, 종료일) (둘 다 포함)
+
+    Raises:
+        ValueError: 날짜 형식 오류 또는 기간 초과
+    """
+    end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else date.today()
+    if start_date:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+    else:
+        start = end - timedelta(days=SALES_REPORT_DEFAULT_DAYS - 1)
+    if start > end:
+        raise ValueError("start_date가 end_date보다 늦습니다.")
+    if (end - start).days + 1 > SALES_REPORT_MAX_DAYS:
+        raise ValueError(f"조회 기간은 최대 {SALES_REPORT_MAX_DAYS}일입니다.")
+    return start, end
+
+
+def _amounts(pay_count, quantity, revenue, cost) -> dict:
+    revenue, cost = int(revenue or 0), int(cost or 0)
+    return {
+        'pay_count': int(pay_count or 0),
+        'quantity': int(quantity or 0),
+        'revenue': revenue,
+        'cost': cost,
+        'margin': revenue - cost,
+        'margin_rate': round((revenue - cost) / revenue, 4) if revenue else None,
+    }
+
+
+# ============================================
+# 일별 매출 조회
+# ============================================
+@router.get("/daily/{store_seq}")
+async def select_daily_sales(store_seq: int, start_date: Optional[str] = None, end_date: Optional[str] = None):
+    """
+    식당의 일별 매출 / 원가 / 마진 (매출이 없는 날은 제외)
+
+    Args:
+        start_date, end_date: 'YYYY-MM-DD' (생략 시 최근 SALES_REPORT_DEFAULT_DAYS일)
+    """
+    try:
+        start, end = _parse_range(start_date, end_date)
+    except ValueError as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+    try:
+        rows = await fetch_all("""
+            SELECT sales_date, SUM(pay_count), SUM(quantity), SUM(revenue), SUM(cost)
+            FROM sales_daily
+            WHERE store_seq = %s AND sales_date BETWEEN %s AND %s
+            GROUP BY sales_date
+            ORDER BY sales_date
+        """, (store_seq, start, end))
+        results = [{'sales_date': row[0].isoformat(), **_amounts(*row[1:])} for row in rows]
+        total = _amounts(*(sum(r[key] for r in results) for key in ('pay_count', 'quantity', 'revenue', 'cost')))
+        return {
+            "results": results,
+            "total": total,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+        }
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+
+# ============================================
+# 메뉴별 매출 조회
+# ============================================
+@router.get("/menus/{store_seq}")
+async def select_menu_sales(store_seq: int, start_date: Optional[str] = None, end_date: Optional[str] = None):
+    """
+    식당의 기간 내 메뉴/옵션별 매출 / 원가 / 마진 (매출 많은 순)
+
+    Args:
+        start_date, end_date: 'YYYY-MM-DD' (생략 시 최근 SALES_REPORT_DEFAULT_DAYS일)
+    """
+    try:
+        start, end = _parse_range(start_date, end_date)
+    except ValueError as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+    try:
+        rows = await fetch_all("""
+            SELECT sd.menu_seq, sd.option_seq, m.menu_name, o.option_name, sd.pay_count, sd.quantity, sd.revenue, sd.cost
+            FROM (
+                SELECT menu_seq, option_seq,
+                       SUM(pay_count) AS pay_count, SUM(quantity) AS quantity,
+                       SUM(revenue) AS revenue, SUM(cost) AS cost
+                FROM sales_daily
+                WHERE store_seq = %s AND sales_date BETWEEN %s AND %s
+                GROUP BY menu_seq, option_seq
+            ) AS sd
+            LEFT JOIN menu m ON sd.menu_seq = m.menu_seq
+            LEFT JOIN `option` o ON sd.option_seq = o.option_seq
+            ORDER BY sd.revenue DESC, sd.menu_seq, sd.option_seq
+        """, (store_seq, start, end))
+        results = [{
+            'menu_seq': row[0],
+            'option_seq': row[1] or None,
+            'menu_name': row[2],
+            'option_name': row[3],
+            **_amounts(*row[4:]),
+        } for row in rows]
+        return {
+            "results": results,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+        }
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 매출 리포트 API - sales_daily 집계 기반 일별 / 메뉴별 매출, 원가, 마진 조회
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - GET /daily/{store_seq}, GET /menus/{store_seq}
+#   - SALES_REPORT_DEFAULT_DAYS / SALES_REPORT_MAX_DAYS 환경변수
@@ -9,17 +9,45 @@ store API - store CRUD
 | 날짜 | 작성자 | 내용 |
 |———--|———---|———--|
 |2026.01.15|유다원|생성|
+|2026.01.22|김택권|커넥션 풀 적용 (connect_db → get_connection)|
+|2026.01.22|김택권|비동기 DB 계층 적용 (get_connection → async_db.fetch_all/fetch_one/execute)|
+|2026.01.22|김택권|카탈로그 캐시 적용 (조회 캐시, 쓰기 시 무효화)|
+|2026.01.22|김택권|식당 화면 묶음 조회 추가 (GET /bundle/{store_seq}, ETag/304)|
+|2026.01.22|김택권|주변 식당 검색 추가 (GET /nearby, 위경도 격자 인덱스, 쓰기 시 증분 갱신)|
+|2026.01.22|김택권|테이블 배치도 추가 (GET/PUT /layout/{store_seq}, store_layout 저장, store_placement 검증)|
+|2026.01.22|김택권|식당 이미지 업로드 추가 (POST /upload_store_image/{store_seq}, upload_image.php 대체)|
+|2026.01.22|김택권|식당 화면 묶음 조회 메뉴에 menu_image_url 추가 (select_menu와 같은 image_store 버전 주소)|
 """
 
-from fastapi import APIRouter, FastAPI, Form, UploadFile, File, Response
+import asyncio
+import hashlib
+import json
+import os
+
+from fastapi import APIRouter, FastAPI, Form, UploadFile, File, Request, Response, Header
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional
-from ..database.connection import connect_db
+from ..database.async_db import fetch_all, fetch_one, execute, run_db
+from ..utils.catalog_cache import catalog_cache, stores_key, store_key, bundle_key, layout_key
+from ..utils.image_store import image_store
+from ..utils.image_upload import UploadError, handle_image_upload, upload_result
+from ..utils.store_geo import store_geo_index, decode_cursor
+from ..utils.store_layout import (
+    LayoutError, parse_layout, validate_layout, save_layout, load_layout, layout_json, select_table_seqs,
+)
 
 router = APIRouter()
 ipAddress = "127.0.0.1"
 port = 8000
 
+# 주변 식당 검색 반경 기본값 / 최대값 (미터), 페이지 크기 기본값 / 최대값
+STORE_NEARBY_DEFAULT_RADIUS = float(os.getenv('STORE_NEARBY_DEFAULT_RADIUS', '3000'))
+STORE_NEARBY_MAX_RADIUS = float(os.getenv('STORE_NEARBY_MAX_RADIUS', '50000'))
+STORE_NEARBY_DEFAULT_K = int(os.getenv('STORE_NEARBY_DEFAULT_K', '20'))
+STORE_NEARBY_MAX_K = int(os.getenv('STORE_NEARBY_MAX_K', '100'))
+
 
 # ============================================
 # 모델 정의
@@ -41,19 +69,18 @@ class YourModel(BaseModel):
 # - ORDER BY id 정렬
 @router.get("/select_stores")
 async def select_all():
-    conn = connect_db()
-    curs = conn.cursor()
-    
+    # 카탈로그 캐시 적중 시 DB 조회 생략
+    return await catalog_cache.get_or_load(stores_key(), _load_stores)
+
+
+async def _load_stores():
     # TODO: SQL 작성
-    curs.execute("""
+    rows = await fetch_all("""
         SELECT store_seq, store_address, store_lat, store_lng, store_phone, store_opentime, store_closetime, store_description, store_image, store_placement, created_at
         FROM store
         ORDER BY store_seq
     """)
     
-    rows = curs.fetchall()
-    conn.close()
-    
     # TODO: 결과 매핑
     result = [{
         'store_seq': row[0],
@@ -80,19 +107,18 @@ async def select_all():
 # - 존재하지 않으면 에러 응답
 @router.get("/select_store/{item_id}")
 async def select_one(item_id: int):
-    conn = connect_db()
-    curs = conn.cursor()
-    
+    # 카탈로그 캐시 적중 시 DB 조회 생략
+    return await catalog_cache.get_or_load(store_key(item_id), lambda: _load_store(item_id))
+
+
+async def _load_store(item_id: int):
     # TODO: SQL 작성
-    curs.execute("""
+    row = await fetch_one("""
         SELECT store_seq, store_address, store_lat, store_lng, store_phone, store_opentime, store_closetime, store_description, store_image, store_placement, created_at
         FROM store 
         WHERE store_seq = %s
     """, (item_id,))
     
-    row = curs.fetchone()
-    conn.close()
-    
     if row is None:
         return {"result": "Error", "message": "store not found"}
     
@@ -113,6 +139,249 @@ async def select_one(item_id: int):
     return {"result": result}
 
 
+# ============================================
+# 주변 식당 검색 (Nearby)
+# ============================================
+# 전체 목록(select_stores)을 받아 앱에서 거리 정렬하던 것을 서버에서 처리
+# - 위치는 메모리 격자 인덱스(store_geo_index)에서 찾고, 식당 정보는 해당 페이지의 식당만 PK로 조회
+# - next_cursor를 cursor로 넘기면 다음 페이지
+@router.get("/nearby")
+async def select_nearby(
+    lat: float,
+    lon: float,
+    radius: Optional[float] = None,
+    k: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
+    radius = STORE_NEARBY_DEFAULT_RADIUS if radius is None else radius
+    k = STORE_NEARBY_DEFAULT_K if k is None else k
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return {"result": "Error", "errorMsg": "lat/lon 범위가 올바르지 않습니다."}
+    if not (0 < radius <= STORE_NEARBY_MAX_RADIUS):
+        return {"result": "Error", "errorMsg": f"radius는 0 초과 {STORE_NEARBY_MAX_RADIUS:g}m 이하여야 합니다."}
+    if not (0 < k <= STORE_NEARBY_MAX_K):
+        return {"result": "Error", "errorMsg": f"k는 1 이상 {STORE_NEARBY_MAX_K} 이하여야 합니다."}
+    try:
+        after = decode_cursor(cursor)
+    except ValueError:
+        return {"result": "Error", "errorMsg": "cursor 형식이 올바르지 않습니다."}
+
+    try:
+        page = await store_geo_index.nearby(lat, lon, radius, k, after)
+        distances = dict(page["items"])
+        if not distances:
+            return {"results": [], "next_cursor": None}
+
+        placeholders = ', '.join(['%s'] * len(distances))
+        rows = await fetch_all(f"""
+            SELECT store_seq, store_address, store_lat, store_lng, store_phone, store_opentime, store_closetime, store_description, store_image, store_placement, created_at
+            FROM store
+            WHERE store_seq IN ({placeholders})
+        """, tuple(distances))
+        stores = {row[0]: row for row in rows}
+
+        # 인덱스 순서(거리순) 유지, 그사이 삭제된 식당은 제외
+        result = [{
+            'store_seq': row[0],
+            'store_address': row[1],
+            'store_lat': row[2],
+            'store_lng': row[3],
+            'store_phone': row[4],
+            'store_opentime': row[5],
+            'store_closetime': row[6],
+            'store_description': row[7],
+            'store_image': row[8],
+            'store_placement': row[9],
+            'created_at': row[10],
+            'distance_m': distances[store_seq],
+        } for store_seq, row in ((seq, stores.get(seq)) for seq in distances) if row is not None]
+        return {"results": result, "next_cursor": page["next_cursor"]}
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+
+# ============================================
+# 식당 화면 묶음 조회 (Bundle)
+# ============================================
+# 식당 화면 하나를 그리는 데 필요한 식당 + 메뉴(옵션 포함) + 테이블을 한 번에 반환
+# - select_store → select_menu → 메뉴마다 select_option 으로 이어지던 N+1 호출 대체
+# - 쿼리 3개 (식당 / 메뉴 LEFT JOIN 옵션 / 테이블), 메뉴 수와 무관
+# - ETag 제공: If-None-Match가 같으면 본문 없이 304 반환
+@router.get("/bundle/{store_seq}")
+async def select_bundle(store_seq: int, if_none_match: Optional[str] = Header(None)):
+    try:
+        bundle = await catalog_cache.get_or_load(bundle_key(store_seq), lambda: _load_bundle(store_seq))
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+    if bundle.get("result") == "Error":
+        return bundle
+
+    headers = {"ETag": bundle["etag"], "Cache-Control": "no-cache"}
+    if if_none_match and bundle["etag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=bundle["body"], headers=headers)
+
+
+def _bundle_etag(body) -> str:
+    """응답 본문(JSON) 기준 ETag"""
+    raw = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+async def _load_bundle(store_seq: int):
+    def _work(conn):
+        curs = conn.cursor()
+        curs.execute("""
+            SELECT store_seq, store_address, store_lat, store_lng, store_phone, store_opentime, store_closetime, store_description, store_image, store_placement, created_at
+            FROM store
+            WHERE store_seq = %s
+        """, (store_seq,))
+        store_row = curs.fetchone()
+        if store_row is None:
+            return None, (), ()
+        curs.execute("""
+            SELECT m.menu_seq, m.store_seq, m.menu_name, m.menu_price, m.menu_description, m.menu_image, m.menu_cost, m.created_at,
+                   o.option_seq, o.option_name, o.option_price, o.option_cost, o.created_at
+            FROM menu m
+            LEFT JOIN table_now_db.option o ON o.menu_seq = m.menu_seq AND o.store_seq = m.store_seq
+            WHERE m.store_seq = %s
+            ORDER BY m.menu_seq, o.option_seq
+        """, (store_seq,))
+        menu_rows = curs.fetchall()
+        curs.execute("""
+            SELECT store_table_seq, store_seq, store_table_name, store_table_capacity, store_table_inuse, created_at
+            FROM store_table
+            WHERE store_seq = %s
+            ORDER BY store_table_seq
+        """, (store_seq,))
+        table_rows = curs.fetchall()
+        return store_row, menu_rows, table_rows
+
+    store_row, menu_rows, table_rows = await run_db(_work)
+    if store_row is None:
+        return {"result": "Error", "message": "store not found"}
+
+    # 메뉴 이미지 버전 주소 (select_menu/{store_seq}의 menu_image_url과 같은 값)
+    image_names = list(dict.fromkeys(row[5] for row in menu_rows))
+    image_urls = dict(zip(image_names, await asyncio.gather(*(image_store.image_url(name) for name in image_names))))
+
+    menus = {}
+    for row in menu_rows:
+        menu = menus.get(row[0])
+        if menu is None:
+            menu = menus[row[0]] = {
+                'menu_seq': row[0],
+                'store_seq': row[1],
+                'menu_name': row[2],
+                'menu_price': row[3],
+                'menu_description': row[4],
+                'menu_image': row[5],
+                'menu_image_url': image_urls[row[5]],
+                'menu_cost': row[6],
+                'created_at': row[7],
+                'options': [],
+            }
+        if row[8] is not None:
+            menu['options'].append({
+                'option_seq': row[8],
+                'store_seq': row[1],
+                'menu_seq': row[0],
+                'option_name': row[9],
+                'option_price': row[10],
+                'option_cost': row[11],
+                'created_at': row[12],
+            })
+
+    body = jsonable_encoder({"result": {
+        'store': {
+            'store_seq': store_row[0],
+            'store_address': store_row[1],
+            'store_lat': store_row[2],
+            'store_lng': store_row[3],
+            'store_phone': store_row[4],
+            'store_opentime': store_row[5],
+            'store_closetime': store_row[6],
+            'store_description': store_row[7],
+            'store_image': store_row[8],
+            'store_placement': store_row[9],
+            'created_at': store_row[10],
+        },
+        'menus': list(menus.values()),
+        'tables': [{
+            'store_table_seq': row[0],
+            'store_seq': row[1],
+            'store_table_name': row[2],
+            'store_table_capacity': row[3],
+            'store_table_inuse': row[4],
+            'created_at': row[5],
+        } for row in table_rows],
+    }})
+    # 캐시에는 인코딩된 본문과 ETag를 함께 저장 (적중 시 재계산 없음)
+    return {"etag": _bundle_etag(body), "body": body}
+
+
+# ============================================
+# 테이블 배치도 (Layout)
+# ============================================
+# store_placement JSON을 앱마다 파싱하고 select_StoreTables_store와 직접 합치던 것을 서버에서 처리
+# - 배치 좌표(store_layout) + 테이블 이름/수용 인원을 합친 배치도를 캐시해 반환
+# - ETag 제공: If-None-Match가 같으면 본문 없이 304 반환
+@router.get("/layout/{store_seq}")
+async def select_layout(store_seq: int, if_none_match: Optional[str] = Header(None)):
+    try:
+        layout = await catalog_cache.get_or_load(layout_key(store_seq), lambda: _load_layout(store_seq))
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+    if layout.get("result") == "Error":
+        return layout
+
+    headers = {"ETag": layout["etag"], "Cache-Control": "no-cache"}
+    if if_none_match and layout["etag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=layout["body"], headers=headers)
+
+
+async def _load_layout(store_seq: int):
+    layout = await run_db(load_layout, store_seq)
+    if layout is None:
+        return {"result": "Error", "message": "store not found"}
+    body = {"result": layout}
+    return {"body": body, "etag": _bundle_etag(body)}
+
+
+@router.put("/layout/{store_seq}")
+async def update_layout(store_seq: int, layout: dict):
+    """
+    배치 저장 (전체 교체)
+    요청 본문: {"tables": [{"seq": store_table_seq, "pos_x": 150.0, "pos_y": 200.0}, ...]}
+    """
+    try:
+        positions = parse_layout(layout)
+    except LayoutError as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+    def _work(conn):
+        curs = conn.cursor()
+        curs.execute("SELECT 1 FROM store WHERE store_seq = %s FOR UPDATE", (store_seq,))
+        if curs.fetchone() is None:
+            return None
+        validate_layout(positions, select_table_seqs(curs, store_seq))
+        count = save_layout(curs, store_seq, positions)
+        # 기존 앱 호환을 위해 store_placement도 같은 JSON으로 유지
+        curs.execute("UPDATE store SET store_placement = %s WHERE store_seq = %s", (layout_json(positions), store_seq))
+        conn.commit()
+        return count
+
+    try:
+        count = await run_db(_work)
+        if count is None:
+            return {"result": "Error", "errorMsg": "store not found"}
+        await catalog_cache.invalidate(layout_key(store_seq), stores_key(), store_key(store_seq), bundle_key(store_seq))
+        return {"result": "OK", "count": count}
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
+
+
 # ============================================
 # 추가 (Create)
 # ============================================
@@ -135,19 +404,20 @@ async def insert_one(
     store_placement: str = Form(...)
 ):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
         # TODO: SQL 작성
+        # 배치 JSON이면 형식 검사 (새 식당은 테이블이 없으므로 배치는 테이블 추가 후 PUT /layout으로 저장)
+        positions = parse_layout(store_placement)
+        if positions:
+            validate_layout(positions, [])
+
         sql = """
             INSERT INTO store (store_address, store_lat, store_lng, store_phone, store_opentime, store_closetime, store_description, store_image, store_placement, created_at) 
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
         """
-        curs.execute(sql, (store_address, store_lat, store_lng, store_phone, store_opentime, store_closetime, store_description, store_image, store_placement))
-        
-        conn.commit()
-        inserted_id = curs.lastrowid
-        conn.close()
+        result = await execute(sql, (store_address, store_lat, store_lng, store_phone, store_opentime, store_closetime, store_description, store_image, store_placement))
+        inserted_id = result.lastrowid
+        await catalog_cache.invalidate(stores_key(), store_key(inserted_id), bundle_key(inserted_id), layout_key(inserted_id))
+        store_geo_index.upsert_store(inserted_id, store_lat, store_lng)
         
         return {"result": "OK", "id": inserted_id}
     except Exception as e:
@@ -174,19 +444,25 @@ async def update_one(
     # TODO: 수정할 Form 파라미터 정의
 ):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
         # TODO: SQL 작성
-        sql = """
-            UPDATE store 
-            SET store_address=%s, store_lat=%s, store_lng=%s, store_phone=%s, store_opentime=%s, store_closetime=%s, store_description=%s, store_image=%s, store_placement=%s
-            WHERE store_seq=%s
-        """
-        curs.execute(sql, (store_address, store_lat, store_lng, store_phone, store_opentime, store_closetime, store_description, store_image, store_placement, store_seq))
-        
-        conn.commit()
-        conn.close()
+        positions = parse_layout(store_placement)
+
+        def _work(conn):
+            curs = conn.cursor()
+            # 배치 JSON이면 검증 후 store_layout도 같은 트랜잭션으로 교체
+            if positions is not None:
+                validate_layout(positions, select_table_seqs(curs, store_seq))
+                save_layout(curs, store_seq, positions)
+            curs.execute("""
+                UPDATE store 
+                SET store_address=%s, store_lat=%s, store_lng=%s, store_phone=%s, store_opentime=%s, store_closetime=%s, store_description=%s, store_image=%s, store_placement=%s
+                WHERE store_seq=%s
+            """, (store_address, store_lat, store_lng, store_phone, store_opentime, store_closetime, store_description, store_image, store_placement, store_seq))
+            conn.commit()
+
+        await run_db(_work)
+        await catalog_cache.invalidate(stores_key(), store_key(store_seq), bundle_key(store_seq), layout_key(store_seq))
+        store_geo_index.upsert_store(store_seq, store_lat, store_lng)
         
         return {"result": "OK"}
     except Exception as e:
@@ -201,14 +477,10 @@ async def update_one(
 @router.delete("/delete_store/{item_id}")
 async def delete_one(item_id: int):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
         sql = "DELETE FROM store WHERE store_seq=%s"
-        curs.execute(sql, (item_id,))
-        
-        conn.commit()
-        conn.close()
+        await execute(sql, (item_id,))
+        await catalog_cache.invalidate(stores_key(), store_key(item_id), bundle_key(item_id), layout_key(item_id))
+        store_geo_index.remove_store(item_id)
         
         return {"result": "OK"}
     except Exception as e:
@@ -246,28 +518,23 @@ async def delete_one(item_id: int):
 
 
 # ============================================
-# [선택] 이미지 업데이트 (이미지 BLOB 컬럼이 있는 경우)
+# 이미지 업로드
 # ============================================
-# TODO: 이미지만 별도로 업데이트
-# - UploadFile = File(...) 사용
-# @app.post("/update_[테이블명]_image")
-# async def update_image(
-#     item_id: int = Form(...),
-#     file: UploadFile = File(...)
-# ):
-#     try:
-#         image_data = await file.read()
-#         
-#         conn = connect_db()
-#         curs = conn.cursor()
-#         sql = "UPDATE [테이블명] SET [이미지컬럼]=%s WHERE id=%s"
-#         curs.execute(sql, (image_data, item_id))
-#         conn.commit()
-#         conn.close()
-#         
-#         return {"result": "OK"}
-#     except Exception as e:
-#         return {"result": "Error", "errorMsg": str(e)}
+# multipart/form-data의 file을 IMAGE_DIR에 "<내용 해시>.<확장자>"로 저장하고 store.store_image 교체
+@router.post("/upload_store_image/{store_seq}")
+async def upload_store_image(request: Request, store_seq: int):
+    try:
+        row = await fetch_one("SELECT store_seq FROM store WHERE store_seq = %s", (store_seq,))
+        if row is None:
+            return JSONResponse({"result": "Error", "message": "Not found"}, status_code=404)
+        _, stored = await handle_image_upload(request)
+        await execute("UPDATE store SET store_image=%s WHERE store_seq=%s", (stored.file_name, store_seq))
+        await catalog_cache.invalidate(stores_key(), store_key(store_seq), bundle_key(store_seq), layout_key(store_seq))
+        return await upload_result(stored)
+    except UploadError as e:
+        return JSONResponse({"result": "Error", "errorMsg": str(e)}, status_code=e.status_code)
+    except Exception as e:
+        return {"result": "Error", "errorMsg": str(e)}
 
 
 # ============================================
@@ -10,13 +10,29 @@ store_table API - store_table CRUD
 |2026.01.15|이예은| 초기 생성 |
 |2026.01.16|이예은| APIRouter로 변경, 중복 코드 제거, import 수정 |
 |2026.01.19|유다원| 가게별 조회 생성 |
+|2026.01.22|김택권|커넥션 풀 적용 (connect_db → get_connection)|
+|2026.01.22|김택권|비동기 DB 계층 적용 (get_connection → async_db.fetch_all/fetch_one/execute)|
+|2026.01.22|김택권|테이블 추가/수정/삭제 시 예약 가능 여부 인덱스의 테이블 목록 무효화|
+|2026.01.22|김택권|전체 조회에 키셋 페이지네이션 추가 (after_seq, limit, next_cursor)|
+|2026.01.22|김택권|테이블 변경 시 식당 묶음 캐시 무효화|
+|2026.01.22|김택권|테이블 변경 시 배치도 캐시 무효화|
+|2026.01.22|김택권|식당별 테이블 점유 / 예약 변경 실시간 구독 추가 (WebSocket /ws, SSE /stream), 테이블 변경 시 이벤트 발행|
 """
 
-from fastapi import APIRouter, Form
+import asyncio
+from fastapi import APIRouter, Form, WebSocket
+from fastapi.responses import JSONResponse, StreamingResponse
 # UploadFile, File, Response는 이미지 기능 구현 시 사용 예정
 from pydantic import BaseModel
 from typing import Optional
-from ..database.connection import connect_db
+from ..database.async_db import fetch_all, fetch_one, execute
+from ..database.pagination import fetch_page
+from ..utils.availability import availability_index
+from ..utils.catalog_cache import catalog_cache, bundle_key, layout_key
+from ..utils.occupancy_hub import (
+    occupancy_hub, dumps_event, table_event, table_removed_event,
+    RESYNC, OCCUPANCY_HEARTBEAT, OCCUPANCY_SEND_TIMEOUT,
+)
 
 router = APIRouter()
 ipAddress = "127.0.0.1"
@@ -39,18 +55,12 @@ class StoreTable(BaseModel):
 # 전체 조회 (Read All)
 # ============================================
 @router.get("/select_StoreTables")
-async def select_all():
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    curs.execute("""
+async def select_all(after_seq: Optional[int] = None, limit: Optional[int] = None):
+    # 키셋 페이지네이션: after_seq/limit 지정 시 페이지 단위 조회, 없으면 전체 조회
+    rows, next_cursor = await fetch_page("""
         SELECT store_table_seq, store_seq, store_table_name, store_table_capacity, store_table_inuse, created_at
-        FROM store_table 
-        ORDER BY store_table_seq
-    """)
-    
-    rows = curs.fetchall()
-    conn.close()
+        FROM store_table
+    """, "store_table_seq", after_seq, limit)
     
     result = [{
         'store_table_seq': row[0],
@@ -61,28 +71,21 @@ async def select_all():
         'created_at': row[5]
     } for row in rows]
     
-    return {"results": result}
+    return {"results": result, "next_cursor": next_cursor}
 
 
 # ============================================
 # 가게별 전체 테이블 조회
 # ============================================
-@router.get("/select_StoreTables_store/{store_seq}")
-async def select_all(store_seq:int):
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    curs.execute("""
+async def _select_store_tables(store_seq: int) -> list:
+    rows = await fetch_all("""
         SELECT store_table_seq, store_seq, store_table_name, store_table_capacity, store_table_inuse, created_at
         FROM store_table
         WHERE store_seq = %s 
         ORDER BY store_table_seq
     """,(store_seq))
     
-    rows = curs.fetchall()
-    conn.close()
-    
-    result = [{
+    return [{
         'store_table_seq': row[0],
         'store_seq': row[1],
         'store_table_name': row[2],
@@ -90,6 +93,12 @@ async def select_all(store_seq:int):
         'store_table_inuse': row[4],
         'created_at': row[5]
     } for row in rows]
+
+
+@router.get("/select_StoreTables_store/{store_seq}")
+async def select_all(store_seq:int):
+    # 배치도 화면의 반복 조회는 /ws/{store_seq} 또는 /stream/{store_seq} 구독으로 대체
+    result = await _select_store_tables(store_seq)
     
     return {"results": result}
 
@@ -99,18 +108,12 @@ async def select_all(store_seq:int):
 # ============================================
 @router.get("/select_StoreTable/{store_table_seq}")
 async def select_one(store_table_seq: int):
-    conn = connect_db()
-    curs = conn.cursor()
-    
-    curs.execute("""
+    row = await fetch_one("""
         SELECT store_table_seq, store_seq, store_table_name, store_table_capacity, store_table_inuse, created_at
         FROM store_table
         WHERE store_table_seq = %s
     """, (store_table_seq,))
     
-    row = curs.fetchone()
-    conn.close()
-    
     if row is None:
         return {"result": "Error", "message": "StoreTable not found"}
     
@@ -137,18 +140,16 @@ async def insert_one(
     # created_at은 DB에서 NOW()로 자동 생성되므로 제거
 ):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
         sql = """
             INSERT INTO store_table (store_seq, store_table_name, store_table_capacity, store_table_inuse, created_at) 
             VALUES (%s, %s, %s, %s, NOW())
         """
-        curs.execute(sql, (store_seq, store_table_name, store_table_capacity, store_table_inuse))
-        
-        conn.commit()
-        inserted_id = curs.lastrowid
-        conn.close()
+        result = await execute(sql, (store_seq, store_table_name, store_table_capacity, store_table_inuse))
+        inserted_id = result.lastrowid
+        availability_index.invalidate_tables(store_seq)
+        await catalog_cache.invalidate(bundle_key(store_seq), layout_key(store_seq))
+        occupancy_hub.publish(store_seq, table_event(
+            store_seq, inserted_id, store_table_name, store_table_capacity, store_table_inuse))
         
         return {"result": "OK", "id": inserted_id}
     except Exception as e:
@@ -168,18 +169,22 @@ async def update_one(
     # created_at은 일반적으로 수정하지 않으므로 제거
 ):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
+        old = await fetch_one("SELECT store_seq FROM store_table WHERE store_table_seq = %s", (store_table_seq,))
         sql = """
             UPDATE store_table 
             SET store_seq=%s, store_table_name=%s, store_table_capacity=%s, store_table_inuse=%s
             WHERE store_table_seq=%s 
         """
-        curs.execute(sql, (store_seq, store_table_name, store_table_capacity, store_table_inuse, store_table_seq))
-        
-        conn.commit()
-        conn.close()
+        await execute(sql, (store_seq, store_table_name, store_table_capacity, store_table_inuse, store_table_seq))
+        # 테이블이 다른 식당으로 옮겨졌을 수 있으므로 전체 무효화
+        availability_index.invalidate_tables()
+        keys = [bundle_key(store_seq), layout_key(store_seq)]
+        if old is not None and old[0] != store_seq:
+            keys += [bundle_key(old[0]), layout_key(old[0])]
+            occupancy_hub.publish(old[0], table_removed_event(old[0], store_table_seq))
+        await catalog_cache.invalidate(*keys)
+        occupancy_hub.publish(store_seq, table_event(
+            store_seq, store_table_seq, store_table_name, store_table_capacity, store_table_inuse))
         
         return {"result": "OK"}
     except Exception as e:
@@ -192,20 +197,106 @@ async def update_one(
 @router.delete("/delete_StoreTable/{store_table_seq}")
 async def delete_one(store_table_seq: int):
     try:
-        conn = connect_db()
-        curs = conn.cursor()
-        
+        old = await fetch_one("SELECT store_seq FROM store_table WHERE store_table_seq = %s", (store_table_seq,))
+        # reserve_table 행은 ON DELETE CASCADE로 함께 삭제 (예약 이력은 reserve.reserve_tables에 남음)
         sql = "DELETE FROM store_table WHERE store_table_seq=%s"
-        curs.execute(sql, (store_table_seq,))
-        
-        conn.commit()
-        conn.close()
+        await execute(sql, (store_table_seq,))
+        availability_index.invalidate_tables()
+        if old is not None:
+            await catalog_cache.invalidate(bundle_key(old[0]), layout_key(old[0]))
+            occupancy_hub.publish(old[0], table_removed_event(old[0], store_table_seq))
         
         return {"result": "OK"}
     except Exception as e:
         return {"result": "Error", "errorMsg": str(e)}
 
 
+# ============================================
+# 실시간 점유 현황 구독 (WebSocket / SSE)
+# ============================================
+# 연결 직후 snapshot(현재 테이블 목록)을 보내고, 이후 table / table_removed / reserve / reserve_removed 변경분 전달
+# 구독을 먼저 시작한 뒤 스냅샷을 읽으므로 그 사이 변경은 스냅샷 뒤에 한 번 더 올 수 있음 (같은 값 덮어쓰기)
+async def _snapshot_message(store_seq: int) -> str:
+    tables = await _select_store_tables(store_seq)
+    return dumps_event({"type": "snapshot", "store_seq": store_seq, "tables": tables})
+
+
+async def _next_message(subscription, store_seq: int, timeout: Optional[float] = None) -> Optional[str]:
+    message = await subscription.get(timeout)
+    if message == RESYNC:
+        # 대기열이 넘친 연결: 밀린 변경분 대신 최신 스냅샷
+        return await _snapshot_message(store_seq)
+    return message
+
+
+async def _ws_send_loop(websocket: WebSocket, subscription, store_seq: int):
+    message = await _snapshot_message(store_seq)
+    while True:
+        await asyncio.wait_for(websocket.send_text(message), OCCUPANCY_SEND_TIMEOUT)
+        message = await _next_message(subscription, store_seq)
+
+
+async def _ws_receive_loop(websocket: WebSocket):
+    # 클라이언트 메시지는 사용하지 않음 (연결 종료 감지용)
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("/ws/{store_seq}")
+async def occupancy_ws(websocket: WebSocket, store_seq: int):
+    subscription = occupancy_hub.subscribe(store_seq)
+    if subscription is None:
+        # 워커 구독자 수 초과: 잠시 후 재시도 (1013 Try Again Later)
+        await websocket.close(code=1013)
+        return
+    tasks = []
+    try:
+        await websocket.accept()
+        sender = asyncio.create_task(_ws_send_loop(websocket, subscription, store_seq))
+        receiver = asyncio.create_task(_ws_receive_loop(websocket))
+        tasks = [sender, receiver]
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        if sender in done and sender.exception() is not None:
+            # 스냅샷 조회 실패 / 전송 시간 초과
+            print(f"⚠️  occupancy ws 종료 (store_seq={store_seq}): {sender.exception()!r}")
+            try:
+                await websocket.close(code=1011)
+            except Exception:
+                pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        occupancy_hub.unsubscribe(subscription)
+
+
+@router.get("/stream/{store_seq}")
+async def occupancy_stream(store_seq: int):
+    if occupancy_hub.is_full():
+        return JSONResponse({"result": "Error", "errorMsg": "구독자가 너무 많습니다. 잠시 후 다시 시도하세요."}, status_code=503)
+
+    async def _events():
+        # 응답이 시작된 뒤에 구독 (시작 전에 끊긴 연결이 구독자로 남지 않도록)
+        subscription = occupancy_hub.subscribe(store_seq)
+        if subscription is None:
+            return
+        try:
+            yield f"retry: 3000\ndata: {await _snapshot_message(store_seq)}\n\n"
+            while True:
+                message = await _next_message(subscription, store_seq, OCCUPANCY_HEARTBEAT)
+                # 이벤트가 없으면 주석으로 연결 유지 (끊긴 연결도 이때 감지됨)
+                yield f"data: {message}\n\n" if message is not None else ": ping\n\n"
+        finally:
+            occupancy_hub.unsubscribe(subscription)
+
+    return StreamingResponse(_events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+
 # ============================================
 # [선택] 이미지 조회 (이미지 BLOB 컬럼이 있는 경우)
 # ============================================
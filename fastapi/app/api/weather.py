@@ -5,13 +5,53 @@ Weather API - OpenWeatherMap API 직접 조회 (DB 저장 없음)
 수정일: 2026-01-21 - weather 테이블 제거 마이그레이션
 """
 
+import asyncio
+import os
 from fastapi import APIRouter, Query
-from typing import Optional
+from pydantic import BaseModel
+from typing import List, Optional
 from datetime import datetime
 from ..utils.weather_service import WeatherService
 
 router = APIRouter()
 
+# 일괄 조회 시 동시에 진행할 위치 수
+WEATHER_BATCH_CONCURRENCY = int(os.getenv('WEATHER_BATCH_CONCURRENCY', '8'))
+
+# 일괄 조회 한 번에 받을 수 있는 최대 위치 수
+WEATHER_BATCH_MAX_LOCATIONS = int(os.getenv('WEATHER_BATCH_MAX_LOCATIONS', '100'))
+
+
+# ============================================
+# 모델 정의
+# ============================================
+class WeatherLocation(BaseModel):
+    store_seq: Optional[int] = None
+    lat: float
+    lon: float
+
+
+class WeatherBatchRequest(BaseModel):
+    locations: List[WeatherLocation]
+    start_date: Optional[str] = None  # YYYY-MM-DD, 없으면 오늘 포함 8일치
+
+
+def _format_forecast(forecast) -> dict:
+    """예보 1건을 응답 형식으로 변환"""
+    weather_datetime = forecast["weather_datetime"]
+    if isinstance(weather_datetime, datetime):
+        weather_datetime_str = weather_datetime.isoformat()
+    else:
+        weather_datetime_str = str(weather_datetime)
+    
+    return {
+        'weather_datetime': weather_datetime_str,
+        'weather_type': forecast["weather_type"],
+        'weather_low': forecast["weather_low"],
+        'weather_high': forecast["weather_high"],
+        'icon_url': forecast["icon_url"]
+    }
+
 
 # ============================================
 # OpenWeatherMap API에서 직접 날씨 데이터 가져오기 (DB 저장 없이)
@@ -46,30 +86,16 @@ async def fetch_weather_direct(
                     "errorMsg": f"날짜 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 필요): {start_date}"
                 }
         
-        # WeatherService를 사용하여 OpenWeatherMap API에서 직접 데이터 가져오기
+        # WeatherService를 사용하여 OpenWeatherMap API에서 직접 데이터 가져오기 (격자 캐시 경유)
         weather_service = WeatherService()
-        forecast_list = weather_service.fetch_daily_forecast(
+        forecast_list = await weather_service.fetch_daily_forecast_cached(
             lat=str(lat),
             lon=str(lon),
             start_date=start_date_obj
         )
         
         # 결과 포맷팅
-        results = []
-        for forecast in forecast_list:
-            weather_datetime = forecast["weather_datetime"]
-            if isinstance(weather_datetime, datetime):
-                weather_datetime_str = weather_datetime.isoformat()
-            else:
-                weather_datetime_str = str(weather_datetime)
-            
-            results.append({
-                'weather_datetime': weather_datetime_str,
-                'weather_type': forecast["weather_type"],
-                'weather_low': forecast["weather_low"],
-                'weather_high': forecast["weather_high"],
-                'icon_url': forecast["icon_url"]
-            })
+        results = [_format_forecast(forecast) for forecast in forecast_list]
         
         return {"results": results}
         
@@ -119,28 +145,16 @@ async def fetch_weather_direct_single(
                     "errorMsg": f"날짜 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 필요): {target_date}"
                 }
         
-        # WeatherService를 사용하여 OpenWeatherMap API에서 특정 날짜의 날씨만 가져오기
+        # WeatherService를 사용하여 OpenWeatherMap API에서 특정 날짜의 날씨만 가져오기 (격자 캐시 경유)
         weather_service = WeatherService()
-        forecast = weather_service.fetch_single_day_weather(
+        forecast = await weather_service.fetch_single_day_weather_cached(
             lat=str(lat),
             lon=str(lon),
             target_date=target_date_obj
         )
         
         # 결과 포맷팅
-        weather_datetime = forecast["weather_datetime"]
-        if isinstance(weather_datetime, datetime):
-            weather_datetime_str = weather_datetime.isoformat()
-        else:
-            weather_datetime_str = str(weather_datetime)
-        
-        result = {
-            'weather_datetime': weather_datetime_str,
-            'weather_type': forecast["weather_type"],
-            'weather_low': forecast["weather_low"],
-            'weather_high': forecast["weather_high"],
-            'icon_url': forecast["icon_url"]
-        }
+        result = _format_forecast(forecast)
         
         return {"result": result}
         
@@ -161,6 +175,59 @@ async def fetch_weather_direct_single(
         }
 
 
+# ============================================
+# 여러 위치의 날씨를 한 번에 가져오기 (식당 목록 화면용)
+# ============================================
+@router.post("/batch")
+async def fetch_weather_batch(request: WeatherBatchRequest):
+    """
+    여러 위치(식당)의 일별 예보를 한 번의 요청으로 가져오기
+    
+    - 위치별로 동시에 조회하되 WEATHER_BATCH_CONCURRENCY개씩만 진행
+    - 가까운 위치는 예보 캐시 격자를 공유하므로 외부 호출이 더 줄어듦
+    - 일부 위치가 실패해도 나머지는 반환 (실패한 위치는 result: Error)
+    
+    요청 예시:
+        {"locations": [{"store_seq": 1, "lat": 37.5665, "lon": 126.978}, ...], "start_date": "2026-01-23"}
+    """
+    if len(request.locations) > WEATHER_BATCH_MAX_LOCATIONS:
+        return {
+            "result": "Error",
+            "errorMsg": f"위치는 한 번에 최대 {WEATHER_BATCH_MAX_LOCATIONS}개까지 조회할 수 있습니다."
+        }
+    
+    start_date_obj = None
+    if request.start_date:
+        try:
+            start_date_obj = datetime.strptime(request.start_date, "%Y-%m-%d")
+        except ValueError:
+            return {
+                "result": "Error",
+                "errorMsg": f"날짜 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 필요): {request.start_date}"
+            }
+    
+    weather_service = WeatherService()
+    semaphore = asyncio.Semaphore(WEATHER_BATCH_CONCURRENCY)
+    
+    async def _fetch(location: WeatherLocation) -> dict:
+        item = {'store_seq': location.store_seq, 'lat': location.lat, 'lon': location.lon}
+        try:
+            async with semaphore:
+                forecast_list = await weather_service.fetch_daily_forecast_cached(
+                    lat=str(location.lat),
+                    lon=str(location.lon),
+                    start_date=start_date_obj
+                )
+            item['results'] = [_format_forecast(forecast) for forecast in forecast_list]
+        except Exception as e:
+            item['result'] = "Error"
+            item['errorMsg'] = str(e)
+        return item
+    
+    results = await asyncio.gather(*[_fetch(location) for location in request.locations])
+    return {"results": results}
+
+
 # ============================================================
 # 생성 이력
 # ============================================================
@@ -184,3 +251,10 @@ async def fetch_weather_direct_single(
 #   - connect_db import 제거
 #   - /direct, /direct/single 엔드포인트만 유지
 #   - OpenWeatherMap API 직접 호출만 지원
+#
+# 2026-01-22 김택권: 날씨 예보 캐시 적용
+#   - /direct, /direct/single이 fetch_*_cached 사용 (위경도 격자 캐시, 동시 미스 합치기)
+#
+# 2026-01-22 김택권: 여러 위치 날씨 일괄 조회 추가
+#   - POST /api/weather/batch (WEATHER_BATCH_CONCURRENCY 동시 조회 제한, 위치별 에러)
+#   - 결과 포맷팅을 _format_forecast로 공통화
@@ -0,0 +1,173 @@
+"""
+비동기 데이터베이스 접근 계층
+async def 엔드포인트에서 동기 pymysql 호출이 이벤트 루프를 막지 않도록
+커넥션 풀 연결을 전용 스레드 풀에서 사용하는 헬퍼
+작성일: 2026-01-22
+작성자: 김택권
+
+사용 예시:
+    from ..database.async_db import fetch_all, fetch_one, execute, run_db
+
+    rows = await fetch_all("SELECT ... FROM store WHERE store_seq = %s", (store_seq,))
+    result = await execute("INSERT INTO ...", (...))   # 커밋 후 lastrowid/rowcount 반환
+
+    # 여러 쿼리를 한 트랜잭션으로 처리할 때
+    def _work(conn):
+        curs = conn.cursor()
+        ...
+        conn.commit()
+        return ...
+    data = await run_db(_work)
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence
+
+from .connection import POOL_CONFIG, get_connection
+
+# DB 작업 스레드 수 (기본값: 커넥션 풀 최대 크기)
+# 스레드 수가 풀 크기를 넘지 않으므로 스레드가 풀 대기로 막히지 않고,
+# 초과 요청은 이벤트 루프를 막지 않은 채 실행 대기열에서 기다립니다.
+DB_EXECUTOR_WORKERS = int(os.getenv('DB_EXECUTOR_WORKERS', str(POOL_CONFIG['max_size'])))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+class ExecuteResult(NamedTuple):
+    """execute() 결과"""
+    lastrowid: int
+    rowcount: int
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """DB 전용 스레드 풀 반환 (최초 호출 시 생성)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DB_EXECUTOR_WORKERS,
+                    thread_name_prefix="db"
+                )
+    return _executor
+
+
+def shutdown_executor():
+    """DB 스레드 풀 종료 (애플리케이션 종료 시 호출)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+def executor_stats() -> Dict:
+    """DB 스레드 풀 지표 (작업자 수, 실행 중 + 대기 중 작업 수) 반환"""
+    return {
+        "workers": DB_EXECUTOR_WORKERS,
+        "pending": _pending,
+    }
+
+
+def _call_with_connection(fn: Callable, args: tuple, kwargs: dict) -> Any:
+    """스레드 풀에서 실행: 풀에서 연결을 대여해 fn(conn, ...) 호출"""
+    with get_connection() as conn:
+        return fn(conn, *args, **kwargs)
+
+
+async def run_db(fn: Callable, *args, **kwargs) -> Any:
+    """
+    fn(conn, *args, **kwargs)를 DB 스레드 풀에서 실행
+
+    - conn은 커넥션 풀에서 대여한 연결이며 fn이 끝나면 반납됨
+    - 커밋은 fn 안에서 conn.commit()으로 직접 수행 (커밋하지 않으면 반납 시 롤백)
+    - fn 안에서 발생한 예외는 그대로 전달됨
+
+    Args:
+        fn: 첫 번째 인자로 연결을 받는 동기 함수
+        *args, **kwargs: fn에 전달할 인자
+
+    Returns:
+        fn의 반환값
+    """
+    global _pending
+    with _pending_lock:
+        _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_executor(),
+            functools.partial(_call_with_connection, fn, args, kwargs)
+        )
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+def _fetch_all(conn, sql: str, params: Optional[Sequence]) -> tuple:
+    curs = conn.cursor()
+    curs.execute(sql, params)
+    return curs.fetchall()
+
+
+def _fetch_one(conn, sql: str, params: Optional[Sequence]) -> Optional[tuple]:
+    curs = conn.cursor()
+    curs.execute(sql, params)
+    return curs.fetchone()
+
+
+def _execute(conn, sql: str, params: Optional[Sequence]) -> ExecuteResult:
+    curs = conn.cursor()
+    curs.execute(sql, params)
+    conn.commit()
+    return ExecuteResult(curs.lastrowid, curs.rowcount)
+
+
+def _execute_many(conn, sql: str, seq_of_params: Sequence[Sequence]) -> int:
+    curs = conn.cursor()
+    rowcount = curs.executemany(sql, seq_of_params)
+    conn.commit()
+    return rowcount or 0
+
+
+async def fetch_all(sql: str, params: Optional[Sequence] = None) -> tuple:
+    """SELECT 실행 후 모든 행 반환"""
+    return await run_db(_fetch_all, sql, params)
+
+
+async def fetch_one(sql: str, params: Optional[Sequence] = None) -> Optional[tuple]:
+    """SELECT 실행 후 첫 번째 행 반환 (없으면 None)"""
+    return await run_db(_fetch_one, sql, params)
+
+
+async def execute(sql: str, params: Optional[Sequence] = None) -> ExecuteResult:
+    """INSERT/UPDATE/DELETE 실행 후 커밋, (lastrowid, rowcount) 반환"""
+    return await run_db(_execute, sql, params)
+
+
+async def execute_many(sql: str, seq_of_params: Sequence[Sequence]) -> int:
+    """executemany 실행 후 커밋, 영향받은 행 수 반환"""
+    return await run_db(_execute_many, sql, seq_of_params)
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 비동기 DB 접근 계층 - 커넥션 풀 연결을 크기가 제한된 전용 스레드 풀에서 사용
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - run_db / fetch_all / fetch_one / execute / execute_many
+#   - DB_EXECUTOR_WORKERS 환경변수 (기본값: 커넥션 풀 최대 크기)
+#   - executor_stats() 지표
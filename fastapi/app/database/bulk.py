@@ -0,0 +1,75 @@
+"""
+다중 행 INSERT 헬퍼
+여러 행을 한 문장(INSERT ... VALUES (...), (...), ...)으로 기록해
+행마다 서버를 왕복하지 않도록 하는 공통 함수 (커밋은 호출하는 쪽에서)
+작성일: 2026-01-22
+작성자: 김택권
+
+사용 예시 (run_db 안에서 같은 트랜잭션으로):
+    from ..database.bulk import bulk_insert
+
+    def _work(conn):
+        curs = conn.cursor()
+        bulk_insert(curs, "pay", ("reserve_seq", "store_seq", ...), rows)
+        conn.commit()
+
+    - 행이 BULK_INSERT_CHUNK개를 넘으면 여러 문장으로 나눠 실행 (max_allowed_packet 초과 방지)
+"""
+
+import os
+from typing import Optional, Sequence
+
+# 한 문장에 넣을 최대 행 수
+BULK_INSERT_CHUNK = int(os.getenv('BULK_INSERT_CHUNK', '500'))
+
+
+def bulk_insert(
+    curs,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Sequence],
+    chunk_size: Optional[int] = None,
+) -> int:
+    """
+    rows를 chunk_size개씩 다중 행 INSERT로 기록
+
+    Args:
+        curs: pymysql 커서
+        table: 테이블 이름 (코드에 고정된 값만 사용, 사용자 입력 금지)
+        columns: 컬럼 이름 목록 (rows 각 행의 값 순서와 같아야 함)
+        rows: 행 값 목록
+        chunk_size: 한 문장의 최대 행 수 (기본 BULK_INSERT_CHUNK)
+
+    Returns:
+        int: 기록된 행 수
+    """
+    if not rows:
+        return 0
+    chunk_size = chunk_size or BULK_INSERT_CHUNK
+    column_sql = ', '.join(f"`{column}`" for column in columns)
+    row_sql = '(' + ', '.join(['%s'] * len(columns)) + ')'
+
+    inserted = 0
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        params = [value for row in chunk for value in row]
+        curs.execute(
+            f"INSERT INTO `{table}` ({column_sql}) VALUES {', '.join([row_sql] * len(chunk))}",
+            params,
+        )
+        inserted += curs.rowcount
+    return inserted
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 다중 행 INSERT 헬퍼 (bulk_insert)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - bulk_insert / BULK_INSERT_CHUNK 환경변수
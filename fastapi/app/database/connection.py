@@ -3,8 +3,15 @@
 Table Now 데이터베이스 연결을 위한 설정
 """
 
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
 import pymysql
 
+from .pool import ConnectionPool, PoolTimeoutError
+
 
 # TODO: 실제 데이터베이스 설정으로 변경 필요
 DB_CONFIG = {
@@ -16,14 +23,34 @@ DB_CONFIG = {
     'port': 13306
 }
 
+# 커넥션 풀 설정 (환경변수로 조정 가능)
+# - DB_POOL_MAX_SIZE: 워커당 최대 연결 수 (워커 수 × 이 값이 MySQL max_connections를 넘지 않게)
+# - DB_POOL_MAX_IDLE: 유휴 연결 폐기 기준 (초)
+# - DB_POOL_MAX_LIFETIME: 연결 최대 수명 (초, MySQL wait_timeout보다 짧게)
+# - DB_POOL_HEALTH_CHECK: 이 시간(초) 이상 쉰 연결은 대여 전 ping
+# - DB_POOL_ACQUIRE_TIMEOUT: 연결 대기 최대 시간 (초)
+POOL_CONFIG = {
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+    'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+    'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+    'health_check_interval': float(os.getenv('DB_POOL_HEALTH_CHECK', '30')),
+    'acquire_timeout': float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '10')),
+}
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
 
 def connect_db():
     """
-    데이터베이스 연결
-    
+    데이터베이스 연결 (풀을 거치지 않는 새 연결)
+
+    API 핸들러에서는 get_connection()을 사용하세요.
+    배치 스크립트 등 풀이 필요 없는 곳과 풀의 연결 생성에 사용됩니다.
+
     Returns:
         pymysql.Connection: 데이터베이스 연결 객체
-        
+
     Raises:
         pymysql.Error: 데이터베이스 연결 실패 시
     """
@@ -32,3 +59,88 @@ def connect_db():
         return conn
     except pymysql.Error as e:
         raise pymysql.Error(f"Database connection failed: {str(e)}") from e
+
+
+def get_pool() -> ConnectionPool:
+    """
+    프로세스 전역 커넥션 풀 반환 (최초 호출 시 생성)
+
+    Returns:
+        ConnectionPool: 커넥션 풀
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(connect_db, **POOL_CONFIG)
+    return _pool
+
+
+def close_pool():
+    """커넥션 풀 종료 (애플리케이션 종료 시 호출)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+@contextmanager
+def get_connection() -> Iterator[pymysql.connections.Connection]:
+    """
+    풀에서 연결을 대여하고 블록이 끝나면 반납
+
+    - 블록 안에서 예외가 발생하면 롤백 후 반납
+    - 커밋은 호출하는 쪽에서 conn.commit()으로 직접 수행
+    - DB 오류로 연결 상태가 불확실하면 재사용하지 않고 폐기
+
+    사용 예시:
+        with get_connection() as conn:
+            curs = conn.cursor()
+            curs.execute("SELECT ...")
+            rows = curs.fetchall()
+
+    Raises:
+        PoolTimeoutError: 풀의 모든 연결이 사용 중이고 대기 시간 초과 시
+        pymysql.Error: 데이터베이스 연결 실패 시
+    """
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+    except pymysql.OperationalError:
+        pool.discard(conn)
+        raise
+    except BaseException:
+        # release()가 열린 트랜잭션을 롤백하고, 롤백이 실패하면 연결을 폐기함
+        pool.release(conn)
+        raise
+    else:
+        pool.release(conn)
+
+
+def get_db() -> Iterator[pymysql.connections.Connection]:
+    """
+    FastAPI 의존성 주입용 연결 대여 함수
+
+    사용 예시:
+        @router.get("/")
+        async def handler(conn = Depends(get_db)):
+            ...
+    """
+    with get_connection() as conn:
+        yield conn
+
+
+def pool_stats() -> dict:
+    """커넥션 풀 지표 (크기, 사용 중, 대기 수, 대기 시간) 반환"""
+    return get_pool().stats()
+
+
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 커넥션 풀 도입
+#   - get_connection() 컨텍스트 매니저 / get_db() FastAPI 의존성 추가
+#   - 풀 설정 환경변수 (DB_POOL_*) 및 pool_stats() 지표 추가
+#   - connect_db()는 풀의 연결 생성 함수로 유지
@@ -0,0 +1,96 @@
+"""
+키셋(커서) 페이지네이션 헬퍼
+"전체 조회" API가 OFFSET 없이 pk 기준 WHERE pk > 커서 ORDER BY pk LIMIT n 으로
+페이지를 읽도록 하는 공통 함수 (페이지 크기와 무관하게 pk 인덱스 탐색 한 번)
+작성일: 2026-01-22
+작성자: 김택권
+
+사용 예시:
+    from ..database.pagination import fetch_page
+
+    @router.get("/select_menu")
+    async def select_all(after_seq: Optional[int] = None, limit: Optional[int] = None):
+        rows, next_cursor = await fetch_page(
+            "SELECT menu_seq, ... FROM menu", "menu_seq", after_seq, limit
+        )
+        return {"results": [...], "next_cursor": next_cursor}
+
+    - after_seq, limit 둘 다 없으면 기존처럼 전체 조회 (next_cursor는 None)
+    - 다음 페이지는 after_seq=next_cursor로 요청, next_cursor가 None이면 마지막 페이지
+"""
+
+import os
+from typing import Optional, Sequence, Tuple
+
+from .async_db import fetch_all
+
+# after_seq만 지정하고 limit을 생략했을 때의 페이지 크기
+DEFAULT_PAGE_LIMIT = int(os.getenv('DEFAULT_PAGE_LIMIT', '100'))
+
+# 한 페이지 최대 크기
+MAX_PAGE_LIMIT = int(os.getenv('MAX_PAGE_LIMIT', '1000'))
+
+
+async def fetch_page(
+    select_sql: str,
+    pk_column: str,
+    after_seq: Optional[int] = None,
+    limit: Optional[int] = None,
+    params: Sequence = (),
+    where: Optional[str] = None,
+) -> Tuple[tuple, Optional[int]]:
+    """
+    pk 기준 키셋 페이지 조회
+
+    Args:
+        select_sql: WHERE / ORDER BY 없는 SELECT ... FROM 문 (첫 번째 컬럼이 pk_column)
+        pk_column: 정렬 및 커서 기준 pk 컬럼 (예: "menu_seq")
+        after_seq: 이 값보다 큰 pk부터 조회 (None이면 처음부터)
+        limit: 페이지 크기 (1 ~ MAX_PAGE_LIMIT로 보정)
+        params: where 조건의 파라미터
+        where: 추가 WHERE 조건 (예: "store_seq = %s")
+
+    Returns:
+        (rows, next_cursor): next_cursor는 다음 페이지가 있을 때 마지막 행의 pk, 없으면 None
+    """
+    conditions = []
+    query_params = list(params)
+    if where:
+        conditions.append(f"({where})")
+    if after_seq is not None:
+        conditions.append(f"{pk_column} > %s")
+        query_params.append(after_seq)
+
+    sql = select_sql
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {pk_column}"
+
+    if after_seq is None and limit is None:
+        # 기존 클라이언트 호환: 페이지 파라미터가 없으면 전체 조회
+        return await fetch_all(sql, query_params), None
+
+    page_size = DEFAULT_PAGE_LIMIT if limit is None else max(1, min(limit, MAX_PAGE_LIMIT))
+    # 한 행 더 읽어 다음 페이지 존재 여부 확인
+    sql += " LIMIT %s"
+    query_params.append(page_size + 1)
+    rows = await fetch_all(sql, query_params)
+
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, rows[-1][0]
+    return rows, None
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 키셋 페이지네이션 공통 함수 (after_seq / limit / next_cursor)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - fetch_page(), DEFAULT_PAGE_LIMIT / MAX_PAGE_LIMIT 환경변수
@@ -0,0 +1,269 @@
+"""
+MySQL 커넥션 풀
+요청마다 pymysql.connect()로 TCP+인증 핸드셰이크를 반복하지 않도록
+연결을 재사용하는 스레드 안전한 고정 크기 풀
+작성일: 2026-01-22
+작성자: 김택권
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import pymysql
+from pymysql.constants.SERVER_STATUS import SERVER_STATUS_IN_TRANS
+
+
+class PoolTimeoutError(pymysql.OperationalError):
+    """풀의 모든 연결이 사용 중이고 대기 시간이 초과되었을 때 발생"""
+
+
+class _PooledConnection:
+    """풀이 관리하는 연결과 생성/마지막 사용 시각"""
+
+    __slots__ = ("conn", "created_at", "last_used_at")
+
+    def __init__(self, conn: pymysql.connections.Connection):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used_at = now
+
+
+class ConnectionPool:
+    """
+    pymysql 연결 풀
+
+    - max_size: 동시에 열 수 있는 최대 연결 수 (max_connections 고갈 방지)
+    - max_idle: 이 시간(초) 이상 쉬고 있던 연결은 폐기 후 새로 연결
+    - max_lifetime: 생성 후 이 시간(초)이 지난 연결은 반납 시 폐기 (서버 wait_timeout 대비)
+    - health_check_interval: 이 시간(초) 이상 쉬고 있던 연결은 대여 전 ping으로 확인
+    - acquire_timeout: 연결이 모두 사용 중일 때 최대 대기 시간(초)
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], pymysql.connections.Connection],
+        max_size: int = 10,
+        max_idle: float = 300.0,
+        max_lifetime: float = 1800.0,
+        health_check_interval: float = 30.0,
+        acquire_timeout: float = 10.0,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size는 1 이상이어야 합니다.")
+
+        self._factory = factory
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+
+        self._idle: deque = deque()
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+        # 지표 (pool.stats()로 조회)
+        self._borrow_count = 0
+        self._created_count = 0
+        self._discarded_count = 0
+        self._timeout_count = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    # ============================================
+    # 대여 / 반납
+    # ============================================
+    def acquire(self, timeout: Optional[float] = None) -> pymysql.connections.Connection:
+        """
+        풀에서 연결을 대여 (없으면 새로 생성, 최대 크기면 대기)
+
+        Args:
+            timeout: 최대 대기 시간(초), None이면 acquire_timeout 사용
+
+        Returns:
+            pymysql.Connection: 사용 가능한 연결
+
+        Raises:
+            PoolTimeoutError: 대기 시간 초과 시
+            pymysql.Error: 새 연결 생성 실패 시
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            item = None
+            create = False
+            with self._cond:
+                if self._closed:
+                    raise pymysql.OperationalError("Connection pool is closed")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeout_count += 1
+                        raise PoolTimeoutError(
+                            f"Connection pool exhausted (max_size={self.max_size}, timeout={timeout}s)"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._idle:
+                    # 가장 최근에 반납된 연결부터 사용 (오래 쉰 연결은 자연스럽게 만료)
+                    item = self._idle.pop()
+                else:
+                    # 자리를 먼저 예약하고 락 밖에서 연결 (핸드셰이크 동안 다른 요청을 막지 않음)
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    item = _PooledConnection(self._factory())
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._created_count += 1
+            elif not self._is_usable(item):
+                self._discard(item)
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._in_use[id(item.conn)] = item
+                self._borrow_count += 1
+                self._wait_time_total += waited
+                if waited > self._wait_time_max:
+                    self._wait_time_max = waited
+            return item.conn
+
+    def release(self, conn: pymysql.connections.Connection) -> None:
+        """
+        대여한 연결을 풀에 반납
+
+        - 열려 있는 트랜잭션은 롤백하여 다음 사용자에게 스냅샷/락이 넘어가지 않도록 함
+        - max_lifetime이 지났거나 상태가 비정상이면 폐기
+        """
+        with self._cond:
+            item = self._in_use.pop(id(conn), None)
+        if item is None:
+            # 풀에서 대여하지 않은 연결은 그냥 닫음
+            self._close_quietly(conn)
+            return
+
+        now = time.monotonic()
+        reusable = (
+            not self._closed
+            and conn.open
+            and now - item.created_at < self.max_lifetime
+        )
+        if reusable:
+            try:
+                if conn.server_status & SERVER_STATUS_IN_TRANS:
+                    conn.rollback()
+            except Exception:
+                reusable = False
+
+        if not reusable:
+            self._discard(item)
+            return
+
+        item.last_used_at = now
+        with self._cond:
+            self._idle.append(item)
+            self._cond.notify()
+
+    def discard(self, conn: pymysql.connections.Connection) -> None:
+        """오류가 발생한 연결을 재사용하지 않고 폐기"""
+        with self._cond:
+            item = self._in_use.pop(id(conn), None)
+        if item is None:
+            self._close_quietly(conn)
+            return
+        self._discard(item)
+
+    def close(self) -> None:
+        """유휴 연결을 모두 닫고 풀을 종료 (사용 중인 연결은 반납 시 닫힘)"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for item in idle:
+            self._close_quietly(item.conn)
+
+    # ============================================
+    # 지표
+    # ============================================
+    def stats(self) -> Dict:
+        """풀 크기 및 대기 시간 지표 반환"""
+        with self._cond:
+            borrows = self._borrow_count
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "borrow_count": borrows,
+                "created_count": self._created_count,
+                "discarded_count": self._discarded_count,
+                "timeout_count": self._timeout_count,
+                "wait_time_avg_ms": round(self._wait_time_total / borrows * 1000, 3) if borrows else 0.0,
+                "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+            }
+
+    # ============================================
+    # 내부 함수
+    # ============================================
+    def _is_usable(self, item: _PooledConnection) -> bool:
+        """유휴 연결이 재사용 가능한지 확인 (만료 및 헬스 체크)"""
+        now = time.monotonic()
+        idle_for = now - item.last_used_at
+        if idle_for >= self.max_idle or now - item.created_at >= self.max_lifetime:
+            return False
+        if idle_for >= self.health_check_interval:
+            try:
+                item.conn.ping(reconnect=False)
+            except Exception:
+                return False
+        return True
+
+    def _discard(self, item: _PooledConnection) -> None:
+        self._close_quietly(item.conn)
+        with self._cond:
+            self._size -= 1
+            self._discarded_count += 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(conn: pymysql.connections.Connection) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: MySQL 커넥션 풀 - 최대 크기 제한, 헬스 체크, max_idle/max_lifetime 재활용, 풀 지표
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - ConnectionPool 클래스 (acquire/release/discard/close/stats)
+#   - 반납 시 열린 트랜잭션 롤백 (REPEATABLE READ 스냅샷이 다음 요청에 남지 않도록)
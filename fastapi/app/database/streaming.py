@@ -0,0 +1,172 @@
+"""
+대용량 조회 스트리밍
+서버 측(unbuffered) 커서로 결과를 조금씩 읽어 async generator로 흘려보내는 헬퍼
+전체 결과를 메모리에 올리지 않으므로 수백만 행 내보내기도 일정한 메모리로 처리
+작성일: 2026-01-22
+작성자: 김택권
+
+사용 예시:
+    from ..database.streaming import stream_rows, StreamLimitError
+
+    try:
+        rows = stream_rows("SELECT ... FROM pay WHERE created_at >= %s", (start,))
+    except StreamLimitError as e:
+        return JSONResponse({"result": "Error", "errorMsg": str(e)}, status_code=503)
+    async for row in rows:
+        ...
+
+주의:
+    - 스트리밍 동안 연결을 계속 점유하므로 커넥션 풀을 쓰지 않고 전용 연결을 엽니다
+      → 워커당 동시 스트리밍은 STREAM_MAX_CONCURRENT개까지, 넘으면 stream_rows()가 StreamLimitError
+    - 소비하는 쪽이 다음 행을 요청할 때만 다음 묶음을 읽음 (느린 클라이언트 = 느린 읽기)
+    - 중간에 끊기면(클라이언트 연결 종료 등) 연결을 닫아 서버 측 커서를 정리
+      (다른 스레드에서 읽는 중이면 그 읽기가 끝난 뒤 닫음)
+"""
+
+import asyncio
+import os
+from typing import AsyncIterator, Optional, Sequence
+
+import pymysql
+
+from .connection import connect_db
+
+# 한 번에 서버에서 읽어올 행 수
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '1000'))
+
+# 워커당 동시 스트리밍 최대 수 (스트리밍마다 풀 밖의 MySQL 연결을 하나씩 사용)
+STREAM_MAX_CONCURRENT = int(os.getenv('STREAM_MAX_CONCURRENT', '4'))
+
+_active_streams = 0
+
+
+class StreamLimitError(Exception):
+    """동시 스트리밍 수 초과 (잠시 후 다시 요청)"""
+    pass
+
+
+def stream_rows(
+    sql: str,
+    params: Optional[Sequence] = None,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> AsyncIterator[tuple]:
+    """
+    SELECT 결과를 서버 측 커서(SSCursor)로 batch_size행씩 읽어 한 행씩 반환하는 async iterator
+
+    - 호출 시점에 동시 스트리밍 자리를 하나 차지하고, 다 읽거나 닫히면(또는 버려지면) 반납
+
+    Args:
+        sql: SELECT 문
+        params: 쿼리 파라미터
+        batch_size: 한 번에 읽을 행 수
+
+    Returns:
+        AsyncIterator[tuple]: 결과 행
+
+    Raises:
+        StreamLimitError: 이미 STREAM_MAX_CONCURRENT개가 스트리밍 중
+    """
+    global _active_streams
+    if _active_streams >= STREAM_MAX_CONCURRENT:
+        raise StreamLimitError(f"동시에 내보낼 수 있는 요청 수({STREAM_MAX_CONCURRENT}개)를 넘었습니다. 잠시 후 다시 시도하세요.")
+    _active_streams += 1
+    return _RowStream(_iter_rows(sql, params, batch_size))
+
+
+def active_streams() -> int:
+    """현재 워커의 스트리밍 수"""
+    return _active_streams
+
+
+class _RowStream:
+    """_iter_rows를 감싸 동시 스트리밍 자리를 한 번만 반납"""
+
+    def __init__(self, rows: AsyncIterator[tuple]):
+        self._rows = rows
+        self._released = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> tuple:
+        try:
+            return await self._rows.__anext__()
+        except BaseException:
+            # 끝까지 읽음(StopAsyncIteration), 오류, 취소
+            self._release()
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await self._rows.aclose()
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        global _active_streams
+        if not self._released:
+            self._released = True
+            _active_streams -= 1
+
+    def __del__(self):
+        # 한 번도 읽지 않고 버려진 경우 (응답을 만들기 전 오류 등)
+        self._release()
+
+
+async def _iter_rows(sql: str, params: Optional[Sequence], batch_size: int) -> AsyncIterator[tuple]:
+    conn = None
+    pending = None
+    try:
+        # 스레드 작업은 shield로 감싸 취소되어도 끝까지 실행되게 하고, 연결은 그 뒤에 닫음
+        pending = asyncio.ensure_future(asyncio.to_thread(connect_db))
+        conn = await asyncio.shield(pending)
+        curs = conn.cursor(pymysql.cursors.SSCursor)
+        pending = asyncio.ensure_future(asyncio.to_thread(curs.execute, sql, params))
+        await asyncio.shield(pending)
+        while True:
+            pending = asyncio.ensure_future(asyncio.to_thread(curs.fetchmany, batch_size))
+            rows = await asyncio.shield(pending)
+            if not rows:
+                break
+            for row in rows:
+                yield row
+    finally:
+        # 다 읽지 않은 서버 측 커서가 남아 있어도 연결을 닫으면 정리됨
+        if pending is not None and not pending.done():
+            pending.add_done_callback(lambda future: _close_after(future, conn))
+        else:
+            _close_quietly(conn)
+
+
+def _close_after(future: "asyncio.Future", conn) -> None:
+    """진행 중이던 스레드 작업이 끝난 뒤 연결 닫기 (연결 중이었으면 만들어진 연결을 닫음)"""
+    if conn is None and not future.cancelled() and future.exception() is None:
+        conn = future.result()
+    _close_quietly(conn)
+
+
+def _close_quietly(conn) -> None:
+    if conn is None:
+        return
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 서버 측 커서(SSCursor) 기반 조회 스트리밍 (stream_rows)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - STREAM_BATCH_SIZE 환경변수
+#
+# 2026-01-22 김택권: 동시 스트리밍 제한 / 끊김 시 연결 정리 수정
+#   - STREAM_MAX_CONCURRENT 환경변수, 초과 시 StreamLimitError (내보내기 API는 503)
+#   - 클라이언트가 끊겨도 스레드에서 진행 중인 execute / fetchmany가 끝난 뒤 연결 종료
@@ -5,6 +5,7 @@ Table Now FastAPI 메인 애플리케이션
 작성자: 김택권
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -15,13 +16,48 @@ import os
 env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
 load_dotenv(dotenv_path=env_path)
 
-# 데이터베이스 연결 (필요시 주석 해제)
-# from app.database.connection import connect_db
+# 데이터베이스 커넥션 풀
+from app.database.connection import get_connection, close_pool, pool_stats
+from app.database.async_db import shutdown_executor, executor_stats
+from app.utils.catalog_cache import catalog_cache
+from app.utils.http_client import close_http_client
+from app.utils.push_outbox import push_outbox_worker
+from app.utils.email_queue import email_queue
+from app.utils.password_hasher import shutdown_hash_pool
+from app.utils.occupancy_hub import occupancy_hub
+from app.utils.image_store import image_store, shutdown_image_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 시작/종료 처리"""
+    # 푸시 알림 발송 대기열 워커 (PUSH_OUTBOX_WORKERS=0이면 시작하지 않음)
+    push_outbox_worker.start()
+    # 이메일 발송 대기열 워커 (SMTP 연결 재사용)
+    email_queue.start()
+    # 점유 현황 이벤트 워커 간 전파 (OCCUPANCY_REDIS_URL이 없으면 워커 내에서만 전달)
+    await occupancy_hub.start()
+    yield
+    await occupancy_hub.stop()
+    await push_outbox_worker.stop()
+    # 대기 중인 이메일 발송 후 SMTP 연결 종료
+    email_queue.stop()
+    # 외부 API keep-alive 연결 정리
+    await close_http_client()
+    # 비밀번호 해시 프로세스 풀 종료
+    shutdown_hash_pool()
+    # 이미지 축소본 생성 프로세스 풀 종료
+    shutdown_image_pool()
+    # 종료 시 DB 스레드 풀 작업 완료 대기 후 풀의 유휴 연결 정리
+    shutdown_executor()
+    close_pool()
+
 
 app = FastAPI(
     title="Table Now API",
     description="Table Now 애플리케이션을 위한 REST API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정 (Flutter 앱과 통신을 위해 필요)
@@ -42,7 +78,7 @@ app.add_middleware(
 # app.include_router(example_router.router, prefix="/api/example", tags=["example"])
 
 # API 라우터 import 및 등록
-from app.api import customer, weather, menu, option, store, reserve, store_table, push_debug, payment
+from app.api import customer, weather, menu, option, store, reserve, store_table, push_debug, payment, sales, image
 
 # Customer API 라우터 등록
 app.include_router(customer.router, prefix="/api/customer", tags=["customer"])
@@ -68,6 +104,12 @@ app.include_router(payment.router, prefix="/api/pay", tags=["pay"])
 # StoreTable API 라우터 등록 : 이예은
 app.include_router(store_table.router, prefix="/api/store_table", tags=["store_table"])
 
+# Sales API 라우터 등록 (매출 리포트) : 김택권
+app.include_router(sales.router, prefix="/api/sales", tags=["sales"])
+
+# Image API 라우터 등록 (메뉴 / 식당 이미지 제공) : 김택권
+app.include_router(image.router, prefix="/api/image", tags=["image"])
+
 # Push Debug API 라우터 등록 (테스트용) : 김택권
 app.include_router(push_debug.router, prefix="/api", tags=["push_debug"])
 
@@ -80,6 +122,7 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
+            "health_db": "/health/db",
             "docs": "/docs",
             "redoc": "/redoc"
         }
@@ -103,6 +146,17 @@ async def health_check():
     }
 
 
+@app.get("/health/db")
+def health_check_db():
+    """데이터베이스 헬스 체크 - 풀에서 연결을 대여해 ping 후 풀 지표 반환"""
+    try:
+        with get_connection() as conn:
+            conn.ping(reconnect=False)
+        return {"status": "healthy", "database": "connected", "pool": pool_stats(), "executor": executor_stats(), "catalog_cache": catalog_cache.stats(), "occupancy": occupancy_hub.stats(), "images": image_store.stats()}
+    except Exception as e:
+        return {"status": "unhealthy", "error": str(e), "pool": pool_stats(), "executor": executor_stats(), "catalog_cache": catalog_cache.stats(), "occupancy": occupancy_hub.stats(), "images": image_store.stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -142,4 +196,37 @@ if __name__ == "__main__":
 #
 # 2026-01-17 김택권: Push Debug API 라우터 등록
 #   - Push Debug API 라우터 등록 (/api/debug/push)
-#   - FCM 단발 푸시 테스트용 엔드포인트 추가
\ No newline at end of file
+#   - FCM 단발 푸시 테스트용 엔드포인트 추가
+#
+# 2026-01-22 김택권: 커넥션 풀 연동
+#   - GET /health/db 추가 (DB ping + 풀 크기/대기 시간 지표)
+#   - lifespan 종료 시 close_pool() 호출
+# 2026-01-22 김택권: 비동기 DB 계층 연동
+#   - /health/db 응답에 DB 스레드 풀 지표(executor) 추가
+#   - lifespan 종료 시 shutdown_executor() 호출
+#
+# 2026-01-22 김택권: 카탈로그 캐시 지표 연동
+#   - /health/db 응답에 catalog_cache 적중률 추가
+#
+# 2026-01-22 김택권: 공용 HTTP 클라이언트 종료 연동
+#   - lifespan 종료 시 close_http_client() 호출
+#
+# 2026-01-22 김택권: 푸시 발송 대기열 워커 연동
+#   - lifespan 시작 시 push_outbox_worker.start(), 종료 시 stop()
+#
+# 2026-01-22 김택권: 이메일 발송 대기열 워커 연동
+#   - lifespan 시작 시 email_queue.start(), 종료 시 stop()
+#
+# 2026-01-22 김택권: 비밀번호 해시 프로세스 풀 종료 연동
+#   - lifespan 종료 시 shutdown_hash_pool() 호출
+#
+# 2026-01-22 김택권: 매출 리포트 라우터 등록
+#   - /api/sales (sales_daily 집계 기반 일별 / 메뉴별 매출)
+#
+# 2026-01-22 김택권: 점유 현황 실시간 구독 허브 연동
+#   - lifespan 시작 시 occupancy_hub.start() (선택적 Redis 전파), 종료 시 stop()
+#   - /health/db 응답에 occupancy 구독 지표 추가
+#
+# 2026-01-22 김택권: 이미지 API 라우터 등록
+#   - /api/image (파일명 기반 이미지 제공, 너비별 축소본)
+#   - lifespan 종료 시 shutdown_image_pool() 호출, /health/db 응답에 images 지표 추가
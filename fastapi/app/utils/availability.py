@@ -0,0 +1,407 @@
+"""
+테이블 예약 가능 여부 엔진
+reserve / store_table 데이터로 식당별·날짜별 테이블 점유 구간 인덱스를 메모리에 유지하고
+"T 시각에 N명이 앉을 수 있는 테이블" 조회에 응답
+작성일: 2026-01-22
+작성자: 김택권
+
+동작 방식:
+    - 예약 하나는 reserve_date부터 RESERVE_SLOT_MINUTES 동안 reserve_tables의 각 테이블을 점유
+      (reserve_tables는 store_table_seq의 comma-separated 목록)
+    - (store_seq, 날짜) 단위로 처음 조회될 때 DB에서 읽어 인덱스를 만들고,
+      이후 예약 추가/수정/삭제 시 API에서 증분 반영
+    - 읽은 지 AVAILABILITY_TTL초가 지난 날짜 / 테이블 목록은 다음 조회 때 DB에서 다시 읽음
+      (다른 워커 프로세스의 쓰기나 DB 직접 수정은 최대 AVAILABILITY_TTL초 늦게 반영)
+    - 테이블별 점유 구간은 시작 시각 기준 정렬 리스트로 유지하고 bisect로 겹침 검사
+
+사용 예시:
+    from ..utils.availability import availability_index
+
+    tables = await availability_index.find_available(store_seq, reserve_date, capacity)
+    availability_index.upsert_reserve(reserve_seq, store_seq, reserve_tables, reserve_date, payment_status)
+    availability_index.remove_reserve(reserve_seq)
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_right, insort
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..database.async_db import run_db
+
+# 예약 1건이 테이블을 점유하는 시간 (분, 앱의 예약 시간표가 1시간 단위)
+RESERVE_SLOT_MINUTES = int(os.getenv('RESERVE_SLOT_MINUTES', '60'))
+
+# 메모리에 유지할 (식당, 날짜) 인덱스 최대 개수 (초과 시 가장 오래 안 쓴 것부터 제거)
+AVAILABILITY_MAX_DAYS = int(os.getenv('AVAILABILITY_MAX_DAYS', '2048'))
+
+# 읽은 지 이 시간(초)이 지난 날짜 인덱스 / 테이블 목록은 다음 조회 때 다시 읽음 (0 이하면 다시 읽지 않음)
+AVAILABILITY_TTL = float(os.getenv('AVAILABILITY_TTL', '30'))
+
+# 테이블을 점유하지 않는 결제 상태 (Toss 결제 상태 기준)
+RELEASED_PAYMENT_STATUSES = {'CANCELED', 'PARTIAL_CANCELED', 'ABORTED', 'EXPIRED'}
+
+_MAX_SEQ = 2 ** 63
+
+
+def parse_reserve_date(value: Union[str, datetime]) -> datetime:
+    """'YYYY-MM-DD HH:MM:SS' / ISO 문자열 또는 datetime을 datetime으로 변환"""
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    return datetime.fromisoformat(str(value).strip()).replace(tzinfo=None)
+
+
+def parse_reserve_tables(value: Optional[str]) -> List[int]:
+    """'1,2,3' 형식의 reserve_tables를 store_table_seq 리스트로 변환 (숫자가 아닌 항목은 무시)"""
+    if not value:
+        return []
+    seqs = []
+    for part in str(value).split(','):
+        part = part.strip()
+        if part.isdigit():
+            seqs.append(int(part))
+    return seqs
+
+
+class _DayIndex:
+    """한 식당의 하루치 테이블 점유 구간 (시작 시각이 그 날짜인 예약)"""
+
+    __slots__ = ("by_table", "loaded_at")
+
+    def __init__(self):
+        # store_table_seq -> [(시작 시각, reserve_seq), ...] 시작 시각 순 정렬
+        self.by_table: Dict[int, List[Tuple[datetime, int]]] = {}
+        # DB에서 읽은 시각 (time.monotonic 기준, TTL 만료 판단용)
+        self.loaded_at = time.monotonic()
+
+    def add(self, table_seq: int, start: datetime, reserve_seq: int) -> None:
+        insort(self.by_table.setdefault(table_seq, []), (start, reserve_seq))
+
+    def remove(self, table_seq: int, start: datetime, reserve_seq: int) -> None:
+        intervals = self.by_table.get(table_seq)
+        if not intervals:
+            return
+        try:
+            intervals.remove((start, reserve_seq))
+        except ValueError:
+            return
+        if not intervals:
+            del self.by_table[table_seq]
+
+    def occupied(self, start: datetime, slot: timedelta) -> set:
+        """[start, start + slot) 구간과 겹치는 예약이 있는 테이블 집합"""
+        # 모든 구간의 길이가 slot으로 같으므로 시작 시각이 (start - slot, start + slot) 안이면 겹침
+        lower = (start - slot, _MAX_SEQ)
+        upper = start + slot
+        result = set()
+        for table_seq, intervals in self.by_table.items():
+            i = bisect_right(intervals, lower)
+            if i < len(intervals) and intervals[i][0] < upper:
+                result.add(table_seq)
+        return result
+
+
+class AvailabilityIndex:
+    """
+    식당별·날짜별 테이블 점유 구간 인덱스
+
+    - 조회는 메모리 인덱스만 사용 (해당 날짜를 처음 조회할 때만 DB 읽기)
+    - 쓰기 API는 DB 커밋 후 upsert_reserve / remove_reserve / invalidate_tables로 인덱스를 갱신
+    - 로딩 중에 같은 날짜에 쓰기가 반영되면 로딩 결과를 버리고 다음 조회 때 다시 읽음
+    - ttl초가 지난 날짜 / 테이블 목록은 다시 읽음 (다른 워커의 쓰기 반영, 다시 읽는 동안은 이전 인덱스로 응답)
+    """
+
+    def __init__(self, slot_minutes: int = RESERVE_SLOT_MINUTES, max_days: int = AVAILABILITY_MAX_DAYS,
+                 ttl: float = AVAILABILITY_TTL):
+        self.slot = timedelta(minutes=slot_minutes)
+        self.max_days = max_days
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (store_seq, date) -> _DayIndex
+        self._days: "OrderedDict[Tuple[int, date], _DayIndex]" = OrderedDict()
+        # store_seq -> {store_table_seq: (store_table_name, store_table_capacity)}
+        self._tables: Dict[int, Dict[int, Tuple[int, int]]] = {}
+        # store_seq -> 테이블 목록을 읽은 시각 (time.monotonic 기준)
+        self._tables_loaded_at: Dict[int, float] = {}
+        # reserve_seq -> (store_seq, 시작 시각, [store_table_seq, ...]) (증분 수정/삭제용)
+        self._reserves: Dict[int, Tuple[int, datetime, List[int]]] = {}
+        # 로딩 중 쓰기 감지용 세대 번호
+        self._day_generation: Dict[Tuple[int, date], int] = {}
+        self._table_generation: Dict[int, int] = {}
+
+    # ============================================
+    # 조회
+    # ============================================
+    async def find_available(self, store_seq: int, reserve_date: Union[str, datetime], capacity: int = 1) -> Dict:
+        """
+        reserve_date 시각에 capacity명이 앉을 수 있는 빈 테이블 조회
+
+        Returns:
+            dict: tables(수용 인원 >= capacity인 빈 테이블), free_tables(모든 빈 테이블),
+                  total_free_capacity(빈 테이블 수용 인원 합계)
+        """
+        start = parse_reserve_date(reserve_date)
+        await self._ensure_loaded(store_seq, start)
+        with self._lock:
+            return self._find_available_locked(store_seq, start, capacity)
+
+    def _find_available_locked(self, store_seq: int, start: datetime, capacity: int) -> Dict:
+        tables = self._tables.get(store_seq, {})
+        occupied = set()
+        for day in self._days_for(start):
+            day_index = self._days.get((store_seq, day))
+            if day_index is not None:
+                self._days.move_to_end((store_seq, day))
+                occupied |= day_index.occupied(start, self.slot)
+
+        free_tables = [
+            {
+                'store_table_seq': table_seq,
+                'store_table_name': name,
+                'store_table_capacity': table_capacity,
+            }
+            for table_seq, (name, table_capacity) in sorted(tables.items())
+            if table_seq not in occupied
+        ]
+        return {
+            'tables': [t for t in free_tables if t['store_table_capacity'] >= capacity],
+            'free_tables': free_tables,
+            'total_free_capacity': sum(t['store_table_capacity'] for t in free_tables),
+        }
+
+    # ============================================
+    # 증분 갱신 (DB 커밋 후 호출)
+    # ============================================
+    def upsert_reserve(
+        self,
+        reserve_seq: int,
+        store_seq: int,
+        reserve_tables: Optional[str],
+        reserve_date: Union[str, datetime],
+        payment_status: Optional[str] = None,
+    ) -> None:
+        """예약 추가/수정 반영 (취소된 결제 상태면 점유 해제)"""
+        start = parse_reserve_date(reserve_date)
+        with self._lock:
+            self._remove_locked(reserve_seq)
+            key = (store_seq, start.date())
+            self._bump_day(key)
+            if payment_status in RELEASED_PAYMENT_STATUSES:
+                return
+            day_index = self._days.get(key)
+            if day_index is None:
+                # 아직 로딩되지 않은 날짜는 조회 시 DB에서 읽으므로 반영할 필요 없음
+                return
+            table_seqs = parse_reserve_tables(reserve_tables)
+            for table_seq in table_seqs:
+                day_index.add(table_seq, start, reserve_seq)
+            self._reserves[reserve_seq] = (store_seq, start, table_seqs)
+
+    def remove_reserve(self, reserve_seq: int) -> None:
+        """예약 삭제 반영"""
+        with self._lock:
+            self._remove_locked(reserve_seq)
+
+    async def refresh_reserve(self, reserve_seq: int) -> Optional[tuple]:
+        """
+        DB에서 예약 한 건을 다시 읽어 반영 (일부 컬럼만 수정하는 API용)
+
+        Returns:
+            tuple: 다시 읽은 (store_seq, reserve_tables, reserve_date, payment_status), 예약이 없으면 None
+        """
+        row = await run_db(_select_reserve, reserve_seq)
+        if row is None:
+            self.remove_reserve(reserve_seq)
+        else:
+            self.upsert_reserve(reserve_seq, row[0], row[1], row[2], row[3])
+        return row
+
+    def invalidate_tables(self, store_seq: Optional[int] = None) -> None:
+        """store_table 변경 반영 (store_seq가 None이면 모든 식당)"""
+        with self._lock:
+            targets = list(self._tables) if store_seq is None else [store_seq]
+            for seq in targets:
+                self._tables.pop(seq, None)
+                self._tables_loaded_at.pop(seq, None)
+                self._table_generation[seq] = self._table_generation.get(seq, 0) + 1
+            if store_seq is None:
+                self._table_generation[None] = self._table_generation.get(None, 0) + 1
+
+    def clear(self) -> None:
+        """인덱스 전체 초기화"""
+        with self._lock:
+            self._days.clear()
+            self._tables.clear()
+            self._tables_loaded_at.clear()
+            self._reserves.clear()
+            self._day_generation.clear()
+            self._table_generation.clear()
+
+    def stats(self) -> Dict:
+        """인덱스 크기 지표"""
+        with self._lock:
+            return {
+                'days': len(self._days),
+                'stores': len(self._tables),
+                'reserves': len(self._reserves),
+                'slot_minutes': int(self.slot.total_seconds() // 60),
+                'ttl': self.ttl,
+            }
+
+    # ============================================
+    # 내부 함수
+    # ============================================
+    def _days_for(self, start: datetime) -> List[date]:
+        """start 시각의 점유 검사에 필요한 날짜 (직전 예약이 자정을 넘기는 경우 포함)"""
+        days = [(start - self.slot).date(), start.date(), (start + self.slot).date()]
+        return sorted(set(days))
+
+    def _remove_locked(self, reserve_seq: int) -> None:
+        entry = self._reserves.pop(reserve_seq, None)
+        if entry is None:
+            return
+        store_seq, start, table_seqs = entry
+        key = (store_seq, start.date())
+        self._bump_day(key)
+        day_index = self._days.get(key)
+        if day_index is not None:
+            for table_seq in table_seqs:
+                day_index.remove(table_seq, start, reserve_seq)
+
+    def _bump_day(self, key: Tuple[int, date]) -> None:
+        self._day_generation[key] = self._day_generation.get(key, 0) + 1
+
+    def _expired(self, loaded_at: float, now: float) -> bool:
+        return self.ttl > 0 and now - loaded_at > self.ttl
+
+    async def _ensure_loaded(self, store_seq: int, start: datetime) -> None:
+        with self._lock:
+            now = time.monotonic()
+            load_tables = (store_seq not in self._tables
+                           or self._expired(self._tables_loaded_at.get(store_seq, now), now))
+            table_generation = (self._table_generation.get(store_seq, 0), self._table_generation.get(None, 0))
+            missing = [
+                day for day in self._days_for(start)
+                if (store_seq, day) not in self._days or self._expired(self._days[(store_seq, day)].loaded_at, now)
+            ]
+            day_generations = {day: self._day_generation.get((store_seq, day), 0) for day in missing}
+
+        if not load_tables and not missing:
+            return
+
+        loading_since = time.monotonic()
+        tables, reserves = await run_db(_load_store_days, store_seq, load_tables, missing)
+
+        with self._lock:
+            if load_tables and table_generation == (
+                self._table_generation.get(store_seq, 0), self._table_generation.get(None, 0)
+            ):
+                self._tables[store_seq] = tables
+                self._tables_loaded_at[store_seq] = loading_since
+
+            for day in missing:
+                key = (store_seq, day)
+                if self._day_generation.get(key, 0) != day_generations[day]:
+                    # 로딩 중에 쓰기가 있었으면 이번 결과는 버림 (다음 조회 때 다시 로딩)
+                    continue
+                old_index = self._days.get(key)
+                if old_index is not None:
+                    if old_index.loaded_at >= loading_since:
+                        # 동시에 다시 읽은 다른 요청이 먼저 반영함
+                        continue
+                    self._forget_day_locked(key, old_index)
+                day_index = _DayIndex()
+                day_index.loaded_at = loading_since
+                for reserve_seq, reserve_tables, reserve_date, payment_status in reserves.get(day, []):
+                    if payment_status in RELEASED_PAYMENT_STATUSES:
+                        continue
+                    table_seqs = parse_reserve_tables(reserve_tables)
+                    for table_seq in table_seqs:
+                        day_index.add(table_seq, reserve_date, reserve_seq)
+                    self._reserves[reserve_seq] = (store_seq, reserve_date, table_seqs)
+                self._days[key] = day_index
+
+            while len(self._days) > self.max_days:
+                self._evict_oldest_locked()
+
+    def _evict_oldest_locked(self) -> None:
+        key, day_index = self._days.popitem(last=False)
+        self._day_generation.pop(key, None)
+        self._forget_day_locked(key, day_index)
+
+    def _forget_day_locked(self, key: Tuple[int, date], day_index: _DayIndex) -> None:
+        """날짜 인덱스에 속한 예약을 _reserves에서 제거 (그 사이 다른 날짜로 옮겨 반영된 예약은 유지)"""
+        for intervals in day_index.by_table.values():
+            for start, reserve_seq in intervals:
+                entry = self._reserves.get(reserve_seq)
+                if entry is not None and (entry[0], entry[1].date()) == key:
+                    self._reserves.pop(reserve_seq, None)
+
+
+def _select_reserve(conn, reserve_seq: int) -> Optional[tuple]:
+    curs = conn.cursor()
+    curs.execute("""
+        SELECT store_seq, reserve_tables, reserve_date, payment_status
+        FROM reserve
+        WHERE reserve_seq = %s
+    """, (reserve_seq,))
+    return curs.fetchone()
+
+
+def _load_store_days(conn, store_seq: int, load_tables: bool, days: List[date]) -> Tuple[Dict, Dict]:
+    """식당의 테이블 목록과 지정 날짜들의 예약을 한 번의 연결로 읽기"""
+    curs = conn.cursor()
+    tables = {}
+    if load_tables:
+        curs.execute("""
+            SELECT store_table_seq, store_table_name, store_table_capacity
+            FROM store_table
+            WHERE store_seq = %s
+        """, (store_seq,))
+        for row in curs.fetchall():
+            tables[row[0]] = (row[1], row[2])
+
+    reserves: Dict[date, List[tuple]] = {}
+    if days:
+        start = datetime.combine(min(days), datetime.min.time())
+        end = datetime.combine(max(days) + timedelta(days=1), datetime.min.time())
+        curs.execute("""
+            SELECT reserve_seq, reserve_tables, reserve_date, payment_status
+            FROM reserve
+            WHERE store_seq = %s
+            AND reserve_date >= %s AND reserve_date < %s
+        """, (store_seq, start, end))
+        wanted = set(days)
+        for row in curs.fetchall():
+            day = row[2].date()
+            if day in wanted:
+                reserves.setdefault(day, []).append(row)
+    return tables, reserves
+
+
+# 프로세스 전역 인덱스
+availability_index = AvailabilityIndex()
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 테이블 예약 가능 여부 엔진 - 식당별·날짜별 점유 구간 인덱스, 예약 쓰기 시 증분 갱신
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - AvailabilityIndex (find_available / upsert_reserve / remove_reserve / refresh_reserve / invalidate_tables)
+#   - RESERVE_SLOT_MINUTES, AVAILABILITY_MAX_DAYS 환경변수
+#
+# 2026-01-22 김택권: refresh_reserve가 다시 읽은 예약 행 반환 (점유 현황 이벤트 발행용)
+#
+# 2026-01-22 김택권: AVAILABILITY_TTL 추가
+#   - 읽은 지 TTL초가 지난 날짜 인덱스 / 테이블 목록은 다음 조회 때 DB에서 다시 읽음
+#   - 여러 워커 프로세스나 DB 직접 수정 시 다른 곳의 예약이 계속 빈 테이블로 보이던 문제
@@ -0,0 +1,340 @@
+"""
+식당 / 메뉴 / 옵션 카탈로그 캐시
+자주 읽히고 드물게 바뀌는 카탈로그 조회 결과를 TTL 캐시에 두고,
+insert / update / delete API에서 관련 키를 명시적으로 무효화
+작성일: 2026-01-22
+작성자: 김택권
+
+백엔드:
+    - 기본: 프로세스 내 LRU (CATALOG_CACHE_MAX_ENTRIES 개, CATALOG_CACHE_TTL 초)
+    - 선택: Redis 호환 서버 (CATALOG_CACHE_REDIS_URL 설정 + redis 패키지 설치 시)
+      여러 워커/서버가 캐시와 무효화를 공유합니다
+
+사용 예시:
+    from ..utils.catalog_cache import catalog_cache, menus_key
+
+    async def _load():
+        rows = await fetch_all(...)
+        return {"results": [...]}
+
+    return await catalog_cache.get_or_load(menus_key(store_seq), _load)
+
+    # 쓰기 API에서
+    await catalog_cache.invalidate(menus_key(store_seq))
+
+무효화와 적재가 겹칠 때:
+    - 키마다 세대(generation) 번호를 두고 invalidate()가 올림
+    - 적재 시작 전에 읽은 세대가 저장 시점에 바뀌었으면 저장하지 않음
+      (무효화 전에 읽은 이전 값이 TTL 동안 다시 캐시되는 것을 방지)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    # redis 패키지가 없으면 프로세스 내 캐시만 사용
+    redis_asyncio = None
+
+# 캐시 유지 시간 (초)
+CATALOG_CACHE_TTL = float(os.getenv('CATALOG_CACHE_TTL', '300'))
+
+# 프로세스 내 캐시 최대 항목 수 (초과 시 가장 오래 안 쓴 항목부터 제거)
+CATALOG_CACHE_MAX_ENTRIES = int(os.getenv('CATALOG_CACHE_MAX_ENTRIES', '1024'))
+
+# Redis 호환 서버 URL (예: redis://localhost:6379/0), 비어 있으면 프로세스 내 캐시 사용
+CATALOG_CACHE_REDIS_URL = os.getenv('CATALOG_CACHE_REDIS_URL', '')
+
+_KEY_PREFIX = "tablenow:catalog:"
+
+# Redis 세대 번호 키 접두어 / 유지 시간 (초, 진행 중인 적재보다 충분히 길면 됨)
+_GEN_PREFIX = _KEY_PREFIX + "gen:"
+_GEN_TTL = 24 * 3600
+
+# 세대 번호가 같을 때만 저장 (KEYS: 값 키, 세대 키 / ARGV: 적재 전 세대, 값, 유지 시간 ms)
+_SET_IF_GENERATION = """
+local current = redis.call('GET', KEYS[2]) or '0'
+if current ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'PX', ARGV[3])
+return 1
+"""
+
+
+# ============================================
+# 캐시 키
+# ============================================
+def stores_key() -> str:
+    """전체 식당 목록 (select_stores)"""
+    return "stores"
+
+
+def store_key(store_seq: int) -> str:
+    """식당 상세 (select_store/{store_seq})"""
+    return f"store:{store_seq}"
+
+
+def menus_key(store_seq: int) -> str:
+    """식당별 메뉴 목록 (select_menu/{store_seq})"""
+    return f"menus:{store_seq}"
+
+
+def options_key(store_seq: int, menu_seq: int) -> str:
+    """메뉴별 옵션 목록 (select_option/{store_seq}/{menu_seq})"""
+    return f"options:{store_seq}:{menu_seq}"
+
+
+def bundle_key(store_seq: int) -> str:
+    """식당 화면 묶음: 식당 + 메뉴/옵션 + 테이블 (store/bundle/{store_seq})"""
+    return f"bundle:{store_seq}"
+
+
+def layout_key(store_seq: int) -> str:
+    """식당 테이블 배치도: 배치 좌표 + 테이블 이름/수용 인원 (store/layout/{store_seq})"""
+    return f"layout:{store_seq}"
+
+
+def menu_image_key(menu_seq: int) -> str:
+    """메뉴 이미지 파일명 (menu/view_menu_image/{menu_seq})"""
+    return f"menu_image:{menu_seq}"
+
+
+# ============================================
+# 백엔드
+# ============================================
+class MemoryCacheBackend:
+    """프로세스 내 TTL + LRU 캐시"""
+
+    def __init__(self, max_entries: int = CATALOG_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def generation(self, key: str) -> Any:
+        with self._lock:
+            return self._epoch, self._generations.get(key, 0)
+
+    async def set(self, key: str, value: Any, ttl: float, generation: Any = None) -> bool:
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._generations.get(key, 0)):
+                return False
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            return True
+
+    async def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class RedisCacheBackend:
+    """Redis 호환 서버 캐시 (값은 JSON으로 저장, datetime은 ISO 문자열로 변환)"""
+
+    def __init__(self, url: str):
+        self._client = redis_asyncio.from_url(url)
+        self._set_if_generation = self._client.register_script(_SET_IF_GENERATION)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(_KEY_PREFIX + key)
+        return None if raw is None else json.loads(raw)
+
+    async def generation(self, key: str) -> Any:
+        raw = await self._client.get(_GEN_PREFIX + key)
+        return '0' if raw is None else raw.decode()
+
+    async def set(self, key: str, value: Any, ttl: float, generation: Any = None) -> bool:
+        payload = json.dumps(value, default=_json_default, ensure_ascii=False)
+        if generation is None:
+            await self._client.set(_KEY_PREFIX + key, payload, px=int(ttl * 1000))
+            return True
+        # 세대 확인과 저장을 서버에서 한 번에 (다른 워커의 무효화도 반영)
+        stored = await self._set_if_generation(
+            keys=[_KEY_PREFIX + key, _GEN_PREFIX + key], args=[generation, payload, int(ttl * 1000)])
+        return bool(stored)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            async with self._client.pipeline(transaction=True) as pipe:
+                pipe.delete(*[_KEY_PREFIX + key for key in keys])
+                for key in keys:
+                    pipe.incr(_GEN_PREFIX + key)
+                    pipe.expire(_GEN_PREFIX + key, _GEN_TTL)
+                await pipe.execute()
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match=_KEY_PREFIX + "*"):
+            await self._client.delete(key)
+
+    def size(self) -> int:
+        return -1
+
+
+# ============================================
+# 캐시
+# ============================================
+class CatalogCache:
+    """
+    읽기 시 적재(read-through) 카탈로그 캐시
+
+    - 적중 시 MySQL을 전혀 거치지 않음
+    - 백엔드 오류(Redis 장애 등)는 캐시 미스로 처리하고 DB에서 읽음
+    - {"result": "Error", ...} 응답은 캐시하지 않음
+    - 반환값은 캐시와 공유되므로 호출하는 쪽에서 수정하지 말 것
+    """
+
+    def __init__(self, backend=None, ttl: float = CATALOG_CACHE_TTL):
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl = ttl
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+        self._stale_skips = 0
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        """
+        캐시에서 key를 읽고, 없으면 loader()로 적재 후 반환
+
+        Args:
+            key: 캐시 키 (stores_key / store_key / menus_key / options_key)
+            loader: DB에서 값을 읽는 async 함수
+            ttl: 유지 시간 (None이면 CATALOG_CACHE_TTL)
+        """
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            self._errors += 1
+            print(f"⚠️  catalog cache get 실패 ({key}): {e}")
+            value = None
+        if value is not None:
+            self._hits += 1
+            return value
+
+        self._misses += 1
+        try:
+            # 적재 시작 전 세대: 적재 중 invalidate()가 있었으면 저장하지 않음
+            generation = await self.backend.generation(key)
+        except Exception as e:
+            self._errors += 1
+            print(f"⚠️  catalog cache generation 조회 실패 ({key}): {e}")
+            return await loader()
+        value = await loader()
+        if isinstance(value, dict) and value.get("result") == "Error":
+            # 없는 항목 등 에러 응답은 캐시하지 않음
+            return value
+        try:
+            if not await self.backend.set(key, value, self.ttl if ttl is None else ttl, generation):
+                self._stale_skips += 1
+        except Exception as e:
+            self._errors += 1
+            print(f"⚠️  catalog cache set 실패 ({key}): {e}")
+        return value
+
+    async def invalidate(self, *keys: str) -> None:
+        """쓰기 후 관련 키 무효화"""
+        try:
+            await self.backend.delete(*keys)
+        except Exception as e:
+            self._errors += 1
+            print(f"⚠️  catalog cache invalidate 실패 ({keys}): {e}")
+
+    async def clear(self) -> None:
+        """전체 캐시 비우기"""
+        await self.backend.clear()
+
+    def stats(self) -> Dict:
+        """적중률 지표"""
+        total = self._hits + self._misses
+        return {
+            "backend": type(self.backend).__name__,
+            "size": self.backend.size(),
+            "hits": self._hits,
+            "misses": self._misses,
+            "errors": self._errors,
+            "stale_skips": self._stale_skips,
+            "hit_rate": round(self._hits / total, 4) if total else 0.0,
+        }
+
+
+def _create_backend():
+    if CATALOG_CACHE_REDIS_URL:
+        if redis_asyncio is None:
+            print("⚠️  CATALOG_CACHE_REDIS_URL이 설정되었지만 redis 패키지가 없어 프로세스 내 캐시를 사용합니다.")
+        else:
+            return RedisCacheBackend(CATALOG_CACHE_REDIS_URL)
+    return MemoryCacheBackend()
+
+
+# 프로세스 전역 카탈로그 캐시
+catalog_cache = CatalogCache(_create_backend())
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 식당/메뉴/옵션 카탈로그 read-through 캐시 (프로세스 내 LRU + 선택적 Redis), 쓰기 시 무효화
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - CatalogCache.get_or_load / invalidate / stats
+#   - MemoryCacheBackend (TTL + LRU), RedisCacheBackend (CATALOG_CACHE_REDIS_URL)
+#
+# 2026-01-22 김택권: 식당 묶음 캐시 키 추가
+#   - bundle_key (store/bundle/{store_seq})
+#
+# 2026-01-22 김택권: 배치도 캐시 키 추가
+#   - layout_key (store/layout/{store_seq})
+#
+# 2026-01-22 김택권: 메뉴 이미지 파일명 캐시 키 추가
+#   - menu_image_key (menu/view_menu_image/{menu_seq})
+#
+# 2026-01-22 김택권: 적재 중 무효화된 값 저장 방지
+#   - 키별 세대 번호 (invalidate 시 증가), 적재 전 세대와 다르면 set 생략
+#   - Redis: 세대 키(gen:) + 세대 확인 후 저장 Lua 스크립트
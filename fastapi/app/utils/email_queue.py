@@ -0,0 +1,278 @@
+"""
+이메일 발송 대기열
+요청 처리 중에는 메시지를 대기열에 넣기만 하고, 전용 스레드가 로그인된 SMTP 연결을
+재사용하며 묶음으로 발송
+작성일: 2026-01-22
+작성자: 김택권
+
+동작:
+    - enqueue(): 메시지를 메모리 대기열에 추가 후 바로 반환 (가득 차면 False)
+    - 워커 스레드: 메시지가 오면 EMAIL_BATCH_SIZE개까지 모아 같은 SMTP 연결로 발송
+    - SMTP 연결은 EMAIL_SMTP_IDLE초 동안 쓰이지 않으면 닫고, 다음 발송 때 다시 연결/로그인
+    - 일시적 오류(연결 끊김, 4xx 응답 등)는 연결을 다시 맺고 EMAIL_RETRY_DELAYS 간격으로 재시도
+    - 영구 오류(수신자 거부, 5xx 응답)나 재시도 소진 시 로그만 남기고 버림
+    - stop(timeout): timeout초 뒤를 마감으로 정하고, 마감 전에 보낼 수 없는 재시도는 바로 포기,
+      마감이 지나면 남은 메시지를 모두 포기하고 워커 종료 (SMTP 연결은 워커가 종료하면서 닫음)
+
+주의:
+    - 대기열은 메모리에만 있으므로 서버 재시작 시 발송 전 메시지는 사라집니다
+      (인증 코드는 DB에 저장된 뒤 등록되므로 사용자는 코드를 다시 요청하면 됨)
+
+사용 예시:
+    from .email_queue import email_queue
+
+    email_queue.enqueue(EmailService.build_password_reset_email(...))
+"""
+
+import heapq
+import itertools
+import os
+import queue
+import smtplib
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from email.message import Message
+
+from .email_service import EmailService
+
+# 대기열 최대 길이
+EMAIL_QUEUE_MAX_SIZE = int(os.getenv('EMAIL_QUEUE_MAX_SIZE', '1000'))
+
+# 한 번에 모아 보낼 최대 메시지 수
+EMAIL_BATCH_SIZE = int(os.getenv('EMAIL_BATCH_SIZE', '20'))
+
+# 이 시간(초) 동안 발송이 없으면 SMTP 연결 종료
+EMAIL_SMTP_IDLE = float(os.getenv('EMAIL_SMTP_IDLE', '60'))
+
+# 재시도 대기 시간 (초), 개수가 곧 최대 재시도 횟수
+EMAIL_RETRY_DELAYS = [float(x) for x in os.getenv('EMAIL_RETRY_DELAYS', '5,30,120').split(',') if x.strip()]
+
+
+def is_transient(error: Exception) -> bool:
+    """재시도할 만한 일시적 오류인지 판단"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 4xx: 일시적, 5xx: 영구
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError,
+                              ConnectionError, socket.timeout, OSError))
+
+
+class EmailQueue:
+    """SMTP 연결을 재사용하는 단일 스레드 이메일 발송 대기열"""
+
+    def __init__(self, max_size: int = EMAIL_QUEUE_MAX_SIZE, batch_size: int = EMAIL_BATCH_SIZE,
+                 idle_timeout: float = EMAIL_SMTP_IDLE, retry_delays: Optional[List[float]] = None,
+                 connect=None):
+        self.batch_size = batch_size
+        self.idle_timeout = idle_timeout
+        self.retry_delays = EMAIL_RETRY_DELAYS if retry_delays is None else retry_delays
+        self._connect = connect or EmailService.connect
+        self._queue: "queue.Queue[Tuple[int, Message]]" = queue.Queue(maxsize=max_size)
+        # 재시도 대기 (ready_at, 순번, 시도 횟수, 메시지)
+        self._retry: List[Tuple[float, int, int, Message]] = []
+        self._counter = itertools.count()
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # stop() 이후 워커가 발송을 포기하는 시각 (time.monotonic 기준)
+        self._deadline = float('inf')
+        self._stats = {"queued": 0, "sent": 0, "retried": 0, "failed": 0, "dropped": 0, "abandoned": 0,
+                       "connects": 0}
+
+    # ----------------------------------------
+    # 외부 API
+    # ----------------------------------------
+    def start(self) -> None:
+        """워커 스레드 시작"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._deadline = float('inf')
+        self._thread = threading.Thread(target=self._run, name="email-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """대기 중인 메시지를 timeout초까지 발송한 뒤 종료 (남은 메시지와 재시도는 포기)"""
+        if self._thread is None:
+            return
+        self._deadline = time.monotonic() + timeout
+        self._stop.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # 발송 중인 SMTP 호출이 끝나지 않음 → 연결은 워커가 종료하면서 닫음
+            print(f"⚠️  이메일 워커가 {timeout}초 안에 종료되지 않았습니다 (발송 중인 메시지 처리 후 종료)")
+            return
+        self._thread = None
+        self._close()
+
+    def enqueue(self, msg: Message) -> bool:
+        """메시지 등록 (바로 반환), 대기열이 가득 찼거나 종료 중이면 False"""
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        if self._stop.is_set():
+            self._stats["dropped"] += 1
+            print("⚠️  이메일 대기열 종료 중이라 메시지를 받지 않습니다")
+            return False
+        try:
+            self._queue.put_nowait((0, msg))
+        except queue.Full:
+            self._stats["dropped"] += 1
+            print(f"⚠️  이메일 대기열이 가득 찼습니다 ({self._queue.maxsize}개)")
+            return False
+        self._stats["queued"] += 1
+        return True
+
+    def stats(self) -> Dict:
+        """대기열 지표"""
+        return {
+            **self._stats,
+            "pending": self._queue.qsize(),
+            "retry_pending": len(self._retry),
+            "connected": self._server is not None,
+        }
+
+    # ----------------------------------------
+    # 워커
+    # ----------------------------------------
+    def _run(self) -> None:
+        try:
+            while True:
+                if self._stop.is_set():
+                    self._abandon_late_retries()
+                    if time.monotonic() >= self._deadline:
+                        self._abandon_pending()
+                        break
+                batch = self._next_batch()
+                if batch:
+                    self._send_batch(batch)
+                    continue
+                if self._stop.is_set() and self._queue.empty() and not self._retry:
+                    break
+                if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+                    self._close()
+        finally:
+            self._close()
+
+    def _next_batch(self) -> List[Tuple[int, Message]]:
+        """발송할 메시지를 batch_size개까지 모음 (없으면 최대 1초 대기)"""
+        batch = []
+        now = time.monotonic()
+        while self._retry and self._retry[0][0] <= now and len(batch) < self.batch_size:
+            _, _, attempts, msg = heapq.heappop(self._retry)
+            batch.append((attempts, msg))
+        if not batch:
+            wait = min(1.0, max(0.0, self._deadline - now))
+            if self._retry:
+                wait = max(0.0, min(wait, self._retry[0][0] - now))
+            try:
+                batch.append(self._queue.get(timeout=wait))
+            except queue.Empty:
+                return batch
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _send_batch(self, batch: List[Tuple[int, Message]]) -> None:
+        for attempts, msg in batch:
+            if time.monotonic() >= self._deadline:
+                self._abandon(msg)
+                continue
+            try:
+                server = self._ensure_server()
+                server.send_message(msg)
+                self._last_used = time.monotonic()
+                self._stats["sent"] += 1
+            except Exception as e:
+                if not isinstance(e, smtplib.SMTPRecipientsRefused):
+                    # 연결 상태를 알 수 없으므로 다음 메시지는 새 연결로 발송
+                    self._close()
+                self._schedule_retry(attempts, msg, e)
+
+    def _schedule_retry(self, attempts: int, msg: Message, error: Exception) -> None:
+        if is_transient(error) and attempts < len(self.retry_delays):
+            ready_at = time.monotonic() + self.retry_delays[attempts]
+            if ready_at > self._deadline:
+                self._abandon(msg)
+                return
+            heapq.heappush(self._retry, (ready_at, next(self._counter), attempts + 1, msg))
+            self._stats["retried"] += 1
+            print(f"⚠️  이메일 발송 재시도 예정 ({attempts + 1}/{len(self.retry_delays)}, {msg['To']}): {error}")
+        else:
+            self._stats["failed"] += 1
+            print(f"❌ 이메일 발송 실패 ({msg['To']}): {error}")
+
+    def _abandon_late_retries(self) -> None:
+        """종료 마감 전에 보낼 수 없는 재시도 포기"""
+        late = [item for item in self._retry if item[0] > self._deadline]
+        if late:
+            self._retry = [item for item in self._retry if item[0] <= self._deadline]
+            heapq.heapify(self._retry)
+            for item in late:
+                self._abandon(item[3])
+
+    def _abandon_pending(self) -> None:
+        """종료 마감이 지나 남은 대기열 / 재시도 모두 포기"""
+        while self._retry:
+            self._abandon(heapq.heappop(self._retry)[3])
+        while True:
+            try:
+                self._abandon(self._queue.get_nowait()[1])
+            except queue.Empty:
+                break
+
+    def _abandon(self, msg: Message) -> None:
+        self._stats["abandoned"] += 1
+        print(f"❌ 이메일 대기열 종료로 발송 포기 ({msg['To']})")
+
+    def _ensure_server(self) -> smtplib.SMTP:
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self._close()
+        if self._server is None:
+            self._server = self._connect()
+            self._stats["connects"] += 1
+            self._last_used = time.monotonic()
+        return self._server
+
+    def _close(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                try:
+                    server.close()
+                except Exception:
+                    pass
+
+
+# 프로세스 전역 이메일 대기열 (main.py lifespan에서 start/stop)
+email_queue = EmailQueue()
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 이메일 발송 대기열 (SMTP 연결 재사용, 묶음 발송, 일시적 오류 재시도)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - EmailQueue.enqueue / start / stop / stats
+#   - EMAIL_QUEUE_MAX_SIZE / EMAIL_BATCH_SIZE / EMAIL_SMTP_IDLE / EMAIL_RETRY_DELAYS 환경변수
+#
+# 2026-01-22 김택권: 종료 처리 수정
+#   - stop(timeout)에 마감 시각 도입, 마감 전에 보낼 수 없는 재시도와 마감 뒤 남은 메시지는 포기 (abandoned 지표)
+#   - 워커가 실제로 끝난 뒤에만 _thread 해제 / SMTP 연결 종료 (워커도 종료 시 연결을 닫음)
+#   - 종료 중 enqueue()는 False (두 번째 워커가 뜨지 않도록)
@@ -5,11 +5,90 @@
 작성자: 김택권
 """
 
+import html
 import smtplib
 import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from functools import lru_cache
+from string import Template
+from typing import Dict, Optional, Tuple
+
+
+# ============================================
+# 이메일 템플릿
+# ============================================
+# 템플릿 이름 → (제목, 텍스트 본문, HTML 본문)
+# $변수는 발송 시 치환 (HTML 본문에는 이스케이프한 값 사용)
+_TEMPLATE_SOURCES: Dict[str, Tuple[str, Optional[str], str]] = {
+    'password_reset_code': (
+        '[Table Now] 비밀번호 변경 인증 코드',
+        """
+            비밀번호 변경 인증
+            
+            안녕하세요, ${customer_name}님.
+            
+            비밀번호 변경을 위한 인증 코드입니다.
+            
+            인증 코드: ${auth_code}
+            
+            이 코드는 ${expires_minutes}분 동안 유효합니다.
+            
+            본인이 요청한 것이 아니라면 이 이메일을 무시하세요.
+            """,
+        """
+            <html>
+            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                    <h2 style="color: #212121;">비밀번호 변경 인증</h2>
+                    <p>안녕하세요, ${customer_name}님.</p>
+                    <p>비밀번호 변경을 위한 인증 코드입니다.</p>
+                    <div style="background-color: #f5f5f5; padding: 20px; text-align: center; margin: 20px 0; border-radius: 8px;">
+                        <h1 style="color: #212121; margin: 0; font-size: 32px; letter-spacing: 5px;">${auth_code}</h1>
+                    </div>
+                    <p>이 코드는 <strong>${expires_minutes}분</strong> 동안 유효합니다.</p>
+                    <p style="color: #757575; font-size: 12px;">본인이 요청한 것이 아니라면 이 이메일을 무시하세요.</p>
+                </div>
+            </body>
+            </html>
+            """,
+    ),
+    'password_reset_link': (
+        '[Table Now] 비밀번호 변경 링크',
+        None,
+        """
+            <html>
+            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                    <h2 style="color: #212121;">비밀번호 변경</h2>
+                    <p>안녕하세요, ${customer_name}님.</p>
+                    <p>비밀번호 변경을 위해 아래 링크를 클릭해주세요.</p>
+                    <div style="text-align: center; margin: 30px 0;">
+                        <a href="${reset_link}" 
+                           style="background-color: #212121; color: white; padding: 12px 30px; 
+                                  text-decoration: none; border-radius: 5px; display: inline-block;">
+                            비밀번호 변경하기
+                        </a>
+                    </div>
+                    <p>이 링크는 <strong>${expires_minutes}분</strong> 동안 유효합니다.</p>
+                    <p style="color: #757575; font-size: 12px;">본인이 요청한 것이 아니라면 이 이메일을 무시하세요.</p>
+                </div>
+            </body>
+            </html>
+            """,
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> Tuple[str, Optional[Template], Template]:
+    """템플릿을 한 번만 컴파일해 캐시 (제목, 텍스트 Template, HTML Template)"""
+    subject, text_source, html_source = _TEMPLATE_SOURCES[name]
+    return (
+        subject,
+        Template(text_source) if text_source is not None else None,
+        Template(html_source),
+    )
 
 
 class EmailService:
@@ -34,6 +113,73 @@ class EmailService:
             return cls.SMTP_USER if cls.SMTP_USER else 'noreply@tablenow.com'
         return from_email
     
+    @classmethod
+    def connect(cls, timeout: float = 30) -> smtplib.SMTP:
+        """SMTP 서버 연결 (STARTTLS + 로그인), 호출한 쪽에서 quit() 필요"""
+        server = smtplib.SMTP(cls.SMTP_HOST, cls.SMTP_PORT, timeout=timeout)
+        try:
+            server.starttls()
+            if cls.SMTP_USER and cls.SMTP_PASSWORD:
+                server.login(cls.SMTP_USER, cls.SMTP_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    @classmethod
+    def render(cls, template_name: str, to_email: str, **values) -> MIMEMultipart:
+        """
+        캐시된 템플릿으로 이메일 메시지 생성
+        
+        Args:
+            template_name: 템플릿 이름 ('password_reset_code', 'password_reset_link')
+            to_email: 수신자 이메일
+            **values: 템플릿 변수
+            
+        Returns:
+            MIMEMultipart: 발송할 메시지
+        """
+        subject, text_template, html_template = get_template(template_name)
+        
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{cls.FROM_NAME} <{cls.get_from_email()}>"
+        msg['To'] = to_email
+        
+        # 텍스트 및 HTML 내용 추가
+        if text_template is not None:
+            msg.attach(MIMEText(text_template.substitute(values), 'plain', 'utf-8'))
+        escaped = {key: html.escape(str(value), quote=True) for key, value in values.items()}
+        msg.attach(MIMEText(html_template.substitute(escaped), 'html', 'utf-8'))
+        return msg
+    
+    @classmethod
+    def send_message(cls, msg: MIMEMultipart) -> bool:
+        """메시지 1건을 새 SMTP 연결로 바로 발송 (대량 발송은 email_queue 사용)"""
+        try:
+            with cls.connect() as server:
+                server.send_message(msg)
+            return True
+        except Exception as e:
+            print(f"이메일 발송 실패: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+    
+    @classmethod
+    def build_password_reset_email(
+        cls,
+        to_email: str,
+        customer_name: str,
+        auth_code: str,
+        expires_minutes: int = 10
+    ) -> MIMEMultipart:
+        """비밀번호 변경 인증 코드 이메일 메시지 생성"""
+        return cls.render(
+            'password_reset_code', to_email,
+            customer_name=customer_name, auth_code=auth_code, expires_minutes=expires_minutes
+        )
+    
     @classmethod
     def send_password_reset_email(
         cls,
@@ -43,7 +189,7 @@ class EmailService:
         expires_minutes: int = 10
     ) -> bool:
         """
-        비밀번호 변경 인증 이메일 발송
+        비밀번호 변경 인증 이메일 발송 (바로 발송, 요청 처리 중에는 queue_password_reset_email 사용)
         
         Args:
             to_email: 수신자 이메일
@@ -55,66 +201,30 @@ class EmailService:
             bool: 발송 성공 여부
         """
         try:
-            # 이메일 내용 작성
-            subject = '[Table Now] 비밀번호 변경 인증 코드'
-            
-            html_content = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #212121;">비밀번호 변경 인증</h2>
-                    <p>안녕하세요, {customer_name}님.</p>
-                    <p>비밀번호 변경을 위한 인증 코드입니다.</p>
-                    <div style="background-color: #f5f5f5; padding: 20px; text-align: center; margin: 20px 0; border-radius: 8px;">
-                        <h1 style="color: #212121; margin: 0; font-size: 32px; letter-spacing: 5px;">{auth_code}</h1>
-                    </div>
-                    <p>이 코드는 <strong>{expires_minutes}분</strong> 동안 유효합니다.</p>
-                    <p style="color: #757575; font-size: 12px;">본인이 요청한 것이 아니라면 이 이메일을 무시하세요.</p>
-                </div>
-            </body>
-            </html>
-            """
-            
-            text_content = f"""
-            비밀번호 변경 인증
-            
-            안녕하세요, {customer_name}님.
-            
-            비밀번호 변경을 위한 인증 코드입니다.
-            
-            인증 코드: {auth_code}
-            
-            이 코드는 {expires_minutes}분 동안 유효합니다.
-            
-            본인이 요청한 것이 아니라면 이 이메일을 무시하세요.
-            """
-            
-            # 이메일 메시지 생성
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{cls.FROM_NAME} <{cls.get_from_email()}>"
-            msg['To'] = to_email
-            
-            # 텍스트 및 HTML 내용 추가
-            part1 = MIMEText(text_content, 'plain', 'utf-8')
-            part2 = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(part1)
-            msg.attach(part2)
-            
-            # SMTP 서버 연결 및 이메일 발송
-            with smtplib.SMTP(cls.SMTP_HOST, cls.SMTP_PORT) as server:
-                server.starttls()
-                if cls.SMTP_USER and cls.SMTP_PASSWORD:
-                    server.login(cls.SMTP_USER, cls.SMTP_PASSWORD)
-                server.send_message(msg)
-            
-            return True
-            
+            msg = cls.build_password_reset_email(to_email, customer_name, auth_code, expires_minutes)
         except Exception as e:
-            print(f"이메일 발송 실패: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"이메일 생성 실패: {e}")
             return False
+        return cls.send_message(msg)
+    
+    @classmethod
+    def queue_password_reset_email(
+        cls,
+        to_email: str,
+        customer_name: str,
+        auth_code: str,
+        expires_minutes: int = 10
+    ) -> bool:
+        """
+        비밀번호 변경 인증 이메일을 발송 대기열에 등록 (바로 반환, 발송은 email_queue 워커가 처리)
+        
+        Returns:
+            bool: 등록 성공 여부 (대기열이 가득 찼으면 False)
+        """
+        from .email_queue import email_queue
+        
+        msg = cls.build_password_reset_email(to_email, customer_name, auth_code, expires_minutes)
+        return email_queue.enqueue(msg)
     
     @classmethod
     def send_password_reset_link(
@@ -137,50 +247,14 @@ class EmailService:
             bool: 발송 성공 여부
         """
         try:
-            subject = '[Table Now] 비밀번호 변경 링크'
-            
-            html_content = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #212121;">비밀번호 변경</h2>
-                    <p>안녕하세요, {customer_name}님.</p>
-                    <p>비밀번호 변경을 위해 아래 링크를 클릭해주세요.</p>
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="{reset_link}" 
-                           style="background-color: #212121; color: white; padding: 12px 30px; 
-                                  text-decoration: none; border-radius: 5px; display: inline-block;">
-                            비밀번호 변경하기
-                        </a>
-                    </div>
-                    <p>이 링크는 <strong>{expires_minutes}분</strong> 동안 유효합니다.</p>
-                    <p style="color: #757575; font-size: 12px;">본인이 요청한 것이 아니라면 이 이메일을 무시하세요.</p>
-                </div>
-            </body>
-            </html>
-            """
-            
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{cls.FROM_NAME} <{cls.get_from_email()}>"
-            msg['To'] = to_email
-            
-            part = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(part)
-            
-            with smtplib.SMTP(cls.SMTP_HOST, cls.SMTP_PORT) as server:
-                server.starttls()
-                if cls.SMTP_USER and cls.SMTP_PASSWORD:
-                    server.login(cls.SMTP_USER, cls.SMTP_PASSWORD)
-                server.send_message(msg)
-            
-            return True
-            
+            msg = cls.render(
+                'password_reset_link', to_email,
+                customer_name=customer_name, reset_link=reset_link, expires_minutes=expires_minutes
+            )
         except Exception as e:
-            print(f"이메일 발송 실패: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"이메일 생성 실패: {e}")
             return False
+        return cls.send_message(msg)
 
 
 # ============================================================
@@ -200,3 +274,8 @@ class EmailService:
 #   - send_password_reset_link 메서드 구현 (비밀번호 변경 링크 이메일 발송, 대안 방법)
 #   - HTML 및 텍스트 형식 이메일 지원
 #   - 에러 처리 및 로깅 구현
+#
+# 2026-01-22 김택권: 템플릿 캐시 및 발송 대기열 연동
+#   - 템플릿을 _TEMPLATE_SOURCES로 분리, get_template()에서 한 번만 컴파일 후 캐시 (HTML 값은 이스케이프)
+#   - render / connect / send_message 공통화
+#   - queue_password_reset_email 추가 (email_queue에 등록 후 바로 반환)
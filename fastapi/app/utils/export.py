@@ -0,0 +1,149 @@
+"""
+데이터 내보내기 (NDJSON / CSV 스트리밍 응답)
+stream_rows()로 읽은 행을 NDJSON 또는 CSV로 변환해 StreamingResponse로 반환
+작성일: 2026-01-22
+작성자: 김택권
+
+사용 예시:
+    from ..database.streaming import stream_rows
+    from ..utils.export import build_export_filter, export_response
+
+    where, params = build_export_filter("created_at", start_date, end_date, store_seq)
+    rows = stream_rows(f"SELECT ... FROM pay {where} ORDER BY pay_id", params)
+    return export_response(rows, columns, "csv", "pay")
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+
+# 지원 형식 → Content-Type
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+# 응답으로 한 번에 내보낼 최소 바이트 수 (행마다 write하지 않도록 묶음)
+_FLUSH_BYTES = 64 * 1024
+
+
+def build_export_filter(
+    date_column: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    store_seq: Optional[int] = None,
+) -> Tuple[str, list]:
+    """
+    기간 / 식당 조건을 WHERE 절로 변환
+
+    - start_date, end_date는 'YYYY-MM-DD' (end_date 당일 포함)
+    - 반개구간 [start_date 00:00, end_date + 1일 00:00)으로 변환해 인덱스 범위 검색 가능
+
+    Returns:
+        (where_sql, params): 조건이 없으면 ("", [])
+
+    Raises:
+        ValueError: 날짜 형식 오류
+    """
+    conditions = []
+    params = []
+    if store_seq is not None:
+        conditions.append("store_seq = %s")
+        params.append(store_seq)
+    if start_date:
+        conditions.append(f"{date_column} >= %s")
+        params.append(datetime.strptime(start_date, "%Y-%m-%d"))
+    if end_date:
+        conditions.append(f"{date_column} < %s")
+        params.append(datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1))
+    if not conditions:
+        return "", params
+    return "WHERE " + " AND ".join(conditions), params
+
+
+def _to_plain(value):
+    """JSON / CSV로 쓸 수 있는 값으로 변환"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return value
+
+
+async def _ndjson_chunks(rows: AsyncIterator[tuple], columns: List[str]) -> AsyncIterator[bytes]:
+    buffer = []
+    size = 0
+    async for row in rows:
+        line = json.dumps(
+            {column: _to_plain(value) for column, value in zip(columns, row)},
+            ensure_ascii=False
+        ) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= _FLUSH_BYTES:
+            yield "".join(buffer).encode('utf-8')
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode('utf-8')
+
+
+async def _csv_chunks(rows: AsyncIterator[tuple], columns: List[str]) -> AsyncIterator[bytes]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    async for row in rows:
+        writer.writerow([_to_plain(value) for value in row])
+        if out.tell() >= _FLUSH_BYTES:
+            yield out.getvalue().encode('utf-8')
+            out.seek(0)
+            out.truncate(0)
+    if out.tell():
+        yield out.getvalue().encode('utf-8')
+
+
+def export_response(
+    rows: AsyncIterator[tuple],
+    columns: List[str],
+    export_format: str,
+    filename: str,
+) -> StreamingResponse:
+    """
+    행 스트림을 NDJSON / CSV StreamingResponse로 반환
+
+    Args:
+        rows: stream_rows() 결과 (async iterator)
+        columns: 컬럼 이름 (SELECT 순서와 동일)
+        export_format: 'ndjson' 또는 'csv'
+        filename: 다운로드 파일 이름 (확장자 제외)
+
+    Raises:
+        ValueError: 지원하지 않는 형식
+    """
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"지원하지 않는 형식입니다: {export_format} (ndjson, csv)")
+    chunks = _ndjson_chunks(rows, columns) if export_format == 'ndjson' else _csv_chunks(rows, columns)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: NDJSON / CSV 스트리밍 내보내기 (export_response, build_export_filter)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
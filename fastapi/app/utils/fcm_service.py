@@ -9,8 +9,15 @@ import firebase_admin
 from firebase_admin import credentials, messaging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List
 
+# FCM 멀티캐스트 한 번에 보낼 수 있는 최대 토큰 수
+FCM_MULTICAST_LIMIT = 500
+
+# 500개 묶음을 동시에 발송할 최대 스레드 수
+FCM_FANOUT_WORKERS = int(os.getenv('FCM_FANOUT_WORKERS', '4'))
+
 
 class FCMService:
     """FCM 푸시 알림 발송 서비스 클래스"""
@@ -126,25 +133,15 @@ class FCMService:
         Returns:
             int: 발송 성공한 기기 수
         """
-        from app.database.connection import connect_db
-        
         cls._ensure_initialized()
         
         if not firebase_admin._apps:
             print("⚠️  Firebase Admin SDK not initialized")
             return 0
         
-        # 고객의 FCM 토큰 조회
-        conn = connect_db()
-        curs = conn.cursor()
-        
         try:
-            curs.execute("""
-                SELECT fcm_token FROM device_token 
-                WHERE customer_seq = %s
-            """, (customer_seq,))
-            
-            tokens = [row[0] for row in curs.fetchall()]
+            # 고객의 FCM 토큰 조회 (발송 전에 연결을 풀에 반납)
+            tokens = cls.get_customer_tokens(customer_seq)
             
             if not tokens:
                 print(f"⚠️  No FCM tokens found for customer_seq: {customer_seq}")
@@ -156,35 +153,64 @@ class FCMService:
                 # print(f"   [{i}] {token[:20]}...{token[-10:]}")
                 print(f"   [{i}] {token}")
             
-            # 각 토큰에 알림 발송 및 만료된 토큰 정리
-            success_count = 0
-            invalid_tokens = []
-            
-            for token in tokens:
-                message_id = cls.send_notification(token, title, body, data)
-                if message_id:
-                    success_count += 1
-                else:
-                    # 발송 실패한 토큰은 만료되었을 가능성이 높음
-                    # UnregisteredError가 발생했을 수 있으므로 추적
-                    invalid_tokens.append(token)
-            
-            # 만료된 토큰이 있으면 DB에서 삭제
-            if invalid_tokens:
-                cls._cleanup_invalid_tokens(invalid_tokens, customer_seq)
+            # 500개 단위 묶음 발송 후 등록 해제된 토큰만 정리
+            # (네트워크 오류 등 일시적 실패 토큰은 삭제하지 않음)
+            fanout = cls.send_fanout(tokens, title, body, data)
+            if fanout["unregistered_tokens"]:
+                cls.cleanup_invalid_tokens(fanout["unregistered_tokens"], customer_seq)
             
-            print(f"✅ Sent notifications to {success_count}/{len(tokens)} devices")
-            return success_count
+            return fanout["success_count"]
             
         except Exception as e:
             print(f"❌ Failed to send notifications to customer: {e}")
             return 0
-        finally:
-            try:
-                curs.close()
-                conn.close()
-            except:
-                pass
+    
+    @classmethod
+    def get_customer_tokens(cls, customer_seq: int) -> List[str]:
+        """
+        고객의 모든 기기 FCM 토큰 조회
+        
+        Args:
+            customer_seq: 고객 번호
+            
+        Returns:
+            List[str]: FCM 토큰 리스트
+        """
+        from app.database.connection import get_connection
+        
+        with get_connection() as conn:
+            curs = conn.cursor()
+            curs.execute("""
+                SELECT fcm_token FROM device_token 
+                WHERE customer_seq = %s
+            """, (customer_seq,))
+            
+            return [row[0] for row in curs.fetchall()]
+    
+    @staticmethod
+    def select_customer_tokens(conn, customer_seqs: List[int]) -> Dict[int, List[str]]:
+        """
+        여러 고객의 FCM 토큰을 한 번에 조회 (async_db.run_db로 실행)
+        
+        Args:
+            conn: DB 연결
+            customer_seqs: 고객 번호 리스트
+            
+        Returns:
+            Dict[int, List[str]]: 고객 번호 → FCM 토큰 리스트 (토큰이 없는 고객은 빠짐)
+        """
+        if not customer_seqs:
+            return {}
+        curs = conn.cursor()
+        placeholders = ','.join(['%s'] * len(customer_seqs))
+        curs.execute(f"""
+            SELECT customer_seq, fcm_token FROM device_token
+            WHERE customer_seq IN ({placeholders})
+        """, list(customer_seqs))
+        tokens: Dict[int, List[str]] = {}
+        for customer_seq, fcm_token in curs.fetchall():
+            tokens.setdefault(customer_seq, []).append(fcm_token)
+        return tokens
     
     @classmethod
     def send_multicast_notification(
@@ -195,7 +221,7 @@ class FCMService:
         data: Optional[Dict[str, str]] = None
     ) -> int:
         """
-        여러 기기에 동시에 푸시 알림 발송 (최대 500개)
+        여러 기기에 동시에 푸시 알림 발송 (토큰 수 제한 없음, send_fanout 사용)
         
         Args:
             tokens: FCM 토큰 리스트
@@ -215,18 +241,64 @@ class FCMService:
         if not tokens:
             return 0
         
-        # FCM은 최대 500개까지 한 번에 발송 가능
-        if len(tokens) > 500:
-            print(f"⚠️  Too many tokens ({len(tokens)}). Maximum is 500.")
-            tokens = tokens[:500]
+        # 500개를 넘으면 여러 묶음으로 나눠 발송 (잘라내지 않음)
+        return cls.send_fanout(tokens, title, body, data)["success_count"]
+    
+    @classmethod
+    def send_fanout(
+        cls,
+        tokens: List[str],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, str]] = None,
+        max_workers: int = FCM_FANOUT_WORKERS
+    ) -> Dict:
+        """
+        토큰 수에 제한 없이 같은 알림 발송 (팬아웃)
         
-        try:
-            # Android에서 동일 알림이 카운트만 올라가는 문제 방지
-            # 각 알림마다 고유한 tag 생성 (밀리초 기반)
-            android_tag = f"notification_{int(time.time() * 1000)}"
+        - 토큰을 FCM_MULTICAST_LIMIT(500)개씩 묶어 send_each_for_multicast로 발송
+        - 묶음은 최대 max_workers개 스레드에서 동시에 발송
+        - 토큰별 결과를 반환하며, 등록 해제(UnregisteredError)된 토큰만 unregistered_tokens에 포함
+        
+        Args:
+            tokens: FCM 토큰 리스트
+            title: 알림 제목
+            body: 알림 내용
+            data: 추가 데이터 (선택사항)
+            max_workers: 동시 발송 스레드 수
             
+        Returns:
+            Dict: {
+                "success_count": 성공 수,
+                "failure_count": 실패 수,
+                "unregistered_tokens": 삭제해도 되는 토큰 리스트,
+                "results": [{"token", "success", "message_id", "error", "unregistered"}, ...] (tokens 순서)
+            }
+        """
+        result = {"success_count": 0, "failure_count": 0, "unregistered_tokens": [], "results": []}
+        if not tokens:
+            return result
+        
+        cls._ensure_initialized()
+        
+        if not firebase_admin._apps:
+            print("⚠️  Firebase Admin SDK not initialized")
+            result["failure_count"] = len(tokens)
+            result["results"] = [
+                {"token": token, "success": False, "message_id": None,
+                 "error": "Firebase Admin SDK not initialized", "unregistered": False}
+                for token in tokens
+            ]
+            return result
+        
+        # Android에서 동일 알림이 카운트만 올라가는 문제 방지
+        # 각 알림마다 고유한 tag 생성 (밀리초 기반, 같은 알림의 묶음끼리는 동일)
+        android_tag = f"notification_{int(time.time() * 1000)}"
+        chunks = [tokens[i:i + FCM_MULTICAST_LIMIT] for i in range(0, len(tokens), FCM_MULTICAST_LIMIT)]
+        
+        def _send_chunk(chunk: List[str]) -> List[Dict]:
             message = messaging.MulticastMessage(
-                tokens=tokens,
+                tokens=chunk,
                 notification=messaging.Notification(
                     title=title,
                     body=body,
@@ -238,21 +310,79 @@ class FCMService:
                     ),
                 ),
             )
+            try:
+                batch = messaging.send_each_for_multicast(message)
+            except Exception as e:
+                # 묶음 전체 실패 (네트워크 오류 등): 일시적 실패로 보고 토큰은 유지
+                print(f"❌ Failed to send multicast chunk ({len(chunk)} tokens): {e}")
+                return [
+                    {"token": token, "success": False, "message_id": None,
+                     "error": f"{type(e).__name__}: {e}", "unregistered": False}
+                    for token in chunk
+                ]
+            return [
+                {
+                    "token": token,
+                    "success": response.success,
+                    "message_id": response.message_id,
+                    "error": None if response.success else f"{type(response.exception).__name__}: {response.exception}",
+                    "unregistered": isinstance(response.exception, messaging.UnregisteredError),
+                }
+                for token, response in zip(chunk, batch.responses)
+            ]
+        
+        if len(chunks) == 1:
+            chunk_results = [_send_chunk(chunks[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks))),
+                                    thread_name_prefix="fcm-fanout") as executor:
+                chunk_results = list(executor.map(_send_chunk, chunks))
+        
+        for chunk_result in chunk_results:
+            for item in chunk_result:
+                result["results"].append(item)
+                if item["success"]:
+                    result["success_count"] += 1
+                else:
+                    result["failure_count"] += 1
+                    if item["unregistered"]:
+                        result["unregistered_tokens"].append(item["token"])
+        
+        print(f"✅ Sent notifications to {result['success_count']}/{len(tokens)} devices "
+              f"({len(chunks)} batch(es), unregistered: {len(result['unregistered_tokens'])})")
+        return result
+    
+    @staticmethod
+    def delete_invalid_tokens(conn, invalid_tokens: List[str], customer_seq: int) -> int:
+        """
+        만료된 FCM 토큰 삭제 (async_db.run_db로 실행, 커밋 포함)
+        
+        Args:
+            conn: DB 연결
+            invalid_tokens: 만료된 토큰 리스트
+            customer_seq: 고객 번호
             
-            response = messaging.send_multicast(message)
-            success_count = response.success_count
-            
-            print(f"✅ Sent notifications to {success_count}/{len(tokens)} devices")
-            return success_count
-            
-        except Exception as e:
-            print(f"❌ Failed to send multicast notification: {e}")
+        Returns:
+            int: 삭제된 토큰 수
+        """
+        if not invalid_tokens:
             return 0
+        curs = conn.cursor()
+        placeholders = ','.join(['%s'] * len(invalid_tokens))
+        curs.execute(f"""
+            DELETE FROM device_token 
+            WHERE customer_seq = %s AND fcm_token IN ({placeholders})
+        """, [customer_seq] + list(invalid_tokens))
+        deleted_count = curs.rowcount
+        conn.commit()
+        if deleted_count > 0:
+            print(f"🧹 Cleaned up {deleted_count} invalid FCM token(s) for customer_seq: {customer_seq}")
+        return deleted_count
     
     @classmethod
-    def _cleanup_invalid_tokens(cls, invalid_tokens: List[str], customer_seq: int):
+    def cleanup_invalid_tokens(cls, invalid_tokens: List[str], customer_seq: int):
         """
-        만료된 FCM 토큰을 DB에서 삭제
+        만료된 FCM 토큰을 DB에서 삭제 (동기 호출용, 실패는 로그만 남김)
         
         Args:
             invalid_tokens: 만료된 토큰 리스트
@@ -262,37 +392,14 @@ class FCMService:
             return
         
         try:
-            from ..database.connection import connect_db
-            
-            conn = connect_db()
-            curs = conn.cursor()
+            from ..database.connection import get_connection
             
-            try:
-                # 만료된 토큰 삭제
-                placeholders = ','.join(['%s'] * len(invalid_tokens))
-                curs.execute(f"""
-                    DELETE FROM device_token 
-                    WHERE customer_seq = %s AND fcm_token IN ({placeholders})
-                """, [customer_seq] + invalid_tokens)
-                
-                deleted_count = curs.rowcount
-                conn.commit()
-                
-                if deleted_count > 0:
-                    print(f"🧹 Cleaned up {deleted_count} invalid FCM token(s) for customer_seq: {customer_seq}")
-                    
-            except Exception as e:
-                conn.rollback()
-                print(f"⚠️  Failed to cleanup invalid tokens: {e}")
-            finally:
+            with get_connection() as conn:
                 try:
-                    curs.close()
-                except:
-                    pass
-                try:
-                    conn.close()
-                except:
-                    pass
+                    cls.delete_invalid_tokens(conn, invalid_tokens, customer_seq)
+                except Exception as e:
+                    conn.rollback()
+                    print(f"⚠️  Failed to cleanup invalid tokens: {e}")
                     
         except Exception as e:
             print(f"⚠️  Failed to cleanup invalid tokens: {e}")
@@ -313,3 +420,20 @@ class FCMService:
 #   - 단일 기기 알림 발송 함수 (`send_notification`)
 #   - 고객의 모든 기기 알림 발송 함수 (`send_notification_to_customer`)
 #   - 여러 기기 동시 알림 발송 함수 (`send_multicast_notification`)
+#
+# 2026-01-22 김택권: 커넥션 풀 적용
+#   - connect_db() 대신 get_connection() 사용
+#   - send_notification_to_customer: 토큰 조회 후 연결을 반납하고 발송 (발송 중 연결 점유 방지)
+#
+# 2026-01-22 김택권: 대량 발송 팬아웃 추가
+#   - send_fanout: 500개 단위 send_each_for_multicast 묶음 발송, FCM_FANOUT_WORKERS 스레드로 동시 발송, 토큰별 결과 반환
+#   - send_notification_to_customer: 토큰별 send 반복 대신 send_fanout 사용, UnregisteredError 토큰만 삭제 (일시적 실패 토큰 유지)
+#   - send_multicast_notification: 500개 초과분을 잘라내지 않고 send_fanout으로 발송 (firebase-admin 7에서 제거된 send_multicast 대체)
+#
+# 2026-01-22 김택권: 고객 토큰 조회 분리
+#   - get_customer_tokens() 추가 (발송 대기열 워커와 공용)
+#
+# 2026-01-22 김택권: 발송 대기열 워커용 DB 함수 분리
+#   - select_customer_tokens(conn, ...): 여러 고객 토큰 한 번에 조회 (run_db용)
+#   - delete_invalid_tokens(conn, ...): 만료 토큰 삭제 (run_db용)
+#   - _cleanup_invalid_tokens → cleanup_invalid_tokens (공개)
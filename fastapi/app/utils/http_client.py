@@ -0,0 +1,79 @@
+"""
+공용 비동기 HTTP 클라이언트
+외부 API(OpenWeatherMap 등) 호출용 httpx.AsyncClient를 프로세스에서 하나만 만들어
+keep-alive 연결을 재사용 (요청마다 TCP/TLS 연결을 새로 맺지 않음)
+작성일: 2026-01-22
+작성자: 김택권
+
+사용 예시:
+    from .http_client import get_http_client
+
+    client = get_http_client()
+    response = await client.get(url, params={...})
+
+    # 서버 종료 시 (main.py lifespan)
+    await close_http_client()
+"""
+
+import os
+from typing import Dict, Optional
+
+import httpx
+
+# 최대 동시 연결 수 (호스트 전체 합)
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '20'))
+
+# 유지할 keep-alive 연결 수
+HTTP_MAX_KEEPALIVE = int(os.getenv('HTTP_MAX_KEEPALIVE', '10'))
+
+# 요청 타임아웃 (초)
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """공용 AsyncClient 반환 (처음 호출 시 생성)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=min(HTTP_TIMEOUT, 5.0)),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            ),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """공용 AsyncClient 종료 (서버 종료 시)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def http_client_stats() -> Dict:
+    """클라이언트 설정 / 상태"""
+    return {
+        "open": _client is not None and not _client.is_closed,
+        "max_connections": HTTP_MAX_CONNECTIONS,
+        "max_keepalive": HTTP_MAX_KEEPALIVE,
+        "timeout": HTTP_TIMEOUT,
+    }
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 외부 API 호출용 공용 httpx.AsyncClient (keep-alive 연결 풀)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - get_http_client / close_http_client / http_client_stats
+#   - HTTP_MAX_CONNECTIONS / HTTP_MAX_KEEPALIVE / HTTP_TIMEOUT 환경변수
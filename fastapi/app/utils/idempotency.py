@@ -0,0 +1,338 @@
+"""
+중복 요청 방지 (Idempotency-Key)
+클라이언트가 Idempotency-Key 헤더를 보내면 첫 실행의 응답을 idempotency_key 테이블에 저장하고,
+같은 키로 다시 온 요청에는 reserve / pay를 건드리지 않고 저장된 응답을 돌려줌
+작성일: 2026-01-22
+작성자: 김택권
+
+동작:
+    - 메모리 캐시(프로세스별, LRU) → DB(idempotency_key) 순으로 저장된 응답 확인
+    - 같은 프로세스의 동시 중복 요청: 첫 요청의 실행 결과를 함께 기다림
+    - 다른 프로세스의 동시 중복 요청: PROCESSING 행이 DONE이 될 때까지 DB를 다시 확인하며 대기
+      (IDEMPOTENCY_WAIT_TIMEOUT 초과 시 "처리 중" 오류)
+    - 실행이 실패하면(예외 또는 "Error" 응답) 키를 삭제해 같은 키로 다시 시도할 수 있게 함
+    - 실행은 성공했는데 DONE 저장이 실패하면 응답은 그대로 반환하고 메모리 캐시에 둔 뒤
+      백그라운드에서 IDEMPOTENCY_PERSIST_RETRY_DELAYS 간격으로 다시 저장
+      (PROCESSING으로 남아 IDEMPOTENCY_STALE_AFTER 후 재시도가 새 요청으로 실행되는 것을 방지)
+    - 같은 키로 본문이 다른 요청을 보내면 실행하지 않고 오류 반환
+    - 저장된 응답으로 답한 경우 응답 헤더에 Idempotent-Replayed: true
+
+사용 예시:
+    from ..utils.idempotency import idempotency_store
+
+    @router.post("/purchase")
+    async def create_purchase(reserve: dict, items: dict, response: Response,
+                              idempotency_key: Optional[str] = Header(None)):
+        return await idempotency_store.respond(
+            "pay.purchase", idempotency_key, response,
+            lambda: _create_purchase(reserve, items), reserve, items,
+        )
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import pymysql
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+from ..database.async_db import execute, run_db
+
+# 저장된 응답 유지 시간 (초)
+IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', '86400'))
+
+# 다른 프로세스가 처리 중인 같은 키를 기다리는 최대 시간 (초)
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv('IDEMPOTENCY_WAIT_TIMEOUT', '10'))
+
+# PROCESSING 상태로 이 시간(초)이 지난 키는 처리하던 서버가 죽은 것으로 보고 넘겨받음
+IDEMPOTENCY_STALE_AFTER = int(os.getenv('IDEMPOTENCY_STALE_AFTER', '60'))
+
+# 프로세스별 메모리 캐시 최대 항목 수
+IDEMPOTENCY_CACHE_MAX_ENTRIES = int(os.getenv('IDEMPOTENCY_CACHE_MAX_ENTRIES', '10000'))
+
+# 만료된 키 삭제 주기 (초)
+IDEMPOTENCY_PURGE_INTERVAL = int(os.getenv('IDEMPOTENCY_PURGE_INTERVAL', '300'))
+
+# 응답(DONE) 저장 실패 시 재시도 간격 (초, 쉼표 구분)
+IDEMPOTENCY_PERSIST_RETRY_DELAYS = [
+    float(d) for d in os.getenv('IDEMPOTENCY_PERSIST_RETRY_DELAYS', '1,5,15,30').split(',') if d.strip()
+]
+
+# 다른 프로세스 대기 시 DB 재확인 간격 (초)
+IDEMPOTENCY_POLL_INTERVAL = 0.1
+
+MAX_KEY_LENGTH = 128
+
+STATUS_PROCESSING = 'PROCESSING'
+STATUS_DONE = 'DONE'
+
+
+def request_hash(*parts: Any) -> str:
+    """요청 본문 해시 (키 재사용 시 같은 요청인지 확인)"""
+    payload = json.dumps(jsonable_encoder(parts), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def is_error_response(response: Any) -> bool:
+    """저장하지 않을 실패 응답인지 확인 ({"result": "Error"} / {"results": "Error"})"""
+    return isinstance(response, dict) and 'Error' in (response.get('result'), response.get('results'))
+
+
+# ============================================
+# DB 작업 (run_db에서 실행)
+# ============================================
+def _claim(conn, scope: str, key: str, req_hash: str, ttl: int, stale_after: int):
+    """
+    키 선점 시도
+    반환: (True, None) 선점 성공 / (False, (status, request_hash, response, 남은 초)) 이미 있음
+    """
+    curs = conn.cursor()
+    # 만료되었거나 처리하던 서버가 죽은 키는 지우고 새로 선점
+    curs.execute("""
+        DELETE FROM idempotency_key
+        WHERE scope = %s AND idem_key = %s
+        AND (expires_at < NOW() OR (status = %s AND created_at < NOW() - INTERVAL %s SECOND))
+    """, (scope, key, STATUS_PROCESSING, stale_after))
+    try:
+        curs.execute("""
+            INSERT INTO idempotency_key (scope, idem_key, request_hash, status, created_at, expires_at)
+            VALUES (%s, %s, %s, %s, NOW(), NOW() + INTERVAL %s SECOND)
+        """, (scope, key, req_hash, STATUS_PROCESSING, ttl))
+        conn.commit()
+        return True, None
+    except pymysql.err.IntegrityError:
+        conn.rollback()
+    curs.execute("""
+        SELECT status, request_hash, response, TIMESTAMPDIFF(SECOND, NOW(), expires_at)
+        FROM idempotency_key
+        WHERE scope = %s AND idem_key = %s
+    """, (scope, key))
+    row = curs.fetchone()
+    if row is None:
+        # 조회 직전에 다른 요청이 실패해 키를 지운 경우: 다시 선점 시도
+        return False, None
+    return False, row
+
+
+class IdempotencyStore:
+    """Idempotency-Key별 응답 저장소 (DB + 프로세스별 메모리 캐시)"""
+
+    def __init__(self, ttl: int = IDEMPOTENCY_TTL, wait_timeout: float = IDEMPOTENCY_WAIT_TIMEOUT,
+                 stale_after: int = IDEMPOTENCY_STALE_AFTER, max_entries: int = IDEMPOTENCY_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.stale_after = stale_after
+        self.max_entries = max_entries
+        # (scope, key) → (만료 시각, request_hash, response)
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, str, Any]]" = OrderedDict()
+        # (scope, key) → 같은 프로세스에서 실행 중인 첫 요청 Task (결과: request_hash, response, replayed)
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._last_purge = 0.0
+        # DONE 저장을 재시도 중인 Task (참조 유지용)
+        self._persisting: set = set()
+        self._stats = {"executed": 0, "memory_hits": 0, "db_hits": 0, "joined": 0, "conflicts": 0,
+                       "persist_failures": 0}
+
+    # ----------------------------------------
+    # 외부 API
+    # ----------------------------------------
+    async def respond(self, scope: str, key: Optional[str], response: Optional[Response],
+                      fn: Callable[[], Awaitable[Any]], *request_parts: Any, error_key: str = 'result') -> Any:
+        """
+        엔드포인트용: 키가 없으면 그대로 실행, 있으면 저장된 응답을 돌려주거나 한 번만 실행
+
+        Args:
+            scope: 키 범위 (API 이름, 다른 API의 같은 키와 구분)
+            key: Idempotency-Key 헤더 값
+            response: 응답 헤더(Idempotent-Replayed)를 설정할 Response
+            fn: 실제 처리 (인자 없는 코루틴 함수)
+            request_parts: 요청 본문 (같은 키로 다른 요청이 오는지 확인용)
+            error_key: 이 API의 오류 응답 키 ("result" 또는 "results")
+        """
+        if not key:
+            return await fn()
+        if len(key) > MAX_KEY_LENGTH:
+            return {error_key: "Error", "errorMsg": f"Idempotency-Key는 {MAX_KEY_LENGTH}자 이하여야 합니다."}
+
+        req_hash = request_hash(*request_parts)
+        stored_hash, result, replayed = await self.run(scope, key, req_hash, fn)
+        if stored_hash != req_hash:
+            self._stats["conflicts"] += 1
+            return {error_key: "Error", "errorMsg": "이미 다른 요청에 사용된 Idempotency-Key입니다."}
+        if result is None:
+            return {error_key: "Error", "errorMsg": "같은 요청을 처리 중입니다. 잠시 후 다시 시도해주세요."}
+        if replayed and response is not None:
+            response.headers["Idempotent-Replayed"] = "true"
+        return result
+
+    async def run(self, scope: str, key: str, req_hash: str,
+                  fn: Callable[[], Awaitable[Any]]) -> Tuple[str, Any, bool]:
+        """
+        키당 한 번만 실행
+        반환: (키에 저장된 request_hash, 응답, 저장된 응답 여부)
+              응답이 None이면 다른 프로세스가 처리 중 (대기 시간 초과)
+        """
+        ident = (scope, key)
+
+        cached = self._cache_get(ident)
+        if cached is not None:
+            self._stats["memory_hits"] += 1
+            return cached[1], cached[2], True
+
+        task = self._inflight.get(ident)
+        if task is not None:
+            # 같은 프로세스에서 실행 중인 첫 요청 결과를 함께 사용
+            self._stats["joined"] += 1
+            stored_hash, result, _ = await asyncio.shield(task)
+            return stored_hash, result, not is_error_response(result)
+
+        # 별도 Task로 실행: 첫 요청의 연결이 끊겨도(취소) 실행과 결과 저장은 끝까지 진행
+        task = asyncio.ensure_future(self._execute(scope, key, req_hash, fn))
+        self._inflight[ident] = task
+        task.add_done_callback(lambda done: self._finish(ident, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, ident: Tuple[str, str], task: asyncio.Task) -> None:
+        self._inflight.pop(ident, None)
+        # 기다리던 요청이 모두 끊긴 경우 "Task exception was never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict:
+        """저장소 지표"""
+        return {**self._stats, "cached": len(self._cache), "inflight": len(self._inflight),
+                "persist_pending": len(self._persisting)}
+
+    # ----------------------------------------
+    # 내부
+    # ----------------------------------------
+    async def _execute(self, scope: str, key: str, req_hash: str,
+                       fn: Callable[[], Awaitable[Any]]) -> Tuple[str, Any, bool]:
+        await self._maybe_purge()
+
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            claimed, row = await run_db(_claim, scope, key, req_hash, self.ttl, self.stale_after)
+            if claimed:
+                break
+            if row is not None:
+                status, stored_hash, stored_response, remaining = row
+                if status == STATUS_DONE:
+                    result = json.loads(stored_response) if isinstance(stored_response, (str, bytes)) else stored_response
+                    self._cache_put((scope, key), stored_hash, result, remaining)
+                    self._stats["db_hits"] += 1
+                    return stored_hash, result, True
+                if stored_hash != req_hash:
+                    return stored_hash, None, False
+            # 다른 프로세스가 처리 중: 끝날 때까지 대기
+            if time.monotonic() >= deadline:
+                return req_hash, None, False
+            await asyncio.sleep(IDEMPOTENCY_POLL_INTERVAL)
+
+        try:
+            self._stats["executed"] += 1
+            result = await fn()
+        except BaseException:
+            await self._release(scope, key)
+            raise
+
+        if is_error_response(result):
+            # 실패 응답은 저장하지 않음 (같은 키로 다시 시도 가능)
+            await self._release(scope, key)
+            return req_hash, result, False
+
+        # reserve / pay는 이미 커밋됨: 여기서부터는 실패해도 응답을 돌려줘야 함
+        self._cache_put((scope, key), req_hash, result, self.ttl)
+        payload = json.dumps(jsonable_encoder(result), ensure_ascii=False)
+        try:
+            await self._persist(scope, key, payload)
+        except Exception as e:
+            self._stats["persist_failures"] += 1
+            print(f"⚠️  Idempotency-Key 응답 저장 실패, 백그라운드 재시도 ({scope}/{key}): {e}")
+            task = asyncio.ensure_future(self._persist_later(scope, key, payload))
+            self._persisting.add(task)
+            task.add_done_callback(self._persisting.discard)
+        return req_hash, result, False
+
+    async def _persist(self, scope: str, key: str, payload: str) -> None:
+        await execute("""
+            UPDATE idempotency_key SET status = %s, response = %s
+            WHERE scope = %s AND idem_key = %s
+        """, (STATUS_DONE, payload, scope, key))
+
+    async def _persist_later(self, scope: str, key: str, payload: str) -> None:
+        for delay in IDEMPOTENCY_PERSIST_RETRY_DELAYS:
+            await asyncio.sleep(delay)
+            try:
+                await self._persist(scope, key, payload)
+                return
+            except Exception as e:
+                print(f"⚠️  Idempotency-Key 응답 저장 재시도 실패 ({scope}/{key}): {e}")
+        # 이 프로세스의 재시도는 메모리 캐시로 계속 막히지만, 다른 프로세스는 STALE_AFTER 후 새 요청으로 처리할 수 있음
+        print(f"❌ Idempotency-Key 응답 저장 포기 ({scope}/{key}) - 중복 요청 확인 필요")
+
+    async def _release(self, scope: str, key: str) -> None:
+        try:
+            await execute("""
+                DELETE FROM idempotency_key WHERE scope = %s AND idem_key = %s AND status = %s
+            """, (scope, key, STATUS_PROCESSING))
+        except Exception as e:
+            # 삭제하지 못해도 IDEMPOTENCY_STALE_AFTER 후 다른 요청이 넘겨받음
+            print(f"⚠️  Idempotency-Key 해제 실패 ({scope}/{key}): {e}")
+
+    async def _maybe_purge(self) -> None:
+        now = time.monotonic()
+        if now - self._last_purge < IDEMPOTENCY_PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        try:
+            await execute("DELETE FROM idempotency_key WHERE expires_at < NOW() LIMIT 1000")
+        except Exception as e:
+            print(f"⚠️  만료된 Idempotency-Key 삭제 실패: {e}")
+
+    def _cache_get(self, ident: Tuple[str, str]) -> Optional[Tuple[float, str, Any]]:
+        entry = self._cache.get(ident)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._cache[ident]
+            return None
+        self._cache.move_to_end(ident)
+        return entry
+
+    def _cache_put(self, ident: Tuple[str, str], req_hash: str, result: Any, ttl: Optional[int]) -> None:
+        if not ttl or ttl <= 0:
+            return
+        self._cache[ident] = (time.monotonic() + ttl, req_hash, result)
+        self._cache.move_to_end(ident)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+
+# 프로세스 전역 저장소
+idempotency_store = IdempotencyStore()
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: Idempotency-Key 중복 요청 방지 저장소 (DB idempotency_key + 메모리 캐시, 동시 중복 요청 합치기)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - IdempotencyStore.respond / run / stats
+#   - IDEMPOTENCY_TTL / IDEMPOTENCY_WAIT_TIMEOUT / IDEMPOTENCY_STALE_AFTER /
+#     IDEMPOTENCY_CACHE_MAX_ENTRIES / IDEMPOTENCY_PURGE_INTERVAL 환경변수
+#
+# 2026-01-22 김택권: DONE 저장 실패 처리
+#   - 실행 성공 후 응답 저장(UPDATE)이 실패해도 500 대신 응답 반환, 메모리 캐시 + 백그라운드 재저장
+#   - IDEMPOTENCY_PERSIST_RETRY_DELAYS 환경변수, stats에 persist_failures / persist_pending
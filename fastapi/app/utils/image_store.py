@@ -0,0 +1,409 @@
+"""
+메뉴 / 식당 이미지 제공 (image_store)
+IMAGE_DIR의 이미지 파일을 내용 해시 ETag, Last-Modified, Range와 함께 제공하고
+목록 화면용 너비별 축소본을 IMAGE_CACHE_DIR(로컬 디스크)에 만들어 재사용
+작성일: 2026-01-22
+작성자: 김택권
+
+동작:
+    - 파일 정보(내용 SHA-256, 실제 형식)는 (경로, 수정 시각, 크기)를 키로 메모리에 캐시 → 파일이 바뀌면 자동으로 다시 계산
+    - ETag: 원본은 "<해시>", 축소본은 "<해시>-w<너비>" (내용이 같으면 항상 같은 값)
+    - Content-Type: 확장자가 아닌 파일 앞부분(매직 바이트)으로 판별 (jpg 이름의 png 등)
+    - 캐시: 요청에 v=<해시 앞 12자리>가 있고 현재 파일과 같으면 1년 immutable,
+      그 외(menu_seq 기반 주소 등 내용이 바뀔 수 있는 주소)는 no-cache + ETag로 재검증(304)
+    - 축소본: w를 IMAGE_VARIANT_WIDTHS 중 같거나 큰 너비로 맞춘 뒤, 원본 해시별 파일로 저장
+      (생성은 이미지 전용 프로세스 풀에서, 같은 축소본 동시 요청은 한 번만 생성)
+      원본이 더 작거나 GIF이거나 Pillow가 없으면 원본 제공
+    - 축소본 폴더는 언제 지워도 됨 (다음 요청 때 다시 생성)
+
+사용 예시:
+    from ..utils.image_store import image_store, serve_image
+
+    return await serve_image(request, menu_image, w, v)          # 엔드포인트에서
+    url = await image_store.image_url(menu_image, width=320)       # 목록 응답에 넣을 버전 주소
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi.responses import FileResponse, JSONResponse, Response
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    # Pillow가 없으면 축소본 없이 원본만 제공
+    Image = None
+
+# 원본 이미지 폴더 (앱이 https://cheng80.myqnapcloud.com/tablenow/<파일명>으로 읽는 폴더)
+IMAGE_DIR = os.getenv('IMAGE_DIR', '/share/Web/tablenow')
+
+# 축소본 저장 폴더 (API 서버 로컬 디스크)
+IMAGE_CACHE_DIR = os.getenv(
+    'IMAGE_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'image_cache'),
+)
+
+# 허용 너비 (요청한 w는 이 중 같거나 큰 값으로 맞춤, 가장 큰 값보다 크면 원본)
+IMAGE_VARIANT_WIDTHS = sorted(int(w) for w in os.getenv('IMAGE_VARIANT_WIDTHS', '160,320,640,1080').split(',') if w.strip())
+
+# 축소본 JPEG / WEBP 품질
+IMAGE_QUALITY = int(os.getenv('IMAGE_QUALITY', '82'))
+
+# 버전 주소(v=)로 요청한 경우의 캐시 시간 (초, 기본 1년)
+IMAGE_MAX_AGE = int(os.getenv('IMAGE_MAX_AGE', str(365 * 24 * 3600)))
+
+# 파일 정보(해시 / 형식) 캐시 항목 수
+IMAGE_INFO_CACHE_SIZE = int(os.getenv('IMAGE_INFO_CACHE_SIZE', '4096'))
+
+# 이미지 처리 전용 프로세스 수 (0이면 프로세스 풀 없이 스레드에서 처리)
+IMAGE_WORKERS = int(os.getenv('IMAGE_WORKERS', str(min(2, os.cpu_count() or 1))))
+
+# 프로세스 시작 방식 (password_hasher와 같은 이유로 기본 spawn)
+IMAGE_START_METHOD = os.getenv('IMAGE_START_METHOD', 'spawn')
+
+VERSION_LENGTH = 12
+
+# 파일명: 경로 구분자 없이 글자 / 숫자 / _ / - / . 만 (숨김 파일 제외)
+_NAME_PATTERN = re.compile(r'^[\w\-][\w\-.]*$')
+
+# (매직 바이트 검사 함수, Content-Type, Pillow 저장 형식)
+_SIGNATURES = (
+    (lambda head: head.startswith(b'\xff\xd8\xff'), 'image/jpeg', 'JPEG'),
+    (lambda head: head.startswith(b'\x89PNG\r\n\x1a\n'), 'image/png', 'PNG'),
+    (lambda head: head[:4] == b'RIFF' and head[8:12] == b'WEBP', 'image/webp', 'WEBP'),
+    (lambda head: head[:6] in (b'GIF87a', b'GIF89a'), 'image/gif', 'GIF'),
+)
+
+_VARIANT_EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class ImageInfo(NamedTuple):
+    """원본 파일 정보"""
+    path: str
+    size: int
+    mtime: float
+    digest: str
+    media_type: str
+    image_format: Optional[str]
+
+    @property
+    def version(self) -> str:
+        return self.digest[:VERSION_LENGTH]
+
+
+class ServedImage(NamedTuple):
+    """응답할 파일 (원본 또는 축소본)"""
+    path: str
+    etag: str
+    last_modified: float
+    media_type: str
+    version: str
+
+
+def sniff_media_type(head: bytes) -> Tuple[str, Optional[str]]:
+    """파일 앞부분 → (Content-Type, Pillow 형식), 알 수 없으면 application/octet-stream"""
+    for match, media_type, image_format in _SIGNATURES:
+        if match(head):
+            return media_type, image_format
+    return 'application/octet-stream', None
+
+
+def resolve_image_path(name: Optional[str], base_dir: str = IMAGE_DIR) -> Optional[str]:
+    """DB에 저장된 파일명 → IMAGE_DIR 안의 경로 (경로 조작이 들어간 이름이면 None)"""
+    if not name or not _NAME_PATTERN.match(name):
+        return None
+    return os.path.join(base_dir, name)
+
+
+def select_width(width: Optional[int]) -> Optional[int]:
+    """요청 너비 → 허용 너비 (없거나 가장 큰 허용 너비보다 크면 None = 원본)"""
+    if not width or width <= 0:
+        return None
+    for allowed in IMAGE_VARIANT_WIDTHS:
+        if allowed >= width:
+            return allowed
+    return None
+
+
+# ============================================
+# 동기 함수 (스레드 / 프로세스 풀에서 실행)
+# ============================================
+def _read_info_sync(path: str, st: os.stat_result) -> ImageInfo:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        head = f.read(64 * 1024)
+        digest.update(head)
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    media_type, image_format = sniff_media_type(head)
+    return ImageInfo(path, st.st_size, st.st_mtime, digest.hexdigest(), media_type, image_format)
+
+
+def resize_image_sync(src: str, dst: str, width: int, image_format: str, quality: int = IMAGE_QUALITY) -> bool:
+    """
+    src를 너비 width로 줄여 dst에 저장 (임시 파일에 쓴 뒤 교체)
+
+    Returns:
+        bool: 원본이 width보다 넓어 축소본을 만들었으면 True
+    """
+    with Image.open(src) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width <= width:
+            return False
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        if image_format == 'JPEG' and resized.mode not in ('RGB', 'L'):
+            resized = resized.convert('RGB')
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        tmp = f"{dst}.{os.getpid()}.tmp"
+        options = {'quality': quality} if image_format in ('JPEG', 'WEBP') else {}
+        if image_format == 'JPEG':
+            options.update(optimize=True, progressive=True)
+        resized.save(tmp, image_format, **options)
+    os.replace(tmp, dst)
+    return True
+
+
+# ============================================
+# 이미지 처리 프로세스 풀
+# ============================================
+def get_image_pool() -> Optional[ProcessPoolExecutor]:
+    """이미지 처리 전용 프로세스 풀 (최초 호출 시 생성, IMAGE_WORKERS=0이면 None)"""
+    global _pool
+    if IMAGE_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=IMAGE_WORKERS,
+                    mp_context=multiprocessing.get_context(IMAGE_START_METHOD),
+                )
+    return _pool
+
+
+def shutdown_image_pool():
+    """이미지 처리 프로세스 풀 종료 (애플리케이션 종료 시 호출)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+async def run_image_task(fn, *args):
+    """CPU를 쓰는 이미지 작업을 프로세스 풀에서 실행 (풀이 깨졌으면 새 풀로 한 번 재시도)"""
+    global _pool
+    loop = asyncio.get_running_loop()
+    pool = get_image_pool()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        print("⚠️  이미지 처리 프로세스 풀 재생성")
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        pool.shutdown(wait=False)
+        return await loop.run_in_executor(get_image_pool(), fn, *args)
+
+
+# ============================================
+# 이미지 저장소
+# ============================================
+class ImageStore:
+    """원본 파일 정보 캐시 + 너비별 축소본 생성 / 재사용"""
+
+    def __init__(self, image_dir: str = IMAGE_DIR, cache_dir: str = IMAGE_CACHE_DIR,
+                 max_entries: int = IMAGE_INFO_CACHE_SIZE):
+        self.image_dir = image_dir
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._info: "OrderedDict[str, Tuple[Tuple, ImageInfo]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, int], asyncio.Task] = {}
+        # 원본이 더 작아 축소본이 필요 없는 (해시, 너비)
+        self._original_only: set = set()
+        self._stats = {"info_hits": 0, "info_misses": 0, "variant_hits": 0, "variants_created": 0, "variant_errors": 0}
+        self._warned_no_pillow = False
+
+    async def info(self, name: Optional[str]) -> Optional[ImageInfo]:
+        """파일명 → 원본 정보 (없는 파일이면 None)"""
+        path = resolve_image_path(name, self.image_dir)
+        if path is None:
+            return None
+        try:
+            st = await asyncio.to_thread(os.stat, path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._info.get(path)
+        if cached is not None and cached[0] == key:
+            self._info.move_to_end(path)
+            self._stats["info_hits"] += 1
+            return cached[1]
+
+        self._stats["info_misses"] += 1
+        info = await asyncio.to_thread(_read_info_sync, path, st)
+        self._info[path] = (key, info)
+        self._info.move_to_end(path)
+        while len(self._info) > self.max_entries:
+            self._info.popitem(last=False)
+        return info
+
+    def variant_path(self, info: ImageInfo, width: int) -> str:
+        ext = _VARIANT_EXTENSIONS[info.image_format]
+        return os.path.join(self.cache_dir, info.digest[:2], f"{info.digest}_w{width}.{ext}")
+
+    async def get(self, name: Optional[str], width: Optional[int] = None) -> Optional[ServedImage]:
+        """
+        응답할 이미지 (원본 또는 width에 맞는 축소본)
+
+        Returns:
+            None: 파일 없음
+        """
+        info = await self.info(name)
+        if info is None:
+            return None
+        original = ServedImage(info.path, f'"{info.digest}"', info.mtime, info.media_type, info.version)
+        width = select_width(width)
+        if width is None or info.image_format not in _VARIANT_EXTENSIONS:
+            return original
+        if Image is None:
+            if not self._warned_no_pillow:
+                self._warned_no_pillow = True
+                print("⚠️  Pillow가 설치되지 않아 이미지 축소본 없이 원본을 제공합니다.")
+            return original
+        if (info.digest, width) in self._original_only:
+            return original
+
+        path = self.variant_path(info, width)
+        if not await asyncio.to_thread(os.path.exists, path):
+            if not await self._create_variant(info, width, path):
+                return original
+        else:
+            self._stats["variant_hits"] += 1
+        return ServedImage(path, f'"{info.digest}-w{width}"', info.mtime, info.media_type, info.version)
+
+    async def _create_variant(self, info: ImageInfo, width: int, path: str) -> bool:
+        key = (info.digest, width)
+        task = self._inflight.get(key)
+        if task is None:
+            # 별도 Task로 실행: 먼저 요청한 쪽이 끊겨도 기다리는 요청은 결과를 받음
+            task = asyncio.ensure_future(run_image_task(resize_image_sync, info.path, path, width, info.image_format))
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self._inflight[key] = task
+        try:
+            created = await asyncio.shield(task)
+        except Exception as e:
+            # 손상된 이미지 등: 원본 제공
+            self._stats["variant_errors"] += 1
+            print(f"⚠️  이미지 축소본 생성 실패 ({info.path}, w={width}): {e}")
+            return False
+        if created:
+            self._stats["variants_created"] += 1
+        else:
+            self._original_only.add(key)
+        return created
+
+    async def image_url(self, name: Optional[str], width: Optional[int] = None, prefix: str = "/api/image") -> Optional[str]:
+        """immutable 캐시가 적용되는 버전 주소 (파일이 없으면 None)"""
+        info = await self.info(name)
+        if info is None:
+            return None
+        url = f"{prefix}/{quote(name)}?v={info.version}"
+        width = select_width(width)
+        return f"{url}&w={width}" if width else url
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "info_entries": len(self._info),
+            "inflight": len(self._inflight),
+            "pillow": Image is not None,
+            "workers": IMAGE_WORKERS,
+        }
+
+
+# ============================================
+# 응답
+# ============================================
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match는 약한 비교 (W/ 접두어 무시)
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag == '*' or (tag[2:] if tag.startswith('W/') else tag) == etag:
+            return True
+    return False
+
+
+def _not_modified(request, served: ServedImage) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, served.etag)
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            return int(served.last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def serve_image(request, name: Optional[str], width: Optional[int] = None, version: Optional[str] = None,
+                      store: Optional[ImageStore] = None):
+    """
+    이미지 응답 (조건부 요청 304, Range 206은 FileResponse가 처리)
+
+    Args:
+        version: 요청 주소의 v 값 (현재 파일 버전과 같으면 immutable 캐시)
+    """
+    served = await (store or image_store).get(name, width)
+    if served is None:
+        return JSONResponse({"result": "Error", "message": "No image"}, status_code=404)
+
+    if version and version == served.version:
+        cache_control = f"public, max-age={IMAGE_MAX_AGE}, immutable"
+    else:
+        # 내용이 바뀔 수 있는 주소: 매번 재검증하되 바뀌지 않았으면 304
+        cache_control = "public, no-cache"
+    headers = {
+        "ETag": served.etag,
+        "Last-Modified": formatdate(served.last_modified, usegmt=True),
+        "Cache-Control": cache_control,
+    }
+    if _not_modified(request, served):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(served.path, media_type=served.media_type, headers=headers)
+
+
+# 프로세스 전역 이미지 저장소
+image_store = ImageStore()
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 이미지 제공 - 내용 해시 ETag / Last-Modified / Range, 버전 주소 immutable 캐시, 너비별 축소본 디스크 캐시
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - ImageStore (info / get / image_url / stats), serve_image
+#   - 이미지 처리 프로세스 풀 (get_image_pool / run_image_task / shutdown_image_pool)
+#   - IMAGE_DIR / IMAGE_CACHE_DIR / IMAGE_VARIANT_WIDTHS / IMAGE_QUALITY / IMAGE_MAX_AGE
+#     / IMAGE_INFO_CACHE_SIZE / IMAGE_WORKERS / IMAGE_START_METHOD 환경변수
@@ -0,0 +1,404 @@
+"""
+이미지 업로드 (image_upload)
+NAS의 upload_image.php를 거치지 않고 API 서버가 multipart 본문을 직접 받아 IMAGE_DIR에 저장
+작성일: 2026-01-22
+작성자: 김택권
+
+동작:
+    - 본문 수신: request.stream()을 python-multipart 파서에 바로 넣고, 파일 부분은 모아 둔 조각이
+      IMAGE_UPLOAD_FLUSH_BYTES를 넘을 때마다 스레드에서 임시 파일에 쓰면서 SHA-256을 함께 계산
+      (UploadFile / SpooledTemporaryFile로 본문 전체를 메모리나 두 번째 파일에 담지 않음)
+    - 크기 제한: Content-Length가 IMAGE_UPLOAD_MAX_BYTES를 넘으면 본문을 읽기 전에 413,
+      Content-Length 없이 보내도 받은 양이 넘는 순간 413
+    - 파일명: "<업로드 내용 SHA-256>.<확장자>" → 같은 파일을 다시 올리면 처리 없이 기존 파일 재사용,
+      내용이 바뀌면 이름도 바뀌므로 image_store의 버전 주소와 함께 immutable 캐시 가능
+      (같은 파일이 동시에 올라오면 처리는 한 번만 하고 나머지는 결과를 기다림)
+    - 처리(이미지 전용 프로세스 풀, image_store.run_image_task):
+        Pillow로 끝까지 디코딩해 손상 / 위장 파일은 415,
+        EXIF 회전 적용, 긴 변이 IMAGE_UPLOAD_MAX_DIM보다 크면 축소 (JPEG는 draft로 줄여서 디코딩),
+        JPEG / PNG / WEBP는 형식 유지, GIF는 그대로, 그 외(BMP / TIFF / MPO 등)는 JPEG(투명이면 PNG)로 변환
+        바꿀 것이 없으면 다시 인코딩하지 않고 받은 파일 그대로 저장
+    - 저장: 임시 파일은 IMAGE_DIR 안의 .upload 폴더 → 같은 파일 시스템에서 os.replace (반쯤 쓴 파일이 보이지 않음)
+    - Pillow가 없으면 매직 바이트로 JPEG / PNG / WEBP / GIF만 받고 변환 없이 저장
+
+사용 예시:
+    from ..utils.image_upload import UploadError, handle_image_upload, upload_result
+
+    upload, stored = await handle_image_upload(request)   # 필드: upload.fields, 저장 파일명: stored.file_name
+    await execute("UPDATE menu SET menu_image=%s WHERE menu_seq=%s", (stored.file_name, menu_seq))
+    return await upload_result(stored)
+"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from .image_store import IMAGE_DIR, IMAGE_QUALITY, image_store, run_image_task, sniff_media_type
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:
+    # python-multipart 0.0.13 미만은 multipart 패키지 이름 사용
+    from multipart.multipart import MultipartParser, parse_options_header
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    # Pillow가 없으면 검증 / 변환 없이 매직 바이트 확인 후 저장
+    Image = None
+
+# 업로드 최대 크기 (바이트, 기본 10MB)
+IMAGE_UPLOAD_MAX_BYTES = int(os.getenv('IMAGE_UPLOAD_MAX_BYTES', str(10 * 1024 * 1024)))
+
+# 저장할 이미지의 긴 변 최대 픽셀 (넘으면 축소)
+IMAGE_UPLOAD_MAX_DIM = int(os.getenv('IMAGE_UPLOAD_MAX_DIM', '2048'))
+
+# 임시 파일 쓰기 단위 (바이트): 이만큼 모이면 스레드에서 한 번에 기록
+IMAGE_UPLOAD_FLUSH_BYTES = int(os.getenv('IMAGE_UPLOAD_FLUSH_BYTES', str(1024 * 1024)))
+
+# 업로드 임시 폴더 (IMAGE_DIR과 같은 파일 시스템이어야 os.replace로 옮길 수 있음)
+IMAGE_UPLOAD_TMP_DIR = os.getenv('IMAGE_UPLOAD_TMP_DIR', os.path.join(IMAGE_DIR, '.upload'))
+
+# 파일 이외 필드 개수 / 크기 제한
+MAX_FIELDS = 16
+MAX_FIELD_BYTES = 1024
+
+# 형식 유지 대상 (Pillow 형식 → 확장자)
+_KEEP_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp', 'GIF': 'gif'}
+_EXTENSIONS = tuple(_KEEP_FORMATS.values())
+
+# EXIF 회전 정보 태그
+_ORIENTATION_TAG = 0x0112
+
+
+class UploadError(Exception):
+    """업로드 거절 (status_code: 400 잘못된 요청 / 413 크기 초과 / 415 이미지 아님)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ReceivedUpload(NamedTuple):
+    """디스크에 받아 둔 업로드 파일"""
+    tmp_path: str
+    size: int
+    digest: str
+    filename: Optional[str]
+    fields: Dict[str, str]
+
+
+class StoredImage(NamedTuple):
+    """IMAGE_DIR에 저장된 이미지"""
+    file_name: str
+    size: int
+    width: Optional[int]
+    height: Optional[int]
+    deduplicated: bool
+
+
+# ============================================
+# 본문 수신
+# ============================================
+class _UploadReceiver:
+    """python-multipart 콜백 → 필드 / 파일 조각 수집 (파일 쓰기는 receive에서 스레드로)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.size = 0
+        self.pending = bytearray()
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._name: Optional[str] = None
+        self._in_file = False
+        self._file_seen = False
+        self._field_data = bytearray()
+        self.complete = False
+
+    def callbacks(self) -> Dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_end": self.on_end,
+        }
+
+    def on_part_begin(self):
+        self._disposition = b""
+        self._name = None
+        self._in_file = False
+        self._field_data = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        if b"name" not in options:
+            raise UploadError("Content-Disposition에 name이 없습니다.")
+        self._name = options[b"name"].decode("utf-8", "replace")
+        if b"filename" in options:
+            if self._file_seen:
+                raise UploadError("파일은 한 번에 하나만 올릴 수 있습니다.")
+            self._file_seen = True
+            self._in_file = True
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+        elif len(self.fields) >= MAX_FIELDS:
+            raise UploadError("필드가 너무 많습니다.")
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if self._in_file:
+            self.size += end - start
+            if self.size > self.max_bytes:
+                raise UploadError(f"파일이 너무 큽니다. (최대 {self.max_bytes // 1024 // 1024}MB)", 413)
+            self.pending += data[start:end]
+        else:
+            self._field_data += data[start:end]
+            if len(self._field_data) > MAX_FIELD_BYTES:
+                raise UploadError(f"필드 값이 너무 깁니다: {self._name}")
+
+    def on_part_end(self):
+        if not self._in_file:
+            self.fields[self._name] = self._field_data.decode("utf-8", "replace")
+        self._in_file = False
+
+    def on_end(self):
+        self.complete = True
+
+
+def _write_chunk(f, digest, data: bytes):
+    f.write(data)
+    digest.update(data)
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def receive_image_upload(request, max_bytes: int = IMAGE_UPLOAD_MAX_BYTES,
+                               tmp_dir: str = IMAGE_UPLOAD_TMP_DIR) -> ReceivedUpload:
+    """
+    multipart/form-data 본문을 읽으며 파일 부분을 임시 파일에 저장 (메모리에는 쓰기 단위만큼만 보관)
+
+    Raises:
+        UploadError: multipart 아님 / 파일 없음 / 크기 초과
+    """
+    content_type = request.headers.get("content-type", "")
+    media_type, params = parse_options_header(content_type)
+    if media_type != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadError("multipart/form-data 형식으로 보내야 합니다.")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + 64 * 1024:
+        # 본문을 받기 전에 거절 (파일 외 필드 / 경계 문자열 여유분 64KB)
+        raise UploadError(f"파일이 너무 큽니다. (최대 {max_bytes // 1024 // 1024}MB)", 413)
+
+    await asyncio.to_thread(os.makedirs, tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, f"{uuid.uuid4().hex}.part")
+    receiver = _UploadReceiver(max_bytes)
+    parser = MultipartParser(params[b"boundary"], receiver.callbacks())
+    digest = hashlib.sha256()
+    f = await asyncio.to_thread(open, tmp_path, "wb")
+    try:
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                if len(receiver.pending) >= IMAGE_UPLOAD_FLUSH_BYTES:
+                    data, receiver.pending = bytes(receiver.pending), bytearray()
+                    await asyncio.to_thread(_write_chunk, f, digest, data)
+            parser.finalize()
+            if receiver.pending:
+                await asyncio.to_thread(_write_chunk, f, digest, bytes(receiver.pending))
+                receiver.pending = bytearray()
+        finally:
+            f.close()
+        if not receiver.complete:
+            raise UploadError("업로드 본문이 중간에 끊겼습니다.")
+        if receiver.filename is None or receiver.size == 0:
+            raise UploadError("업로드할 파일(file)이 없습니다.")
+    except BaseException as e:
+        # 연결 끊김 / 취소 포함: 임시 파일은 바로 삭제
+        _remove_quietly(tmp_path)
+        if isinstance(e, ValueError) and not isinstance(e, UploadError):
+            # python-multipart 파싱 오류 (MultipartParseError는 ValueError)
+            raise UploadError(f"잘못된 multipart 본문입니다: {e}") from e
+        raise
+    return ReceivedUpload(tmp_path, receiver.size, digest.hexdigest(), receiver.filename, receiver.fields)
+
+
+# ============================================
+# 처리 (프로세스 풀에서 실행)
+# ============================================
+def process_upload_sync(path: str, max_dim: int = IMAGE_UPLOAD_MAX_DIM,
+                        quality: int = IMAGE_QUALITY) -> Tuple[str, Optional[int], Optional[int]]:
+    """
+    받은 파일 검증 후 필요하면 회전 / 축소 / 변환해 같은 경로에 덮어씀
+
+    Returns:
+        (확장자, 너비, 높이)
+
+    Raises:
+        ValueError: 이미지가 아니거나 손상된 파일
+    """
+    if Image is None:
+        with open(path, 'rb') as f:
+            _, image_format = sniff_media_type(f.read(16))
+        if image_format not in _KEEP_FORMATS:
+            raise ValueError("지원하지 않는 이미지 형식입니다.")
+        return _KEEP_FORMATS[image_format], None, None
+
+    try:
+        with Image.open(path) as image:
+            image_format = image.format
+            if image_format == 'GIF':
+                # 움직이는 GIF는 프레임을 유지하기 위해 그대로 저장 (첫 프레임만 디코딩해 검증)
+                image.load()
+                return 'gif', image.width, image.height
+            orientation = image.getexif().get(_ORIENTATION_TAG, 1)
+            target = image_format if image_format in ('JPEG', 'PNG', 'WEBP') else None
+            if target is None:
+                has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+                target = 'PNG' if has_alpha else 'JPEG'
+            scale = max_dim / max(image.size)
+            if target == image_format and orientation == 1 and scale >= 1:
+                # 끝까지 디코딩해 잘린 / 손상된 파일 거절
+                image.load()
+                return _KEEP_FORMATS[target], image.width, image.height
+
+            if scale < 1 and image_format == 'JPEG':
+                # 큰 JPEG는 디코딩 단계에서 1/2 ~ 1/8로 줄여 읽음 (결과 크기 이상으로만 줄어듦)
+                image.draft(image.mode, (round(image.width * scale), round(image.height * scale)))
+            output = ImageOps.exif_transpose(image)
+            output.thumbnail((max_dim, max_dim), Image.LANCZOS)
+            if target == 'JPEG' and output.mode not in ('RGB', 'L'):
+                output = output.convert('RGB')
+            options = {'quality': quality} if target in ('JPEG', 'WEBP') else {}
+            if target == 'JPEG':
+                options.update(optimize=True, progressive=True)
+            tmp = f"{path}.out"
+            output.save(tmp, target, **options)
+            size = output.size
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as e:
+        _remove_quietly(f"{path}.out")
+        raise ValueError("이미지 파일이 아니거나 손상된 파일입니다.") from e
+    os.replace(tmp, path)
+    return _KEEP_FORMATS[target], size[0], size[1]
+
+
+# ============================================
+# 저장
+# ============================================
+def _find_existing(digest: str, image_dir: str) -> Optional[str]:
+    for ext in _EXTENSIONS:
+        name = f"{digest}.{ext}"
+        if os.path.exists(os.path.join(image_dir, name)):
+            return name
+    return None
+
+
+def _publish(tmp_path: str, dst: str) -> int:
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, dst)
+    return os.path.getsize(dst)
+
+
+# 처리 중인 업로드 (내용 해시 → Task): 같은 파일이 동시에 올라오면 한 번만 처리
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+async def _process_and_publish(tmp_path: str, digest: str,
+                               image_dir: str) -> Tuple[str, int, Optional[int], Optional[int]]:
+    try:
+        try:
+            ext, width, height = await run_image_task(process_upload_sync, tmp_path)
+        except ValueError as e:
+            raise UploadError(str(e), 415) from e
+        file_name = f"{digest}.{ext}"
+        size = await asyncio.to_thread(_publish, tmp_path, os.path.join(image_dir, file_name))
+        return file_name, size, width, height
+    finally:
+        await asyncio.to_thread(_remove_quietly, tmp_path)
+
+
+async def store_image_upload(upload: ReceivedUpload, image_dir: str = IMAGE_DIR) -> StoredImage:
+    """
+    받은 파일을 처리해 IMAGE_DIR에 "<해시>.<확장자>"로 저장 (같은 내용이 이미 있거나 처리 중이면 재사용)
+
+    Raises:
+        UploadError: 이미지가 아닌 파일 (415)
+    """
+    task = _inflight.get(upload.digest)
+    if task is None:
+        existing = await asyncio.to_thread(_find_existing, upload.digest, image_dir)
+        if existing is not None:
+            await asyncio.to_thread(_remove_quietly, upload.tmp_path)
+            size = await asyncio.to_thread(os.path.getsize, os.path.join(image_dir, existing))
+            return StoredImage(existing, size, None, None, True)
+        task = _inflight.get(upload.digest)
+    if task is not None:
+        # 같은 내용을 처리 중: 결과만 기다림
+        await asyncio.to_thread(_remove_quietly, upload.tmp_path)
+        file_name, size, width, height = await asyncio.shield(task)
+        return StoredImage(file_name, size, width, height, True)
+
+    # 별도 Task로 실행: 먼저 올린 쪽이 끊겨도 기다리는 요청은 결과를 받음 (임시 파일 삭제도 Task가 담당)
+    task = asyncio.ensure_future(_process_and_publish(upload.tmp_path, upload.digest, image_dir))
+    task.add_done_callback(lambda _: _inflight.pop(upload.digest, None))
+    _inflight[upload.digest] = task
+    file_name, size, width, height = await asyncio.shield(task)
+    return StoredImage(file_name, size, width, height, False)
+
+
+async def handle_image_upload(request) -> Tuple[ReceivedUpload, StoredImage]:
+    """receive_image_upload + store_image_upload (엔드포인트에서 한 번에 호출)"""
+    upload = await receive_image_upload(request)
+    return upload, await store_image_upload(upload)
+
+
+async def upload_result(stored: StoredImage) -> Dict:
+    """업로드 성공 응답 (file_url은 immutable 캐시가 적용되는 /api/image 버전 주소)"""
+    return {
+        "result": "OK",
+        "file_name": stored.file_name,
+        "file_url": await image_store.image_url(stored.file_name),
+        "size": stored.size,
+        "width": stored.width,
+        "height": stored.height,
+        "deduplicated": stored.deduplicated,
+    }
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 이미지 업로드 - multipart 스트리밍 수신, 내용 해시 파일명(중복 재사용), 프로세스 풀 검증 / 회전 / 축소 / 변환
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - receive_image_upload / store_image_upload / handle_image_upload / upload_result, UploadError
+#   - 같은 내용 동시 업로드는 한 번만 처리 (_inflight)
+#   - IMAGE_UPLOAD_MAX_BYTES / IMAGE_UPLOAD_MAX_DIM / IMAGE_UPLOAD_FLUSH_BYTES / IMAGE_UPLOAD_TMP_DIR 환경변수
@@ -0,0 +1,327 @@
+"""
+식당별 테이블 점유 / 예약 변경 실시간 전달 (occupancy_hub)
+직원이 테이블 사용 여부를 바꾸거나 예약이 생기면 해당 식당을 구독 중인 배치도 화면에 바로 알려서
+select_StoreTables_store 반복 조회(폴링)를 대체
+작성일: 2026-01-22
+작성자: 김택권
+
+구조:
+    - 프로세스 내 발행/구독 허브: 식당 번호 → 구독자 집합
+    - publish()는 이벤트를 JSON으로 한 번만 직렬화해 구독자 대기열에 넣고 바로 반환 (기다리지 않음)
+    - 구독자마다 크기 OCCUPANCY_QUEUE_SIZE의 대기열: 가득 차면(느린 연결) 쌓인 이벤트를 버리고
+      resync 하나만 남김 → 연결 쪽에서 스냅샷을 다시 보냄 (느린 연결이 메모리나 다른 연결을 막지 않음)
+    - 유휴 구독자는 대기열 + asyncio.Event 하나씩이라 워커당 수천 개 연결도 가벼움
+    - 선택: OCCUPANCY_REDIS_URL(기본 CATALOG_CACHE_REDIS_URL) 설정 + redis 패키지 설치 시
+      Redis pub/sub로 다른 워커/서버의 이벤트도 받음 (자기 이벤트는 origin으로 걸러냄)
+
+이벤트 (JSON, 모두 "type"과 "store_seq" 포함):
+    - snapshot: 연결 직후 / resync 시 현재 테이블 목록 (tables는 select_StoreTables_store 결과와 같은 형식)
+    - table: 테이블 추가 / 수정 (store_table_seq, store_table_name, store_table_capacity, store_table_inuse)
+    - table_removed: 테이블 삭제 또는 다른 식당으로 이동 (store_table_seq)
+    - reserve: 예약 추가 / 수정 / 결제 상태 변경 (reserve_seq, reserve_tables, reserve_date, payment_status)
+    - reserve_removed: 예약 삭제 (reserve_seq)
+
+사용 예시:
+    from ..utils.occupancy_hub import occupancy_hub, table_event
+
+    # 쓰기 API에서 (DB 커밋 후, 이벤트 루프에서 호출)
+    occupancy_hub.publish(store_seq, table_event(store_seq, store_table_seq, name, capacity, inuse))
+
+    # 구독 (store_table.py의 /ws, /stream 엔드포인트)
+    subscription = occupancy_hub.subscribe(store_seq)
+    try:
+        message = await subscription.get(timeout=25)
+    finally:
+        occupancy_hub.unsubscribe(subscription)
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from collections import deque
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Optional, Set
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    # redis 패키지가 없으면 프로세스 내 허브만 사용
+    redis_asyncio = None
+
+# 구독자별 대기열 크기 (초과 시 쌓인 이벤트를 버리고 resync)
+OCCUPANCY_QUEUE_SIZE = int(os.getenv('OCCUPANCY_QUEUE_SIZE', '64'))
+
+# 워커당 최대 구독자 수 (초과 시 새 연결 거절)
+OCCUPANCY_MAX_SUBSCRIBERS = int(os.getenv('OCCUPANCY_MAX_SUBSCRIBERS', '10000'))
+
+# SSE 연결 유지용 주석 전송 간격 (초, 프록시 유휴 타임아웃보다 짧게)
+OCCUPANCY_HEARTBEAT = float(os.getenv('OCCUPANCY_HEARTBEAT', '25'))
+
+# 이벤트 하나를 보내는 최대 시간 (초, 초과 시 응답 없는 연결로 보고 끊음)
+OCCUPANCY_SEND_TIMEOUT = float(os.getenv('OCCUPANCY_SEND_TIMEOUT', '10'))
+
+# 여러 워커가 이벤트를 공유할 Redis 호환 서버 URL, 비어 있으면 프로세스 내에서만 전달
+OCCUPANCY_REDIS_URL = os.getenv('OCCUPANCY_REDIS_URL', os.getenv('CATALOG_CACHE_REDIS_URL', ''))
+
+_REDIS_CHANNEL = "tablenow:occupancy"
+
+# 대기열이 넘친 구독자에게 전달되는 표시 (연결 쪽에서 스냅샷을 다시 보냄)
+RESYNC = json.dumps({"type": "resync"})
+
+
+# ============================================
+# 이벤트
+# ============================================
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_event(event: Dict) -> str:
+    return json.dumps(event, default=_json_default, ensure_ascii=False)
+
+
+def table_event(store_seq: int, store_table_seq: int, name, capacity, inuse) -> Dict:
+    return {
+        "type": "table",
+        "store_seq": store_seq,
+        "store_table_seq": store_table_seq,
+        "store_table_name": name,
+        "store_table_capacity": capacity,
+        "store_table_inuse": inuse,
+    }
+
+
+def table_removed_event(store_seq: int, store_table_seq: int) -> Dict:
+    return {"type": "table_removed", "store_seq": store_seq, "store_table_seq": store_table_seq}
+
+
+def reserve_event(store_seq: int, reserve_seq: int, reserve_tables, reserve_date, payment_status=None) -> Dict:
+    return {
+        "type": "reserve",
+        "store_seq": store_seq,
+        "reserve_seq": reserve_seq,
+        "reserve_tables": reserve_tables,
+        "reserve_date": reserve_date,
+        "payment_status": payment_status,
+    }
+
+
+def reserve_removed_event(store_seq: int, reserve_seq: int) -> Dict:
+    return {"type": "reserve_removed", "store_seq": store_seq, "reserve_seq": reserve_seq}
+
+
+# ============================================
+# 구독자
+# ============================================
+class Subscription:
+    """연결 하나의 구독 (대기열 + 깨우기용 Event)"""
+
+    __slots__ = ("store_seq", "max_queue", "dropped", "_queue", "_event")
+
+    def __init__(self, store_seq: int, max_queue: int = OCCUPANCY_QUEUE_SIZE):
+        self.store_seq = store_seq
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._queue: deque = deque()
+        self._event = asyncio.Event()
+
+    def push(self, message: str) -> bool:
+        """대기열에 추가 (넘쳐서 resync로 바꿨으면 True)"""
+        overflow = len(self._queue) >= self.max_queue
+        if overflow:
+            # 느린 연결: 밀린 변경분 대신 스냅샷을 다시 받게 함
+            self.dropped += len(self._queue)
+            self._queue.clear()
+            self._queue.append(RESYNC)
+        else:
+            self._queue.append(message)
+        self._event.set()
+        return overflow
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        다음 이벤트(JSON 문자열) 대기
+
+        Returns:
+            None: timeout 동안 이벤트 없음 (SSE heartbeat 전송 시점)
+        """
+        while not self._queue:
+            self._event.clear()
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._queue.popleft()
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+
+# ============================================
+# 허브
+# ============================================
+class OccupancyHub:
+    """
+    식당별 발행/구독 허브 (이벤트 루프 스레드에서만 사용)
+
+    - publish는 구독자 수만큼 deque.append만 하므로 쓰기 API 응답을 늦추지 않음
+    - 전달 순서는 식당 안에서 발행 순서와 같음 (resync로 건너뛸 수는 있음)
+    """
+
+    def __init__(self, max_subscribers: int = OCCUPANCY_MAX_SUBSCRIBERS, redis_url: str = OCCUPANCY_REDIS_URL):
+        self.max_subscribers = max_subscribers
+        self.redis_url = redis_url
+        self.origin = uuid.uuid4().hex
+        self._stores: Dict[int, Set[Subscription]] = {}
+        self._count = 0
+        self._published = 0
+        self._resyncs = 0
+        self._client = None
+        self._relay_task: Optional[asyncio.Task] = None
+        self._send_tasks: Set[asyncio.Task] = set()
+
+    def is_full(self) -> bool:
+        return self._count >= self.max_subscribers
+
+    def subscribe(self, store_seq: int) -> Optional[Subscription]:
+        """
+        식당 구독 시작
+
+        Returns:
+            None: 구독자 수가 OCCUPANCY_MAX_SUBSCRIBERS에 도달함 (연결 거절)
+        """
+        if self.is_full():
+            return None
+        subscription = Subscription(store_seq)
+        self._stores.setdefault(store_seq, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._stores.get(subscription.store_seq)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        self._count -= 1
+        if not subscribers:
+            del self._stores[subscription.store_seq]
+
+    def publish(self, store_seq: int, event: Dict) -> None:
+        """이벤트 발행 (이 워커 구독자에게 전달 + Redis 사용 시 다른 워커로 전파)"""
+        self._publish_message(store_seq, dumps_event(event))
+
+    def request_resync(self, store_seq: int) -> None:
+        """식당 구독자 모두에게 스냅샷을 다시 보내게 함 (변경분을 이벤트로 만들기 어려운 일괄 변경용)"""
+        self._publish_message(store_seq, RESYNC)
+
+    def _publish_message(self, store_seq: int, message: str) -> None:
+        self._deliver(store_seq, message)
+        if self._client is not None:
+            task = asyncio.create_task(self._relay_publish(store_seq, message))
+            self._send_tasks.add(task)
+            task.add_done_callback(self._send_tasks.discard)
+
+    def _deliver(self, store_seq: int, message: str) -> None:
+        subscribers = self._stores.get(store_seq)
+        if not subscribers:
+            return
+        self._published += 1
+        for subscription in subscribers:
+            if subscription.push(message):
+                self._resyncs += 1
+
+    # ============================================
+    # Redis 전파 (선택)
+    # ============================================
+    async def start(self) -> None:
+        """Redis 전파 시작 (main.py lifespan, URL이 없으면 아무것도 하지 않음)"""
+        if not self.redis_url or self._relay_task is not None:
+            return
+        if redis_asyncio is None:
+            print("⚠️  OCCUPANCY_REDIS_URL이 설정되었지만 redis 패키지가 없어 워커 내에서만 전달합니다.")
+            return
+        client = redis_asyncio.from_url(self.redis_url)
+        try:
+            pubsub = client.pubsub()
+            await pubsub.subscribe(_REDIS_CHANNEL)
+        except Exception as e:
+            # Redis 장애로 API 시작이 막히지 않도록 워커 내 전달로 계속
+            print(f"⚠️  occupancy Redis 연결 실패, 워커 내에서만 전달합니다: {e}")
+            await client.aclose()
+            return
+        self._client = client
+        self._relay_task = asyncio.create_task(self._relay_loop(pubsub))
+
+    async def stop(self) -> None:
+        if self._relay_task is not None:
+            self._relay_task.cancel()
+            await asyncio.gather(self._relay_task, return_exceptions=True)
+            self._relay_task = None
+        if self._send_tasks:
+            await asyncio.gather(*self._send_tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _relay_publish(self, store_seq: int, message: str) -> None:
+        try:
+            await self._client.publish(_REDIS_CHANNEL, f"{self.origin}|{store_seq}|{message}")
+        except Exception as e:
+            print(f"⚠️  occupancy 이벤트 전파 실패 (store_seq={store_seq}): {e}")
+
+    async def _relay_loop(self, pubsub) -> None:
+        while True:
+            try:
+                async for item in pubsub.listen():
+                    if item.get("type") != "message":
+                        continue
+                    data = item["data"]
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    origin, store_seq, message = data.split("|", 2)
+                    if origin != self.origin:
+                        self._deliver(int(store_seq), message)
+            except asyncio.CancelledError:
+                await pubsub.aclose()
+                raise
+            except Exception as e:
+                print(f"⚠️  occupancy 이벤트 수신 오류: {e}")
+                await asyncio.sleep(1)
+
+    def stats(self) -> Dict:
+        """구독 지표"""
+        return {
+            "subscribers": self._count,
+            "stores": len(self._stores),
+            "published": self._published,
+            "resyncs": self._resyncs,
+            "pending": sum(s.pending() for subscribers in self._stores.values() for s in subscribers),
+            "relay": self._relay_task is not None,
+        }
+
+
+# 프로세스 전역 허브
+occupancy_hub = OccupancyHub()
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 식당별 테이블 점유 / 예약 변경 발행-구독 허브 (구독자별 대기열 + resync, 선택적 Redis 전파)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - OccupancyHub.subscribe / unsubscribe / publish / request_resync / start / stop / stats
+#   - table / table_removed / reserve / reserve_removed 이벤트
+#   - OCCUPANCY_QUEUE_SIZE / OCCUPANCY_MAX_SUBSCRIBERS / OCCUPANCY_HEARTBEAT / OCCUPANCY_SEND_TIMEOUT
+#     / OCCUPANCY_REDIS_URL 환경변수
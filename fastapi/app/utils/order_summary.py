@@ -0,0 +1,282 @@
+"""
+예약별 주문 요약 (order_summary)
+영수증 화면(/api/pay/select_group_by_reserve)이 볼 때마다 pay GROUP BY + menu/store/option 조인을 하지 않도록
+결제 기록 시 같은 트랜잭션에서 요약을 계산해 order_summary에 저장하고, 조회는 PK 한 번으로 처리
+작성일: 2026-01-22
+작성자: 김택권
+
+동작:
+    - 쓰기: pay를 기록하는 API(purchase / booking / insert)가 커밋 전에 refresh_order_summaries() 호출
+    - 읽기: load_order_summary()가 order_summary를 PK로 조회,
+      없으면(마이그레이션 전 예약 등) 실시간 집계 후 저장 (지연 백필)
+    - 요약은 결제 시점의 메뉴/옵션 이름, 이미지를 담은 스냅샷 (메뉴 정보를 고친 뒤 다시 맞추려면 재생성)
+    - 동시성: 같은 예약의 pay 쓰기 / 요약 갱신은 reserve 행 잠금(lock_reserves)으로 직렬화하고,
+      집계는 잠금 읽기(FOR SHARE)로 다른 트랜잭션이 커밋한 최신 pay까지 포함
+      (pay INSERT는 외래키 검사로 reserve 행에 공유 잠금을 걸므로 pay를 쓰기 전에 lock_reserves 호출)
+
+관리 스크립트 (fastapi 폴더에서 실행):
+    python run_order_summary_rebuild.py   # 전체 재생성
+    python check_order_summary.py         # 저장된 요약과 실시간 집계 비교
+
+사용 예시 (run_db 안에서 같은 트랜잭션으로):
+    def _work(conn):
+        curs = conn.cursor()
+        lock_reserves(curs, [reserve_seq])
+        bulk_insert(curs, "pay", PAY_COLUMNS, rows)
+        refresh_order_summaries(curs, [reserve_seq])
+        conn.commit()
+"""
+
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# 재생성 / 검사 시 한 번에 처리할 예약 수
+ORDER_SUMMARY_BATCH_SIZE = int(os.getenv('ORDER_SUMMARY_BATCH_SIZE', '500'))
+
+# 실시간 집계 SQL (기존 select_group_by_reserve와 같은 결과, 예약 여러 개를 한 번에 집계)
+_LIVE_SUMMARY_SQL = """
+    SELECT pp.*, m.menu_name, s.store_description, o.option_name, m.menu_image FROM
+    (
+        SELECT COUNT(p.pay_id) AS total_row_count,
+               p.reserve_seq,
+               p.store_seq,
+               p.menu_seq,
+               p.option_seq,
+               SUM(p.pay_quantity) AS total_quantity,
+               SUM(p.pay_amount) AS total_amount,
+               SUM(p.pay_quantity * p.pay_amount) AS total_pay
+        FROM pay p
+        WHERE p.reserve_seq IN ({placeholders})
+        GROUP BY p.reserve_seq, p.store_seq, p.menu_seq, p.option_seq
+        {locking}
+    ) AS pp
+    INNER JOIN menu m ON pp.menu_seq = m.menu_seq
+    INNER JOIN store s ON pp.store_seq = s.store_seq
+    LEFT JOIN `option` o ON pp.option_seq = o.option_seq
+"""
+
+
+def _to_int(value) -> Optional[int]:
+    # SUM()은 Decimal로 반환되므로 JSON 저장 전에 정수로 변환
+    return int(value) if value is not None else None
+
+
+def _line_sort_key(line: Dict) -> Tuple:
+    return (line['store_seq'], line['menu_seq'], line['option_seq'] or 0)
+
+
+def summarize_rows(rows: Iterable[Sequence]) -> Dict[int, List[Dict]]:
+    """
+    실시간 집계 행 → {reserve_seq: [영수증 항목, ...]}
+    항목 키는 기존 select_group_by_reserve 응답과 동일 (total_pay는 기존과 같이 SUM(pay_amount))
+    """
+    summaries: Dict[int, List[Dict]] = {}
+    for row in rows:
+        summaries.setdefault(row[1], []).append({
+            'total_count': _to_int(row[0]),
+            'reserve_seq': row[1],
+            'store_seq': row[2],
+            'menu_seq': row[3],
+            'option_seq': row[4],
+            'total_quantity': _to_int(row[5]),
+            'total_pay': _to_int(row[6]),
+            'menu_name': row[8],
+            'store_description': row[9],
+            'option_name': row[10],
+            'menu_image': row[11],
+        })
+    for lines in summaries.values():
+        lines.sort(key=_line_sort_key)
+    return summaries
+
+
+def live_summaries(curs, reserve_seqs: Sequence[int], locking: bool = False) -> Dict[int, List[Dict]]:
+    """
+    예약들의 요약을 pay에서 실시간 집계
+    locking=True면 pay를 잠금 읽기(FOR SHARE) → 트랜잭션 스냅샷이 아니라 커밋된 최신 행 기준
+    """
+    if not reserve_seqs:
+        return {}
+    placeholders = ', '.join(['%s'] * len(reserve_seqs))
+    sql = _LIVE_SUMMARY_SQL.format(placeholders=placeholders, locking="FOR SHARE" if locking else "")
+    curs.execute(sql, tuple(reserve_seqs))
+    return summarize_rows(curs.fetchall())
+
+
+def lock_reserves(curs, reserve_seqs: Iterable[int]) -> None:
+    """
+    예약 행 잠금 (커밋 / 롤백까지 같은 예약의 pay 쓰기와 요약 갱신을 직렬화)
+    pay를 쓰는 트랜잭션은 pay INSERT 전에 호출 (INSERT 뒤에 잠그면 외래키 공유 잠금끼리 교착)
+    """
+    reserve_seqs = sorted({seq for seq in reserve_seqs if seq is not None})
+    if not reserve_seqs:
+        return
+    placeholders = ', '.join(['%s'] * len(reserve_seqs))
+    curs.execute(f"SELECT reserve_seq FROM reserve WHERE reserve_seq IN ({placeholders}) ORDER BY reserve_seq FOR UPDATE",
+                 tuple(reserve_seqs))
+    curs.fetchall()
+
+
+def refresh_order_summaries(curs, reserve_seqs: Iterable[int]) -> int:
+    """
+    예약들의 요약을 다시 계산해 order_summary에 저장 (커밋은 호출하는 쪽에서)
+    pay 행이 없는 예약은 요약을 삭제
+    - 예약 행을 잠그고 pay를 잠금 읽기로 집계하므로, 동시에 커밋된 다른 결제가 빠진 요약으로 덮어쓰지 않음
+
+    Returns:
+        int: 저장된 요약 수
+    """
+    reserve_seqs = sorted({seq for seq in reserve_seqs if seq is not None})
+    if not reserve_seqs:
+        return 0
+    lock_reserves(curs, reserve_seqs)
+    summaries = live_summaries(curs, reserve_seqs, locking=True)
+
+    empty = [seq for seq in reserve_seqs if seq not in summaries]
+    if empty:
+        placeholders = ', '.join(['%s'] * len(empty))
+        curs.execute(f"DELETE FROM order_summary WHERE reserve_seq IN ({placeholders})", tuple(empty))
+
+    if not summaries:
+        return 0
+    values, params = [], []
+    for reserve_seq, lines in summaries.items():
+        values.append("(%s, %s, %s, %s, %s, NOW())")
+        params.extend((
+            reserve_seq,
+            len(lines),
+            sum(line['total_quantity'] or 0 for line in lines),
+            sum(line['total_pay'] or 0 for line in lines),
+            json.dumps(lines, ensure_ascii=False),
+        ))
+    curs.execute(f"""
+        INSERT INTO order_summary (reserve_seq, line_count, total_quantity, total_amount, summary, updated_at)
+        VALUES {', '.join(values)}
+        ON DUPLICATE KEY UPDATE
+            line_count = VALUES(line_count),
+            total_quantity = VALUES(total_quantity),
+            total_amount = VALUES(total_amount),
+            summary = VALUES(summary),
+            updated_at = VALUES(updated_at)
+    """, params)
+    return len(summaries)
+
+
+def _load_stored(curs, reserve_seqs: Sequence[int]) -> Dict[int, List[Dict]]:
+    placeholders = ', '.join(['%s'] * len(reserve_seqs))
+    curs.execute(f"SELECT reserve_seq, summary FROM order_summary WHERE reserve_seq IN ({placeholders})",
+                 tuple(reserve_seqs))
+    return {
+        row[0]: json.loads(row[1]) if isinstance(row[1], (str, bytes)) else row[1]
+        for row in curs.fetchall()
+    }
+
+
+def load_order_summary(conn, reserve_seq: int) -> List[Dict]:
+    """
+    예약 요약 조회 (run_db에서 실행)
+    - order_summary PK 조회, 없으면 실시간 집계 후 저장
+    """
+    curs = conn.cursor()
+    stored = _load_stored(curs, [reserve_seq])
+    if reserve_seq in stored:
+        return stored[reserve_seq]
+
+    # 요약이 없는 예약 (마이그레이션 전 결제 등): 집계 후 저장
+    if refresh_order_summaries(curs, [reserve_seq]):
+        conn.commit()
+        return _load_stored(curs, [reserve_seq]).get(reserve_seq, [])
+    conn.rollback()
+    return []
+
+
+# ============================================
+# 재생성 / 검사 (관리 스크립트용)
+# ============================================
+def iter_reserve_batches(conn, batch_size: int = ORDER_SUMMARY_BATCH_SIZE) -> Iterator[List[int]]:
+    """pay가 있는 예약 번호를 키셋 방식으로 batch_size개씩 반환"""
+    curs = conn.cursor()
+    after = 0
+    while True:
+        curs.execute("""
+            SELECT DISTINCT reserve_seq FROM pay
+            WHERE reserve_seq > %s
+            ORDER BY reserve_seq
+            LIMIT %s
+        """, (after, batch_size))
+        batch = [row[0] for row in curs.fetchall()]
+        if not batch:
+            return
+        yield batch
+        after = batch[-1]
+
+
+def rebuild_order_summaries(conn, batch_size: int = ORDER_SUMMARY_BATCH_SIZE) -> int:
+    """
+    전체 요약 재생성 (배치마다 커밋)
+    - pay가 없는데 요약만 남은 예약은 삭제
+
+    Returns:
+        int: 저장된 요약 수
+    """
+    curs = conn.cursor()
+    total = 0
+    for batch in iter_reserve_batches(conn, batch_size):
+        total += refresh_order_summaries(curs, batch)
+        conn.commit()
+    curs.execute("""
+        DELETE os FROM order_summary os
+        WHERE NOT EXISTS (SELECT 1 FROM pay p WHERE p.reserve_seq = os.reserve_seq)
+    """)
+    conn.commit()
+    return total
+
+
+def check_order_summaries(conn, batch_size: int = ORDER_SUMMARY_BATCH_SIZE) -> Dict:
+    """
+    저장된 요약과 실시간 집계 비교
+
+    Returns:
+        dict: {"checked", "missing": [...], "mismatched": [...], "orphaned": [...]}
+            - missing: pay는 있는데 요약이 없는 예약
+            - mismatched: 요약 내용이 실시간 집계와 다른 예약
+            - orphaned: pay가 없는데 요약만 있는 예약
+    """
+    curs = conn.cursor()
+    result = {"checked": 0, "missing": [], "mismatched": [], "orphaned": []}
+    for batch in iter_reserve_batches(conn, batch_size):
+        live = live_summaries(curs, batch)
+        stored = _load_stored(curs, batch)
+        for reserve_seq in batch:
+            result["checked"] += 1
+            if reserve_seq not in stored:
+                result["missing"].append(reserve_seq)
+            elif stored[reserve_seq] != live.get(reserve_seq, []):
+                result["mismatched"].append(reserve_seq)
+    curs.execute("""
+        SELECT os.reserve_seq FROM order_summary os
+        WHERE NOT EXISTS (SELECT 1 FROM pay p WHERE p.reserve_seq = os.reserve_seq)
+    """)
+    result["orphaned"] = [row[0] for row in curs.fetchall()]
+    conn.rollback()
+    return result
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 예약별 주문 요약(order_summary) 저장 / 조회 / 재생성 / 검사
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - refresh_order_summaries / load_order_summary / rebuild_order_summaries / check_order_summaries
+#   - ORDER_SUMMARY_BATCH_SIZE 환경변수
+#
+# 2026-01-22 김택권: 동시 결제 시 요약 덮어쓰기 수정
+#   - lock_reserves: 같은 예약의 pay 쓰기 / 요약 갱신을 reserve 행 잠금으로 직렬화
+#   - refresh_order_summaries: 예약 잠금 후 pay를 잠금 읽기(FOR SHARE)로 집계
@@ -0,0 +1,211 @@
+"""
+비밀번호 해시 (scrypt)
+메모리를 많이 쓰는 scrypt 해시를 전용 프로세스 풀에서 계산해
+이벤트 루프와 DB 스레드를 막지 않고, 로그인 처리량이 CPU 코어 수만큼 늘어나도록 함
+작성일: 2026-01-22
+작성자: 김택권
+
+저장 형식 (customer.customer_pw, VARCHAR(255)):
+    scrypt$<N>$<r>$<p>$<salt(base64)>$<hash(base64)>
+
+    - 'scrypt$'로 시작하지 않는 값은 예전 평문 비밀번호로 보고 그대로 비교
+    - 평문이거나 현재 설정(PW_SCRYPT_N/R/P)과 다른 값으로 만든 해시는 needs_rehash=True
+      → 로그인 성공 시 새 해시로 교체
+
+사용 예시:
+    from ..utils.password_hasher import hash_password, verify_password
+
+    pw_hash = await hash_password(customer_pw)
+    ok, needs_rehash = await verify_password(customer_pw, stored_pw)
+
+    # 서버 종료 시 (main.py lifespan)
+    shutdown_hash_pool()
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+# scrypt 비용 (N: CPU/메모리 비용, 2의 거듭제곱 / r: 블록 크기 / p: 병렬도)
+# 해시 1회 메모리 사용량 ≈ 128 * N * r 바이트 (기본 16MB)
+PW_SCRYPT_N = int(os.getenv('PW_SCRYPT_N', str(2 ** 14)))
+PW_SCRYPT_R = int(os.getenv('PW_SCRYPT_R', '8'))
+PW_SCRYPT_P = int(os.getenv('PW_SCRYPT_P', '1'))
+
+# 해시 전용 프로세스 수 (기본값: CPU 코어 수, 0이면 프로세스 풀 없이 스레드에서 계산)
+PW_HASH_WORKERS = int(os.getenv('PW_HASH_WORKERS', str(os.cpu_count() or 1)))
+
+# 프로세스 시작 방식 (DB 스레드 등을 가진 서버 프로세스를 fork하지 않도록 기본 spawn)
+PW_HASH_START_METHOD = os.getenv('PW_HASH_START_METHOD', 'spawn')
+
+HASH_PREFIX = 'scrypt'
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# 없는 계정으로 로그인할 때도 같은 시간이 걸리도록 비교할 해시 (최초 사용 시 생성)
+_dummy_hash: Optional[str] = None
+
+
+# ============================================
+# 동기 함수 (프로세스 풀에서 실행)
+# ============================================
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode('utf-8'),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=128 * n * r * (p + 1) + 1024 * 1024,
+        dklen=KEY_BYTES,
+    )
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+def hash_password_sync(password: str, n: int = PW_SCRYPT_N, r: int = PW_SCRYPT_R, p: int = PW_SCRYPT_P) -> str:
+    """비밀번호 해시 문자열 생성 (동기)"""
+    salt = os.urandom(SALT_BYTES)
+    key = _scrypt(password, salt, n, r, p)
+    return f"{HASH_PREFIX}${n}${r}${p}${_b64(salt)}${_b64(key)}"
+
+
+def is_hashed(stored: Optional[str]) -> bool:
+    """저장된 값이 scrypt 해시 형식인지 확인"""
+    return bool(stored) and stored.startswith(HASH_PREFIX + '$')
+
+
+def verify_password_sync(password: str, stored: Optional[str]) -> Tuple[bool, bool]:
+    """
+    비밀번호 검증 (동기)
+    반환: (일치 여부, 새 해시로 교체 필요 여부)
+    """
+    if not stored:
+        return False, False
+
+    if not is_hashed(stored):
+        # 예전 평문 비밀번호
+        ok = hmac.compare_digest(password.encode('utf-8'), stored.encode('utf-8'))
+        return ok, ok
+
+    try:
+        _, n, r, p, salt, key = stored.split('$')
+        n, r, p = int(n), int(r), int(p)
+        expected = _unb64(key)
+        actual = _scrypt(password, _unb64(salt), n, r, p)
+    except (ValueError, TypeError):
+        return False, False
+
+    ok = hmac.compare_digest(actual, expected)
+    needs_rehash = ok and (n, r, p) != (PW_SCRYPT_N, PW_SCRYPT_R, PW_SCRYPT_P)
+    return ok, needs_rehash
+
+
+# ============================================
+# 비동기 함수 (엔드포인트에서 사용)
+# ============================================
+def get_hash_pool() -> Optional[ProcessPoolExecutor]:
+    """해시 전용 프로세스 풀 반환 (최초 호출 시 생성, PW_HASH_WORKERS=0이면 None)"""
+    global _pool
+    if PW_HASH_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=PW_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context(PW_HASH_START_METHOD),
+                )
+    return _pool
+
+
+def shutdown_hash_pool():
+    """해시 프로세스 풀 종료 (애플리케이션 종료 시 호출)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def _reset_broken_pool(pool: ProcessPoolExecutor):
+    """작업 프로세스가 비정상 종료된 풀을 버림 (다음 호출 시 새로 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+async def _run(fn, *args):
+    loop = asyncio.get_running_loop()
+    pool = get_hash_pool()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # 작업 프로세스가 죽으면(OOM 등) 풀 전체를 쓸 수 없게 되므로 새 풀로 한 번 재시도
+        print("⚠️  비밀번호 해시 프로세스 풀 재생성")
+        _reset_broken_pool(pool)
+        return await loop.run_in_executor(get_hash_pool(), fn, *args)
+
+
+async def hash_password(password: str) -> str:
+    """비밀번호 해시 문자열 생성"""
+    return await _run(hash_password_sync, password)
+
+
+async def verify_password(password: str, stored: Optional[str]) -> Tuple[bool, bool]:
+    """
+    비밀번호 검증
+    반환: (일치 여부, 새 해시로 교체 필요 여부)
+    stored가 없으면(없는 계정) 더미 해시와 비교해 응답 시간으로 계정 존재 여부를 알 수 없도록 함
+    """
+    global _dummy_hash
+    if not stored:
+        if _dummy_hash is None:
+            _dummy_hash = await hash_password(os.urandom(SALT_BYTES).hex())
+        await _run(verify_password_sync, password, _dummy_hash)
+        return False, False
+    return await _run(verify_password_sync, password, stored)
+
+
+def hash_pool_stats() -> Dict:
+    """해시 설정 / 풀 상태"""
+    return {
+        "workers": PW_HASH_WORKERS,
+        "started": _pool is not None,
+        "n": PW_SCRYPT_N,
+        "r": PW_SCRYPT_R,
+        "p": PW_SCRYPT_P,
+    }
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: scrypt 비밀번호 해시 / 검증 (프로세스 풀, 평문 비밀번호 자동 교체 지원)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - hash_password / verify_password / shutdown_hash_pool / hash_pool_stats
+#   - PW_SCRYPT_N / PW_SCRYPT_R / PW_SCRYPT_P / PW_HASH_WORKERS / PW_HASH_START_METHOD 환경변수
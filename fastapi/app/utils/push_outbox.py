@@ -0,0 +1,340 @@
+"""
+푸시 알림 발송 대기열 (push_outbox)
+API는 대기열에 등록만 하고 바로 응답, 워커가 묶음으로 꺼내 FCMService로 발송
+작성일: 2026-01-22
+작성자: 김택권
+
+동작:
+    - enqueue_push(): push_outbox에 PENDING 행 추가 후 같은 프로세스의 워커를 깨움
+    - 워커: next_attempt_at이 지난 PENDING / PROCESSING 행을 SELECT ... FOR UPDATE SKIP LOCKED로
+      PUSH_OUTBOX_BATCH_SIZE개씩 가져와 PROCESSING(임대)으로 바꾼 뒤 발송
+    - 발송 성공 → SENT
+    - 일시적 실패 → PENDING, 지수 백오프 후 재시도 (실패한 기기만 retry_tokens로 재시도)
+    - PUSH_MAX_ATTEMPTS회 실패 또는 대상 기기 없음 → DEAD (보관, 수동 재시도 가능)
+    - 워커가 발송 중 죽으면 임대(PUSH_OUTBOX_LEASE초) 만료 후 다른 워커가 다시 발송
+      → 적어도 한 번 발송 (드물게 중복 발송 가능)
+
+실행 방식:
+    - API 프로세스 안: PUSH_OUTBOX_WORKERS개 워커를 main.py lifespan에서 시작 (기본 1)
+    - 별도 프로세스: API는 PUSH_OUTBOX_WORKERS=0, 발송 서버에서 python run_push_worker.py
+      (여러 프로세스를 띄워도 SKIP LOCKED로 행이 겹치지 않음)
+
+사용 예시:
+    from ..utils.push_outbox import enqueue_push
+
+    outbox_seq = await enqueue_push(title, body, data, customer_seq=customer_seq)
+"""
+
+import asyncio
+import json
+import os
+import random
+from typing import Dict, List, Optional
+
+from ..database.async_db import execute, fetch_all, run_db
+from .fcm_service import FCMService
+
+# 프로세스당 워커 수 (0이면 이 프로세스에서는 발송하지 않음)
+PUSH_OUTBOX_WORKERS = int(os.getenv('PUSH_OUTBOX_WORKERS', '1'))
+
+# 한 번에 가져올 행 수
+PUSH_OUTBOX_BATCH_SIZE = int(os.getenv('PUSH_OUTBOX_BATCH_SIZE', '50'))
+
+# 대기열이 비었을 때 다시 확인하는 간격 (초)
+PUSH_OUTBOX_POLL_INTERVAL = float(os.getenv('PUSH_OUTBOX_POLL_INTERVAL', '2'))
+
+# 발송 임대 시간 (초): 이 시간 안에 결과를 기록하지 못하면 다른 워커가 다시 가져감
+PUSH_OUTBOX_LEASE = int(os.getenv('PUSH_OUTBOX_LEASE', '60'))
+
+# 최대 발송 시도 횟수 (초과 시 DEAD)
+PUSH_MAX_ATTEMPTS = int(os.getenv('PUSH_MAX_ATTEMPTS', '6'))
+
+# 재시도 백오프: PUSH_RETRY_BASE × 2^(시도-1) 초, 최대 PUSH_RETRY_MAX 초
+PUSH_RETRY_BASE = int(os.getenv('PUSH_RETRY_BASE', '5'))
+PUSH_RETRY_MAX = int(os.getenv('PUSH_RETRY_MAX', '600'))
+
+STATUS_PENDING = 'PENDING'
+STATUS_PROCESSING = 'PROCESSING'
+STATUS_SENT = 'SENT'
+STATUS_DEAD = 'DEAD'
+
+_OUTBOX_COLUMNS = "outbox_seq, customer_seq, fcm_token, title, body, data, attempts, retry_tokens"
+
+
+def retry_delay(attempts: int) -> int:
+    """attempts번째 실패 후 다음 시도까지 대기 시간 (초, ±20% 지터)"""
+    delay = min(PUSH_RETRY_BASE * (2 ** max(attempts - 1, 0)), PUSH_RETRY_MAX)
+    return max(1, min(int(delay * random.uniform(0.8, 1.2)), PUSH_RETRY_MAX))
+
+
+async def enqueue_push(
+    title: str,
+    body: str,
+    data: Optional[Dict] = None,
+    customer_seq: Optional[int] = None,
+    fcm_token: Optional[str] = None,
+) -> int:
+    """
+    푸시 알림을 발송 대기열에 등록
+
+    Args:
+        title: 알림 제목
+        body: 알림 내용
+        data: 추가 데이터
+        customer_seq: 대상 고객 (고객의 모든 기기)
+        fcm_token: 대상 토큰 (단일 기기, customer_seq 대신 사용)
+
+    Returns:
+        int: outbox_seq
+    """
+    if customer_seq is None and not fcm_token:
+        raise ValueError("customer_seq 또는 fcm_token이 필요합니다.")
+    result = await execute("""
+        INSERT INTO push_outbox (customer_seq, fcm_token, title, body, data, status, next_attempt_at, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, NOW(), NOW())
+    """, (
+        customer_seq, fcm_token, title, body,
+        json.dumps({k: str(v) for k, v in data.items()}, ensure_ascii=False) if data else None,
+        STATUS_PENDING,
+    ))
+    push_outbox_worker.notify()
+    return result.lastrowid
+
+
+def _claim_batch(conn, limit: int) -> List[Dict]:
+    """발송할 행을 가져와 PROCESSING(임대)으로 변경"""
+    curs = conn.cursor()
+    curs.execute(f"""
+        SELECT {_OUTBOX_COLUMNS}
+        FROM push_outbox
+        WHERE status IN (%s, %s) AND next_attempt_at <= NOW()
+        ORDER BY next_attempt_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    """, (STATUS_PENDING, STATUS_PROCESSING, limit))
+    rows = curs.fetchall()
+    if not rows:
+        conn.commit()
+        return []
+    seqs = [row[0] for row in rows]
+    placeholders = ','.join(['%s'] * len(seqs))
+    curs.execute(f"""
+        UPDATE push_outbox
+        SET status = %s, attempts = attempts + 1, next_attempt_at = NOW() + INTERVAL %s SECOND
+        WHERE outbox_seq IN ({placeholders})
+    """, [STATUS_PROCESSING, PUSH_OUTBOX_LEASE] + seqs)
+    conn.commit()
+    return [{
+        'outbox_seq': row[0],
+        'customer_seq': row[1],
+        'fcm_token': row[2],
+        'title': row[3],
+        'body': row[4],
+        'data': json.loads(row[5]) if row[5] else None,
+        'attempts': row[6] + 1,
+        'retry_tokens': json.loads(row[7]) if row[7] else None,
+    } for row in rows]
+
+
+def customer_token_seqs(items: List[Dict]) -> List[int]:
+    """기기 토큰을 DB에서 읽어야 하는 행의 고객 번호 (재시도 토큰 / 지정 토큰이 없는 행)"""
+    return sorted({item['customer_seq'] for item in items
+                   if not item['retry_tokens'] and not item['fcm_token'] and item['customer_seq'] is not None})
+
+
+def deliver(item: Dict, customer_tokens: Dict[int, List[str]]) -> Dict:
+    """
+    대기열 행 1건 발송 (동기, 워커 스레드에서 실행, DB 접근 없음)
+
+    Args:
+        customer_tokens: 고객 번호 → 기기 토큰 (묶음 단위로 미리 조회한 값)
+
+    Returns:
+        Dict: {"status": SENT/PENDING/DEAD, "success_count", "retry_tokens", "error", "unregistered_tokens"}
+    """
+    if item['retry_tokens']:
+        tokens = item['retry_tokens']
+    elif item['fcm_token']:
+        tokens = [item['fcm_token']]
+    else:
+        tokens = customer_tokens.get(item['customer_seq'], [])
+
+    if not tokens:
+        return {"status": STATUS_DEAD, "success_count": 0, "retry_tokens": None,
+                "error": "등록된 기기 토큰이 없습니다.", "unregistered_tokens": []}
+
+    fanout = FCMService.send_fanout(tokens, item['title'], item['body'], item['data'])
+    unregistered = fanout["unregistered_tokens"] if item['customer_seq'] is not None else []
+
+    failed = [r for r in fanout["results"] if not r["success"] and not r["unregistered"]]
+    if not failed:
+        return {"status": STATUS_SENT, "success_count": fanout["success_count"], "retry_tokens": None,
+                "error": None, "unregistered_tokens": unregistered}
+
+    error = failed[0]["error"]
+    if item['attempts'] >= PUSH_MAX_ATTEMPTS:
+        return {"status": STATUS_DEAD, "success_count": fanout["success_count"], "retry_tokens": None,
+                "error": f"최대 시도 횟수({PUSH_MAX_ATTEMPTS}) 초과: {error}", "unregistered_tokens": unregistered}
+    return {"status": STATUS_PENDING, "success_count": fanout["success_count"],
+            "retry_tokens": [r["token"] for r in failed], "error": error, "unregistered_tokens": unregistered}
+
+
+def _record_result(conn, item: Dict, outcome: Dict) -> None:
+    """발송 결과 기록 (PENDING이면 백오프 후 재시도 시각 설정)"""
+    curs = conn.cursor()
+    delay = retry_delay(item['attempts']) if outcome["status"] == STATUS_PENDING else 0
+    curs.execute("""
+        UPDATE push_outbox
+        SET status = %s,
+            success_count = success_count + %s,
+            retry_tokens = %s,
+            last_error = %s,
+            next_attempt_at = NOW() + INTERVAL %s SECOND,
+            sent_at = IF(%s = 'SENT', NOW(), sent_at)
+        WHERE outbox_seq = %s AND status = %s
+    """, (
+        outcome["status"], outcome["success_count"],
+        json.dumps(outcome["retry_tokens"]) if outcome["retry_tokens"] else None,
+        outcome["error"], delay, outcome["status"],
+        item['outbox_seq'], STATUS_PROCESSING,
+    ))
+    conn.commit()
+
+
+class PushOutboxWorker:
+    """push_outbox를 비우는 asyncio 워커 묶음"""
+
+    def __init__(self, workers: int = PUSH_OUTBOX_WORKERS, batch_size: int = PUSH_OUTBOX_BATCH_SIZE,
+                 poll_interval: float = PUSH_OUTBOX_POLL_INTERVAL):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._sent = 0
+        self._retried = 0
+        self._dead = 0
+
+    def start(self) -> None:
+        """워커 시작 (이벤트 루프 안에서 호출)"""
+        if self._tasks or self.workers <= 0:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._loop(i)) for i in range(self.workers)]
+        print(f"📮 push outbox 워커 {self.workers}개 시작")
+
+    async def stop(self) -> None:
+        """워커 종료 (진행 중인 묶음은 임대 만료 후 다시 발송됨)"""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """새 행이 등록되었음을 알려 대기 중인 워커를 깨움"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run_once(self) -> int:
+        """한 묶음 가져와 발송, 처리한 행 수 반환"""
+        items = await run_db(_claim_batch, self.batch_size)
+        if not items:
+            return 0
+        # 기기 토큰은 묶음 전체를 쿼리 한 번으로 조회 (발송 스레드는 DB 연결을 쓰지 않음)
+        seqs = customer_token_seqs(items)
+        customer_tokens = await run_db(FCMService.select_customer_tokens, seqs) if seqs else {}
+        outcomes = await asyncio.gather(
+            *[asyncio.to_thread(deliver, item, customer_tokens) for item in items], return_exceptions=True
+        )
+        for item, outcome in zip(items, outcomes):
+            if isinstance(outcome, BaseException):
+                # 예상하지 못한 오류(DB 등)도 일시적 실패로 보고 재시도
+                outcome = {"status": STATUS_PENDING, "success_count": 0,
+                           "retry_tokens": item['retry_tokens'], "error": f"{type(outcome).__name__}: {outcome}"}
+                if item['attempts'] >= PUSH_MAX_ATTEMPTS:
+                    outcome["status"] = STATUS_DEAD
+            elif outcome["unregistered_tokens"]:
+                try:
+                    await run_db(FCMService.delete_invalid_tokens, outcome["unregistered_tokens"], item['customer_seq'])
+                except Exception as e:
+                    print(f"⚠️  만료 토큰 삭제 실패 (customer_seq={item['customer_seq']}): {e}")
+            await run_db(_record_result, item, outcome)
+            if outcome["status"] == STATUS_SENT:
+                self._sent += 1
+            elif outcome["status"] == STATUS_DEAD:
+                self._dead += 1
+                print(f"☠️  push outbox {item['outbox_seq']} DEAD: {outcome['error']}")
+            else:
+                self._retried += 1
+        return len(items)
+
+    async def _loop(self, index: int) -> None:
+        while not self._stopping:
+            try:
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ push outbox 워커 {index} 오류: {e}")
+                processed = 0
+            if processed:
+                continue
+            # 대기열이 비었으면 새 등록 알림 또는 poll_interval까지 대기
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict:
+        """이 프로세스 워커 지표"""
+        return {
+            "workers": len(self._tasks),
+            "sent": self._sent,
+            "retried": self._retried,
+            "dead": self._dead,
+        }
+
+
+async def outbox_counts() -> Dict[str, int]:
+    """상태별 대기열 행 수"""
+    rows = await fetch_all("SELECT status, COUNT(*) FROM push_outbox GROUP BY status")
+    return {row[0]: row[1] for row in rows}
+
+
+async def requeue_dead(outbox_seq: int) -> bool:
+    """DEAD 행을 다시 대기열에 넣음 (시도 횟수 초기화), 성공 여부 반환"""
+    result = await execute("""
+        UPDATE push_outbox
+        SET status = %s, attempts = 0, retry_tokens = NULL, last_error = NULL, next_attempt_at = NOW()
+        WHERE outbox_seq = %s AND status = %s
+    """, (STATUS_PENDING, outbox_seq, STATUS_DEAD))
+    if result.rowcount:
+        push_outbox_worker.notify()
+    return result.rowcount > 0
+
+
+# 프로세스 전역 워커
+push_outbox_worker = PushOutboxWorker()
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 푸시 알림 발송 대기열 (enqueue_push, PushOutboxWorker: 묶음 발송, 지수 백오프, DEAD 보관)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - PUSH_OUTBOX_WORKERS / PUSH_OUTBOX_BATCH_SIZE / PUSH_OUTBOX_POLL_INTERVAL / PUSH_OUTBOX_LEASE 환경변수
+#   - PUSH_MAX_ATTEMPTS / PUSH_RETRY_BASE / PUSH_RETRY_MAX 환경변수
+#
+# 2026-01-22 김택권: 발송 스레드의 DB 연결 사용 제거
+#   - 묶음의 기기 토큰을 run_db 쿼리 한 번으로 미리 조회 (customer_token_seqs + FCMService.select_customer_tokens)
+#   - 만료 토큰 삭제도 run_db로 실행 (FCMService.delete_invalid_tokens), deliver()는 FCM 발송만 담당
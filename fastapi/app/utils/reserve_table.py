@@ -0,0 +1,112 @@
+"""
+reserve_table (예약-테이블 연관) 읽기/쓰기 헬퍼
+reserve.reserve_tables 문자열을 정규화한 reserve_table 테이블에 이중 기록하고,
+"테이블 X가 T 시각에 비어 있는가"를 (store_table_seq, reserve_date) 인덱스로 조회
+작성일: 2026-01-22
+작성자: 김택권
+
+이중 읽기:
+    - reserve_table에 행이 있는 예약은 인덱스 범위 검색으로 조회
+    - 마이그레이션 백필 전 예약 등 reserve_table 행이 없는 예약은 reserve_tables 문자열로 조회
+    - 모든 예약이 백필되면 문자열 경로는 결과가 없는 빈 조회가 됨
+
+사용 예시 (run_db 안에서 같은 트랜잭션으로):
+    def _work(conn):
+        curs = conn.cursor()
+        curs.execute("INSERT INTO reserve ...")
+        write_reserve_tables(curs, curs.lastrowid, store_seq, reserve_tables, reserve_date)
+        conn.commit()
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple, Union
+
+from .availability import RELEASED_PAYMENT_STATUSES, RESERVE_SLOT_MINUTES, parse_reserve_date, parse_reserve_tables
+
+_RELEASED_STATUS_SQL = ', '.join(f"'{status}'" for status in sorted(RELEASED_PAYMENT_STATUSES))
+
+
+def write_reserve_tables(
+    curs,
+    reserve_seq: int,
+    store_seq: int,
+    reserve_tables: Optional[str],
+    reserve_date: Union[str, datetime],
+) -> int:
+    """
+    예약의 reserve_table 행을 reserve_tables 기준으로 다시 기록 (커밋은 호출하는 쪽에서)
+
+    - 해당 식당에 존재하는 테이블만 기록 (잘못된 번호는 reserve_tables 문자열에만 남음)
+
+    Returns:
+        int: 기록된 행 수
+    """
+    curs.execute("DELETE FROM reserve_table WHERE reserve_seq = %s", (reserve_seq,))
+    table_seqs = parse_reserve_tables(reserve_tables)
+    if not table_seqs:
+        return 0
+    placeholders = ', '.join(['%s'] * len(table_seqs))
+    curs.execute(f"""
+        INSERT INTO reserve_table (reserve_seq, store_table_seq, store_seq, reserve_date)
+        SELECT %s, store_table_seq, store_seq, %s
+        FROM store_table
+        WHERE store_seq = %s AND store_table_seq IN ({placeholders})
+    """, (reserve_seq, reserve_date, store_seq, *table_seqs))
+    return curs.rowcount
+
+
+def find_table_conflicts(
+    curs,
+    store_table_seq: int,
+    reserve_date: Union[str, datetime],
+    slot_minutes: int = RESERVE_SLOT_MINUTES,
+) -> List[Tuple[int, datetime]]:
+    """
+    테이블이 reserve_date부터 slot_minutes 동안 겹치는 예약 조회 (취소된 결제 제외)
+
+    Returns:
+        list: [(reserve_seq, reserve_date), ...] 예약 일시 순
+    """
+    start = parse_reserve_date(reserve_date)
+    slot = timedelta(minutes=slot_minutes)
+    # 모든 예약의 점유 시간이 같으므로 시작 시각이 (start - slot, start + slot) 안이면 겹침
+    lower, upper = start - slot, start + slot
+
+    # 1) reserve_table: idx_reserve_table_table_date 범위 검색
+    curs.execute(f"""
+        SELECT rt.reserve_seq, rt.reserve_date
+        FROM reserve_table rt
+        JOIN reserve r ON r.reserve_seq = rt.reserve_seq
+        WHERE rt.store_table_seq = %s
+        AND rt.reserve_date > %s AND rt.reserve_date < %s
+        AND (r.payment_status IS NULL OR r.payment_status NOT IN ({_RELEASED_STATUS_SQL}))
+    """, (store_table_seq, lower, upper))
+    conflicts = list(curs.fetchall())
+
+    # 2) reserve_table 행이 없는 (백필 전) 예약: reserve_tables 문자열 검사
+    curs.execute(f"""
+        SELECT r.reserve_seq, r.reserve_date
+        FROM store_table st
+        JOIN reserve r ON r.store_seq = st.store_seq
+        WHERE st.store_table_seq = %s
+        AND r.reserve_date > %s AND r.reserve_date < %s
+        AND FIND_IN_SET(%s, REPLACE(r.reserve_tables, ' ', '')) > 0
+        AND (r.payment_status IS NULL OR r.payment_status NOT IN ({_RELEASED_STATUS_SQL}))
+        AND NOT EXISTS (SELECT 1 FROM reserve_table rt WHERE rt.reserve_seq = r.reserve_seq)
+    """, (store_table_seq, lower, upper, str(store_table_seq)))
+    conflicts.extend(curs.fetchall())
+
+    return sorted(conflicts, key=lambda row: row[1])
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: reserve_table 이중 기록(write_reserve_tables) 및 테이블 시간 충돌 이중 읽기(find_table_conflicts)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
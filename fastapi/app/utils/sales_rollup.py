@@ -0,0 +1,177 @@
+"""
+일별 매출 / 마진 집계 (sales_daily)
+pay를 기록하는 API가 같은 트랜잭션에서 (식당, 일자, 메뉴, 옵션)별 합계를 더해 두고,
+매출 리포트(/api/sales)는 pay 대신 sales_daily 범위 조회로 응답
+작성일: 2026-01-22
+작성자: 김택권
+
+집계 기준:
+    - 일자: DATE(pay.created_at)
+    - 매출: pay_quantity * pay_amount (pay_amount는 단가)
+    - 원가: 메뉴 행은 pay_quantity * menu.menu_cost, 옵션 행은 pay_quantity * option.option_cost
+      (기록 시점의 원가로 고정, 백필은 실행 시점의 원가 사용)
+    - 옵션 없는 메뉴 행은 option_seq = 0 (PK에 NULL을 쓸 수 없음)
+
+동작:
+    - 쓰기: purchase / booking / insert가 커밋 전에 apply_sales_rollup() 호출 (더하기 UPSERT)
+    - 백필: run_sales_backfill.py → backfill_sales_daily() (식당별로 기간을 지우고 pay에서 다시 집계)
+
+사용 예시 (run_db 안에서 같은 트랜잭션으로):
+    def _work(conn):
+        curs = conn.cursor()
+        bulk_insert(curs, "pay", PAY_COLUMNS, rows)
+        apply_sales_rollup(curs, rows)
+        conn.commit()
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# PAY_COLUMNS 순서의 pay 행 인덱스
+_STORE, _MENU, _OPTION, _QUANTITY, _AMOUNT, _CREATED_AT = 1, 2, 3, 4, 5, 6
+
+
+def sales_day(created_at) -> str:
+    """pay.created_at 값 → 'YYYY-MM-DD' (MySQL DATE()와 같은 결과)"""
+    if isinstance(created_at, datetime):
+        return created_at.strftime("%Y-%m-%d")
+    if isinstance(created_at, date):
+        return created_at.isoformat()
+    return str(created_at)[:10]
+
+
+def _option_key(option_seq) -> int:
+    return int(option_seq) if option_seq is not None else 0
+
+
+def _load_costs(curs, table: str, key: str, cost: str, seqs: Iterable[int]) -> Dict[int, int]:
+    seqs = sorted(set(seqs))
+    if not seqs:
+        return {}
+    placeholders = ', '.join(['%s'] * len(seqs))
+    curs.execute(f"SELECT {key}, {cost} FROM `{table}` WHERE {key} IN ({placeholders})", tuple(seqs))
+    return {row[0]: row[1] or 0 for row in curs.fetchall()}
+
+
+def apply_sales_rollup(curs, rows: Sequence[Sequence]) -> int:
+    """
+    새로 기록한 pay 행을 sales_daily에 더함 (커밋은 호출하는 쪽에서)
+
+    Args:
+        curs: pymysql 커서 (pay INSERT와 같은 트랜잭션)
+        rows: PAY_COLUMNS 순서의 pay 행 목록
+
+    Returns:
+        int: 갱신한 집계 행 수
+    """
+    if not rows:
+        return 0
+    menu_costs = _load_costs(curs, "menu", "menu_seq", "menu_cost",
+                             (int(row[_MENU]) for row in rows if row[_OPTION] is None))
+    option_costs = _load_costs(curs, "option", "option_seq", "option_cost",
+                               (int(row[_OPTION]) for row in rows if row[_OPTION] is not None))
+
+    # (식당, 일자, 메뉴, 옵션) → [결제 행 수, 수량, 매출, 원가]
+    deltas: Dict[Tuple, List[int]] = {}
+    for row in rows:
+        option_seq = _option_key(row[_OPTION])
+        quantity = int(row[_QUANTITY] or 0)
+        unit_cost = option_costs.get(option_seq, 0) if option_seq else menu_costs.get(int(row[_MENU]), 0)
+        key = (int(row[_STORE]), sales_day(row[_CREATED_AT]), int(row[_MENU]), option_seq)
+        delta = deltas.setdefault(key, [0, 0, 0, 0])
+        delta[0] += 1
+        delta[1] += quantity
+        delta[2] += quantity * int(row[_AMOUNT] or 0)
+        delta[3] += quantity * unit_cost
+
+    # 동시 결제끼리 같은 순서로 행 잠금을 잡도록 키 순서로 기록 (교착 방지)
+    values, params = [], []
+    for key in sorted(deltas):
+        values.append("(%s, %s, %s, %s, %s, %s, %s, %s, NOW())")
+        params.extend((*key, *deltas[key]))
+    curs.execute(f"""
+        INSERT INTO sales_daily (store_seq, sales_date, menu_seq, option_seq, pay_count, quantity, revenue, cost, updated_at)
+        VALUES {', '.join(values)}
+        ON DUPLICATE KEY UPDATE
+            pay_count = pay_count + VALUES(pay_count),
+            quantity = quantity + VALUES(quantity),
+            revenue = revenue + VALUES(revenue),
+            cost = cost + VALUES(cost),
+            updated_at = VALUES(updated_at)
+    """, params)
+    return len(deltas)
+
+
+# ============================================
+# 백필 (관리 스크립트용)
+# ============================================
+_BACKFILL_SQL = """
+    INSERT INTO sales_daily (store_seq, sales_date, menu_seq, option_seq, pay_count, quantity, revenue, cost, updated_at)
+    SELECT p.store_seq,
+           DATE(p.created_at),
+           p.menu_seq,
+           IFNULL(p.option_seq, 0),
+           COUNT(*),
+           SUM(p.pay_quantity),
+           SUM(p.pay_quantity * p.pay_amount),
+           SUM(p.pay_quantity * IF(p.option_seq IS NULL, m.menu_cost, IFNULL(o.option_cost, 0))),
+           NOW()
+    FROM pay p
+    INNER JOIN menu m ON p.menu_seq = m.menu_seq
+    LEFT JOIN `option` o ON p.option_seq = o.option_seq
+    WHERE p.store_seq = %s AND p.created_at >= %s AND p.created_at < %s
+    GROUP BY p.store_seq, DATE(p.created_at), p.menu_seq, IFNULL(p.option_seq, 0)
+"""
+
+
+def backfill_sales_daily(
+    conn,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    store_seqs: Optional[Sequence[int]] = None,
+    on_store=None,
+) -> int:
+    """
+    sales_daily를 pay에서 다시 집계 (식당마다 기간 삭제 + INSERT ... SELECT를 한 트랜잭션으로 커밋)
+
+    Args:
+        start_date, end_date: 기간 (둘 다 포함, 없으면 pay 전체 기간)
+        store_seqs: 대상 식당 (없으면 pay가 있는 모든 식당)
+        on_store: 식당 하나를 마칠 때마다 호출 (store_seq, 집계 행 수) - 진행 표시용
+
+    Returns:
+        int: 기록된 집계 행 수
+    """
+    curs = conn.cursor()
+    if store_seqs is None:
+        curs.execute("SELECT DISTINCT store_seq FROM pay ORDER BY store_seq")
+        store_seqs = [row[0] for row in curs.fetchall()]
+    start = datetime.combine(start_date, datetime.min.time()) if start_date else datetime(1970, 1, 1)
+    end = datetime.combine(end_date + timedelta(days=1), datetime.min.time()) if end_date else datetime(9999, 1, 1)
+
+    total = 0
+    for store_seq in store_seqs:
+        curs.execute("""
+            DELETE FROM sales_daily
+            WHERE store_seq = %s AND sales_date >= %s AND sales_date < %s
+        """, (store_seq, start.date(), end.date()))
+        curs.execute(_BACKFILL_SQL, (store_seq, start, end))
+        conn.commit()
+        total += curs.rowcount
+        if on_store:
+            on_store(store_seq, curs.rowcount)
+    return total
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 일별 매출 / 마진 집계(sales_daily) 증분 갱신 및 백필
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - apply_sales_rollup / backfill_sales_daily / sales_day
@@ -0,0 +1,328 @@
+"""
+주변 식당 검색 인덱스
+식당 위치(store_lat, store_lng)를 위경도 격자에 나눠 메모리에 두고
+"이 좌표에서 반경 R 안의 가까운 식당 k곳" 조회에 응답
+작성일: 2026-01-22
+작성자: 김택권
+
+동작 방식:
+    - 처음 조회할 때 store에서 (store_seq, store_lat, store_lng)만 읽어 격자 인덱스 생성
+    - 식당 추가/수정/삭제 API가 DB 커밋 후 upsert_store / remove_store로 증분 반영
+    - 다른 워커 프로세스의 변경은 STORE_GEO_REFRESH초마다 다시 읽어 반영
+    - 조회는 기준 좌표의 격자부터 바깥 고리(ring) 순서로 넓혀 가며 후보를 모으고,
+      다음 고리의 최소 거리가 k번째 거리보다 멀어지면 중단 (식당 수가 아닌 주변 밀도에 비례)
+    - 결과는 (거리, store_seq) 순 정렬, 마지막 항목을 커서로 다음 페이지 조회
+
+사용 예시:
+    from ..utils.store_geo import store_geo_index
+
+    page = await store_geo_index.nearby(lat, lng, radius_m=3000, k=20)
+    store_geo_index.upsert_store(store_seq, store_lat, store_lng)
+    store_geo_index.remove_store(store_seq)
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..database.async_db import run_db
+
+# 격자 한 칸 크기 (도, 0.01도 ≈ 위도 방향 1.1km)
+STORE_GEO_CELL_DEG = float(os.getenv('STORE_GEO_CELL_DEG', '0.01'))
+
+# 다른 프로세스 변경 반영을 위한 전체 재로딩 주기 (초)
+STORE_GEO_REFRESH = float(os.getenv('STORE_GEO_REFRESH', '300'))
+
+_EARTH_RADIUS_M = 6371008.8
+_METERS_PER_DEG = math.pi * _EARTH_RADIUS_M / 180
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 좌표 사이의 구면 거리 (미터)"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def encode_cursor(distance_m: float, store_seq: int) -> str:
+    return f"{distance_m:.1f}:{store_seq}"
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[float, int]]:
+    """
+    'distance_m:store_seq' 커서 → (거리, store_seq)
+
+    Raises:
+        ValueError: 커서 형식 오류
+    """
+    if not cursor:
+        return None
+    distance, store_seq = cursor.split(':', 1)
+    return float(distance), int(store_seq)
+
+
+class StoreGeoIndex:
+    """
+    위경도 격자 기반 식당 위치 인덱스
+
+    - 조회는 메모리 인덱스만 사용 (처음 조회와 STORE_GEO_REFRESH 주기 재로딩 때만 DB 읽기)
+    - 재로딩 중에 반영된 쓰기는 로딩 결과를 적용한 뒤 다시 반영
+    """
+
+    def __init__(self, cell_deg: float = STORE_GEO_CELL_DEG, refresh: float = STORE_GEO_REFRESH):
+        self.cell_deg = cell_deg
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._load_lock: Optional[asyncio.Lock] = None
+        # store_seq -> (lat, lng)
+        self._positions: Dict[int, Tuple[float, float]] = {}
+        # store_seq -> (위도 라디안, 경도 라디안, cos(위도)) - 거리 계산용
+        self._radians: Dict[int, Tuple[float, float, float]] = {}
+        # (위도 칸, 경도 칸) -> {store_seq, ...}
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._loaded_at: Optional[float] = None
+        # 재로딩 중 들어온 쓰기 (store_seq, (lat, lng) 또는 삭제면 None)
+        self._pending: Optional[List[Tuple[int, Optional[Tuple[float, float]]]]] = None
+
+    # ============================================
+    # 조회
+    # ============================================
+    async def nearby(
+        self,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        k: int,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> Dict:
+        """
+        (lat, lng)에서 radius_m 안의 식당을 가까운 순으로 k개 조회
+
+        Args:
+            after: 이전 페이지 마지막 항목의 (거리, store_seq) - 이보다 뒤의 항목만 반환
+
+        Returns:
+            dict: items([(store_seq, 거리 m), ...]), next_cursor(다음 페이지가 없으면 None)
+        """
+        await self._ensure_loaded()
+        with self._lock:
+            found = self._search_locked(lat, lng, radius_m, k + 1, after)
+        items = found[:k]
+        next_cursor = encode_cursor(*items[-1]) if len(found) > k else None
+        return {"items": [(store_seq, distance) for distance, store_seq in items], "next_cursor": next_cursor}
+
+    def _search_locked(
+        self, lat: float, lng: float, radius_m: float, want: int, after: Optional[Tuple[float, int]]
+    ) -> List[Tuple[float, int]]:
+        center_i, center_j = self._cell(lat, lng)
+        lat_rad, lng_rad = math.radians(lat), math.radians(lng)
+        cos_lat = math.cos(lat_rad)
+        total = len(self._positions)
+        candidates: List[Tuple[float, int]] = []
+        seen = 0
+        ring = 0
+        # 고리를 넓히며 본 칸 수가 식당이 있는 칸 수를 넘으면 (한적한 지역) 빈 칸을 하나씩 보지 않고
+        # 식당이 있는 칸만 고리 번호별로 모아 두고 빈 고리는 건너뜀 (최악에도 전체 칸 수의 2배 이내)
+        walked = 0
+        buckets: Optional[Dict[int, List[Tuple[int, int]]]] = None
+        bucket_rings: List[int] = []
+        while seen < total:
+            if buckets is None and walked > len(self._cells):
+                buckets = {}
+                for cell in self._cells:
+                    cell_ring = max(abs(cell[0] - center_i), abs(cell[1] - center_j))
+                    if cell_ring >= ring:
+                        buckets.setdefault(cell_ring, []).append(cell)
+                bucket_rings = sorted(buckets, reverse=True)
+                if not bucket_rings:
+                    break
+                ring = bucket_rings[-1]
+            if buckets is None:
+                cells = self._ring_cells(center_i, center_j, ring)
+                walked += 8 * ring or 1
+            else:
+                cells = buckets[bucket_rings.pop()]
+
+            for cell in cells:
+                for store_seq in self._cells.get(cell, ()):
+                    seen += 1
+                    store_lat, store_lng, store_cos = self._radians[store_seq]
+                    # haversine (좌표 라디안 / cos 값은 미리 계산)
+                    a = (math.sin((store_lat - lat_rad) / 2) ** 2
+                         + cos_lat * store_cos * math.sin((store_lng - lng_rad) / 2) ** 2)
+                    distance = round(2 * _EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a))), 1)
+                    if distance <= radius_m:
+                        key = (distance, store_seq)
+                        if after is None or key > after:
+                            candidates.append(key)
+
+            if buckets is None:
+                next_ring = ring + 1
+            elif bucket_rings:
+                next_ring = bucket_rings[-1]
+            else:
+                break
+            # 다음 고리에 있는 식당은 최소 이 거리 이상 떨어져 있음
+            next_bound = self._ring_min_distance(lat, next_ring)
+            if next_bound > radius_m:
+                break
+            if len(candidates) >= want:
+                candidates.sort()
+                del candidates[want:]
+                if candidates[-1][0] < next_bound:
+                    break
+            ring = next_ring
+        candidates.sort()
+        return candidates[:want]
+
+    def _ring_min_distance(self, lat: float, ring: int) -> float:
+        """기준 좌표에서 ring번째 고리 격자까지의 최소 거리 하한 (미터)"""
+        if ring <= 1:
+            return 0.0
+        # 경도 방향 칸 너비는 고위도일수록 좁아지므로 고리가 닿는 가장 높은 위도 기준으로 계산
+        max_lat = min(89.9, abs(lat) + ring * self.cell_deg)
+        return (ring - 1) * self.cell_deg * _METERS_PER_DEG * math.cos(math.radians(max_lat))
+
+    @staticmethod
+    def _ring_cells(center_i: int, center_j: int, ring: int):
+        if ring == 0:
+            yield (center_i, center_j)
+            return
+        for di in range(-ring, ring + 1):
+            if abs(di) == ring:
+                for dj in range(-ring, ring + 1):
+                    yield (center_i + di, center_j + dj)
+            else:
+                yield (center_i + di, center_j - ring)
+                yield (center_i + di, center_j + ring)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg))
+
+    # ============================================
+    # 쓰기 반영 (DB 커밋 후 호출)
+    # ============================================
+    def upsert_store(self, store_seq: int, lat: float, lng: float) -> None:
+        """식당 추가/위치 수정 반영"""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((store_seq, (float(lat), float(lng))))
+            self._put_locked(store_seq, float(lat), float(lng))
+
+    def remove_store(self, store_seq: int) -> None:
+        """식당 삭제 반영"""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((store_seq, None))
+            self._drop_locked(store_seq)
+
+    def clear(self) -> None:
+        """인덱스 비우기 (다음 조회 때 다시 로딩)"""
+        with self._lock:
+            self._positions.clear()
+            self._radians.clear()
+            self._cells.clear()
+            self._loaded_at = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "stores": len(self._positions),
+                "cells": len(self._cells),
+                "cell_deg": self.cell_deg,
+                "loaded_age": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+            }
+
+    def _put_locked(self, store_seq: int, lat: float, lng: float) -> None:
+        self._drop_locked(store_seq)
+        self._positions[store_seq] = (lat, lng)
+        self._radians[store_seq] = (math.radians(lat), math.radians(lng), math.cos(math.radians(lat)))
+        self._cells.setdefault(self._cell(lat, lng), set()).add(store_seq)
+
+    def _drop_locked(self, store_seq: int) -> None:
+        position = self._positions.pop(store_seq, None)
+        self._radians.pop(store_seq, None)
+        if position is None:
+            return
+        cell = self._cell(*position)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(store_seq)
+            if not members:
+                del self._cells[cell]
+
+    # ============================================
+    # 로딩
+    # ============================================
+    async def _ensure_loaded(self) -> None:
+        if self._fresh():
+            return
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            # 동시에 들어온 조회는 한 번만 로딩
+            if self._fresh():
+                return
+            with self._lock:
+                self._pending = []
+            try:
+                rows = await run_db(_load_positions)
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            with self._lock:
+                self._replace_locked(rows)
+                for store_seq, position in self._pending:
+                    if position is None:
+                        self._drop_locked(store_seq)
+                    else:
+                        self._put_locked(store_seq, *position)
+                self._pending = None
+                self._loaded_at = time.monotonic()
+
+    def load_rows(self, rows) -> None:
+        """(store_seq, lat, lng) 목록으로 인덱스 전체 교체 (벤치마크 / 테스트용)"""
+        with self._lock:
+            self._replace_locked(rows)
+            self._loaded_at = time.monotonic()
+
+    def _replace_locked(self, rows) -> None:
+        self._positions.clear()
+        self._radians.clear()
+        self._cells.clear()
+        for store_seq, lat, lng in rows:
+            if lat is not None and lng is not None:
+                self._put_locked(store_seq, float(lat), float(lng))
+
+    def _fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh
+
+
+def _load_positions(conn) -> List[tuple]:
+    curs = conn.cursor()
+    curs.execute("SELECT store_seq, store_lat, store_lng FROM store")
+    return list(curs.fetchall())
+
+
+# 프로세스 전역 인덱스
+store_geo_index = StoreGeoIndex()
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 주변 식당 검색 인덱스 - 위경도 격자, 고리 확장 k-최근접 조회, 식당 쓰기 시 증분 갱신
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - StoreGeoIndex (nearby / upsert_store / remove_store / clear / stats / load_rows)
+#   - STORE_GEO_CELL_DEG, STORE_GEO_REFRESH 환경변수
@@ -0,0 +1,171 @@
+"""
+식당 테이블 배치도 (store_layout)
+store.store_placement의 JSON 문자열({"tables": [{"seq", "pos_x", "pos_y"}]})을
+검증해 store_layout 테이블(테이블당 1행)에 저장하고, 테이블 이름/수용 인원과 합친 배치도를 만듦
+작성일: 2026-01-22
+작성자: 김택권
+
+동작:
+    - 저장: PUT /api/store/layout/{store_seq} 또는 insert/update_store의 store_placement가 배치 JSON이면
+      parse_layout() → validate_layout() → save_layout() (store_placement도 같은 JSON으로 유지)
+    - 조회: GET /api/store/layout/{store_seq} → load_layout() 결과를 catalog_cache(layout_key)에 캐시
+    - 무효화: 테이블 추가/수정/삭제, 식당 수정/삭제, 배치 저장 시 layout_key 무효화
+    - '배치 v1' 같은 JSON이 아닌 기존 값은 배치 정보 없음으로 취급 (모든 테이블이 unplaced)
+
+사용 예시 (run_db 안에서 같은 트랜잭션으로):
+    positions = parse_layout(store_placement)
+    if positions is not None:
+        validate_layout(positions, table_seqs_of_store)
+        save_layout(curs, store_seq, positions)
+"""
+
+import json
+import math
+import os
+from typing import Dict, List, Optional, Sequence
+
+from ..database.bulk import bulk_insert
+
+# 배치 좌표 최대값 (앱 배치 화면 좌표계 기준)
+STORE_LAYOUT_MAX_COORD = float(os.getenv('STORE_LAYOUT_MAX_COORD', '10000'))
+
+# 배치도 한 장의 최대 테이블 수
+STORE_LAYOUT_MAX_TABLES = int(os.getenv('STORE_LAYOUT_MAX_TABLES', '500'))
+
+LAYOUT_COLUMNS = ("store_table_seq", "store_seq", "pos_x", "pos_y")
+
+
+class LayoutError(ValueError):
+    """배치 JSON 형식/내용 오류"""
+
+
+def parse_layout(value) -> Optional[List[Dict]]:
+    """
+    store_placement 값 → [{"seq", "pos_x", "pos_y"}, ...]
+
+    Returns:
+        None: 배치 JSON이 아닌 값 ('배치 v1' 등 기존 문자열, 빈 값)
+
+    Raises:
+        LayoutError: 배치 JSON이지만 형식이 잘못된 경우
+    """
+    if isinstance(value, dict):
+        data = value
+    else:
+        if not value or not str(value).lstrip().startswith('{'):
+            return None
+        try:
+            data = json.loads(value)
+        except json.JSONDecodeError as e:
+            raise LayoutError(f"배치 JSON 형식이 올바르지 않습니다: {e}")
+    if not isinstance(data, dict) or not isinstance(data.get('tables'), list):
+        raise LayoutError('배치 JSON에 "tables" 배열이 없습니다.')
+
+    positions = []
+    for index, item in enumerate(data['tables']):
+        if not isinstance(item, dict):
+            raise LayoutError(f"tables[{index}]: 객체가 아닙니다.")
+        try:
+            seq = item['seq']
+            pos_x, pos_y = float(item['pos_x']), float(item['pos_y'])
+        except KeyError as e:
+            raise LayoutError(f"tables[{index}]: {e.args[0]} 값이 없습니다.")
+        except (TypeError, ValueError):
+            raise LayoutError(f"tables[{index}]: pos_x / pos_y는 숫자여야 합니다.")
+        if isinstance(seq, bool) or not isinstance(seq, int):
+            if not (isinstance(seq, str) and seq.isdigit()):
+                raise LayoutError(f"tables[{index}]: seq는 정수여야 합니다.")
+            seq = int(seq)
+        positions.append({"seq": seq, "pos_x": pos_x, "pos_y": pos_y})
+    return positions
+
+
+def validate_layout(positions: List[Dict], table_seqs: Sequence[int]) -> None:
+    """
+    배치 내용 검사 (식당의 테이블인지, 중복/좌표 범위)
+
+    Args:
+        table_seqs: 해당 식당의 store_table_seq 목록
+
+    Raises:
+        LayoutError: 잘못된 항목이 있는 경우 (항목별 사유를 모아서 한 번에)
+    """
+    if len(positions) > STORE_LAYOUT_MAX_TABLES:
+        raise LayoutError(f"테이블은 최대 {STORE_LAYOUT_MAX_TABLES}개까지 배치할 수 있습니다.")
+    owned = set(table_seqs)
+    seen = set()
+    errors = []
+    for index, item in enumerate(positions):
+        seq = item['seq']
+        if seq not in owned:
+            errors.append(f"tables[{index}]: {seq}번 테이블은 이 식당의 테이블이 아닙니다.")
+        if seq in seen:
+            errors.append(f"tables[{index}]: {seq}번 테이블이 중복되었습니다.")
+        seen.add(seq)
+        for axis in ('pos_x', 'pos_y'):
+            value = item[axis]
+            if not math.isfinite(value) or not (0 <= value <= STORE_LAYOUT_MAX_COORD):
+                errors.append(f"tables[{index}]: {axis}는 0 이상 {STORE_LAYOUT_MAX_COORD:g} 이하여야 합니다.")
+    if errors:
+        raise LayoutError(" / ".join(errors))
+
+
+def layout_json(positions: List[Dict]) -> str:
+    """store_placement에 함께 저장할 배치 JSON (기존 형식 유지)"""
+    return json.dumps({"tables": positions}, ensure_ascii=False)
+
+
+def select_table_seqs(curs, store_seq: int) -> List[int]:
+    curs.execute("SELECT store_table_seq FROM store_table WHERE store_seq = %s", (store_seq,))
+    return [row[0] for row in curs.fetchall()]
+
+
+def save_layout(curs, store_seq: int, positions: List[Dict]) -> int:
+    """식당 배치 전체 교체 (커밋은 호출하는 쪽에서)"""
+    curs.execute("DELETE FROM store_layout WHERE store_seq = %s", (store_seq,))
+    return bulk_insert(curs, "store_layout", LAYOUT_COLUMNS, [
+        (item['seq'], store_seq, item['pos_x'], item['pos_y']) for item in positions
+    ])
+
+
+def load_layout(conn, store_seq: int) -> Optional[Dict]:
+    """
+    테이블 + 배치 좌표를 합친 배치도 (run_db에서 실행)
+
+    Returns:
+        dict: {"store_seq", "tables": [{"seq", "name", "capacity", "x", "y"}], "unplaced": [{"seq", "name", "capacity"}]}
+        None: 식당 없음
+    """
+    curs = conn.cursor()
+    curs.execute("SELECT 1 FROM store WHERE store_seq = %s", (store_seq,))
+    if curs.fetchone() is None:
+        return None
+    curs.execute("""
+        SELECT st.store_table_seq, st.store_table_name, st.store_table_capacity, l.pos_x, l.pos_y
+        FROM store_table st
+        LEFT JOIN store_layout l ON l.store_table_seq = st.store_table_seq AND l.store_seq = st.store_seq
+        WHERE st.store_seq = %s
+        ORDER BY st.store_table_seq
+    """, (store_seq,))
+    tables, unplaced = [], []
+    for seq, name, capacity, pos_x, pos_y in curs.fetchall():
+        if pos_x is None:
+            unplaced.append({"seq": seq, "name": name, "capacity": capacity})
+        else:
+            tables.append({"seq": seq, "name": name, "capacity": capacity, "x": pos_x, "y": pos_y})
+    return {"store_seq": store_seq, "tables": tables, "unplaced": unplaced}
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: 식당 테이블 배치도 - store_placement JSON 검증, store_layout 저장, 테이블 정보와 합친 배치도 조회
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - parse_layout / validate_layout / save_layout / load_layout
+#   - STORE_LAYOUT_MAX_COORD, STORE_LAYOUT_MAX_TABLES 환경변수
@@ -0,0 +1,158 @@
+"""
+날씨 예보 캐시
+OpenWeatherMap OneCall 일별 예보(daily 원본)를 위경도 격자 단위로 캐시
+작성일: 2026-01-22
+작성자: 김택권
+
+동작:
+    - 위경도를 WEATHER_BUCKET_DEG 단위 격자로 반올림 → 가까운 식당끼리 같은 항목 공유
+    - 격자 중심 좌표로 OpenWeatherMap을 호출하므로 어떤 식당이 먼저 요청해도 결과가 같음
+    - 만료 시각은 WEATHER_CACHE_TTL 단위 벽시계 경계(예: 매시 정각/30분)에 맞춰
+      예보 갱신 주기와 날짜 변경(자정)을 넘겨 오래된 예보를 쓰지 않음
+    - 같은 격자에 대한 동시 미스는 진행 중인 호출 하나를 함께 기다림 (요청 합치기)
+    - 호출 실패는 캐시하지 않음 (기다리던 요청은 같은 예외를 받음)
+
+사용 예시:
+    from .weather_cache import forecast_cache
+
+    daily = await forecast_cache.get_daily(lat, lon, fetch)   # fetch(bucket_lat, bucket_lon) -> awaitable
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+# 격자 크기 (도), 0.05도 ≒ 위도 5.5km
+WEATHER_BUCKET_DEG = float(os.getenv('WEATHER_BUCKET_DEG', '0.05'))
+
+# 캐시 유지 시간 (초), 벽시계 기준 이 단위 경계에서 만료
+WEATHER_CACHE_TTL = int(os.getenv('WEATHER_CACHE_TTL', '1800'))
+
+# 최대 격자 수 (초과 시 가장 오래 안 쓴 격자부터 제거)
+WEATHER_CACHE_MAX_ENTRIES = int(os.getenv('WEATHER_CACHE_MAX_ENTRIES', '2048'))
+
+
+def bucket_of(lat, lon, bucket_deg: float = WEATHER_BUCKET_DEG) -> Tuple[str, str]:
+    """위경도를 격자 중심 좌표 문자열로 변환 (캐시 키 겸 OpenWeatherMap 호출 좌표)"""
+    decimals = max(0, -math.floor(math.log10(bucket_deg))) + 1
+
+    def _snap(value) -> str:
+        return f"{round(round(float(value) / bucket_deg) * bucket_deg, decimals):.{decimals}f}"
+
+    return _snap(lat), _snap(lon)
+
+
+def next_expiry(now: float, ttl: int = WEATHER_CACHE_TTL) -> float:
+    """now 이후 첫 ttl 경계 시각 (epoch 초)"""
+    return (math.floor(now / ttl) + 1) * ttl
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    # 기다리는 요청이 모두 끊긴 경우 "exception was never retrieved" 경고 방지
+    if not task.cancelled():
+        task.exception()
+
+
+class ForecastCache:
+    """격자별 일별 예보 캐시 (요청 합치기 포함)"""
+
+    def __init__(self, ttl: int = WEATHER_CACHE_TTL, max_entries: int = WEATHER_CACHE_MAX_ENTRIES,
+                 bucket_deg: float = WEATHER_BUCKET_DEG):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bucket_deg = bucket_deg
+        self._data: "OrderedDict[Tuple[str, str], Tuple[float, List[Dict]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._upstream_calls = 0
+
+    async def get_daily(
+        self,
+        lat,
+        lon,
+        fetch: Callable[[str, str], Awaitable[List[Dict]]],
+    ) -> List[Dict]:
+        """
+        격자의 daily 원본 리스트 반환 (없으면 fetch로 가져와 저장)
+
+        Args:
+            lat, lon: 요청 위경도
+            fetch: fetch(bucket_lat, bucket_lon) → daily 리스트 (async)
+        """
+        key = bucket_of(lat, lon, self.bucket_deg)
+        item = self._data.get(key)
+        if item is not None:
+            expires_at, daily = item
+            if time.time() < expires_at:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return daily
+            del self._data[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self._misses += 1
+            self._upstream_calls += 1
+            # 별도 Task로 실행: 먼저 요청한 쪽이 끊겨도 기다리는 요청은 결과를 받음
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+            task.add_done_callback(_consume_exception)
+            self._inflight[key] = task
+        else:
+            # 같은 격자를 이미 가져오는 중이면 그 결과를 기다림
+            self._coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key: Tuple[str, str], fetch) -> List[Dict]:
+        try:
+            daily = await fetch(*key)
+            self._store(key, daily)
+            return daily
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key: Tuple[str, str], daily: List[Dict]) -> None:
+        self._data[key] = (next_expiry(time.time(), self.ttl), daily)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """전체 캐시 비우기"""
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률 / 외부 호출 수 지표"""
+        total = self._hits + self._misses + self._coalesced
+        return {
+            "size": len(self._data),
+            "inflight": len(self._inflight),
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "upstream_calls": self._upstream_calls,
+            "hit_rate": round((self._hits + self._coalesced) / total, 4) if total else 0.0,
+        }
+
+
+# 프로세스 전역 예보 캐시
+forecast_cache = ForecastCache()
+
+
+# ============================================================
+# 생성 이력
+# ============================================================
+# 작성일: 2026-01-22
+# 작성자: 김택권
+# 설명: OpenWeatherMap 일별 예보 캐시 (위경도 격자, 벽시계 경계 TTL, 동시 미스 요청 합치기)
+#
+# ============================================================
+# 수정 이력
+# ============================================================
+# 2026-01-22 김택권: 초기 생성
+#   - ForecastCache.get_daily / stats, bucket_of, next_expiry
+#   - WEATHER_BUCKET_DEG / WEATHER_CACHE_TTL / WEATHER_CACHE_MAX_ENTRIES 환경변수
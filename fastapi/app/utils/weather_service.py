@@ -7,11 +7,14 @@ OpenWeatherMap API 서비스
 """
 
 import os
+import httpx
 import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
 from .weather_mapping import get_weather_type_korean, get_weather_icon_url  # noqa: E402
+from .weather_cache import forecast_cache
+from .http_client import get_http_client
 
 # ============================================
 # OpenWeatherMap API 설정
@@ -99,107 +102,151 @@ class WeatherService:
             - start_date=None: 오늘부터 8일치 모두 반환
             - start_date=오늘+3일: 오늘+3일부터 5일치만 반환 (총 8일 중 남은 5일)
         """
+        try:
+            return self._parse_daily(self._request_daily(lat, lon), start_date)
+        except requests.RequestException as e:
+            raise requests.RequestException(f"OpenWeatherMap API 요청 실패: {str(e)}") from e
+        except (KeyError, ValueError, TypeError) as e:
+            raise ValueError(f"API 응답 파싱 실패: {str(e)}") from e
+
+    async def fetch_daily_forecast_cached(
+        self,
+        lat: str = DEFAULT_LAT,
+        lon: str = DEFAULT_LON,
+        start_date: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        fetch_daily_forecast의 캐시 버전 (async)
+
+        - 위경도를 격자(WEATHER_BUCKET_DEG)로 묶어 가까운 식당끼리 같은 예보를 공유
+        - 캐시가 없을 때 같은 격자에 대한 동시 요청은 OpenWeatherMap 호출 1번으로 합침
+        - 인자 / 반환값 / 예외는 fetch_daily_forecast와 동일
+        """
+        try:
+            daily = await forecast_cache.get_daily(lat, lon, self._arequest_daily)
+            return self._parse_daily(daily, start_date)
+        except (requests.RequestException, httpx.HTTPError) as e:
+            raise requests.RequestException(f"OpenWeatherMap API 요청 실패: {str(e)}") from e
+        except (KeyError, ValueError, TypeError) as e:
+            raise ValueError(f"API 응답 파싱 실패: {str(e)}") from e
+
+    def _request_daily(self, lat, lon) -> List[Dict]:
+        """OpenWeatherMap OneCall API 호출 후 daily 원본 리스트 반환"""
         url = f"{OPENWEATHER_BASE_URL}?lat={lat}&lon={lon}&units=metric&exclude=minutely,alerts&appid={self.api_key}"
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+        data = response.json()
         
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+        if "daily" not in data or len(data["daily"]) == 0:
+            raise ValueError("API 응답에 'daily' 데이터가 없습니다.")
+        return data["daily"]
+
+    async def _arequest_daily(self, lat, lon) -> List[Dict]:
+        """_request_daily의 async 버전 (공용 keep-alive 클라이언트 사용, 이벤트 루프를 막지 않음)"""
+        response = await get_http_client().get(OPENWEATHER_BASE_URL, params={
+            "lat": lat,
+            "lon": lon,
+            "units": "metric",
+            "exclude": "minutely,alerts",
+            "appid": self.api_key,
+        })
+        response.raise_for_status()
+        data = response.json()
+        
+        if "daily" not in data or len(data["daily"]) == 0:
+            raise ValueError("API 응답에 'daily' 데이터가 없습니다.")
+        return data["daily"]
+
+    def _parse_daily(self, daily: List[Dict], start_date=None, limit: Optional[int] = None) -> List[Dict]:
+        """daily 원본 리스트를 날짜 검증 / 필터링 후 응답 형식으로 변환 (limit개까지만)"""
+        # 날짜 검증
+        today = datetime.now().date()
+        max_date = today + timedelta(days=7)  # 오늘 포함 8일 = 오늘 + 7일
+        
+        start_date_only = None
+        if start_date:
+            # start_date가 datetime이면 date만 추출
+            if isinstance(start_date, datetime):
+                start_date_only = start_date.date()
+            elif isinstance(start_date, str):
+                # 문자열인 경우 파싱
+                try:
+                    start_date_only = datetime.strptime(start_date, "%Y-%m-%d").date()
+                except ValueError:
+                    raise ValueError(f"날짜 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 필요): {start_date}")
+            else:
+                start_date_only = start_date
             
-            if "daily" not in data or len(data["daily"]) == 0:
-                raise ValueError("API 응답에 'daily' 데이터가 없습니다.")
+            if start_date_only < today:
+                raise ValueError("과거 날짜의 실시간 예보는 조회할 수 없습니다.")
             
-            # 날짜 검증
-            today = datetime.now().date()
-            max_date = today + timedelta(days=7)  # 오늘 포함 8일 = 오늘 + 7일
+            if start_date_only > max_date:
+                raise ValueError(f"예보는 오늘부터 최대 8일까지만 조회 가능합니다. (요청한 날짜: {start_date_only})")
+        
+        result = []
+        
+        for daily_item in daily:
+            # Unix timestamp를 datetime으로 변환
+            dt = datetime.fromtimestamp(daily_item["dt"])
+            # 날짜의 시작 시간 (00:00:00)으로 설정
+            weather_datetime = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+            weather_date = weather_datetime.date()
             
-            start_date_only = None
-            if start_date:
-                # start_date가 datetime이면 date만 추출
-                if isinstance(start_date, datetime):
-                    start_date_only = start_date.date()
-                elif isinstance(start_date, str):
-                    # 문자열인 경우 파싱
-                    try:
-                        start_date_only = datetime.strptime(start_date, "%Y-%m-%d").date()
-                    except ValueError:
-                        raise ValueError(f"날짜 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 필요): {start_date}")
-                else:
-                    start_date_only = start_date
-                
-                if start_date_only < today:
-                    raise ValueError("과거 날짜의 실시간 예보는 조회할 수 없습니다.")
-                
-                if start_date_only > max_date:
-                    raise ValueError(f"예보는 오늘부터 최대 8일까지만 조회 가능합니다. (요청한 날짜: {start_date_only})")
+            # 날짜 필터링
+            if start_date_only:
+                # start_date부터만 포함 (해당 날짜부터 남은 날짜만)
+                if weather_date < start_date_only:
+                    continue
             
-            result = []
+            # 날씨 정보 추출
+            weather_info = daily_item["weather"][0] if daily_item.get("weather") else {}
+            weather_main = weather_info.get("main", "Clear")
+            icon_code = weather_info.get("icon", "01d")
             
-            for daily_item in data["daily"]:
-                # Unix timestamp를 datetime으로 변환
-                dt = datetime.fromtimestamp(daily_item["dt"])
-                # 날짜의 시작 시간 (00:00:00)으로 설정
-                weather_datetime = dt.replace(hour=0, minute=0, second=0, microsecond=0)
-                weather_date = weather_datetime.date()
-                
-                # 날짜 필터링
-                if start_date_only:
-                    # start_date부터만 포함 (해당 날짜부터 남은 날짜만)
-                    if weather_date < start_date_only:
-                        continue
-                
-                # 날씨 정보 추출
-                weather_info = daily_item["weather"][0] if daily_item.get("weather") else {}
-                weather_main = weather_info.get("main", "Clear")
-                icon_code = weather_info.get("icon", "01d")
-                
-                # 온도 정보 추출
-                temp = daily_item.get("temp", {})
-                
-                # OpenWeatherMap OneCall API 3.0 구조 확인
-                # temp 객체에는 min, max, day, night, eve, morn 필드가 있음
-                weather_low = temp.get("min", None)
-                weather_high = temp.get("max", None)
-                
-                # 값이 없거나 None인 경우 처리
-                if weather_low is None:
-                    print(f"⚠️  Warning: temp.min not found in API response. temp keys: {list(temp.keys())}")
-                    weather_low = 0.0
-                if weather_high is None:
-                    print(f"⚠️  Warning: temp.max not found in API response. temp keys: {list(temp.keys())}")
-                    weather_high = 0.0
-                
-                # 온도 값 검증 (한국 기준: -30~50도 범위)
-                weather_low = float(weather_low)
-                weather_high = float(weather_high)
-                
-                if weather_low < -30 or weather_low > 50:
-                    print(f"⚠️  Warning: weather_low ({weather_low}°C) is out of normal range for Korea")
-                if weather_high < -30 or weather_high > 50:
-                    print(f"⚠️  Warning: weather_high ({weather_high}°C) is out of normal range for Korea")
-                if weather_low > weather_high:
-                    print(f"⚠️  Warning: weather_low ({weather_low}°C) is greater than weather_high ({weather_high}°C)")
-                    # 최저/최고 온도 교정
-                    weather_low, weather_high = weather_high, weather_low
-                
-                result.append({
-                    "dt": daily_item["dt"],
-                    "weather_datetime": weather_datetime,
-                    "weather_type": get_weather_type_korean(weather_main),
-                    "weather_type_en": weather_main,
-                    "weather_low": weather_low,
-                    "weather_high": weather_high,
-                    "icon_code": icon_code,
-                    "icon_url": get_weather_icon_url(icon_code)
-                })
+            # 온도 정보 추출
+            temp = daily_item.get("temp", {})
             
-            return result
+            # OpenWeatherMap OneCall API 3.0 구조 확인
+            # temp 객체에는 min, max, day, night, eve, morn 필드가 있음
+            weather_low = temp.get("min", None)
+            weather_high = temp.get("max", None)
             
-        except requests.RequestException as e:
-            raise requests.RequestException(f"OpenWeatherMap API 요청 실패: {str(e)}") from e
-        except (KeyError, ValueError, TypeError) as e:
-            raise ValueError(f"API 응답 파싱 실패: {str(e)}") from e
-    
+            # 값이 없거나 None인 경우 처리
+            if weather_low is None:
+                print(f"⚠️  Warning: temp.min not found in API response. temp keys: {list(temp.keys())}")
+                weather_low = 0.0
+            if weather_high is None:
+                print(f"⚠️  Warning: temp.max not found in API response. temp keys: {list(temp.keys())}")
+                weather_high = 0.0
+            
+            # 온도 값 검증 (한국 기준: -30~50도 범위)
+            weather_low = float(weather_low)
+            weather_high = float(weather_high)
+            
+            if weather_low < -30 or weather_low > 50:
+                print(f"⚠️  Warning: weather_low ({weather_low}°C) is out of normal range for Korea")
+            if weather_high < -30 or weather_high > 50:
+                print(f"⚠️  Warning: weather_high ({weather_high}°C) is out of normal range for Korea")
+            if weather_low > weather_high:
+                print(f"⚠️  Warning: weather_low ({weather_low}°C) is greater than weather_high ({weather_high}°C)")
+                # 최저/최고 온도 교정
+                weather_low, weather_high = weather_high, weather_low
+            
+            result.append({
+                "dt": daily_item["dt"],
+                "weather_datetime": weather_datetime,
+                "weather_type": get_weather_type_korean(weather_main),
+                "weather_type_en": weather_main,
+                "weather_low": weather_low,
+                "weather_high": weather_high,
+                "icon_code": icon_code,
+                "icon_url": get_weather_icon_url(icon_code)
+            })
+            if limit is not None and len(result) >= limit:
+                break
+        
+        return result
+
     def fetch_single_day_weather(
         self,
         lat: str = DEFAULT_LAT,
@@ -230,7 +277,48 @@ class WeatherService:
             requests.RequestException: API 요청 실패 시
             ValueError: API 응답이 유효하지 않을 때, 날짜 범위 초과 시, 해당 날짜 데이터가 없을 때
         """
-        # 날짜 파싱
+        target_date_only = self._target_date_only(target_date)
+        
+        # fetch_daily_forecast를 사용하여 해당 날짜부터 가져오기 (하루만 필요)
+        forecast_list = self.fetch_daily_forecast(
+            lat=lat,
+            lon=lon,
+            start_date=target_date_only
+        )
+        
+        if not forecast_list or len(forecast_list) == 0:
+            raise ValueError(f"해당 날짜({target_date_only})의 날씨 데이터를 찾을 수 없습니다.")
+        
+        # 첫 번째 항목만 반환 (하루치만)
+        return forecast_list[0]
+
+    async def fetch_single_day_weather_cached(
+        self,
+        lat: str = DEFAULT_LAT,
+        lon: str = DEFAULT_LON,
+        target_date: Optional[datetime] = None
+    ) -> Dict:
+        """
+        fetch_single_day_weather의 캐시 버전 (async)
+
+        - 8일치 예보를 캐시에서 읽어 해당 날짜 하루치만 변환 (날짜마다 다시 받지 않음)
+        - 인자 / 반환값 / 예외는 fetch_single_day_weather와 동일
+        """
+        target_date_only = self._target_date_only(target_date)
+        try:
+            daily = await forecast_cache.get_daily(lat, lon, self._arequest_daily)
+            forecast_list = self._parse_daily(daily, target_date_only, limit=1)
+        except (requests.RequestException, httpx.HTTPError) as e:
+            raise requests.RequestException(f"OpenWeatherMap API 요청 실패: {str(e)}") from e
+        except (KeyError, ValueError, TypeError) as e:
+            raise ValueError(f"API 응답 파싱 실패: {str(e)}") from e
+        
+        if not forecast_list:
+            raise ValueError(f"해당 날짜({target_date_only})의 날씨 데이터를 찾을 수 없습니다.")
+        return forecast_list[0]
+
+    def _target_date_only(self, target_date):
+        """조회 날짜를 date로 변환 (None이면 오늘)"""
         target_date_only = None
         if target_date:
             if isinstance(target_date, datetime):
@@ -245,19 +333,7 @@ class WeatherService:
         else:
             # None이면 오늘 날짜
             target_date_only = datetime.now().date()
-        
-        # fetch_daily_forecast를 사용하여 해당 날짜부터 가져오기 (하루만 필요)
-        forecast_list = self.fetch_daily_forecast(
-            lat=lat,
-            lon=lon,
-            start_date=target_date_only
-        )
-        
-        if not forecast_list or len(forecast_list) == 0:
-            raise ValueError(f"해당 날짜({target_date_only})의 날씨 데이터를 찾을 수 없습니다.")
-        
-        # 첫 번째 항목만 반환 (하루치만)
-        return forecast_list[0]
+        return target_date_only
 
 
 # ============================================================
@@ -284,3 +360,12 @@ class WeatherService:
 #   - save_weather_to_db() 메서드 삭제
 #   - fetch_daily_forecast(), fetch_single_day_weather()만 유지
 #   - OpenWeatherMap API 직접 호출만 지원
+#
+# 2026-01-22 김택권: 날씨 예보 캐시 추가
+#   - fetch_daily_forecast_cached / fetch_single_day_weather_cached 추가 (weather_cache.forecast_cache 경유)
+#   - API 호출(_request_daily)과 변환(_parse_daily) 분리
+#   - 단일 날짜 조회는 캐시된 8일치에서 하루치만 변환
+#
+# 2026-01-22 김택권: 비동기 HTTP 클라이언트 적용
+#   - 캐시 버전(fetch_*_cached)은 _arequest_daily로 공용 httpx.AsyncClient(keep-alive) 사용
+#   - 스레드에서 requests를 호출하던 방식 대체
@@ -0,0 +1,103 @@
+"""
+예약 + 결제 기록 지연 시간 비교 스크립트
+기존 3단계 호출(insert_reserve → purchase → purchase/update)과 단일 호출(/api/pay/booking)의
+건당 지연 시간을 실행 중인 API 서버에 대해 측정
+
+사용법:
+    python bench_booking.py STORE_SEQ CUSTOMER_SEQ MENU_SEQ [OPTION_SEQ] [반복횟수]
+
+예시:
+    python bench_booking.py 1 1 1 1 50
+    BENCH_API_URL=http://192.168.0.10:8000 python bench_booking.py 1 1 1
+
+주의:
+    - 실제로 reserve / pay 행이 기록됩니다 (테스트 DB에서 실행하세요)
+    - 테이블을 점유하지 않도록 reserve_tables는 빈 값, 결제 상태는 CANCELED로 기록합니다
+"""
+
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+API_URL = os.getenv('BENCH_API_URL', 'http://127.0.0.1:8000')
+
+
+def make_payload(store_seq, customer_seq, menu_seq, option_seq, index):
+    reserve_date = (datetime.now() + timedelta(days=30, minutes=index)).strftime("%Y-%m-%d %H:%M:%S")
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    reserve = {
+        "store_seq": store_seq,
+        "customer_seq": customer_seq,
+        "reserve_tables": "",
+        "reserve_capacity": 2,
+        "reserve_date": reserve_date,
+        "payment_key": f"bench-{index}",
+        "payment_status": "CANCELED",
+    }
+    options = {str(option_seq): {"count": 1, "price": 1000}} if option_seq else {}
+    items = {"menus": {str(menu_seq): {"count": 2, "price": 10000, "date": now, "options": options}}}
+    return reserve, items
+
+
+def three_calls(session, reserve, items):
+    """기존 흐름: 예약 → 결제 항목 → 결제 상태 (요청 3번, 커밋 3번)"""
+    r = session.post(f"{API_URL}/api/pay/insert_reserve", json=reserve).json()
+    reserve_seq = r['result']['reserve_seq']
+    session.post(f"{API_URL}/api/pay/purchase", json={"reserve": {**reserve, "reserve_seq": reserve_seq}, "items": items}).json()
+    session.post(f"{API_URL}/api/pay/purchase/update", json={
+        "payment_key": reserve['payment_key'], "payment_status": reserve['payment_status'], "reserve_seq": reserve_seq,
+    }).json()
+
+
+def one_call(session, reserve, items):
+    """단일 트랜잭션: /api/pay/booking (요청 1번, 커밋 1번)"""
+    r = session.post(f"{API_URL}/api/pay/booking", json={"reserve": reserve, "items": items}).json()
+    if r.get('result') == 'Error':
+        raise RuntimeError(r.get('errorMsg'))
+
+
+def measure(name, fn, session, args, count):
+    latencies = []
+    for i in range(count):
+        reserve, items = make_payload(*args, i)
+        start = time.perf_counter()
+        fn(session, reserve, items)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{name:<14} | {statistics.median(latencies):>8.1f} | {p95:>8.1f} | {statistics.mean(latencies):>8.1f}")
+
+
+def main():
+    if len(sys.argv) < 4:
+        print(__doc__)
+        return
+    store_seq, customer_seq, menu_seq = int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3])
+    option_seq = int(sys.argv[4]) if len(sys.argv) > 4 and sys.argv[4] != '0' else None
+    count = int(sys.argv[5]) if len(sys.argv) > 5 else 30
+
+    print("=" * 60)
+    print("예약 + 결제 기록 지연 시간 비교")
+    print("=" * 60)
+    print(f"🌐 API: {API_URL}")
+    print(f"🏪 식당: {store_seq}, 👤 고객: {customer_seq}, 🍽️ 메뉴: {menu_seq}, 옵션: {option_seq}")
+    print(f"🔁 반복: {count}회")
+    print()
+
+    args = (store_seq, customer_seq, menu_seq, option_seq)
+    with requests.Session() as session:
+        # 연결/캐시 준비
+        one_call(session, *make_payload(*args, -1))
+
+        print(f"{'방식':<14} | {'p50(ms)':>8} | {'p95(ms)':>8} | {'평균(ms)':>8}")
+        print("-" * 50)
+        measure("3단계 호출", three_calls, session, args, count)
+        measure("booking", one_call, session, args, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+점유 현황 발행/구독 허브 성능 측정 스크립트 (DB / 서버 불필요)
+한 식당에 유휴 구독자 N개를 붙여 두고 이벤트 발행 → 모든 구독자 수신까지의 시간과 메모리를 측정
+
+사용법:
+    python bench_occupancy_stream.py [구독자수] [발행횟수]
+
+예시:
+    python bench_occupancy_stream.py
+    python bench_occupancy_stream.py 20000 50
+    OCCUPANCY_QUEUE_SIZE=16 python bench_occupancy_stream.py
+
+참고:
+    - 구독자마다 실제 연결 대신 대기열을 읽는 태스크 하나를 둡니다 (WebSocket/SSE 전송 시간 제외)
+    - 마지막 단계에서 읽지 않는 구독자(느린 연결)가 resync로 바뀌는지 확인합니다
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+
+from app.utils.occupancy_hub import OCCUPANCY_QUEUE_SIZE, OccupancyHub, RESYNC, table_event
+
+
+async def run(count, publishes):
+    hub = OccupancyHub(max_subscribers=count + 1, redis_url="")
+    tracemalloc.start()
+    subscriptions = [hub.subscribe(1) for _ in range(count)]
+    received = [0]
+    done = asyncio.Event()
+    target = [count]
+
+    async def consume(subscription):
+        while True:
+            await subscription.get()
+            received[0] += 1
+            if received[0] >= target[0]:
+                done.set()
+
+    tasks = [asyncio.create_task(consume(s)) for s in subscriptions]
+    await asyncio.sleep(0)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"💤 유휴 구독자 {count}개: 약 {memory / count:.0f} B/구독자 (태스크 포함 {memory / 1024 / 1024:.1f} MB)")
+
+    publish_ms, fanout_ms = [], []
+    for i in range(publishes):
+        received[0] = 0
+        done.clear()
+        start = time.perf_counter()
+        hub.publish(1, table_event(1, 1, 1, 4, i % 2 == 0))
+        publish_ms.append((time.perf_counter() - start) * 1000)
+        await done.wait()
+        fanout_ms.append((time.perf_counter() - start) * 1000)
+    print(f"📣 publish 호출 p50: {statistics.median(publish_ms):.2f} ms (쓰기 API가 기다리는 시간)")
+    print(f"📬 전체 수신 p50: {statistics.median(fanout_ms):.2f} ms, 최대: {max(fanout_ms):.2f} ms")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # 읽지 않는 구독자: 대기열 크기를 넘기면 resync 하나만 남음
+    slow = subscriptions[0]
+    for i in range(OCCUPANCY_QUEUE_SIZE * 3):
+        hub.publish(1, table_event(1, 1, 1, 4, i % 2 == 0))
+    first = await slow.get(0)
+    ok = "✅" if first == RESYNC and slow.pending() < OCCUPANCY_QUEUE_SIZE else "❌"
+    print(f"🐢 느린 구독자: 남은 이벤트 {slow.pending() + 1}개 (대기열 {OCCUPANCY_QUEUE_SIZE}), 첫 이벤트 resync {ok}")
+    print(f"📊 {hub.stats()}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    publishes = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    print("=" * 60)
+    print("점유 현황 발행/구독 허브 성능 측정")
+    print("=" * 60)
+    asyncio.run(run(count, publishes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+비밀번호 해시(scrypt) 처리량 측정 스크립트
+DB 없이 verify_password만 반복 실행해 초당 로그인 검증 수를 워커 수별로 측정
+
+사용법:
+    python bench_password_hash.py [검증횟수] [N] [r] [p]
+
+예시:
+    python bench_password_hash.py                 # 200회, 현재 설정(PW_SCRYPT_N/R/P)
+    python bench_password_hash.py 400 32768 8 1   # 비용을 올렸을 때 비교
+
+참고:
+    - 워커 수는 1, 2, 4 ... CPU 코어 수까지 늘려가며 측정합니다 (PW_HASH_WORKERS 환경변수 대신 직접 풀 생성)
+    - '코어당'은 초당 검증 수 / 워커 수 입니다. 코어당 값이 유지되면 코어 수만큼 처리량이 늘어난 것입니다
+    - 로그인 1회 목표 시간(보통 50~250ms)에 맞게 PW_SCRYPT_N을 고르는 데 사용합니다
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.utils.password_hasher import (
+    PW_SCRYPT_N, PW_SCRYPT_R, PW_SCRYPT_P, hash_password_sync, verify_password_sync,
+)
+
+
+async def measure(pool: ProcessPoolExecutor, stored: str, count: int) -> float:
+    loop = asyncio.get_running_loop()
+    # 프로세스 시작 시간 제외
+    await asyncio.gather(*[loop.run_in_executor(pool, verify_password_sync, 'pw', stored)
+                           for _ in range(pool._max_workers)])
+    start = time.perf_counter()
+    results = await asyncio.gather(*[loop.run_in_executor(pool, verify_password_sync, 'password123', stored)
+                                     for _ in range(count)])
+    elapsed = time.perf_counter() - start
+    assert all(ok for ok, _ in results)
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else PW_SCRYPT_N
+    r = int(sys.argv[3]) if len(sys.argv) > 3 else PW_SCRYPT_R
+    p = int(sys.argv[4]) if len(sys.argv) > 4 else PW_SCRYPT_P
+    cores = os.cpu_count() or 1
+
+    print("=" * 60)
+    print("비밀번호 해시 처리량 측정")
+    print("=" * 60)
+    print(f"🔐 scrypt N={n}, r={r}, p={p} (메모리 {128 * n * r * p / 1024 / 1024:.0f}MB/회)")
+    print(f"🖥️  CPU 코어: {cores}, 검증 횟수: {count}")
+    print()
+
+    stored = hash_password_sync('password123', n, r, p)
+
+    # 단일 검증 지연 시간 (현재 프로세스)
+    start = time.perf_counter()
+    verify_password_sync('password123', stored)
+    print(f"⏱️  검증 1회: {(time.perf_counter() - start) * 1000:.1f}ms")
+    print()
+
+    workers = 1
+    ctx = multiprocessing.get_context('spawn')
+    print(f"{'워커':>4} | {'초당 검증':>10} | {'코어당':>8}")
+    print("-" * 30)
+    while True:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            elapsed = asyncio.run(measure(pool, stored, count))
+        rate = count / elapsed
+        print(f"{workers:>4} | {rate:>10.1f} | {rate / workers:>8.1f}")
+        if workers >= cores:
+            break
+        workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    main()
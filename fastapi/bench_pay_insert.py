@@ -0,0 +1,84 @@
+"""
+pay 일괄 추가 방식 비교 스크립트
+항목마다 INSERT(기존 /api/pay/insert) vs 다중 행 INSERT(bulk_insert)를 10 / 100 / 1000개에서 측정
+
+사용법:
+    python bench_pay_insert.py RESERVE_SEQ STORE_SEQ MENU_SEQ [반복횟수]
+
+예시:
+    python bench_pay_insert.py 1 1 1
+    BULK_INSERT_CHUNK=200 python bench_pay_insert.py 1 1 1 5
+
+참고:
+    - 존재하는 reserve / store / menu 번호가 필요합니다 (pay 외래키)
+    - 측정은 트랜잭션 안에서 하고 마지막에 ROLLBACK 하므로 데이터가 남지 않습니다
+    - 원격 DB일수록 왕복 시간이 커서 차이가 크게 나타납니다
+"""
+
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from app.database.bulk import BULK_INSERT_CHUNK, bulk_insert
+from app.database.connection import close_pool, get_connection
+from app.api.payment import PAY_COLUMNS
+
+SIZES = (10, 100, 1000)
+
+
+def per_row(curs, rows):
+    """기존 방식: 항목마다 execute (항목 수만큼 왕복)"""
+    for row in rows:
+        curs.execute(
+            "insert into pay(reserve_seq,store_seq,menu_seq,option_seq,pay_quantity,pay_amount,created_at) values(%s,%s,%s,%s,%s,%s,%s)",
+            row,
+        )
+
+
+def bulk(curs, rows):
+    """다중 행 INSERT: BULK_INSERT_CHUNK개씩 한 문장"""
+    bulk_insert(curs, "pay", PAY_COLUMNS, rows)
+
+
+def measure(conn, fn, rows, repeat):
+    elapsed = []
+    for _ in range(repeat):
+        curs = conn.cursor()
+        start = time.perf_counter()
+        fn(curs, rows)
+        elapsed.append((time.perf_counter() - start) * 1000)
+        conn.rollback()
+    return statistics.median(elapsed)
+
+
+def main():
+    if len(sys.argv) < 4:
+        print(__doc__)
+        return
+    reserve_seq, store_seq, menu_seq = int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3])
+    repeat = int(sys.argv[4]) if len(sys.argv) > 4 else 3
+    created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    print("=" * 60)
+    print("pay 일괄 추가 방식 비교 (측정 후 ROLLBACK)")
+    print("=" * 60)
+    print(f"🧾 예약: {reserve_seq}, 🏪 식당: {store_seq}, 🍽️ 메뉴: {menu_seq}")
+    print(f"📦 BULK_INSERT_CHUNK: {BULK_INSERT_CHUNK}, 🔁 반복: {repeat}회 (중앙값)")
+    print()
+    print(f"{'항목 수':>6} | {'항목별(ms)':>10} | {'다중 행(ms)':>11} | {'배수':>6}")
+    print("-" * 46)
+
+    try:
+        with get_connection() as conn:
+            for size in SIZES:
+                rows = [(reserve_seq, store_seq, menu_seq, None, 1, 1000 + i, created_at) for i in range(size)]
+                slow = measure(conn, per_row, rows, repeat)
+                fast = measure(conn, bulk, rows, repeat)
+                print(f"{size:>6} | {slow:>10.1f} | {fast:>11.1f} | {slow / fast:>5.1f}x")
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+주변 식당 검색 인덱스 성능 측정 스크립트 (DB 불필요)
+임의 좌표의 식당 N곳으로 StoreGeoIndex를 만들고 밀집 / 보통 / 한적한 위치의 조회 시간을 측정
+
+사용법:
+    python bench_store_nearby.py [식당수] [반복횟수]
+
+예시:
+    python bench_store_nearby.py
+    python bench_store_nearby.py 100000 200
+    STORE_GEO_CELL_DEG=0.005 python bench_store_nearby.py
+
+참고:
+    - 식당은 남한 범위(위도 33~38, 경도 125~130)에 고르게 N곳 + 서울 도심 반경 약 2km에 N/10곳 밀집
+    - 결과는 전체 탐색(정렬) 결과와 비교해 검증합니다
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+from app.utils.store_geo import STORE_GEO_CELL_DEG, StoreGeoIndex, haversine_m
+
+# (이름, 위도, 경도, 반경 m, k)
+QUERIES = (
+    ("서울 도심 (밀집)", 37.5, 127.0, 3000, 20),
+    ("서울 도심 넓게", 37.5, 127.0, 50000, 100),
+    ("지방 (보통)", 35.0, 128.0, 3000, 20),
+    ("지방 넓게", 35.0, 128.0, 50000, 100),
+    ("해외 (식당 없음)", 20.0, 100.0, 50000, 20),
+)
+
+
+def make_rows(count):
+    random.seed(0)
+    rows = [(i, 33 + random.random() * 5, 125 + random.random() * 5) for i in range(1, count + 1)]
+    rows += [(count + i, 37.5 + random.gauss(0, 0.02), 127.0 + random.gauss(0, 0.02)) for i in range(1, count // 10 + 1)]
+    return rows
+
+
+def brute_force(rows, lat, lng, radius, k):
+    found = sorted((round(haversine_m(lat, lng, a, b), 1), s) for s, a, b in rows)
+    return [(s, d) for d, s in found if d <= radius][:k]
+
+
+async def run(count, repeat):
+    rows = make_rows(count)
+    index = StoreGeoIndex()
+    start = time.perf_counter()
+    index.load_rows(rows)
+    print(f"🏗️  인덱스 생성: {len(rows)}곳, {(time.perf_counter() - start) * 1000:.0f} ms, 칸 {index.stats()['cells']}개")
+    print()
+    print(f"{'위치':<16} | {'반경(m)':>7} | {'k':>4} | {'p50(ms)':>8} | {'전체 탐색(ms)':>12} | 검증")
+    print("-" * 70)
+    for name, lat, lng, radius, k in QUERIES:
+        elapsed = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            page = await index.nearby(lat, lng, radius, k)
+            elapsed.append((time.perf_counter() - t) * 1000)
+        t = time.perf_counter()
+        expected = brute_force(rows, lat, lng, radius, k)
+        brute_ms = (time.perf_counter() - t) * 1000
+        ok = "✅" if page["items"] == expected else "❌"
+        print(f"{name:<16} | {radius:>7} | {k:>4} | {statistics.median(elapsed):>8.2f} | {brute_ms:>12.1f} | {ok}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    print("=" * 60)
+    print("주변 식당 검색 인덱스 성능 측정")
+    print("=" * 60)
+    print(f"🏪 식당: {count}곳 (+ 밀집 {count // 10}곳), 📐 STORE_GEO_CELL_DEG: {STORE_GEO_CELL_DEG}, 🔁 반복: {repeat}회")
+    asyncio.run(run(count, repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+예약별 주문 요약(order_summary) 일치 검사 스크립트
+저장된 요약과 pay 실시간 집계를 비교해 누락 / 불일치 / 고아 요약이 있으면 실패(종료 코드 1)
+
+사용법:
+    python check_order_summary.py
+
+참고:
+    - 누락: 요약이 없는 예약 (조회 시 자동으로 채워지지만 run_order_summary_rebuild.py로 한 번에 채울 수 있음)
+    - 불일치: pay가 API를 거치지 않고 변경되었거나 메뉴/옵션 이름이 바뀐 경우
+    - 문제가 있으면 python run_order_summary_rebuild.py [예약번호 ...]로 다시 맞추세요
+"""
+
+import sys
+
+from app.database.connection import close_pool, get_connection
+from app.utils.order_summary import check_order_summaries
+
+# 목록에 출력할 최대 예약 수
+MAX_LISTED = 20
+
+
+def print_list(label, reserve_seqs):
+    listed = ', '.join(map(str, reserve_seqs[:MAX_LISTED]))
+    more = f" 외 {len(reserve_seqs) - MAX_LISTED}건" if len(reserve_seqs) > MAX_LISTED else ""
+    print(f"❌ {label}: {len(reserve_seqs)}건 - {listed}{more}")
+
+
+def main():
+    print("=" * 60)
+    print("예약별 주문 요약 일치 검사")
+    print("=" * 60)
+
+    try:
+        with get_connection() as conn:
+            result = check_order_summaries(conn)
+    finally:
+        close_pool()
+
+    print(f"🔍 검사한 예약: {result['checked']}건")
+    ok = True
+    for key, label in (("missing", "요약 누락"), ("mismatched", "내용 불일치"), ("orphaned", "pay 없는 요약")):
+        if result[key]:
+            print_list(label, result[key])
+            ok = False
+    if ok:
+        print("✅ 모든 요약이 실시간 집계와 일치합니다")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+예약 8일 조회 실행 계획 검사 스크립트 (EXPLAIN)
+select_reserves_8 / select_reserves_8_store 쿼리가 기대 인덱스를 쓰지 않으면 실패(종료 코드 1)
+
+사용법:
+    python check_reserve_query_plans.py [--lenient] [날짜] [식당번호]
+
+예시:
+    python check_reserve_query_plans.py
+    python check_reserve_query_plans.py 2026-01-23 1
+    python check_reserve_query_plans.py --lenient
+
+검사 순서 (쿼리마다):
+    1. ANALYZE TABLE reserve로 통계 갱신
+    2. 인덱스 강제(FORCE INDEX) + EXPLAIN FORMAT=JSON → 기대 인덱스로 범위 검색(access_type=range)이 되는지
+       (행 수와 무관하게 인덱스 누락 / 쿼리 조건 변경을 잡아냄)
+    3. 그대로 EXPLAIN → 옵티마이저가 실제로 기대 인덱스를 선택하는지 (type=ALL이면 실패)
+
+참고:
+    - 행 수가 적은 테이블(MIN_ROWS 미만)에서는 옵티마이저가 전체 스캔을 택할 수 있습니다.
+      --lenient면 이 경우 3단계만 경고로 처리합니다 (2단계는 항상 검사)
+    - 인덱스가 없으면 mysql/migration_v4_reserve_date_index.sql을 먼저 실행하세요
+    - pytest로도 실행됩니다 (tests/test_reserve_query_plans.py, RUN_DB_TESTS=1일 때만)
+"""
+
+import json
+import re
+import sys
+from datetime import datetime
+from app.database.connection import connect_db
+from app.api.reserve import (
+    SELECT_RESERVES_RANGE_SQL,
+    SELECT_RESERVES_RANGE_STORE_SQL,
+    reserve_range,
+)
+
+# 이 행 수 이상이면 --lenient여도 옵티마이저가 반드시 인덱스를 선택해야 함
+MIN_ROWS = 1000
+
+# (이름, SQL, 식당 조건 여부, 기대 인덱스, 인덱스가 범위 검색에 써야 하는 컬럼)
+PLAN_CHECKS = (
+    ("select_reserves_8 (전체 식당)", SELECT_RESERVES_RANGE_SQL, False,
+     'idx_reserve_date', ('reserve_date',)),
+    ("select_reserves_8_store (식당별)", SELECT_RESERVES_RANGE_STORE_SQL, True,
+     'idx_reserve_store_date', ('store_seq', 'reserve_date')),
+)
+
+
+def explain(curs, sql, params):
+    """EXPLAIN 결과를 dict 리스트로 반환"""
+    curs.execute("EXPLAIN " + sql, params)
+    columns = [col[0] for col in curs.description]
+    return [dict(zip(columns, row)) for row in curs.fetchall()]
+
+
+def force_index(sql, index):
+    """FROM reserve 뒤에 FORCE INDEX를 붙인 SQL"""
+    return re.sub(r"\bFROM reserve\b", f"FROM reserve FORCE INDEX (`{index}`)", sql, count=1)
+
+
+def find_table(node, table):
+    """EXPLAIN FORMAT=JSON 결과에서 table_name이 table인 항목 찾기 (ordering_operation 등 중첩 포함)"""
+    if isinstance(node, dict):
+        if node.get('table_name') == table:
+            return node
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        found = find_table(child, table)
+        if found is not None:
+            return found
+    return None
+
+
+def explain_forced(curs, sql, params, index):
+    """인덱스 강제 EXPLAIN FORMAT=JSON의 reserve 항목 (없으면 None)"""
+    curs.execute("EXPLAIN FORMAT=JSON " + force_index(sql, index), params)
+    return find_table(json.loads(curs.fetchone()[0]), 'reserve')
+
+
+def check_forced(forced, expected_key, key_parts):
+    """인덱스 강제 시 범위 검색이 되는지, 통과하면 True"""
+    if forced is None:
+        print("   ❌ 인덱스 강제 실행 계획에 reserve 테이블이 없습니다")
+        return False
+    used = forced.get('used_key_parts') or []
+    print(f"   [FORCE INDEX] access_type={forced.get('access_type')} key={forced.get('key')} used_key_parts={used}")
+    if forced.get('key') != expected_key or forced.get('access_type') != 'range':
+        print(f"   ❌ {expected_key} 인덱스로 범위 검색을 할 수 없습니다 (인덱스 누락 또는 쿼리 조건 변경)")
+        return False
+    missing = [part for part in key_parts if part not in used]
+    if missing:
+        print(f"   ❌ {expected_key} 인덱스가 {', '.join(missing)} 조건에 쓰이지 않습니다")
+        return False
+    return True
+
+
+def check_plan(plan, expected_key, table_rows, lenient):
+    """옵티마이저가 고른 실행 계획 검사, 통과하면 True"""
+    ok = True
+    for row in plan:
+        print(f"   table={row['table']} type={row['type']} key={row['key']} "
+              f"possible_keys={row['possible_keys']} rows={row['rows']} Extra={row['Extra']}")
+        if row['table'] != 'reserve':
+            continue
+        if row['type'] != 'ALL' and row['key'] == expected_key:
+            continue
+        if lenient and table_rows < MIN_ROWS:
+            print(f"   ⚠️  테이블 행 수({table_rows})가 적어 옵티마이저가 {row['key'] or '전체 스캔'}을 선택 "
+                  f"(--lenient, {expected_key} 범위 검색은 가능)")
+        else:
+            print(f"   ❌ 전체 스캔 또는 다른 인덱스 사용 (기대: {expected_key}, 테이블 행 수: {table_rows})")
+            ok = False
+    return ok
+
+
+def check_plans(conn, date, store_seq, lenient=False):
+    """
+    예약 8일 조회 쿼리의 실행 계획 검사
+
+    Returns:
+        list: [(이름, 통과 여부), ...]
+    """
+    start_dt, end_dt = reserve_range(date)
+    curs = conn.cursor()
+    # 통계가 오래되면 행 수 추정이 틀려 인덱스를 두고도 전체 스캔을 택할 수 있음
+    curs.execute("ANALYZE TABLE reserve")
+    curs.fetchall()
+    curs.execute("SELECT COUNT(*) FROM reserve")
+    table_rows = curs.fetchone()[0]
+
+    results = []
+    for name, sql, by_store, expected_key, key_parts in PLAN_CHECKS:
+        params = (store_seq, start_dt, end_dt) if by_store else (start_dt, end_dt)
+        print(f"🔍 {name}")
+        ok = check_forced(explain_forced(curs, sql, params, expected_key), expected_key, key_parts)
+        ok = check_plan(explain(curs, sql, params), expected_key, table_rows, lenient) and ok
+        if ok:
+            print("   ✅ 통과")
+        print()
+        results.append((name, ok))
+    return results
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != '--lenient']
+    lenient = '--lenient' in sys.argv[1:]
+    date = args[0] if len(args) > 0 else datetime.now().strftime("%Y-%m-%d")
+    store_seq = int(args[1]) if len(args) > 1 else 1
+    start_dt, end_dt = reserve_range(date)
+
+    print("=" * 60)
+    print("예약 8일 조회 실행 계획 검사")
+    print("=" * 60)
+    print(f"📅 기간: [{start_dt}, {end_dt})  🏠 식당 번호: {store_seq}  lenient={lenient}")
+    print()
+
+    conn = connect_db()
+    try:
+        results = check_plans(conn, date, store_seq, lenient)
+    finally:
+        conn.close()
+
+    print("=" * 60)
+    if all(ok for _, ok in results):
+        print("✅ 모든 실행 계획 검사 통과")
+        sys.exit(0)
+    print("❌ 실행 계획 검사 실패")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# MySQL 8.0 마이그레이션 v3 - reserve_table 연관 테이블 추가
+
+-- > 목적: reserve.reserve_tables (comma-separated 문자열)를 정규화한 reserve_table 테이블 생성 및 기존 예약 백필
+-- > 대상: table_now_db_init_v2.sql로 생성된 기존 데이터베이스 (v2 → v3)
+-- > 작성일: 2026-01-22
+-- > 작성자: 김택권
+-- > 특징: 여러 번 실행해도 안전 (CREATE TABLE IF NOT EXISTS + INSERT IGNORE)
+-- =========================================================
+-- 적용 순서
+--   1. 이 스크립트 실행 (테이블 생성 + 백필)
+--   2. FastAPI 서버 배포 (예약 추가/수정 시 reserve.reserve_tables와 reserve_table에 함께 기록)
+--   3. 배포 전후로 생성된 예약이 빠지지 않도록 백필(2번 블록)을 한 번 더 실행
+--
+-- reserve.reserve_tables 컬럼은 앱 호환을 위해 유지합니다 (이중 기록).
+-- 테이블(store_table)을 삭제하면 그 테이블의 reserve_table 행도 함께 삭제됩니다 (ON DELETE CASCADE).
+-- 예약 이력은 reserve.reserve_tables 문자열에 그대로 남습니다.
+-- =========================================================
+
+USE `table_now_db`;
+
+SET NAMES utf8mb4;
+
+-- ---------------------------------------------------------
+-- 1) reserve_table (예약-테이블 연관)
+-- ---------------------------------------------------------
+-- reserve_date는 "테이블 X가 T 시각에 비어 있는가" 조회를
+-- (store_table_seq, reserve_date) 인덱스 범위 검색으로 처리하기 위해 reserve에서 복제
+CREATE TABLE IF NOT EXISTS `reserve_table` (
+    `reserve_seq` INT NOT NULL COMMENT '예약 번호',
+    `store_table_seq` INT NOT NULL COMMENT '테이블 번호',
+    `store_seq` INT NOT NULL COMMENT '식당 번호',
+    `reserve_date` DATETIME NOT NULL COMMENT '예약 일시 (reserve.reserve_date 복제)',
+    PRIMARY KEY (`reserve_seq`, `store_table_seq`),
+    KEY `idx_reserve_table_table_date` (`store_table_seq`, `reserve_date`),
+    KEY `idx_reserve_table_store_date` (`store_seq`, `reserve_date`),
+    CONSTRAINT `fk_reserve_table_reserve_seq` FOREIGN KEY (`reserve_seq`) REFERENCES `reserve` (`reserve_seq`) ON UPDATE RESTRICT ON DELETE CASCADE,
+    CONSTRAINT `fk_reserve_table_store_table_seq` FOREIGN KEY (`store_table_seq`) REFERENCES `store_table` (`store_table_seq`) ON UPDATE RESTRICT ON DELETE CASCADE,
+    CONSTRAINT `fk_reserve_table_store_seq` FOREIGN KEY (`store_seq`) REFERENCES `store` (`store_seq`) ON UPDATE RESTRICT ON DELETE RESTRICT
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
+-- ---------------------------------------------------------
+-- 1-1) 이미 생성된 reserve_table의 store_table 외래키를 ON DELETE CASCADE로 변경
+-- ---------------------------------------------------------
+-- 이전 버전 스크립트는 ON DELETE RESTRICT로 만들어 예약이 있는 테이블을 삭제할 수 없었음
+-- (DELETE /api/store_table/delete_StoreTable/{seq} → 1451 오류)
+SET @sql = IF(
+    (SELECT COUNT(*) FROM information_schema.REFERENTIAL_CONSTRAINTS
+     WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'reserve_table'
+     AND CONSTRAINT_NAME = 'fk_reserve_table_store_table_seq' AND DELETE_RULE <> 'CASCADE') > 0,
+    'ALTER TABLE `reserve_table` DROP FOREIGN KEY `fk_reserve_table_store_table_seq`',
+    'SELECT ''fk_reserve_table_store_table_seq already ON DELETE CASCADE'''
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @sql = IF(
+    (SELECT COUNT(*) FROM information_schema.REFERENTIAL_CONSTRAINTS
+     WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'reserve_table'
+     AND CONSTRAINT_NAME = 'fk_reserve_table_store_table_seq') = 0,
+    'ALTER TABLE `reserve_table` ADD CONSTRAINT `fk_reserve_table_store_table_seq` FOREIGN KEY (`store_table_seq`) REFERENCES `store_table` (`store_table_seq`) ON UPDATE RESTRICT ON DELETE CASCADE',
+    'SELECT ''fk_reserve_table_store_table_seq exists'''
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- ---------------------------------------------------------
+-- 2) 백필: reserve.reserve_tables → reserve_table
+-- ---------------------------------------------------------
+-- - '1,2,3' 문자열을 JSON 배열로 바꿔 JSON_TABLE로 행 단위 분리
+-- - 숫자가 아닌 항목, 존재하지 않거나 다른 식당의 테이블 번호는 제외
+--   (제외된 예약은 API의 이중 읽기 경로에서 reserve_tables 문자열로 계속 조회됨)
+-- - 이미 백필된 행은 INSERT IGNORE로 건너뜀
+INSERT IGNORE INTO `reserve_table` (`reserve_seq`, `store_table_seq`, `store_seq`, `reserve_date`)
+SELECT r.`reserve_seq`, st.`store_table_seq`, r.`store_seq`, r.`reserve_date`
+FROM `reserve` r
+JOIN JSON_TABLE(
+    CONCAT('["', REPLACE(REPLACE(r.`reserve_tables`, ' ', ''), ',', '","'), '"]'),
+    '$[*]' COLUMNS (`table_no` VARCHAR(32) PATH '$')
+) jt
+JOIN `store_table` st
+    ON st.`store_table_seq` = CAST(jt.`table_no` AS UNSIGNED)
+    AND st.`store_seq` = r.`store_seq`
+WHERE jt.`table_no` REGEXP '^[0-9]+$';
+
+-- ---------------------------------------------------------
+-- 3) 검증: 백필되지 않은 예약 확인 (결과가 있으면 reserve_tables 데이터 확인 필요)
+-- ---------------------------------------------------------
+SELECT r.`reserve_seq`, r.`store_seq`, r.`reserve_tables`
+FROM `reserve` r
+WHERE NOT EXISTS (
+    SELECT 1 FROM `reserve_table` rt WHERE rt.`reserve_seq` = r.`reserve_seq`
+);
+
+-- ============================================================
+-- 생성 이력
+-- ============================================================
+-- 작성일: 2026-01-22
+-- 작성자: 김택권
+-- 설명: reserve_table 연관 테이블 생성 및 reserve.reserve_tables 백필 마이그레이션
+--
+-- ============================================================
+-- 수정 이력
+-- ============================================================
+-- 2026-01-22 김택권: 초기 생성
+--   - reserve_table 테이블 (PK: reserve_seq + store_table_seq)
+--   - idx_reserve_table_table_date (store_table_seq, reserve_date) 인덱스
+--   - JSON_TABLE 기반 백필 및 검증 쿼리
+--
+-- 2026-01-22 김택권: store_table 외래키 삭제 규칙 변경
+--   - fk_reserve_table_store_table_seq: ON DELETE RESTRICT → ON DELETE CASCADE
+--     (예약이 있는 테이블도 삭제 가능, 예약 이력은 reserve.reserve_tables에 유지)
+--   - 이미 생성된 reserve_table은 1-1) 블록에서 외래키를 다시 생성
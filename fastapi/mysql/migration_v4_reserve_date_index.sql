@@ -0,0 +1,88 @@
+# MySQL 8.0 마이그레이션 v4 - reserve 예약 일시 복합 인덱스
+
+-- > 목적: 8일 예약 조회(select_reserves_8, select_reserves_8_store)가 전체 예약을 스캔하지 않도록 인덱스 추가
+-- > 대상: migration_v3_reserve_table.sql까지 적용된 데이터베이스 (v3 → v4)
+-- > 작성일: 2026-01-22
+-- > 작성자: 김택권
+-- > 특징: 여러 번 실행해도 안전 (information_schema로 인덱스 존재 여부 확인 후 실행)
+-- =========================================================
+-- 추가 인덱스
+--   - idx_reserve_store_date (store_seq, reserve_date): 식당별 기간 조회 (select_reserves_8_store)
+--   - idx_reserve_date (reserve_date): 전체 식당 기간 조회 (select_reserves_8)
+--
+-- 삭제 인덱스
+--   - idx_reserve_store_seq (store_seq): idx_reserve_store_date의 앞부분과 중복
+--     (fk_reserve_store_seq 외래키는 idx_reserve_store_date를 사용)
+--
+-- 커버링 인덱스를 쓰지 않는 이유
+--   - 두 조회는 reserve의 9개 컬럼을 모두 반환하므로 커버링 인덱스는 사실상 테이블 전체를 한 번 더 저장
+--   - reserve_tables / payment_key / payment_status가 VARCHAR(255) utf8mb4 (각 최대 1,022바이트)라
+--     9개 컬럼을 모두 넣으면 키 길이가 InnoDB 한도(3,072바이트)를 넘어 인덱스를 만들 수 없음
+--   - 결제 상태 변경(purchase/update)마다 보조 인덱스도 함께 갱신되어 쓰기 비용 증가
+--   → (store_seq, reserve_date) / (reserve_date) 범위 검색 후 PK로 행을 읽음
+--     (식당·기간당 예약 수만큼만 읽으므로 전체 스캔 대비 충분, ORDER BY reserve_seq는 결과 행만 정렬)
+--
+-- 검증: python check_reserve_query_plans.py (EXPLAIN으로 전체 스캔 여부 확인)
+-- =========================================================
+
+USE `table_now_db`;
+
+-- ---------------------------------------------------------
+-- 1) idx_reserve_store_date (store_seq, reserve_date)
+-- ---------------------------------------------------------
+SET @sql = IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'reserve' AND INDEX_NAME = 'idx_reserve_store_date') = 0,
+    'ALTER TABLE `reserve` ADD INDEX `idx_reserve_store_date` (`store_seq`, `reserve_date`), ALGORITHM = INPLACE, LOCK = NONE',
+    'SELECT ''idx_reserve_store_date already exists'''
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- ---------------------------------------------------------
+-- 2) idx_reserve_date (reserve_date)
+-- ---------------------------------------------------------
+SET @sql = IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'reserve' AND INDEX_NAME = 'idx_reserve_date') = 0,
+    'ALTER TABLE `reserve` ADD INDEX `idx_reserve_date` (`reserve_date`), ALGORITHM = INPLACE, LOCK = NONE',
+    'SELECT ''idx_reserve_date already exists'''
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- ---------------------------------------------------------
+-- 3) 중복 인덱스 idx_reserve_store_seq 삭제
+-- ---------------------------------------------------------
+SET @sql = IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'reserve' AND INDEX_NAME = 'idx_reserve_store_seq') > 0,
+    'ALTER TABLE `reserve` DROP INDEX `idx_reserve_store_seq`, ALGORITHM = INPLACE, LOCK = NONE',
+    'SELECT ''idx_reserve_store_seq already dropped'''
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- ---------------------------------------------------------
+-- 4) 통계 갱신 및 확인
+-- ---------------------------------------------------------
+ANALYZE TABLE `reserve`;
+
+SHOW INDEX FROM `reserve`;
+
+-- ============================================================
+-- 생성 이력
+-- ============================================================
+-- 작성일: 2026-01-22
+-- 작성자: 김택권
+-- 설명: reserve (store_seq, reserve_date) / (reserve_date) 인덱스 추가, 중복 인덱스 정리
+--
+-- ============================================================
+-- 수정 이력
+-- ============================================================
+-- 2026-01-22 김택권: 초기 생성
+--
+-- 2026-01-22 김택권: 커버링 인덱스를 쓰지 않는 이유 설명 추가 (키 길이 한도 / 쓰기 비용)
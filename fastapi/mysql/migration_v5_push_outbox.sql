@@ -0,0 +1,54 @@
+# MySQL 8.0 마이그레이션 v5 - push_outbox (푸시 알림 발송 대기열)
+
+-- > 목적: 푸시 알림을 HTTP 요청 안에서 바로 보내지 않고 대기열에 저장한 뒤 워커가 발송 (재시도 / 실패 보관)
+-- > 대상: migration_v4_reserve_date_index.sql까지 적용된 데이터베이스 (v4 → v5)
+-- > 작성일: 2026-01-22
+-- > 작성자: 김택권
+-- > 특징: 여러 번 실행해도 안전 (CREATE TABLE IF NOT EXISTS)
+-- =========================================================
+-- 상태 흐름
+--   PENDING → PROCESSING → SENT
+--                        → PENDING (일시적 실패, next_attempt_at까지 대기 후 재시도)
+--                        → DEAD    (최대 시도 횟수 초과 또는 대상 기기 없음)
+--   - PROCESSING 행의 next_attempt_at은 임대 만료 시각: 워커가 죽으면 만료 후 다른 워커가 다시 가져감
+--     (적어도 한 번 발송 보장, 드물게 중복 발송 가능)
+--   - 워커는 SELECT ... FOR UPDATE SKIP LOCKED로 행을 나눠 가짐 (MySQL 8.0 이상)
+-- =========================================================
+
+USE `table_now_db`;
+
+CREATE TABLE IF NOT EXISTS `push_outbox` (
+    `outbox_seq` BIGINT NOT NULL AUTO_INCREMENT COMMENT '발송 대기 번호',
+    `customer_seq` INT NULL COMMENT '대상 고객 번호 (고객의 모든 기기)',
+    `fcm_token` VARCHAR(255) NULL COMMENT '대상 FCM 토큰 (단일 기기 발송 시, customer_seq 대신 사용)',
+    `title` VARCHAR(255) NOT NULL COMMENT '알림 제목',
+    `body` TEXT NOT NULL COMMENT '알림 내용',
+    `data` JSON NULL COMMENT '추가 데이터',
+    `status` VARCHAR(20) NOT NULL DEFAULT 'PENDING' COMMENT '상태 (PENDING/PROCESSING/SENT/DEAD)',
+    `attempts` INT NOT NULL DEFAULT 0 COMMENT '발송 시도 횟수',
+    `retry_tokens` JSON NULL COMMENT '일부 기기만 실패한 경우 재시도할 토큰 목록',
+    `success_count` INT NOT NULL DEFAULT 0 COMMENT '발송 성공 기기 수 (누적)',
+    `last_error` TEXT NULL COMMENT '마지막 실패 사유',
+    `next_attempt_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '다음 시도 시각 (PROCESSING이면 임대 만료 시각)',
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '등록 일시',
+    `sent_at` DATETIME NULL COMMENT '발송 완료 일시',
+    PRIMARY KEY (`outbox_seq`),
+    KEY `idx_push_outbox_status_next` (`status`, `next_attempt_at`),
+    KEY `idx_push_outbox_customer_seq` (`customer_seq`),
+    CONSTRAINT `fk_push_outbox_customer_seq` FOREIGN KEY (`customer_seq`) REFERENCES `customer` (`customer_seq`) ON UPDATE RESTRICT ON DELETE CASCADE
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
+-- 확인: 상태별 건수
+SELECT `status`, COUNT(*) AS cnt FROM `push_outbox` GROUP BY `status`;
+
+-- ============================================================
+-- 생성 이력
+-- ============================================================
+-- 작성일: 2026-01-22
+-- 작성자: 김택권
+-- 설명: 푸시 알림 발송 대기열(push_outbox) 테이블 추가
+--
+-- ============================================================
+-- 수정 이력
+-- ============================================================
+-- 2026-01-22 김택권: 초기 생성
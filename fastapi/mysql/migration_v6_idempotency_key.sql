@@ -0,0 +1,44 @@
+# MySQL 8.0 마이그레이션 v6 - idempotency_key (중복 요청 방지 키 저장소)
+
+-- > 목적: 결제/예약 API를 같은 Idempotency-Key로 다시 호출하면 저장된 응답을 돌려주고 INSERT를 반복하지 않음
+-- > 대상: migration_v5_push_outbox.sql까지 적용된 데이터베이스 (v5 → v6)
+-- > 작성일: 2026-01-22
+-- > 작성자: 김택권
+-- > 특징: 여러 번 실행해도 안전 (CREATE TABLE IF NOT EXISTS)
+-- =========================================================
+-- 상태 흐름
+--   (없음) → PROCESSING (첫 요청이 키 선점, INSERT 성공한 요청만 실행)
+--          → DONE       (성공 응답 저장, expires_at까지 같은 키 요청에 그대로 응답)
+--          → (삭제)     (실행 실패 시 행 삭제 → 같은 키로 다시 시도 가능)
+--   - PROCESSING 행이 오래 남아 있으면(서버 종료 등) IDEMPOTENCY_STALE_AFTER(초) 후 다른 요청이 넘겨받음
+--   - 만료된 행은 API 서버가 주기적으로 삭제 (idx_idempotency_key_expires)
+-- =========================================================
+
+USE `table_now_db`;
+
+CREATE TABLE IF NOT EXISTS `idempotency_key` (
+    `scope` VARCHAR(64) NOT NULL COMMENT '키 범위 (API 이름)',
+    `idem_key` VARCHAR(128) NOT NULL COMMENT '클라이언트가 보낸 Idempotency-Key',
+    `request_hash` CHAR(64) NOT NULL COMMENT '요청 본문 SHA-256 (같은 키로 다른 요청을 보내면 거부)',
+    `status` VARCHAR(20) NOT NULL DEFAULT 'PROCESSING' COMMENT '상태 (PROCESSING/DONE)',
+    `response` JSON NULL COMMENT '저장된 응답 (DONE)',
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '등록 일시',
+    `expires_at` DATETIME NOT NULL COMMENT '만료 일시',
+    PRIMARY KEY (`scope`, `idem_key`),
+    KEY `idx_idempotency_key_expires` (`expires_at`)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
+-- 확인: 범위/상태별 건수
+SELECT `scope`, `status`, COUNT(*) AS cnt FROM `idempotency_key` GROUP BY `scope`, `status`;
+
+-- ============================================================
+-- 생성 이력
+-- ============================================================
+-- 작성일: 2026-01-22
+-- 작성자: 김택권
+-- 설명: 중복 요청 방지 키 저장소(idempotency_key) 테이블 추가
+--
+-- ============================================================
+-- 수정 이력
+-- ============================================================
+-- 2026-01-22 김택권: 초기 생성
@@ -0,0 +1,45 @@
+# MySQL 8.0 마이그레이션 v7 - order_summary (예약별 주문 요약)
+
+-- > 목적: 영수증 화면(/api/pay/select_group_by_reserve)이 pay GROUP BY + menu/store/option 조인 대신 PK 한 번으로 조회
+-- > 대상: migration_v6_idempotency_key.sql까지 적용된 데이터베이스 (v6 → v7)
+-- > 작성일: 2026-01-22
+-- > 작성자: 김택권
+-- > 특징: 여러 번 실행해도 안전 (CREATE TABLE IF NOT EXISTS)
+-- =========================================================
+-- 기록 방식
+--   - pay를 기록하는 API(purchase / booking / insert)가 같은 트랜잭션에서 요약을 다시 계산해 저장
+--   - summary: 기존 select_group_by_reserve 응답의 results 배열 그대로 (메뉴/옵션 이름, 이미지 포함 스냅샷)
+--   - 기존 예약은 조회 시 자동으로 채워지며, 한 번에 채우려면 fastapi 폴더에서
+--     python run_order_summary_rebuild.py 실행
+--   - 일치 여부 검사: python check_order_summary.py
+-- =========================================================
+
+USE `table_now_db`;
+
+CREATE TABLE IF NOT EXISTS `order_summary` (
+    `reserve_seq` INT NOT NULL COMMENT '예약 번호',
+    `line_count` INT NOT NULL COMMENT '요약 항목 수 (식당/메뉴/옵션 조합 수)',
+    `total_quantity` INT NOT NULL COMMENT '총 수량',
+    `total_amount` INT NOT NULL COMMENT '총 금액 (항목 total_pay 합계)',
+    `summary` JSON NOT NULL COMMENT '영수증 항목 배열',
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '갱신 일시',
+    PRIMARY KEY (`reserve_seq`),
+    CONSTRAINT `fk_order_summary_reserve` FOREIGN KEY (`reserve_seq`) REFERENCES `reserve` (`reserve_seq`) ON DELETE CASCADE
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
+-- 확인: 요약 수 / pay가 있는 예약 수
+SELECT
+    (SELECT COUNT(*) FROM `order_summary`) AS summary_cnt,
+    (SELECT COUNT(DISTINCT `reserve_seq`) FROM `pay`) AS reserve_with_pay_cnt;
+
+-- ============================================================
+-- 생성 이력
+-- ============================================================
+-- 작성일: 2026-01-22
+-- 작성자: 김택권
+-- 설명: 예약별 주문 요약(order_summary) 테이블 추가
+--
+-- ============================================================
+-- 수정 이력
+-- ============================================================
+-- 2026-01-22 김택권: 초기 생성
@@ -0,0 +1,45 @@
+# MySQL 8.0 마이그레이션 v8 - sales_daily (식당/일자/메뉴/옵션별 매출 집계)
+
+-- > 목적: 매출 리포트(/api/sales)가 pay 전체를 읽지 않고 집계 테이블 범위 조회로 응답
+-- > 대상: migration_v7_order_summary.sql까지 적용된 데이터베이스 (v7 → v8)
+-- > 작성일: 2026-01-22
+-- > 작성자: 김택권
+-- > 특징: 여러 번 실행해도 안전 (CREATE TABLE IF NOT EXISTS)
+-- =========================================================
+-- 기록 방식
+--   - pay를 기록하는 API(purchase / booking / insert)가 같은 트랜잭션에서 합계를 더함
+--   - 매출 = pay_quantity * pay_amount, 원가 = pay_quantity * (옵션 행이면 option_cost, 아니면 menu_cost)
+--   - 옵션 없는 메뉴 행은 option_seq = 0
+--   - 기존 결제는 fastapi 폴더에서 python run_sales_backfill.py로 채움
+-- =========================================================
+
+USE `table_now_db`;
+
+CREATE TABLE IF NOT EXISTS `sales_daily` (
+    `store_seq` INT NOT NULL COMMENT '식당 번호',
+    `sales_date` DATE NOT NULL COMMENT '매출 일자 (DATE(pay.created_at))',
+    `menu_seq` INT NOT NULL COMMENT '메뉴 번호',
+    `option_seq` INT NOT NULL DEFAULT 0 COMMENT '추가 메뉴 번호 (옵션 없는 메뉴 행은 0)',
+    `pay_count` INT NOT NULL DEFAULT 0 COMMENT '결제 행 수',
+    `quantity` INT NOT NULL DEFAULT 0 COMMENT '수량 합계',
+    `revenue` BIGINT NOT NULL DEFAULT 0 COMMENT '매출 합계',
+    `cost` BIGINT NOT NULL DEFAULT 0 COMMENT '원가 합계',
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '갱신 일시',
+    PRIMARY KEY (`store_seq`, `sales_date`, `menu_seq`, `option_seq`)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
+-- 확인: 식당별 집계 행 수 / 기간
+SELECT `store_seq`, COUNT(*) AS cnt, MIN(`sales_date`) AS first_date, MAX(`sales_date`) AS last_date
+FROM `sales_daily` GROUP BY `store_seq`;
+
+-- ============================================================
+-- 생성 이력
+-- ============================================================
+-- 작성일: 2026-01-22
+-- 작성자: 김택권
+-- 설명: 식당/일자/메뉴/옵션별 매출 집계(sales_daily) 테이블 추가
+--
+-- ============================================================
+-- 수정 이력
+-- ============================================================
+-- 2026-01-22 김택권: 초기 생성
@@ -0,0 +1,65 @@
+# MySQL 8.0 마이그레이션 v9 - store_layout (식당 테이블 배치 좌표)
+
+-- > 목적: store.store_placement의 배치 JSON({"tables": [{"seq", "pos_x", "pos_y"}]})을 테이블당 1행으로 정규화
+-- > 대상: migration_v8_sales_daily.sql까지 적용된 데이터베이스 (v8 → v9)
+-- > 작성일: 2026-01-22
+-- > 작성자: 김택권
+-- > 특징: 여러 번 실행해도 안전 (CREATE TABLE IF NOT EXISTS, 백필은 ON DUPLICATE KEY UPDATE)
+-- =========================================================
+-- 변경 내용
+--   1) store_layout 생성 (store_table 1개당 좌표 1행, 테이블/식당 삭제 시 함께 삭제)
+--   2) store_placement가 올바른 배치 JSON인 식당은 store_layout으로 백필
+--      - JSON이 아닌 값('배치 v1' 등)은 건너뜀
+--      - 다른 식당의 테이블 번호나 없는 테이블 번호는 건너뜀
+--   3) store.store_placement를 VARCHAR(255) → TEXT로 변경 (배치가 커져도 잘리지 않도록, 기존 앱 호환용으로 유지)
+-- =========================================================
+
+USE `table_now_db`;
+
+CREATE TABLE IF NOT EXISTS `store_layout` (
+    `store_table_seq` INT NOT NULL COMMENT '테이블 번호',
+    `store_seq` INT NOT NULL COMMENT '식당 번호',
+    `pos_x` DOUBLE NOT NULL COMMENT '배치 X 좌표',
+    `pos_y` DOUBLE NOT NULL COMMENT '배치 Y 좌표',
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '갱신 일시',
+    PRIMARY KEY (`store_table_seq`),
+    KEY `idx_store_layout_store_seq` (`store_seq`),
+    CONSTRAINT `fk_store_layout_store_table` FOREIGN KEY (`store_table_seq`) REFERENCES `store_table` (`store_table_seq`) ON DELETE CASCADE,
+    CONSTRAINT `fk_store_layout_store` FOREIGN KEY (`store_seq`) REFERENCES `store` (`store_seq`) ON DELETE CASCADE
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
+-- 백필: 배치 JSON → store_layout
+INSERT INTO `store_layout` (`store_table_seq`, `store_seq`, `pos_x`, `pos_y`)
+SELECT jt.`seq`, s.`store_seq`, jt.`pos_x`, jt.`pos_y`
+FROM `store` s
+JOIN JSON_TABLE(
+    IF(JSON_VALID(s.`store_placement`), s.`store_placement`, '{"tables": []}'),
+    '$.tables[*]' COLUMNS (
+        `seq` INT PATH '$.seq',
+        `pos_x` DOUBLE PATH '$.pos_x',
+        `pos_y` DOUBLE PATH '$.pos_y'
+    )
+) AS jt
+JOIN `store_table` st ON st.`store_table_seq` = jt.`seq` AND st.`store_seq` = s.`store_seq`
+WHERE jt.`pos_x` IS NOT NULL AND jt.`pos_y` IS NOT NULL
+ON DUPLICATE KEY UPDATE `store_seq` = VALUES(`store_seq`), `pos_x` = VALUES(`pos_x`), `pos_y` = VALUES(`pos_y`);
+
+ALTER TABLE `store` MODIFY `store_placement` TEXT NOT NULL COMMENT '테이블 배치 정보 (배치 JSON은 store_layout에 정규화)';
+
+-- 확인: 식당별 배치된 테이블 수 / 전체 테이블 수
+SELECT s.`store_seq`,
+       (SELECT COUNT(*) FROM `store_layout` l WHERE l.`store_seq` = s.`store_seq`) AS placed_cnt,
+       (SELECT COUNT(*) FROM `store_table` st WHERE st.`store_seq` = s.`store_seq`) AS table_cnt
+FROM `store` s;
+
+-- ============================================================
+-- 생성 이력
+-- ============================================================
+-- 작성일: 2026-01-22
+-- 작성자: 김택권
+-- 설명: 식당 테이블 배치 좌표(store_layout) 테이블 추가, store_placement 백필 및 TEXT 변경
+--
+-- ============================================================
+-- 수정 이력
+-- ============================================================
+-- 2026-01-22 김택권: 초기 생성
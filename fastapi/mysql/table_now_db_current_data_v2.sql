@@ -122,6 +122,21 @@ VALUES
   (2, 2, 2, '6', 1, '2026-01-23 12:30:00', '2026-01-15 18:25:00', 'paykey_demo_002', 'DONE')
 ON DUPLICATE KEY UPDATE `reserve_seq` = VALUES(`reserve_seq`), `store_seq` = VALUES(`store_seq`), `customer_seq` = VALUES(`customer_seq`), `reserve_tables` = VALUES(`reserve_tables`), `reserve_capacity` = VALUES(`reserve_capacity`), `reserve_date` = VALUES(`reserve_date`), `created_at` = VALUES(`created_at`), `payment_key` = VALUES(`payment_key`), `payment_status` = VALUES(`payment_status`);
 
+-- reserve_table 데이터 (reserve.reserve_tables 정규화)
+-- reserve 2의 '6'은 다른 식당(store 1)의 테이블이라 제외 (reserve_tables 문자열로만 조회됨)
+INSERT INTO `reserve_table` (`reserve_seq`, `store_table_seq`, `store_seq`, `reserve_date`)
+VALUES
+  (1, 1, 1, '2026-01-23 12:00:00'),
+  (1, 2, 1, '2026-01-23 12:00:00')
+ON DUPLICATE KEY UPDATE `store_seq` = VALUES(`store_seq`), `reserve_date` = VALUES(`reserve_date`);
+
+-- store_layout 데이터 (store 1의 store_placement 배치 JSON 정규화)
+INSERT INTO `store_layout` (`store_table_seq`, `store_seq`, `pos_x`, `pos_y`)
+VALUES
+  (1, 1, 150.0, 200.0),
+  (38, 1, 300.0, 300.0)
+ON DUPLICATE KEY UPDATE `store_seq` = VALUES(`store_seq`), `pos_x` = VALUES(`pos_x`), `pos_y` = VALUES(`pos_y`);
+
 -- pay 테이블 데이터 (변경 없음)
 INSERT INTO `pay` (`pay_id`, `reserve_seq`, `store_seq`, `menu_seq`, `option_seq`, `pay_quantity`, `pay_amount`, `created_at`)
 VALUES
@@ -171,6 +186,8 @@ COMMIT;
 --   - menu: 12건 ✅
 --   - option: 11건 ✅
 --   - reserve: 2건 ✅ (weather_datetime만 제거)
+--   - reserve_table: 2건 (2026-01-22 추가, reserve 1의 테이블 1,2)
+--   - store_layout: 2건 (2026-01-22 추가, store 1의 테이블 1,38 배치 좌표)
 --   - pay: 8건 ✅
 --   - device_token: 8건 ✅
 --   - password_reset_auth: 1건 ✅
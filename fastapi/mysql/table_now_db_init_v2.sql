@@ -26,16 +26,28 @@ SET NAMES utf8mb4;
 SET FOREIGN_KEY_CHECKS = 0;
 
 -- Drop tables (reverse dependency order)
+DROP TABLE IF EXISTS `store_layout`;
+
+DROP TABLE IF EXISTS `sales_daily`;
+
+DROP TABLE IF EXISTS `order_summary`;
+
+DROP TABLE IF EXISTS `idempotency_key`;
+
 DROP TABLE IF EXISTS `pay`;
 
 DROP TABLE IF EXISTS `option`;
 
 DROP TABLE IF EXISTS `menu`;
 
+DROP TABLE IF EXISTS `reserve_table`;
+
 DROP TABLE IF EXISTS `reserve`;
 
 DROP TABLE IF EXISTS `password_reset_auth`;
 
+DROP TABLE IF EXISTS `push_outbox`;
+
 DROP TABLE IF EXISTS `device_token`;
 
 DROP TABLE IF EXISTS `store_table`;
@@ -79,7 +91,7 @@ CREATE TABLE `store` (
     `store_closetime` VARCHAR(255) NULL COMMENT '운영 종료시간 (정보용)',
     `store_description` VARCHAR(255) NULL COMMENT '식당 설명',
     `store_image` VARCHAR(255) NULL COMMENT '이미지 URL',
-    `store_placement` VARCHAR(255) NOT NULL COMMENT '테이블 배치 정보',
+    `store_placement` TEXT NOT NULL COMMENT '테이블 배치 정보 (배치 JSON은 store_layout에 정규화)',
     `created_at` DATETIME NOT NULL COMMENT '생성 일자',
     PRIMARY KEY (`store_seq`)
 ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
@@ -135,6 +147,30 @@ CREATE TABLE `device_token` (
     UNIQUE KEY `uk_customer_token` (`customer_seq`, `fcm_token`)
 ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
 
+-- ---------------------------------------------------------
+-- 5-1) push_outbox (푸시 알림 발송 대기열)
+-- ---------------------------------------------------------
+CREATE TABLE `push_outbox` (
+    `outbox_seq` BIGINT NOT NULL AUTO_INCREMENT COMMENT '발송 대기 번호',
+    `customer_seq` INT NULL COMMENT '대상 고객 번호 (고객의 모든 기기)',
+    `fcm_token` VARCHAR(255) NULL COMMENT '대상 FCM 토큰 (단일 기기 발송 시, customer_seq 대신 사용)',
+    `title` VARCHAR(255) NOT NULL COMMENT '알림 제목',
+    `body` TEXT NOT NULL COMMENT '알림 내용',
+    `data` JSON NULL COMMENT '추가 데이터',
+    `status` VARCHAR(20) NOT NULL DEFAULT 'PENDING' COMMENT '상태 (PENDING/PROCESSING/SENT/DEAD)',
+    `attempts` INT NOT NULL DEFAULT 0 COMMENT '발송 시도 횟수',
+    `retry_tokens` JSON NULL COMMENT '일부 기기만 실패한 경우 재시도할 토큰 목록',
+    `success_count` INT NOT NULL DEFAULT 0 COMMENT '발송 성공 기기 수 (누적)',
+    `last_error` TEXT NULL COMMENT '마지막 실패 사유',
+    `next_attempt_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '다음 시도 시각 (PROCESSING이면 임대 만료 시각)',
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '등록 일시',
+    `sent_at` DATETIME NULL COMMENT '발송 완료 일시',
+    PRIMARY KEY (`outbox_seq`),
+    KEY `idx_push_outbox_status_next` (`status`, `next_attempt_at`),
+    KEY `idx_push_outbox_customer_seq` (`customer_seq`),
+    CONSTRAINT `fk_push_outbox_customer_seq` FOREIGN KEY (`customer_seq`) REFERENCES `customer` (`customer_seq`) ON UPDATE RESTRICT ON DELETE CASCADE
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
 -- ---------------------------------------------------------
 -- 6) reserve (weather 테이블 참조 제거됨)
 -- ---------------------------------------------------------
@@ -151,12 +187,29 @@ CREATE TABLE `reserve` (
     `payment_key` VARCHAR(255) NULL COMMENT 'Toss Payment Key',
     `payment_status` VARCHAR(255) NULL COMMENT '결제 상태',
     PRIMARY KEY (`reserve_seq`),
-    KEY `idx_reserve_store_seq` (`store_seq`),
+    KEY `idx_reserve_store_date` (`store_seq`, `reserve_date`),
+    KEY `idx_reserve_date` (`reserve_date`),
     KEY `idx_reserve_customer_seq` (`customer_seq`),
     CONSTRAINT `fk_reserve_store_seq` FOREIGN KEY (`store_seq`) REFERENCES `store` (`store_seq`) ON UPDATE RESTRICT ON DELETE RESTRICT,
     CONSTRAINT `fk_reserve_customer_seq` FOREIGN KEY (`customer_seq`) REFERENCES `customer` (`customer_seq`) ON UPDATE RESTRICT ON DELETE RESTRICT
 ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
 
+-- ---------------------------------------------------------
+-- 6-1) reserve_table (예약-테이블 연관, reserve.reserve_tables 정규화)
+-- ---------------------------------------------------------
+CREATE TABLE `reserve_table` (
+    `reserve_seq` INT NOT NULL COMMENT '예약 번호',
+    `store_table_seq` INT NOT NULL COMMENT '테이블 번호',
+    `store_seq` INT NOT NULL COMMENT '식당 번호',
+    `reserve_date` DATETIME NOT NULL COMMENT '예약 일시 (reserve.reserve_date 복제)',
+    PRIMARY KEY (`reserve_seq`, `store_table_seq`),
+    KEY `idx_reserve_table_table_date` (`store_table_seq`, `reserve_date`),
+    KEY `idx_reserve_table_store_date` (`store_seq`, `reserve_date`),
+    CONSTRAINT `fk_reserve_table_reserve_seq` FOREIGN KEY (`reserve_seq`) REFERENCES `reserve` (`reserve_seq`) ON UPDATE RESTRICT ON DELETE CASCADE,
+    CONSTRAINT `fk_reserve_table_store_table_seq` FOREIGN KEY (`store_table_seq`) REFERENCES `store_table` (`store_table_seq`) ON UPDATE RESTRICT ON DELETE CASCADE,
+    CONSTRAINT `fk_reserve_table_store_seq` FOREIGN KEY (`store_seq`) REFERENCES `store` (`store_seq`) ON UPDATE RESTRICT ON DELETE RESTRICT
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
 -- ---------------------------------------------------------
 -- 7) menu
 -- ---------------------------------------------------------
@@ -215,6 +268,66 @@ CREATE TABLE `pay` (
     CONSTRAINT `fk_pay_option_seq` FOREIGN KEY (`option_seq`) REFERENCES `option` (`option_seq`) ON UPDATE RESTRICT ON DELETE RESTRICT
 ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
 
+-- ---------------------------------------------------------
+-- 10) idempotency_key (중복 요청 방지 키 저장소)
+-- ---------------------------------------------------------
+CREATE TABLE `idempotency_key` (
+    `scope` VARCHAR(64) NOT NULL COMMENT '키 범위 (API 이름)',
+    `idem_key` VARCHAR(128) NOT NULL COMMENT '클라이언트가 보낸 Idempotency-Key',
+    `request_hash` CHAR(64) NOT NULL COMMENT '요청 본문 SHA-256 (같은 키로 다른 요청을 보내면 거부)',
+    `status` VARCHAR(20) NOT NULL DEFAULT 'PROCESSING' COMMENT '상태 (PROCESSING/DONE)',
+    `response` JSON NULL COMMENT '저장된 응답 (DONE)',
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '등록 일시',
+    `expires_at` DATETIME NOT NULL COMMENT '만료 일시',
+    PRIMARY KEY (`scope`, `idem_key`),
+    KEY `idx_idempotency_key_expires` (`expires_at`)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
+-- ---------------------------------------------------------
+-- 11) order_summary (예약별 주문 요약)
+-- ---------------------------------------------------------
+CREATE TABLE `order_summary` (
+    `reserve_seq` INT NOT NULL COMMENT '예약 번호',
+    `line_count` INT NOT NULL COMMENT '요약 항목 수 (식당/메뉴/옵션 조합 수)',
+    `total_quantity` INT NOT NULL COMMENT '총 수량',
+    `total_amount` INT NOT NULL COMMENT '총 금액 (항목 total_pay 합계)',
+    `summary` JSON NOT NULL COMMENT '영수증 항목 배열',
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '갱신 일시',
+    PRIMARY KEY (`reserve_seq`),
+    CONSTRAINT `fk_order_summary_reserve` FOREIGN KEY (`reserve_seq`) REFERENCES `reserve` (`reserve_seq`) ON DELETE CASCADE
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
+-- ---------------------------------------------------------
+-- 12) sales_daily (식당/일자/메뉴/옵션별 매출 집계)
+-- ---------------------------------------------------------
+CREATE TABLE `sales_daily` (
+    `store_seq` INT NOT NULL COMMENT '식당 번호',
+    `sales_date` DATE NOT NULL COMMENT '매출 일자 (DATE(pay.created_at))',
+    `menu_seq` INT NOT NULL COMMENT '메뉴 번호',
+    `option_seq` INT NOT NULL DEFAULT 0 COMMENT '추가 메뉴 번호 (옵션 없는 메뉴 행은 0)',
+    `pay_count` INT NOT NULL DEFAULT 0 COMMENT '결제 행 수',
+    `quantity` INT NOT NULL DEFAULT 0 COMMENT '수량 합계',
+    `revenue` BIGINT NOT NULL DEFAULT 0 COMMENT '매출 합계',
+    `cost` BIGINT NOT NULL DEFAULT 0 COMMENT '원가 합계',
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '갱신 일시',
+    PRIMARY KEY (`store_seq`, `sales_date`, `menu_seq`, `option_seq`)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
+-- ---------------------------------------------------------
+-- 13) store_layout (식당 테이블 배치 좌표)
+-- ---------------------------------------------------------
+CREATE TABLE `store_layout` (
+    `store_table_seq` INT NOT NULL COMMENT '테이블 번호',
+    `store_seq` INT NOT NULL COMMENT '식당 번호',
+    `pos_x` DOUBLE NOT NULL COMMENT '배치 X 좌표',
+    `pos_y` DOUBLE NOT NULL COMMENT '배치 Y 좌표',
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '갱신 일시',
+    PRIMARY KEY (`store_table_seq`),
+    KEY `idx_store_layout_store_seq` (`store_seq`),
+    CONSTRAINT `fk_store_layout_store_table` FOREIGN KEY (`store_table_seq`) REFERENCES `store_table` (`store_table_seq`) ON DELETE CASCADE,
+    CONSTRAINT `fk_store_layout_store` FOREIGN KEY (`store_seq`) REFERENCES `store` (`store_seq`) ON DELETE CASCADE
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_0900_ai_ci;
+
 -- ============================================================
 -- 생성 이력
 -- ============================================================
@@ -232,3 +345,36 @@ CREATE TABLE `pay` (
 --   - reserve 테이블에서 weather_datetime 컬럼 제거
 --   - reserve 테이블에서 fk_reserve_weather FK 제약조건 제거
 --   - 테이블 수: 10개 → 9개
+--
+-- 2026-01-22 김택권: reserve_table 연관 테이블 추가
+--   - reserve.reserve_tables (comma-separated)를 정규화한 reserve_table 생성
+--   - (store_table_seq, reserve_date) 인덱스로 테이블별 시간 충돌 조회
+--   - 기존 DB는 migration_v3_reserve_table.sql로 생성 및 백필
+--   - fk_reserve_table_store_table_seq는 ON DELETE CASCADE (테이블 삭제 시 연관 행 삭제, 이력은 reserve.reserve_tables에 유지)
+--
+-- 2026-01-22 김택권: reserve 예약 일시 인덱스
+--   - idx_reserve_store_seq → idx_reserve_store_date (store_seq, reserve_date)
+--   - idx_reserve_date (reserve_date) 추가
+--   - 조회 컬럼 전체를 담는 커버링 인덱스는 키 길이 한도(3,072바이트) 초과로 불가 → 범위 검색 후 PK 조회
+--   - 기존 DB는 migration_v4_reserve_date_index.sql로 적용
+--
+-- 2026-01-22 김택권: push_outbox 발송 대기열 추가
+--   - 푸시 알림 API는 대기열에 등록만 하고 워커(app/utils/push_outbox.py)가 발송
+--   - 기존 DB는 migration_v5_push_outbox.sql로 적용
+--
+-- 2026-01-22 김택권: idempotency_key 중복 요청 방지 키 저장소 추가
+--   - 결제/예약 API의 Idempotency-Key 헤더별 응답 저장 (app/utils/idempotency.py)
+--   - 기존 DB는 migration_v6_idempotency_key.sql로 적용
+--
+-- 2026-01-22 김택권: order_summary 예약별 주문 요약 추가
+--   - pay 기록 시 같은 트랜잭션에서 저장, 영수증 조회는 PK 한 번 (app/utils/order_summary.py)
+--   - 기존 DB는 migration_v7_order_summary.sql로 적용
+--
+-- 2026-01-22 김택권: sales_daily 매출 집계 추가
+--   - pay 기록 시 같은 트랜잭션에서 (식당, 일자, 메뉴, 옵션)별 합계 갱신 (app/utils/sales_rollup.py)
+--   - 기존 DB는 migration_v8_sales_daily.sql 적용 후 run_sales_backfill.py로 백필
+--
+-- 2026-01-22 김택권: store_layout 테이블 배치 좌표 추가
+--   - store.store_placement 배치 JSON을 테이블당 1행으로 정규화 (app/utils/store_layout.py)
+--   - store.store_placement VARCHAR(255) → TEXT
+--   - 기존 DB는 migration_v9_store_layout.sql로 적용 (배치 JSON 백필 포함)
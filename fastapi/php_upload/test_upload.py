@@ -1,202 +1,149 @@
 #!/usr/bin/env python3
 """
-제품 이미지 업로드 테스트 스크립트
-FastAPI 서버에 파일 업로드를 테스트합니다.
+이미지 업로드 부하 테스트 스크립트
+같은 이미지를 동시에 여러 번 올려 처리량(요청/초, MB/초)과 지연 시간(p50 / p95)을 측정
 
 사용 방법:
-    python test_upload.py [product_seq] [image_path]
+    python test_upload.py <image_path> [요청수] [동시성]
 
 예시:
-    python test_upload.py 1 /path/to/test_image.jpg
+    # FastAPI 업로드 (POST /api/image/upload, DB 변경 없음)
+    python test_upload.py ../../images/sample.jpg 200 16
+
+    # 메뉴 이미지 교체까지 포함 (POST /api/menu/upload_menu_image/{menu_seq})
+    UPLOAD_URL=http://127.0.0.1:8000/api/menu/upload_menu_image/1 python test_upload.py sample.jpg 50 4
+
+    # 기존 PHP 업로드와 비교 (NAS의 upload_image.php, 추가 필드는 UPLOAD_FIELDS)
+    UPLOAD_URL=https://cheng80.myqnapcloud.com/upload_image.php UPLOAD_FIELDS=product_seq=1 \\
+        python test_upload.py sample.jpg 50 4
+
+환경변수:
+    API_BASE_URL   FastAPI 서버 주소 (기본 http://127.0.0.1:8000)
+    UPLOAD_URL     업로드 주소 전체 (지정하면 API_BASE_URL 무시)
+    UPLOAD_FIELDS  함께 보낼 필드 (예: product_seq=1,file_type=image)
+    UPLOAD_UNIQUE  1(기본)이면 요청마다 파일 끝에 몇 바이트를 붙여 내용을 다르게 함
+                   → 매번 검증 / 변환 / 저장 경로 측정, 0이면 같은 내용 → 중복 재사용 경로 측정
+
+참고:
+    - 서버 업로드 폴더에 요청 수만큼 파일이 생깁니다 (UPLOAD_UNIQUE=1). 테스트 서버에서 실행하세요.
+    - 서버 없이 FastAPI 업로드만 측정하려면 test_upload_local.py
 """
 
+import asyncio
+import os
+import statistics
 import sys
-import requests
+import time
 from pathlib import Path
 
-def test_upload_image(product_seq: int, image_path: str, api_base_url: str = "http://127.0.0.1:8000"):
-    """
-    제품 이미지 업로드 테스트
-    
-    Args:
-        product_seq: 제품 시퀀스 번호
-        image_path: 업로드할 이미지 파일 경로
-        api_base_url: FastAPI 서버 URL
-    """
-    image_file = Path(image_path)
-    
-    if not image_file.exists():
-        print(f"❌ 파일을 찾을 수 없습니다: {image_path}")
-        return False
-    
-    if not image_file.is_file():
-        print(f"❌ 파일이 아닙니다: {image_path}")
-        return False
-    
-    # 파일 확장자 확인
-    valid_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
-    if image_file.suffix.lower() not in valid_extensions:
-        print(f"❌ 지원하지 않는 이미지 형식입니다: {image_file.suffix}")
-        print(f"   지원 형식: {', '.join(valid_extensions)}")
-        return False
-    
-    print(f"📤 제품 이미지 업로드 테스트 시작")
-    print(f"   제품 번호: {product_seq}")
-    print(f"   파일: {image_path}")
-    print(f"   파일 크기: {image_file.stat().st_size / 1024:.2f} KB")
-    print(f"   API URL: {api_base_url}")
-    print()
-    
-    try:
-        # 파일 업로드
-        url = f"{api_base_url}/api/products/{product_seq}/upload_file"
-        
-        with open(image_file, 'rb') as f:
-            files = {
-                'file': (image_file.name, f, 'image/jpeg')
-            }
-            data = {
-                'file_type': 'image'
-            }
-            
-            print(f"🔄 업로드 중...")
-            print(f"   URL: {url}")
-            
-            response = requests.post(url, files=files, data=data, timeout=30)
-            
-            print(f"📥 응답 수신")
-            print(f"   상태 코드: {response.status_code}")
-            print(f"   응답 본문: {response.text[:500]}")
-            print()
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('result') == 'OK' or 'file_url' in result:
-                    print("✅ 업로드 성공!")
-                    if 'file_url' in result:
-                        print(f"   파일 URL: {result['file_url']}")
-                    return True
-                else:
-                    print(f"❌ 업로드 실패: {result}")
-                    return False
-            else:
-                print(f"❌ HTTP 오류: {response.status_code}")
-                print(f"   응답: {response.text}")
-                return False
-                
-    except requests.exceptions.ConnectionError:
-        print(f"❌ 연결 실패: FastAPI 서버에 연결할 수 없습니다.")
-        print(f"   서버가 실행 중인지 확인하세요: {api_base_url}")
-        return False
-    except Exception as e:
-        print(f"❌ 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-def test_upload_glb(product_seq: int, glb_path: str, model_name: str, api_base_url: str = "http://127.0.0.1:8000"):
+import httpx
+
+
+def build_url() -> str:
+    if os.getenv("UPLOAD_URL"):
+        return os.getenv("UPLOAD_URL")
+    return f"{os.getenv('API_BASE_URL', 'http://127.0.0.1:8000')}/api/image/upload"
+
+
+def parse_fields(value: str) -> dict:
+    fields = {}
+    for item in value.split(","):
+        if "=" in item:
+            key, val = item.split("=", 1)
+            fields[key.strip()] = val.strip()
+    return fields
+
+
+async def run_load(url: str, image_path: str, count: int, concurrency: int,
+                   fields: dict = None, unique: bool = True) -> dict:
     """
-    GLB 모델 파일 업로드 테스트
-    
-    Args:
-        product_seq: 제품 시퀀스 번호
-        glb_path: 업로드할 GLB 파일 경로
-        model_name: 모델 이름 (예: 'nike_v2k')
-        api_base_url: FastAPI 서버 URL
+    업로드 부하 실행
+
+    Returns:
+        dict: ok, failed, statuses, elapsed, latencies(ms), bytes, last(마지막 성공 응답)
     """
-    glb_file = Path(glb_path)
-    
-    if not glb_file.exists():
-        print(f"❌ 파일을 찾을 수 없습니다: {glb_path}")
-        return False
-    
-    if glb_file.suffix.lower() != '.glb':
-        print(f"❌ GLB 파일이 아닙니다: {glb_path}")
-        return False
-    
-    print(f"📤 GLB 모델 파일 업로드 테스트 시작")
-    print(f"   제품 번호: {product_seq}")
-    print(f"   파일: {glb_path}")
-    print(f"   모델명: {model_name}")
-    print(f"   파일 크기: {glb_file.stat().st_size / 1024:.2f} KB")
-    print(f"   API URL: {api_base_url}")
-    print()
-    
-    try:
-        url = f"{api_base_url}/api/products/{product_seq}/upload_file"
-        
-        with open(glb_file, 'rb') as f:
-            files = {
-                'file': (glb_file.name, f, 'model/gltf-binary')
-            }
-            data = {
-                'file_type': 'glb',
-                'model_name': model_name
-            }
-            
-            print(f"🔄 업로드 중...")
-            print(f"   URL: {url}")
-            
-            response = requests.post(url, files=files, data=data, timeout=60)
-            
-            print(f"📥 응답 수신")
-            print(f"   상태 코드: {response.status_code}")
-            print(f"   응답 본문: {response.text[:500]}")
-            print()
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('result') == 'OK' or 'file_url' in result:
-                    print("✅ 업로드 성공!")
-                    if 'file_url' in result:
-                        print(f"   파일 URL: {result['file_url']}")
-                    return True
-                else:
-                    print(f"❌ 업로드 실패: {result}")
-                    return False
+    data = Path(image_path).read_bytes()
+    name = Path(image_path).name
+    # 요청마다 다른 내용: JPEG / PNG 디코더는 파일 끝 뒤의 바이트를 무시
+    run_id = os.urandom(4).hex()
+    queue = asyncio.Queue()
+    for i in range(count):
+        queue.put_nowait(i)
+    result = {"ok": 0, "failed": 0, "statuses": {}, "latencies": [], "bytes": 0, "last": None}
+
+    async def worker(client):
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            body = data + f"{run_id}-{i}".encode() if unique else data
+            start = time.perf_counter()
+            try:
+                response = await client.post(url, files={"file": (name, body)}, data=fields or {})
+                status = response.status_code
+                ok = status == 200 and response.json().get("result") == "OK"
+                if ok:
+                    result["last"] = response.json()
+            except Exception as e:
+                status = type(e).__name__
+                ok = False
+            result["latencies"].append((time.perf_counter() - start) * 1000)
+            result["statuses"][status] = result["statuses"].get(status, 0) + 1
+            if ok:
+                result["ok"] += 1
+                result["bytes"] += len(body)
             else:
-                print(f"❌ HTTP 오류: {response.status_code}")
-                print(f"   응답: {response.text}")
-                return False
-                
-    except requests.exceptions.ConnectionError:
-        print(f"❌ 연결 실패: FastAPI 서버에 연결할 수 없습니다.")
-        print(f"   서버가 실행 중인지 확인하세요: {api_base_url}")
-        return False
-    except Exception as e:
-        print(f"❌ 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+                result["failed"] += 1
 
-if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("사용 방법:")
-        print("  이미지 업로드: python test_upload.py <product_seq> <image_path>")
-        print("  GLB 업로드:   python test_upload.py <product_seq> <glb_path> <model_name>")
-        print()
-        print("예시:")
-        print("  python test_upload.py 1 /path/to/image.jpg")
-        print("  python test_upload.py 1 /path/to/model.glb nike_v2k")
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        result["elapsed"] = time.perf_counter() - start
+    return result
+
+
+def print_result(result: dict):
+    latencies = sorted(result["latencies"])
+    elapsed = result["elapsed"]
+    print(f"✅ 성공: {result['ok']}  ❌ 실패: {result['failed']}  상태: {result['statuses']}")
+    print(f"⏱️  전체 {elapsed:.2f}초 → {result['ok'] / elapsed:.1f} 요청/초, "
+          f"{result['bytes'] / 1024 / 1024 / elapsed:.2f} MB/초")
+    if latencies:
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"📈 지연 p50: {statistics.median(latencies):.1f} ms, p95: {p95:.1f} ms, 최대: {latencies[-1]:.1f} ms")
+    if result["last"]:
+        print(f"📄 마지막 응답: {result['last']}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("사용 방법: python test_upload.py <image_path> [요청수] [동시성]")
         sys.exit(1)
-    
-    product_seq = int(sys.argv[1])
-    file_path = sys.argv[2]
-    
-    # API Base URL (환경 변수 또는 기본값)
-    import os
-    api_base_url = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
-    
-    # GLB 파일인지 확인
-    if Path(file_path).suffix.lower() == '.glb':
-        if len(sys.argv) < 4:
-            print("❌ GLB 파일은 model_name이 필요합니다.")
-            print("   사용 방법: python test_upload.py <product_seq> <glb_path> <model_name>")
-            sys.exit(1)
-        model_name = sys.argv[3]
-        success = test_upload_glb(product_seq, file_path, model_name, api_base_url)
-    else:
-        success = test_upload_image(product_seq, file_path, api_base_url)
-    
-    sys.exit(0 if success else 1)
+    image_path = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    if not Path(image_path).is_file():
+        print(f"❌ 파일을 찾을 수 없습니다: {image_path}")
+        sys.exit(1)
+
+    url = build_url()
+    fields = parse_fields(os.getenv("UPLOAD_FIELDS", ""))
+    unique = os.getenv("UPLOAD_UNIQUE", "1") != "0"
+
+    print("=" * 60)
+    print("이미지 업로드 부하 테스트")
+    print("=" * 60)
+    print(f"URL: {url}")
+    print(f"파일: {image_path} ({Path(image_path).stat().st_size / 1024:.1f} KB)")
+    print(f"요청 {count}개, 동시성 {concurrency}, 요청마다 다른 내용: {unique}, 필드: {fields or '-'}")
+    print()
 
+    result = asyncio.run(run_load(url, image_path, count, concurrency, fields, unique))
+    print_result(result)
+    sys.exit(0 if result["failed"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
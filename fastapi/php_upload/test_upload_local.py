@@ -1,145 +1,115 @@
 #!/usr/bin/env python3
 """
-로컬에서 FastAPI 파일 업로드 테스트
-FastAPI 서버가 로컬에서 실행 중일 때 사용
+로컬 이미지 업로드 부하 테스트 (DB / NAS 불필요)
+임시 IMAGE_DIR을 쓰는 업로드 전용 서버(uvicorn)를 이 프로세스 안에서 띄우고
+test_upload.py의 부하 실행으로 POST /api/image/upload 처리량을 측정
 
 사용 방법:
+    python test_upload_local.py [image_path] [요청수] [동시성]
+
+예시:
     python test_upload_local.py
+    python test_upload_local.py ../../images/AppLogo.png 300 16
+    IMAGE_WORKERS=4 IMAGE_UPLOAD_MAX_DIM=1080 python test_upload_local.py
+
+참고:
+    - image_path를 생략하면 3000x2000 JPEG를 만들어 사용 (축소 경로 측정, Pillow 필요)
+    - 1단계: 요청마다 다른 내용 (수신 + 검증 / 축소 + 저장)
+    - 2단계: 같은 내용 반복 (수신 + 해시 후 기존 파일 재사용)
+    - 메뉴 / 식당 연결(DB 갱신)은 포함하지 않음
 """
 
-import requests
-from pathlib import Path
+import asyncio
+import io
+import os
+import shutil
 import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+PORT = int(os.getenv("UPLOAD_TEST_PORT", "8765"))
+
+
+def make_sample(path: str):
+    from PIL import Image
+
+    size = (3000, 2000)
+    # 단색이면 압축이 지나치게 잘 되므로 그라데이션 + 잡음
+    image = Image.merge("RGB", (
+        Image.linear_gradient("L").resize(size),
+        Image.radial_gradient("L").resize(size),
+        Image.effect_noise(size, 24),
+    ))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=90)
+    Path(path).write_bytes(buffer.getvalue())
+
+
+async def run(image_path: str, count: int, concurrency: int):
+    import uvicorn
+    from fastapi import FastAPI
+
+    from app.api import image
+    from app.utils.image_store import image_store, shutdown_image_pool
+    from test_upload import print_result, run_load
+
+    app = FastAPI()
+    app.include_router(image.router, prefix="/api/image")
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=PORT, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    url = f"http://127.0.0.1:{PORT}/api/image/upload"
+    try:
+        # 프로세스 풀 준비 (첫 요청의 spawn 시간을 측정에서 제외)
+        await run_load(url, image_path, 1, 1)
+
+        print("1️⃣ 요청마다 다른 내용 (검증 / 축소 / 저장)")
+        print_result(await run_load(url, image_path, count, concurrency, unique=True))
+        print()
+        print("2️⃣ 같은 내용 반복 (해시 후 기존 파일 재사용)")
+        print_result(await run_load(url, image_path, count, concurrency, unique=False))
+        print()
+        print(f"📊 {image_store.stats()}")
+    finally:
+        server.should_exit = True
+        await serve_task
+        shutdown_image_pool()
+
+
+def main():
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    image_dir = tempfile.mkdtemp(prefix="tablenow_upload_")
+    # image_store / image_upload가 읽기 전에 설정
+    os.environ["IMAGE_DIR"] = image_dir
+    os.environ["IMAGE_CACHE_DIR"] = os.path.join(image_dir, "cache")
+
+    if len(sys.argv) > 1 and sys.argv[1]:
+        image_path = sys.argv[1]
+    else:
+        image_path = os.path.join(image_dir, "sample_source.jpg.src")
+        make_sample(image_path)
 
-# 테스트 이미지 파일 경로 (php_upload 폴더에서 상위로 올라가서 images 폴더 접근)
-TEST_IMAGE = Path(__file__).parent.parent.parent / "images" / "Nike_Air_1_Black_01.png"
-API_BASE_URL = "http://127.0.0.1:8000"
-PRODUCT_SEQ = 1  # 테스트용 제품 번호
-
-def test_upload():
-    """이미지 업로드 테스트"""
-    
-    if not TEST_IMAGE.exists():
-        print(f"❌ 테스트 이미지를 찾을 수 없습니다: {TEST_IMAGE}")
-        print(f"   다른 이미지 파일 경로를 지정하세요.")
-        return False
-    
     print("=" * 60)
-    print("FastAPI 파일 업로드 테스트")
+    print("로컬 이미지 업로드 부하 테스트")
     print("=" * 60)
-    print(f"API URL: {API_BASE_URL}")
-    print(f"제품 번호: {PRODUCT_SEQ}")
-    print(f"테스트 이미지: {TEST_IMAGE}")
-    print(f"파일 크기: {TEST_IMAGE.stat().st_size / 1024:.2f} KB")
-    print()
-    
-    # 1. FastAPI 서버 연결 확인
-    print("1️⃣ FastAPI 서버 연결 확인...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=2)
-        if response.status_code == 200:
-            print("   ✅ FastAPI 서버 연결 성공")
-        else:
-            print(f"   ⚠️  서버 응답: {response.status_code}")
-    except requests.exceptions.ConnectionError:
-        print("   ❌ FastAPI 서버에 연결할 수 없습니다.")
-        print("   서버가 실행 중인지 확인하세요:")
-        print("   cd fastapi && python app/main.py")
-        return False
-    except Exception as e:
-        print(f"   ❌ 오류: {e}")
-        return False
-    
+    print(f"IMAGE_DIR: {image_dir}")
+    print(f"파일: {image_path} ({Path(image_path).stat().st_size / 1024:.1f} KB)")
+    print(f"요청 {count}개, 동시성 {concurrency}")
     print()
-    
-    # 2. 제품 존재 확인
-    print("2️⃣ 제품 존재 확인...")
     try:
-        response = requests.get(f"{API_BASE_URL}/api/products/{PRODUCT_SEQ}", timeout=5)
-        if response.status_code == 200:
-            product_data = response.json()
-            if product_data.get('result') != 'Error':
-                print(f"   ✅ 제품 {PRODUCT_SEQ} 존재 확인")
-                product_name = product_data.get('result', {}).get('p_name', 'N/A')
-                print(f"   제품명: {product_name}")
-            else:
-                print(f"   ⚠️  제품 {PRODUCT_SEQ}를 찾을 수 없습니다.")
-                print("   다른 제품 번호를 사용하거나 제품을 먼저 생성하세요.")
-        else:
-            print(f"   ⚠️  제품 조회 실패: {response.status_code}")
-    except Exception as e:
-        print(f"   ⚠️  제품 조회 중 오류: {e}")
-    
-    print()
-    
-    # 3. 파일 업로드
-    print("3️⃣ 파일 업로드 테스트...")
-    try:
-        url = f"{API_BASE_URL}/api/products/{PRODUCT_SEQ}/upload_file"
-        
-        with open(TEST_IMAGE, 'rb') as f:
-            files = {
-                'file': (TEST_IMAGE.name, f, 'image/png')
-            }
-            data = {
-                'file_type': 'image'
-            }
-            
-            print(f"   업로드 URL: {url}")
-            print(f"   파일: {TEST_IMAGE.name}")
-            
-            response = requests.post(url, files=files, data=data, timeout=30)
-            
-            print(f"   HTTP 상태 코드: {response.status_code}")
-            
-            if response.status_code == 200:
-                result = response.json()
-                print()
-                print("   ✅ 업로드 성공!")
-                print(f"   응답: {result}")
-                
-                if 'file_url' in result:
-                    file_url = result['file_url']
-                    print()
-                    print("=" * 60)
-                    print("업로드된 파일 URL:")
-                    print(f"   {file_url}")
-                    print("=" * 60)
-                    print()
-                    print("웹 브라우저에서 접속하여 파일이 정상적으로 저장되었는지 확인하세요.")
-                
-                if 'saved_path' in result:
-                    saved_path = result['saved_path']
-                    print(f"   저장 경로: {saved_path}")
-                    # 파일 존재 확인
-                    if Path(saved_path).exists():
-                        print(f"   ✅ 파일이 저장되었습니다: {saved_path}")
-                    else:
-                        print(f"   ⚠️  파일이 저장되지 않았습니다: {saved_path}")
-                
-                return True
-            else:
-                print(f"   ❌ 업로드 실패")
-                print(f"   응답: {response.text}")
-                return False
-                
-    except requests.exceptions.Timeout:
-        print("   ❌ 요청 시간 초과")
-        return False
-    except Exception as e:
-        print(f"   ❌ 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        asyncio.run(run(image_path, count, concurrency))
+        saved = [name for name in os.listdir(image_dir) if not name.startswith(".") and "." in name
+                 and not name.endswith(".src")]
+        print(f"💾 저장된 파일: {len(saved)}개, 임시 파일 남음: {len(os.listdir(os.path.join(image_dir, '.upload')))}개")
+    finally:
+        shutil.rmtree(image_dir, ignore_errors=True)
 
-if __name__ == "__main__":
-    print()
-    success = test_upload()
-    print()
-    if success:
-        print("✅ 테스트 완료!")
-        sys.exit(0)
-    else:
-        print("❌ 테스트 실패")
-        sys.exit(1)
 
+if __name__ == "__main__":
+    main()
@@ -1,159 +1,63 @@
 #!/usr/bin/env python3
 """
-PHP 파일 업로드 테스트 스크립트
-FastAPI를 통해 PHP로 이미지 업로드 테스트
+PHP 업로드(upload_image.php) ↔ FastAPI 업로드(POST /api/image/upload) 처리량 비교
+같은 이미지 / 요청 수 / 동시성으로 두 주소에 test_upload.py 부하를 차례로 실행
 
 사용 방법:
-    python test_upload_php.py
+    python test_upload_php.py <image_path> [요청수] [동시성]
+
+예시:
+    python test_upload_php.py ../../images/AppLogo.png 50 4
+    PHP_UPLOAD_URL=https://cheng80.myqnapcloud.com/upload_image.php python test_upload_php.py sample.jpg
+
+환경변수:
+    PHP_UPLOAD_URL   PHP 업로드 주소 (기본 https://cheng80.myqnapcloud.com/upload_image.php)
+    PHP_FIELDS       PHP에 함께 보낼 필드 (기본 product_seq=1, 이전 프로젝트 스크립트 기준)
+    API_BASE_URL     FastAPI 서버 주소 (기본 http://127.0.0.1:8000)
+
+참고:
+    - 두 쪽 모두 업로드 폴더에 요청 수만큼 파일이 생깁니다. 테스트 서버 / 테스트 폴더에서 실행하세요.
+    - PHP는 요청마다 product_{seq}_<원본이름>으로 덮어쓰므로 저장 결과가 아닌 처리량만 비교합니다.
 """
 
-import requests
-from pathlib import Path
+import asyncio
+import os
 import sys
+from pathlib import Path
 
-# 테스트 이미지 파일 경로 (php_upload 폴더에서 상위로 올라가서 images 폴더 접근)
-TEST_IMAGE = Path(__file__).parent.parent.parent / "images" / "Nike_Air_1_Black_01.png"
-API_BASE_URL = "http://127.0.0.1:8000"
-PRODUCT_SEQ = 1  # 테스트용 제품 번호
+from test_upload import parse_fields, print_result, run_load
+
+PHP_UPLOAD_URL = os.getenv("PHP_UPLOAD_URL", "https://cheng80.myqnapcloud.com/upload_image.php")
+API_BASE_URL = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("사용 방법: python test_upload_php.py <image_path> [요청수] [동시성]")
+        sys.exit(1)
+    image_path = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    if not Path(image_path).is_file():
+        print(f"❌ 파일을 찾을 수 없습니다: {image_path}")
+        sys.exit(1)
 
-def test_upload():
-    """PHP를 통한 이미지 업로드 테스트"""
-    
-    if not TEST_IMAGE.exists():
-        print(f"❌ 테스트 이미지를 찾을 수 없습니다: {TEST_IMAGE}")
-        print(f"   다른 이미지 파일 경로를 지정하세요.")
-        return False
-    
     print("=" * 60)
-    print("PHP 파일 업로드 테스트 (FastAPI 경유)")
+    print("PHP ↔ FastAPI 이미지 업로드 처리량 비교")
     print("=" * 60)
-    print(f"FastAPI URL: {API_BASE_URL}")
-    print(f"제품 번호: {PRODUCT_SEQ}")
-    print(f"테스트 이미지: {TEST_IMAGE}")
-    print(f"파일 크기: {TEST_IMAGE.stat().st_size / 1024:.2f} KB")
-    print()
-    
-    # 1. FastAPI 서버 연결 확인
-    print("1️⃣ FastAPI 서버 연결 확인...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=2)
-        if response.status_code == 200:
-            print("   ✅ FastAPI 서버 연결 성공")
-        else:
-            print(f"   ⚠️  서버 응답: {response.status_code}")
-    except requests.exceptions.ConnectionError:
-        print("   ❌ FastAPI 서버에 연결할 수 없습니다.")
-        print("   서버가 실행 중인지 확인하세요:")
-        print("   cd fastapi && uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload")
-        return False
-    except Exception as e:
-        print(f"   ❌ 오류: {e}")
-        return False
-    
-    print()
-    
-    # 2. 제품 존재 확인
-    print("2️⃣ 제품 존재 확인...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/api/products/{PRODUCT_SEQ}", timeout=5)
-        if response.status_code == 200:
-            product_data = response.json()
-            if product_data.get('result') != 'Error':
-                print(f"   ✅ 제품 {PRODUCT_SEQ} 존재 확인")
-                product_name = product_data.get('result', {}).get('p_name', 'N/A')
-                print(f"   제품명: {product_name}")
-            else:
-                print(f"   ⚠️  제품 {PRODUCT_SEQ}를 찾을 수 없습니다.")
-                print("   다른 제품 번호를 사용하거나 제품을 먼저 생성하세요.")
-        else:
-            print(f"   ⚠️  제품 조회 실패: {response.status_code}")
-    except Exception as e:
-        print(f"   ⚠️  제품 조회 중 오류: {e}")
-    
+    print(f"파일: {image_path} ({Path(image_path).stat().st_size / 1024:.1f} KB)")
+    print(f"요청 {count}개, 동시성 {concurrency}")
     print()
-    
-    # 3. 파일 업로드 (FastAPI → PHP)
-    print("3️⃣ 파일 업로드 테스트 (FastAPI → PHP)...")
-    try:
-        url = f"{API_BASE_URL}/api/products/{PRODUCT_SEQ}/upload_file"
-        
-        with open(TEST_IMAGE, 'rb') as f:
-            files = {
-                'file': (TEST_IMAGE.name, f, 'image/png')
-            }
-            data = {
-                'file_type': 'image'
-            }
-            
-            print(f"   업로드 URL: {url}")
-            print(f"   파일: {TEST_IMAGE.name}")
-            print(f"   파일 타입: image")
-            print()
-            print("   FastAPI가 PHP로 파일을 전달합니다...")
-            print(f"   PHP 스크립트: https://cheng80.myqnapcloud.com/upload_image.php")
-            
-            response = requests.post(url, files=files, data=data, timeout=30)
-            
-            print(f"   HTTP 상태 코드: {response.status_code}")
-            
-            if response.status_code == 200:
-                result = response.json()
-                print()
-                print("   ✅ 업로드 성공!")
-                print(f"   응답: {result}")
-                
-                if result.get('result') == 'OK':
-                    file_url = result.get('file_url')
-                    saved_path = result.get('saved_path')
-                    file_name = result.get('file_name')
-                    
-                    print()
-                    print("=" * 60)
-                    print("업로드 결과:")
-                    print("=" * 60)
-                    print(f"   파일명: {file_name}")
-                    print(f"   저장 경로: {saved_path}")
-                    print(f"   웹 URL: {file_url}")
-                    print("=" * 60)
-                    print()
-                    print("✅ NAS의 /share/Web/images/ 디렉토리에서 파일을 확인하세요.")
-                    print(f"   예상 파일명: {file_name}")
-                    print()
-                    print("웹 브라우저에서 접속하여 파일이 정상적으로 저장되었는지 확인:")
-                    print(f"   {file_url}")
-                    
-                    return True
-                else:
-                    error_msg = result.get('errorMsg', '알 수 없는 오류')
-                    print(f"   ❌ 업로드 실패: {error_msg}")
-                    return False
-            else:
-                print(f"   ❌ 업로드 실패")
-                print(f"   응답: {response.text}")
-                return False
-                
-    except requests.exceptions.Timeout:
-        print("   ❌ 요청 시간 초과")
-        return False
-    except Exception as e:
-        print(f"   ❌ 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
 
-if __name__ == "__main__":
-    print()
-    success = test_upload()
-    print()
-    if success:
-        print("✅ 테스트 완료!")
+    targets = (
+        ("PHP", PHP_UPLOAD_URL, parse_fields(os.getenv("PHP_FIELDS", "product_seq=1"))),
+        ("FastAPI", f"{API_BASE_URL}/api/image/upload", {}),
+    )
+    for label, url, fields in targets:
+        print(f"▶ {label}: {url}")
+        print_result(asyncio.run(run_load(url, image_path, count, concurrency, fields)))
         print()
-        print("다음 단계:")
-        print("1. NAS의 /share/Web/images/ 디렉토리에서 파일 확인")
-        print("2. 웹 브라우저에서 URL 접속하여 이미지 확인")
-        print("3. DB의 product 테이블에서 p_image 필드 확인")
-        sys.exit(0)
-    else:
-        print("❌ 테스트 실패")
-        sys.exit(1)
 
+
+if __name__ == "__main__":
+    main()
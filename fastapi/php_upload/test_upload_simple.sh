@@ -1,21 +1,18 @@
 #!/bin/bash
-# 간단한 파일 업로드 테스트 스크립트 (curl 사용)
+# 간단한 이미지 업로드 테스트 스크립트 (curl 사용)
 #
-# ⚠️ 이전 프로젝트(슈즈샵)에서 사용하던 테스트 스크립트입니다.
-# Table Now 프로젝트에 맞게 수정이 필요합니다:
-# - API 엔드포인트 경로 변경
-# - 파라미터 이름 변경 (product_seq 등)
+# menu_seq를 주면 메뉴 이미지 교체 (POST /api/menu/upload_menu_image/{menu_seq}),
+# 생략하거나 0이면 파일 저장만 (POST /api/image/upload)
 
 # 설정
 API_BASE_URL="${API_BASE_URL:-http://127.0.0.1:8000}"
-PRODUCT_SEQ="${1:-1}"  # TODO: Table Now 프로젝트에 맞게 파라미터 변경
-IMAGE_PATH="${2:-}"
+IMAGE_PATH="${1:-}"
+MENU_SEQ="${2:-0}"
 
 if [ -z "$IMAGE_PATH" ]; then
-    echo "사용 방법: ./test_upload_simple.sh [id] [image_path]"
-    echo "예시: ./test_upload_simple.sh 1 /path/to/image.jpg"
-    echo ""
-    echo "⚠️  이전 프로젝트용 스크립트입니다. Table Now 프로젝트에 맞게 수정이 필요합니다."
+    echo "사용 방법: ./test_upload_simple.sh <image_path> [menu_seq]"
+    echo "예시: ./test_upload_simple.sh /path/to/image.jpg"
+    echo "      ./test_upload_simple.sh /path/to/image.jpg 3"
     exit 1
 fi
 
@@ -24,17 +21,21 @@ if [ ! -f "$IMAGE_PATH" ]; then
     exit 1
 fi
 
-echo "📤 제품 이미지 업로드 테스트"
-echo "   제품 번호: $PRODUCT_SEQ"
+if [ "$MENU_SEQ" != "0" ]; then
+    URL="$API_BASE_URL/api/menu/upload_menu_image/$MENU_SEQ"
+else
+    URL="$API_BASE_URL/api/image/upload"
+fi
+
+echo "📤 이미지 업로드 테스트"
 echo "   파일: $IMAGE_PATH"
-echo "   API URL: $API_BASE_URL"
+echo "   URL: $URL"
 echo ""
 
 # curl로 파일 업로드
 response=$(curl -s -w "\n%{http_code}" -X POST \
-    -F "file_type=image" \
     -F "file=@$IMAGE_PATH" \
-    "$API_BASE_URL/api/products/$PRODUCT_SEQ/upload_file")
+    "$URL")
 
 # HTTP 상태 코드와 본문 분리
 http_code=$(echo "$response" | tail -n1)
@@ -46,12 +47,11 @@ echo "   응답 본문:"
 echo "$body" | python3 -m json.tool 2>/dev/null || echo "$body"
 echo ""
 
-if [ "$http_code" = "200" ]; then
+if [ "$http_code" = "200" ] && echo "$body" | grep -q '"result":"OK"'; then
     echo "✅ 업로드 성공!"
     # file_url 추출 (간단한 방법)
-    echo "$body" | grep -o '"file_url":"[^"]*"' | cut -d'"' -f4 | head -1
+    echo "$API_BASE_URL$(echo "$body" | grep -o '"file_url":"[^"]*"' | cut -d'"' -f4 | head -1)"
 else
     echo "❌ 업로드 실패"
     exit 1
 fi
-
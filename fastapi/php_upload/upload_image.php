@@ -3,6 +3,10 @@
  * 이미지 업로드 PHP 스크립트
  * NAS의 웹서버 디렉토리에 배치
  * 
+ * ⚠️ Table Now에서는 FastAPI 업로드로 대체되었습니다 (2026-01-22, 김택권):
+ *   POST /api/image/upload, /api/menu/upload_menu_image/{menu_seq}, /api/store/upload_store_image/{store_seq}
+ *   (fastapi/app/utils/image_upload.py). 이 파일은 처리량 비교(test_upload_php.py)용으로만 남겨 둡니다.
+ *
  * ⚠️ 이전 프로젝트(슈즈샵)에서 사용하던 파일입니다.
  * Table Now 프로젝트에 맞게 수정이 필요합니다:
  * - 저장 경로 설정
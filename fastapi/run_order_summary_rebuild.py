@@ -0,0 +1,53 @@
+"""
+예약별 주문 요약(order_summary) 재생성 스크립트
+pay를 다시 집계해 order_summary를 채우고, pay가 없는 요약은 삭제
+
+사용법:
+    python run_order_summary_rebuild.py [예약번호 ...]
+
+예시:
+    python run_order_summary_rebuild.py             # 전체 재생성 (migration_v7 적용 직후 백필)
+    python run_order_summary_rebuild.py 12 15       # 지정한 예약만 재생성
+    ORDER_SUMMARY_BATCH_SIZE=200 python run_order_summary_rebuild.py
+
+참고:
+    - 요약은 결제 시점의 메뉴/옵션 이름을 담은 스냅샷이므로 메뉴 정보를 고친 뒤 맞추려면 다시 실행
+    - 전체 재생성은 ORDER_SUMMARY_BATCH_SIZE개 예약마다 커밋합니다
+"""
+
+import sys
+import time
+
+from app.database.connection import close_pool, get_connection
+from app.utils.order_summary import (
+    ORDER_SUMMARY_BATCH_SIZE,
+    rebuild_order_summaries,
+    refresh_order_summaries,
+)
+
+
+def main():
+    reserve_seqs = [int(arg) for arg in sys.argv[1:]]
+
+    print("=" * 60)
+    print("예약별 주문 요약 재생성")
+    print("=" * 60)
+    print(f"🎯 대상: {', '.join(map(str, reserve_seqs)) if reserve_seqs else '전체'}")
+    print(f"📦 ORDER_SUMMARY_BATCH_SIZE: {ORDER_SUMMARY_BATCH_SIZE}")
+    print()
+
+    start = time.perf_counter()
+    try:
+        with get_connection() as conn:
+            if reserve_seqs:
+                count = refresh_order_summaries(conn.cursor(), reserve_seqs)
+                conn.commit()
+            else:
+                count = rebuild_order_summaries(conn)
+    finally:
+        close_pool()
+    print(f"✅ 저장된 요약: {count}건 ({time.perf_counter() - start:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+푸시 알림 발송 워커 단독 실행 스크립트
+API 서버와 별도 프로세스로 push_outbox를 비움 (발송 처리량을 API 워커 수와 무관하게 조절)
+
+사용법:
+    python run_push_worker.py [워커수]
+
+예시:
+    python run_push_worker.py        # PUSH_OUTBOX_WORKERS (기본 1)
+    python run_push_worker.py 4
+
+참고:
+    - API 서버는 PUSH_OUTBOX_WORKERS=0으로 실행하면 등록만 하고 발송하지 않습니다
+    - 여러 프로세스를 띄워도 SELECT ... FOR UPDATE SKIP LOCKED로 같은 알림을 나눠 갖지 않습니다
+    - Ctrl+C로 종료, 발송 중이던 알림은 임대(PUSH_OUTBOX_LEASE) 만료 후 다시 발송됩니다
+"""
+
+import asyncio
+import sys
+
+from app.database.async_db import shutdown_executor
+from app.database.connection import close_pool
+from app.utils.push_outbox import PushOutboxWorker, PUSH_OUTBOX_WORKERS
+
+
+async def run(workers: int):
+    worker = PushOutboxWorker(workers=workers)
+    worker.start()
+    try:
+        while True:
+            await asyncio.sleep(60)
+            print(f"📮 {worker.stats()}")
+    finally:
+        await worker.stop()
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else max(PUSH_OUTBOX_WORKERS, 1)
+
+    print("=" * 60)
+    print("푸시 알림 발송 워커")
+    print("=" * 60)
+    print(f"👷 워커 수: {workers}")
+    print()
+
+    try:
+        asyncio.run(run(workers))
+    except KeyboardInterrupt:
+        print("\n🛑 종료")
+    finally:
+        shutdown_executor()
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
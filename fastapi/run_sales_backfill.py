@@ -0,0 +1,61 @@
+"""
+매출 집계(sales_daily) 백필 스크립트
+식당마다 기간의 집계를 지우고 pay에서 다시 계산 (식당 단위로 커밋)
+
+사용법:
+    python run_sales_backfill.py [시작일] [종료일] [식당번호 ...]
+
+예시:
+    python run_sales_backfill.py                          # 전체 기간, 모든 식당 (migration_v8 적용 직후)
+    python run_sales_backfill.py 2026-01-01 2026-01-31    # 기간 지정
+    python run_sales_backfill.py 2026-01-01 2026-01-31 1 3
+
+참고:
+    - 원가는 실행 시점의 menu_cost / option_cost로 계산됩니다
+      (API로 기록된 집계는 결제 시점 원가이므로 다시 백필하면 값이 달라질 수 있음)
+    - 식당마다 DELETE + INSERT ... SELECT를 한 트랜잭션으로 실행하므로 결제가 적은 시간에 실행하세요
+"""
+
+import sys
+import time
+from datetime import datetime
+
+from app.database.connection import close_pool, get_connection
+from app.utils.sales_rollup import backfill_sales_daily
+
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date() if value and value != '-' else None
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] in ('-h', '--help'):
+        print(__doc__)
+        return
+    start_date = parse_date(args[0]) if len(args) > 0 else None
+    end_date = parse_date(args[1]) if len(args) > 1 else None
+    store_seqs = [int(arg) for arg in args[2:]] or None
+
+    print("=" * 60)
+    print("매출 집계(sales_daily) 백필")
+    print("=" * 60)
+    print(f"📅 기간: {start_date or '처음'} ~ {end_date or '끝'}")
+    print(f"🏪 식당: {', '.join(map(str, store_seqs)) if store_seqs else '전체'}")
+    print()
+
+    def on_store(store_seq, rows):
+        print(f"   🏪 식당 {store_seq}: {rows}행")
+
+    start = time.perf_counter()
+    try:
+        with get_connection() as conn:
+            total = backfill_sales_daily(conn, start_date, end_date, store_seqs, on_store=on_store)
+    finally:
+        close_pool()
+    print()
+    print(f"✅ 집계 행: {total}건 ({time.perf_counter() - start:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+예약 8일 조회 실행 계획 테스트 (check_reserve_query_plans.py를 pytest로 실행)
+
+작성일: 2026-01-22
+작성자: 김택권
+
+실행:
+    RUN_DB_TESTS=1 python -m pytest tests/test_reserve_query_plans.py -v
+
+참고:
+    - ANALYZE TABLE / EXPLAIN을 실제 DB(app/database/connection.py의 DB_CONFIG)에 실행하므로
+      RUN_DB_TESTS=1일 때만 실행하고, 그 외에는 건너뜀
+    - DB에 연결할 수 없어도 건너뜀
+    - 행 수와 관계없이 엄격 모드(--lenient 없음)로 검사
+"""
+
+import os
+from datetime import datetime
+
+import pytest
+
+pymysql = pytest.importorskip("pymysql")
+
+if os.getenv("RUN_DB_TESTS") != "1":
+    pytest.skip("RUN_DB_TESTS=1일 때만 DB 실행 계획 테스트 실행", allow_module_level=True)
+
+from app.database.connection import connect_db
+from check_reserve_query_plans import PLAN_CHECKS, check_plans
+
+
+@pytest.fixture(scope="module")
+def conn():
+    try:
+        conn = connect_db()
+    except pymysql.Error as e:
+        pytest.skip(f"DB 연결 불가: {e}")
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def results(conn):
+    date = os.getenv("RESERVE_PLAN_DATE", datetime.now().strftime("%Y-%m-%d"))
+    store_seq = int(os.getenv("RESERVE_PLAN_STORE_SEQ", "1"))
+    return dict(check_plans(conn, date, store_seq))
+
+
+@pytest.mark.parametrize("name", [check[0] for check in PLAN_CHECKS])
+def test_reserve_query_uses_index(results, name):
+    assert results[name], f"{name} 실행 계획이 기대 인덱스를 쓰지 않음 (출력 참고)"